@@ -0,0 +1,2 @@
+""" Performance benchmarks for the metadata manager. They are not part of the test suite.
+"""
@@ -0,0 +1,137 @@
+""" Benchmark the sample sheet builders on synthetic designs: the row builder, the vectorized design builder and the
+previous implementation appending the samples one at a time with pandas.concat. The previous implementation is
+quadratic and only run up to LEGACY_MAX_SIZE samples. The DataFrames of all the builders are checked to be identical.
+
+Run from the repository root with: python -m benchmarks.creator_samples [sizes...]
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from sys import argv
+from time import perf_counter
+from typing import Any
+
+from pandas import DataFrame, Series, concat as pd_concat
+
+from ptmd.const import (
+    SAMPLE_SHEET_COLUMNS, DOSE_MAPPING, TIME_POINT_MAPPING, EMPTY_FIELDS_VALUES, BASE_IDENTIFIER, BLANK_CODE
+)
+from ptmd.lib.creator.dataframes import build_sample_dataframe
+from ptmd.lib.creator.design import build_design_dataframe
+
+
+DEFAULT_SIZES: list[int] = [100, 1000, 10000, 100000]
+LEGACY_MAX_SIZE: int = 10000
+DOSES: list[str] = ['BMD10', 'BMD25', '10mg/L']
+TIMEPOINTS: list[int] = [4, 8, 12, 24]
+REPLICATES: int = 5
+
+
+class BenchmarkHarvester:
+    """ The attributes of the HarvesterInput used by the sample sheet builder.
+
+    :param size: The approximate number of samples of the design.
+    """
+
+    def __init__(self, size: int) -> None:
+        """ The harvester constructor. """
+        per_chemical: int = len(TIMEPOINTS) * REPLICATES
+        chemicals: int = max(1, size // (per_chemical * len(DOSES)))
+        self.exposure_conditions: list[dict] = [
+            {'chemicals': [f"Compound {code}" for code in range(1, chemicals + 1)], 'dose': dose} for dose in DOSES
+        ]
+        self.chemicals_mapping: dict[str, str] = {f"Compound {code}": f"{code:03d}" for code in range(1, chemicals + 1)}
+        self.timepoints: list[int] = TIMEPOINTS
+        self.replicates4exposure: int = REPLICATES
+        self.replicates4control: int = REPLICATES
+        self.replicates_blank: int = 4
+        self.exposure_batch: str = 'AC'
+        self.vehicle: str = 'DMSO'
+        self.start_date: datetime = datetime(2023, 1, 1)
+
+
+def build_sample_dataframe_concat(harvester: Any, chemicals_mapping: dict[str, str], organism_code: str) -> DataFrame:
+    """ The previous implementation of build_sample_dataframe, kept for comparison.
+
+    :param harvester: The harvester to build the DataFrame from.
+    :param chemicals_mapping: A dictionary mapping chemicals names to ptox codes.
+    :param organism_code: The organism code to use.
+    :return: A DataFrame
+    """
+    dataframe: DataFrame = DataFrame(columns=SAMPLE_SHEET_COLUMNS)
+    number_of_timepoints: int = len(harvester.timepoints)
+    for exposure_condition in harvester.exposure_conditions:
+        dose_code: str = DOSE_MAPPING[exposure_condition['dose']]
+        for chemical in exposure_condition['chemicals']:
+            chemical_code: str = chemicals_mapping[chemical]
+            for tp in range(1, number_of_timepoints + 1):
+                timepoint: str = TIME_POINT_MAPPING.get(f'TP{tp}', 'X')
+                for replicate in range(1, harvester.replicates4exposure + 1):
+                    hash_id: str = '%s%s%s%s%s%s' % (organism_code, harvester.exposure_batch, chemical_code,
+                                                     dose_code, timepoint, replicate)
+                    series: Series = Series([
+                        hash_id, BASE_IDENTIFIER + chemical_code, *EMPTY_FIELDS_VALUES, replicate, chemical,
+                        exposure_condition['dose'], 'TP%s' % tp, harvester.timepoints[tp - 1]
+                    ], index=dataframe.columns)
+                    dataframe = pd_concat([dataframe, series.to_frame().T], ignore_index=False, sort=False, copy=False)
+    for tp in range(1, number_of_timepoints + 1):
+        timepoint = TIME_POINT_MAPPING.get(f'TP{tp}', 'X')
+        control_code = '999' if harvester.vehicle == 'DMSO' else '000'
+        for replicate in range(1, harvester.replicates4control + 1):
+            hash_id = '%s%s%sZ%s%s' % (organism_code, harvester.exposure_batch, control_code, timepoint, replicate)
+            series = Series([hash_id, BASE_IDENTIFIER + control_code, *EMPTY_FIELDS_VALUES, replicate,
+                             "CONTROL (%s)" % harvester.vehicle, 0, 'TP%s' % tp, harvester.timepoints[tp - 1]],
+                            index=dataframe.columns)
+            dataframe = pd_concat([dataframe, series.to_frame().T], ignore_index=False, sort=False, copy=False)
+    for blank in range(1, harvester.replicates_blank + 1):
+        hash_id = '%s%s%sZS%s' % (organism_code, harvester.exposure_batch, BLANK_CODE, blank)
+        series = Series([hash_id, f'{BASE_IDENTIFIER}{BLANK_CODE}', *EMPTY_FIELDS_VALUES, blank, 'EXTRACTION BLANK', "0",
+                         'TP0', 0], index=dataframe.columns)
+        dataframe = pd_concat([dataframe, series.to_frame().T], ignore_index=False, sort=False, copy=False)
+    return dataframe
+
+
+def run(builder: Any, harvester: BenchmarkHarvester) -> tuple[float, DataFrame]:
+    """ Build the sample sheet of a design.
+
+    :param builder: The sample sheet builder.
+    :param harvester: The design.
+    :return: The elapsed time in seconds and the DataFrame.
+    """
+    start: float = perf_counter()
+    dataframe: DataFrame = builder(harvester, harvester.chemicals_mapping, 'F')
+    return perf_counter() - start, dataframe
+
+
+def identical(first: DataFrame, second: DataFrame) -> bool:
+    """ Check that two DataFrames have the same values, types, index and CSV output.
+
+    :param first: The first DataFrame.
+    :param second: The second DataFrame.
+    :return: True if they are identical.
+    """
+    return first.equals(second) and first.index.equals(second.index) and first.dtypes.equals(second.dtypes) and \
+        first.to_csv() == second.to_csv()
+
+
+def main(sizes: list[int]) -> None:
+    """ Run the benchmark for each size and print the results.
+
+    :param sizes: The approximate numbers of samples to benchmark.
+    """
+    print(f"{'samples':>10} {'concat':>10} {'rows':>10} {'design':>10} {'identical':>10}")
+    for size in sizes:
+        harvester: BenchmarkHarvester = BenchmarkHarvester(size)
+        elapsed, dataframe = run(build_sample_dataframe, harvester)
+        design_elapsed, design = run(build_design_dataframe, harvester)
+        same: bool = identical(dataframe, design)
+        legacy_elapsed: str = '-'
+        if len(dataframe) <= LEGACY_MAX_SIZE:
+            seconds, legacy = run(build_sample_dataframe_concat, harvester)
+            legacy_elapsed = f"{seconds:.3f}"
+            same = same and identical(legacy, dataframe)
+        print(f"{len(dataframe):>10} {legacy_elapsed:>10} {elapsed:>10.3f} {design_elapsed:>10.3f} {str(same):>10}")
+
+
+if __name__ == '__main__':
+    main([int(size) for size in argv[1:]] or DEFAULT_SIZES)
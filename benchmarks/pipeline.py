@@ -0,0 +1,478 @@
+""" Benchmark the life cycle of a file on synthetic exposure campaigns: building the sample sheet, writing and uploading
+the template, validating the filled spreadsheet, saving its samples and converting it to ISA. Each workload is a study
+design of a realistic size, varying the number of chemicals, doses, timepoints and replicates.
+
+The benchmark doesn't need the services of a deployment: the database is an in-memory SQLite database seeded with the
+organisms and chemicals shipped with the application, and Google Drive is replaced by a local directory. Each stage is
+timed on its own, keeping the best of several runs, and run once more while tracing the allocations to record its peak
+memory. The results can be saved as JSON and compared against a stored baseline, in which case the command fails when
+a stage is slower or uses more memory than the baseline allows.
+
+Run from the repository root with:
+    python -m benchmarks.pipeline [--workloads small medium] [--repeat 3] [--output results.json]
+                                  [--baseline benchmarks/baseline.json] [--tolerance 0.25] [--save-baseline]
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser, Namespace
+from datetime import datetime
+from json import dump, load
+from logging import WARNING
+from os import path, makedirs
+from platform import platform, python_version
+from shutil import copyfile, rmtree
+from sys import exit as sys_exit
+from tempfile import mkdtemp
+from time import perf_counter
+from tracemalloc import start as start_tracing, stop as stop_tracing, get_traced_memory, reset_peak
+from typing import Any, Callable
+
+from flask import Flask
+from flask_jwt_extended import create_access_token, decode_token, verify_jwt_in_request
+from pandas import DataFrame, read_excel
+
+from ptmd.config import db, jwt, session
+from ptmd.const import PTX_ID_LABEL
+from ptmd.logger import LOGGER
+from ptmd.boot.file_parsers import parse_chemicals, parse_organisms
+from ptmd.database import File, Sample, User, Organisation, JWT, reference_data, create_chemicals, create_organisms
+from ptmd.database.queries import build_timepoints_hours, get_chemicals_from_name
+from ptmd.lib.creator import DataframeCreator
+from ptmd.lib.creator.dataframes import build_sample_dataframe
+from ptmd.lib.creator.skeleton import template_cache
+from ptmd.lib.excel import save_to_excel
+from ptmd.lib.validator import ExcelValidator
+from ptmd.lib.isa import Batch2ISA
+from ptmd.api.queries.samples.core import SampleGenerator
+import ptmd.api.queries.utils  # noqa: F401 registers the JWT user loader
+
+
+BASELINE_PATH: str = path.join(path.dirname(__file__), 'baseline.json')
+DEFAULT_REPEAT: int = 3
+DEFAULT_TOLERANCE: float = 0.25
+MIN_DIFFERENCE: dict[str, float] = {'seconds': 0.05, 'peak_memory_mb': 1.0}
+METRICS: tuple[str, ...] = ('seconds', 'peak_memory_mb')
+DOSES: list[str] = ['BMD10', 'BMD25', '10mg/L']
+PARTNER: str = 'UOB'
+ORGANISM: str = 'Drosophila_melanogaster_female'
+PASSWORD: str = 'Benchmark1!'
+SAMPLES_PER_BOX: int = 81
+WORKLOADS: dict[str, dict[str, int]] = {
+    'small': {'chemicals': 5, 'doses': 1, 'timepoints': 2, 'replicates': 3},
+    'medium': {'chemicals': 10, 'doses': 3, 'timepoints': 3, 'replicates': 4},
+    'chemicals': {'chemicals': 100, 'doses': 1, 'timepoints': 2, 'replicates': 4},
+    'timepoints': {'chemicals': 10, 'doses': 2, 'timepoints': 5, 'replicates': 4},
+    'replicates': {'chemicals': 10, 'doses': 3, 'timepoints': 2, 'replicates': 9},
+    'large': {'chemicals': 30, 'doses': 3, 'timepoints': 5, 'replicates': 6}
+}
+
+
+class LocalDrive:
+    """ Local stand-in for the GoogleDriveConnector. The files are stored in a directory and identified by a counter.
+
+    :param directory: The directory holding the uploaded and downloaded files.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """ The local drive constructor. """
+        self.directory: str = directory
+        self.downloads: str = path.join(directory, 'downloads')
+        self.files: dict[str, str] = {}
+        makedirs(self.downloads, exist_ok=True)
+
+    def upload_file(self, directory_id: str, file_path: str, title: str = 'SAMPLE_TEST') -> dict[str, str]:
+        """ Store a copy of a file.
+
+        :param directory_id: The folder of the file, used as a prefix of the identifier.
+        :param file_path: The path of the file to upload.
+        :param title: The name of the file.
+        :return: The identifier, title and link of the stored file.
+        """
+        file_id: str = f"{directory_id}_{len(self.files) + 1}"
+        self.files[file_id] = path.join(self.directory, f"{file_id}.xlsx")
+        copyfile(file_path, self.files[file_id])
+        return {'id': file_id, 'title': title, 'alternateLink': f"file://{self.files[file_id]}"}
+
+    def download_file(self, file_id: str | int, filename: str) -> str:
+        """ Copy a stored file to the downloads directory.
+
+        :param file_id: The identifier of the file.
+        :param filename: The name of the downloaded file.
+        :return: The path of the downloaded file.
+        """
+        filepath: str = path.join(self.downloads, filename)
+        copyfile(self.files[str(file_id)], filepath)
+        return filepath
+
+
+class LocalExcelValidator(ExcelValidator):
+    """ ExcelValidator downloading the file from the local drive.
+
+    :param file: The serialized file to validate.
+    :param drive: The local drive holding the file.
+    """
+
+    def __init__(self, file: dict, drive: LocalDrive) -> None:
+        """ The local validator constructor. """
+        super().__init__(file_id=file['file_id'])
+        self.file = file
+        self.drive: LocalDrive = drive
+
+    def download_file(self) -> str | None:
+        """ Download the file from the local drive.
+
+        :return: the downloaded file path.
+        """
+        return self.drive.download_file(self.file['gdrive_id'], self.file['name'])
+
+
+class LocalSampleGenerator(SampleGenerator):
+    """ SampleGenerator downloading the file from the local drive.
+
+    :param file: The file to generate samples from.
+    :param drive: The local drive holding the file.
+    """
+
+    def __init__(self, file: File, drive: LocalDrive) -> None:
+        """ The local sample generator constructor. """
+        self.samples: list[str] = []
+        self.file_id = file.file_id
+        self.file = file
+        self.filename = file.name
+        self.drive: LocalDrive = drive
+
+    def get_data(self) -> tuple:
+        """ Get the data from the spreadsheet stored in the local drive.
+
+        :return: A tuple containing the data and the filepath.
+        """
+        filepath: str = self.drive.download_file(self.file.gdrive_id, self.filename)
+        return self.read_spreadsheet(filepath), filepath
+
+
+def make_design(parameters: dict[str, int], chemicals: list[str], batch: str) -> dict:
+    """ Build the user input of a synthetic study design.
+
+    :param parameters: The number of chemicals per dose, doses, timepoints and replicates of the design. Each dose is
+                       given to different chemicals.
+    :param chemicals: The names of the chemicals available in the database.
+    :param batch: The exposure batch of the design.
+    :return: The user input expected by the DataframeCreator.
+    """
+    return {
+        'partner': PARTNER,
+        'organism': ORGANISM,
+        'exposure_batch': batch,
+        'replicates4exposure': parameters['replicates'],
+        'replicates4control': parameters['replicates'],
+        'replicates_blank': 2,
+        'start_date': '2023-01-01',
+        'end_date': '2023-01-02',
+        'vehicle': 'DMSO',
+        'timepoints': [4 * (index + 1) for index in range(parameters['timepoints'])],
+        'exposure': [{
+            'chemicals': chemicals[index * parameters['chemicals']:(index + 1) * parameters['chemicals']],
+            'dose': dose
+        } for index, dose in enumerate(DOSES[:parameters['doses']])]
+    }
+
+
+def fill_spreadsheet(filepath: str) -> None:
+    """ Fill the columns of a template left to the partners, as if the exposure had been carried out.
+
+    :param filepath: The path to the template.
+    """
+    general: DataFrame = read_excel(filepath, sheet_name='General Information')
+    samples: DataFrame = read_excel(filepath, sheet_name='Exposure information')
+    positions: range = range(len(samples))
+    samples['sampleid_label'] = samples[PTX_ID_LABEL]
+    samples['shipment_identifier'] = 'Shipment 1'
+    samples['operator'] = 'Operator'
+    samples['quantity_dead_during_exposure'] = 0
+    samples['amount_replaced_before_collection'] = 0
+    samples['collection_order'] = [index + 1 for index in positions]
+    samples['box_id'] = [f"Box {index // SAMPLES_PER_BOX + 1}" for index in positions]
+    samples['box_row'] = [chr(65 + index % SAMPLES_PER_BOX // 9) for index in positions]
+    samples['box_column'] = [index % 9 + 1 for index in positions]
+    samples['exposure_route'] = 'water'
+    samples['mass_including_tube_(mg)'] = 1.5
+    samples['mass_excluding_tube_(mg)'] = 0.5
+    samples['observations_notes'] = ''
+    save_to_excel((samples, general), filepath)
+
+
+def measure(stage: Callable[[], Any], repeat: int, setup: Callable[[], None] | None = None) -> dict[str, float]:
+    """ Time a stage and record its peak memory. The time is the best of several runs and the memory is traced
+    during an additional run, so that tracing doesn't slow down the timed runs.
+
+    :param stage: The stage to run.
+    :param repeat: The number of timed runs.
+    :param setup: An optional function run before each run of the stage, outside the measures.
+    :return: The time in seconds and the peak memory in megabytes.
+    """
+    timings: list[float] = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start: float = perf_counter()
+        stage()
+        timings.append(perf_counter() - start)
+    if setup:
+        setup()
+    start_tracing()
+    try:
+        reset_peak()
+        stage()
+        peak: int = get_traced_memory()[1]
+    finally:
+        stop_tracing()
+    return {'seconds': round(min(timings), 4), 'peak_memory_mb': round(peak / 1024 ** 2, 2)}
+
+
+def run_workload(parameters: dict[str, int], batch: str, user: User, drive: LocalDrive, repeat: int) -> dict:
+    """ Run all the stages on the design of a workload.
+
+    :param parameters: The number of chemicals, doses, timepoints and replicates of the design.
+    :param batch: The exposure batch of the design.
+    :param user: The author of the file.
+    :param drive: The local drive holding the files.
+    :param repeat: The number of timed runs of each stage.
+    :return: The size of the design, the validation outcome and the measures of each stage.
+    """
+    chemicals: list[str] = sorted(reference_data.chemicals, key=lambda chemical: reference_data.chemicals[chemical])
+    design: dict = make_design(parameters, [chemical for chemical in chemicals if chemical not in ('Water', 'DMSO')], batch)
+    creator: DataframeCreator = DataframeCreator(user_input=design)
+    chemicals_mapping, organism_code = creator.get_references()
+    filename: str = f"{PARTNER}_{ORGANISM}_{batch}.xlsx"
+    template: str = path.join(drive.directory, filename)
+    stages: dict[str, dict[str, float]] = {}
+    uploaded: dict[str, str] = {}
+
+    def upload_template() -> None:
+        """ Write the template and upload it. """
+        creator.save_file(template)
+        uploaded.update(drive.upload_file(PARTNER, template, filename))
+
+    stages['sample_dataframe'] = measure(
+        lambda: build_sample_dataframe(harvester=creator, chemicals_mapping=chemicals_mapping,
+                                       organism_code=organism_code),
+        repeat
+    )
+    stages['template'] = measure(upload_template, repeat, setup=template_cache.clear)
+
+    fill_spreadsheet(template)
+    file: File = File(gdrive_id=drive.upload_file(PARTNER, template, filename)['id'],
+                      name=filename,
+                      batch=batch,
+                      replicates=design['replicates4exposure'],
+                      controls=design['replicates4control'],
+                      blanks=design['replicates_blank'],
+                      organisation_name=PARTNER,
+                      user_id=user.id,
+                      organism_name=ORGANISM,
+                      vehicle_name=design['vehicle'],
+                      chemicals=get_chemicals_from_name([name for condition in design['exposure']
+                                                         for name in condition['chemicals']]),
+                      timepoints=build_timepoints_hours(design['timepoints']),
+                      start_date=design['start_date'],
+                      end_date=design['end_date'])
+    session.add(file)
+    session.commit()
+    file_id: int = file.file_id
+
+    validators: list[LocalExcelValidator] = []
+
+    def validate() -> None:
+        """ Download and validate the filled spreadsheet. """
+        validators.append(LocalExcelValidator(dict(file), drive))
+        validators[-1].validate_content()
+
+    def clear_samples() -> None:
+        """ Remove the samples of the file so that they are inserted again. """
+        Sample.query.filter(Sample.file_id == file_id).delete()
+        session.commit()
+        session.expire_all()
+        SampleGenerator.compounds.clear()
+
+    def convert() -> None:
+        """ Load the file with its samples and convert it to ISA. """
+        Batch2ISA(File.query.filter(File.file_id == file_id).first()).convert()
+
+    stages['validate'] = measure(validate, repeat)
+    stages['save_samples'] = measure(lambda: LocalSampleGenerator(file, drive).generate_samples(), repeat,
+                                     setup=clear_samples)
+    stages['isa'] = measure(convert, repeat, setup=session.expire_all)
+    samples: int = Sample.query.filter(Sample.file_id == file_id).count()
+    stages['save_samples']['samples_per_second'] = round(samples / stages['save_samples']['seconds'], 1)
+    return {
+        'parameters': parameters,
+        'samples': samples,
+        'valid': validators[-1].report['valid'],
+        'stages': stages
+    }
+
+
+def create_benchmark_app() -> Flask:
+    """ Create an application bound to an in-memory SQLite database, using the models and the JWT manager of the
+    metadata manager.
+
+    :return: The application.
+    """
+    application: Flask = Flask(__name__)
+    application.config.update({
+        'SECRET_KEY': 'benchmark',
+        'JWT_SECRET_KEY': 'benchmark',
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://'
+    })
+    db.init_app(application)
+    jwt.init_app(application)
+    return application
+
+
+def seed(organisations: list[str]) -> tuple[User, str]:
+    """ Create the tables and the reference data, and log a user in.
+
+    :param organisations: The names of the organisations to create.
+    :return: The user and its access token.
+    """
+    db.create_all()
+    session.add_all([Organisation(name=name, gdrive_id=name, longname=name) for name in organisations])
+    user: User = User(username='benchmark', password=PASSWORD, email='benchmark@example.com', role='admin')
+    session.add(user)
+    session.commit()
+    organisms: dict[str, dict] = {}
+    for organism in parse_organisms():
+        organisms.setdefault(organism['ptox_biosystem_name'], organism)
+    create_organisms(list(organisms.values()))
+    create_chemicals(parse_chemicals())
+    token: str = create_access_token(identity=str(user.id))
+    session.add(JWT(jti=decode_token(token)['jti'], user=user))
+    session.commit()
+    reference_data.invalidate()
+    return user, token
+
+
+def run(workloads: list[str], repeat: int) -> dict:
+    """ Run the benchmark on the given workloads.
+
+    :param workloads: The names of the workloads to run.
+    :param repeat: The number of timed runs of each stage.
+    :return: The results.
+    """
+    directory: str = mkdtemp()
+    application: Flask = create_benchmark_app()
+    results: dict = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': python_version(),
+        'platform': platform(),
+        'repeat': repeat,
+        'workloads': {}
+    }
+    try:
+        drive: LocalDrive = LocalDrive(directory)
+        with application.app_context():
+            user, token = seed([PARTNER])
+            with application.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+                verify_jwt_in_request()
+                for index, name in enumerate(workloads):
+                    batch: str = f"A{chr(65 + index)}"
+                    results['workloads'][name] = run_workload(WORKLOADS[name], batch, user, drive, repeat)
+                    print_workload(name, results['workloads'][name])
+            session.remove()
+            db.drop_all()
+    finally:
+        reference_data.invalidate()
+        template_cache.clear()
+        rmtree(directory, ignore_errors=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """ Compare the results against a baseline. A measure regresses when it exceeds the baseline by more than the
+    tolerance and by more than MIN_DIFFERENCE, which keeps the noise of the fastest stages from failing the comparison.
+
+    :param results: The results of the current run.
+    :param baseline: The results of the baseline run.
+    :param tolerance: The allowed relative increase, 0.25 allowing the measures to be 25% above the baseline.
+    :return: The regressions.
+    """
+    regressions: list[dict] = []
+    for workload, result in results['workloads'].items():
+        stages: dict = baseline['workloads'].get(workload, {}).get('stages', {})
+        for stage, measures in result['stages'].items():
+            if stage not in stages:
+                continue
+            for metric in METRICS:
+                current: float = measures[metric]
+                previous: float = stages[stage][metric]
+                if current > previous * (1 + tolerance) and current - previous > MIN_DIFFERENCE[metric]:
+                    regressions.append({
+                        'workload': workload,
+                        'stage': stage,
+                        'metric': metric,
+                        'baseline': previous,
+                        'current': current,
+                        'ratio': round(current / previous, 2) if previous else None
+                    })
+    return regressions
+
+
+def print_workload(name: str, result: dict) -> None:
+    """ Print the measures of a workload.
+
+    :param name: The name of the workload.
+    :param result: The results of the workload.
+    """
+    print(f"{name}: {result['samples']} samples, valid={result['valid']}")
+    for stage, measures in result['stages'].items():
+        print(f"  {stage:<18} {measures['seconds']:>10.3f} s {measures['peak_memory_mb']:>10.2f} MB")
+
+
+def parse_arguments() -> Namespace:
+    """ Parse the command line arguments.
+
+    :return: The arguments.
+    """
+    parser: ArgumentParser = ArgumentParser(description="Benchmark the life cycle of a file on synthetic designs.")
+    parser.add_argument('--workloads', nargs='+', choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="The number of timed runs per stage.")
+    parser.add_argument('--output', help="Save the results as JSON to this path.")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="The results to compare against.")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="The allowed relative increase of each measure over the baseline.")
+    parser.add_argument('--save-baseline', action='store_true', help="Save the results as the new baseline.")
+    return parser.parse_args()
+
+
+def main(arguments: Namespace) -> int:
+    """ Run the benchmark, save the results and compare them against the baseline.
+
+    :param arguments: The command line arguments.
+    :return: The exit code: 1 if a measure regressed, 0 otherwise.
+    """
+    LOGGER.setLevel(WARNING)
+    results: dict = run(arguments.workloads, arguments.repeat)
+    if arguments.output:
+        with open(arguments.output, 'w') as f:
+            dump(results, f, indent=2)
+    if arguments.save_baseline:
+        with open(arguments.baseline, 'w') as f:
+            dump(results, f, indent=2)
+        print(f"Baseline saved to {arguments.baseline}")
+        return 0
+    if not path.exists(arguments.baseline):
+        print(f"No baseline found at {arguments.baseline}")
+        return 0
+    with open(arguments.baseline, 'r') as f:
+        baseline: dict = load(f)
+    regressions: list[dict] = compare(results, baseline, arguments.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression['workload']}/{regression['stage']} {regression['metric']}: "
+              f"{regression['baseline']} -> {regression['current']} (x{regression['ratio']})")
+    if not regressions:
+        print(f"No regression against {arguments.baseline} (tolerance {arguments.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys_exit(main(parse_arguments()))
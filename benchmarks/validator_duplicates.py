@@ -0,0 +1,91 @@
+""" Benchmark the duplicate detection of the validator on synthetic exposure records.
+
+Run from the repository root with: python -m benchmarks.validator_duplicates [sizes...]
+The time per row should stay roughly constant when the number of rows grows.
+"""
+from __future__ import annotations
+
+from sys import argv
+from time import perf_counter
+
+from ptmd.lib.validator.core import VerticalValidator
+from ptmd.lib.validator.duplicates import DuplicateIndex
+from ptmd.lib.validator.validate_identifier import validate_unique_identifier
+
+
+DEFAULT_SIZES: list[int] = [1000, 10000, 100000]
+
+
+class BenchmarkValidator:
+    """ Minimal stand-in for the ExcelValidator holding the state used by the duplicate checks. """
+
+    def __init__(self) -> None:
+        """ The benchmark validator constructor. """
+        self.report: dict = {'valid': True, 'errors': {}}
+        self.identifiers: DuplicateIndex = DuplicateIndex()
+        self.current_record: dict = {}
+
+    def add_error(self, label: str, message: str, field: str) -> None:
+        """ Record an error in the report.
+
+        :param label: The label of the record.
+        :param message: The error message.
+        :param field: The field concerned by the error.
+        """
+        self.report['valid'] = False
+        self.report['errors'].setdefault(label, []).append({'message': message, 'field_concerned': field})
+
+
+def make_records(size: int) -> list[dict]:
+    """ Build synthetic exposure records with unique identifiers, box positions and collection orders.
+
+    :param size: The number of records to build.
+    :return: The records.
+    """
+    return [{
+        'precisiontox_short_identifier': f"FAC{index:09d}",
+        'compound_name': f"Compound {index % 50}",
+        'replicate': 1,
+        'timepoint_(hours)': 4,
+        'dose_code': 'BMD10',
+        'box_id': f"Box{index // 81}",
+        'box_row': chr(65 + (index // 9) % 9),
+        'box_column': index % 9 + 1,
+        'collection_order': index
+    } for index in range(size)]
+
+
+def run(size: int) -> float:
+    """ Run the duplicate checks on the given number of records.
+
+    :param size: The number of records.
+    :return: The elapsed time in seconds.
+    """
+    records: list[dict] = make_records(size)
+    validator: BenchmarkValidator = BenchmarkValidator()
+    definitions: dict = {'timepoints': [4], 'replicates': 1, 'blanks': 0, 'control': 1, 'compound_vehicle': 'DMSO'}
+    graph: VerticalValidator = VerticalValidator(definitions, validator)  # type: ignore
+    start: float = perf_counter()
+    for record_index, record in enumerate(records):
+        label: str = f"Record at line {record_index + 2} ({record['precisiontox_short_identifier']})"
+        validator.current_record = {'data': record, 'label': label, 'line': record_index + 2}
+        validate_unique_identifier(validator, record_index)
+        graph.add_node(validator.current_record)
+    elapsed: float = perf_counter() - start
+    assert validator.report['valid'], "The synthetic records should not contain duplicates."
+    return elapsed
+
+
+def main(sizes: list[int]) -> None:
+    """ Run the benchmark for each size and print the results.
+
+    :param sizes: The numbers of records to benchmark.
+    """
+    print(f"{'rows':>10} {'seconds':>10} {'us/row':>10}")
+    for size in sizes:
+        elapsed: float = run(size)
+        print(f"{size:>10} {elapsed:>10.3f} {elapsed / size * 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    main([int(size) for size in argv[1:]] or DEFAULT_SIZES)
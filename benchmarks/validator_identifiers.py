@@ -0,0 +1,80 @@
+""" Benchmark the per-record and columnar identifier validations on synthetic exposure records.
+
+Run from the repository root with: python -m benchmarks.validator_identifiers [sizes...]
+"""
+from __future__ import annotations
+
+from sys import argv
+from time import perf_counter
+
+from ptmd.lib.validator.columnar import validate_identifier_columns
+from ptmd.lib.validator.context import ValidationContext
+from ptmd.lib.validator.validate_identifier import validate_identifier
+from .validator_duplicates import BenchmarkValidator
+
+
+DEFAULT_SIZES: list[int] = [1000, 10000, 100000]
+GENERAL_INFO: dict = {'exposure_batch': 'AC', 'biosystem_name': 'fly'}
+CONTEXT: ValidationContext = ValidationContext(organisms={'fly': 'F'},
+                                               chemicals={f"Compound {code}": code for code in range(1, 51)})
+
+
+def make_records(size: int) -> list[dict]:
+    """ Build synthetic exposure records with valid identifiers.
+
+    :param size: The number of records to build.
+    :return: The records.
+    """
+    return [{
+        'precisiontox_short_identifier': f"FAC{index % 50 + 1:03d}LA{index % 9 + 1}",
+        'compound_hash': f"PTX{index % 50 + 1:03d}",
+        'compound_name': f"Compound {index % 50 + 1}",
+        'dose_code': 'BMD10',
+        'timepoint_level': 'TP1',
+        'replicate': index % 9 + 1
+    } for index in range(size)]
+
+
+def run_per_record(records: list[dict]) -> float:
+    """ Run the per-record identifier checks.
+
+    :param records: The records to validate.
+    :return: The elapsed time in seconds.
+    """
+    validator: BenchmarkValidator = BenchmarkValidator()
+    validator.general_info = GENERAL_INFO  # type: ignore
+    validator.context = CONTEXT  # type: ignore
+    start: float = perf_counter()
+    for record_index, record in enumerate(records):
+        validator.current_record = {'data': record, 'label': str(record_index)}
+        validator.identifiers = type(validator.identifiers)()
+        validate_identifier(validator, record_index)
+    return perf_counter() - start
+
+
+def run_columnar(records: list[dict]) -> float:
+    """ Run the columnar identifier checks.
+
+    :param records: The records to validate.
+    :return: The elapsed time in seconds.
+    """
+    start: float = perf_counter()
+    validate_identifier_columns(records, GENERAL_INFO, CONTEXT)
+    return perf_counter() - start
+
+
+def main(sizes: list[int]) -> None:
+    """ Run the benchmark for each size and print the results.
+
+    :param sizes: The numbers of records to benchmark.
+    """
+    print(f"{'rows':>10} {'per-record':>12} {'columnar':>12} {'speedup':>8}")
+    for size in sizes:
+        records: list[dict] = make_records(size)
+        per_record: float = run_per_record(records)
+        columnar: float = run_columnar(records)
+        print(f"{size:>10} {per_record:>12.3f} {columnar:>12.3f} {per_record / columnar:>8.1f}")
+
+
+if __name__ == '__main__':
+    main([int(size) for size in argv[1:]] or DEFAULT_SIZES)
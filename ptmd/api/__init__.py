@@ -1,5 +1,6 @@
-""" This module provides all the routes necessary for the API to work.
+""" This module provides all the routes necessary for the API to work, and the command line entry points.
 
 :author: D. Batista (Terazus)
 """
 from ptmd.api.routes import app
+from ptmd.api.cli import validate_files_command
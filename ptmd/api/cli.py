@@ -0,0 +1,50 @@
+""" This module contains the command line entry points registered on the Flask application. They are run with
+`flask --app app <command>` from the repository root.
+"""
+from __future__ import annotations
+
+from json import dumps
+
+import click
+
+from ptmd.config import app
+from ptmd.lib.validator.batch import BatchValidator, summarize
+from ptmd.api.queries.files.bulk_validate import find_files
+
+
+@app.cli.command('validate-files')
+@click.argument('file_ids', nargs=-1, type=int)
+@click.option('--name', help='Validate the files whose name contains this value.')
+@click.option('--batch', help='Validate the files whose batch contains this value.')
+@click.option('--organisation', 'organisation_name', help='Validate the files of this organisation.')
+@click.option('--organism', 'organism_name', help='Validate the files of this organism.')
+@click.option('--chemical', 'chemical_name', help='Validate the files containing this chemical.')
+@click.option('--invalid-only', is_flag=True, help='Only validate the files that are not validated successfully yet.')
+@click.option('--workers', type=int, default=None, help='Number of validation processes. Defaults to the CPU count.')
+@click.option('--downloads', type=int, default=4, show_default=True, help='Number of concurrent downloads.')
+def validate_files_command(
+        file_ids: tuple[int, ...],
+        name: str | None,
+        batch: str | None,
+        organisation_name: str | None,
+        organism_name: str | None,
+        chemical_name: str | None,
+        invalid_only: bool,
+        workers: int | None,
+        downloads: int
+) -> None:
+    """ Validate the given FILE_IDS and/or the files matching the filters, and print a JSON report. """
+    filters: dict = {
+        'name': name, 'batch': batch, 'organisation_name': organisation_name, 'organism_name': organism_name,
+        'chemical_name': chemical_name, 'is_valid': False if invalid_only else None
+    }
+    try:
+        files: list[dict] = find_files(list(file_ids), {key: value for key, value in filters.items() if value is not None})
+    except (ValueError, TypeError) as e:
+        raise click.UsageError(str(e))
+    if not files:
+        raise click.ClickException("No files found")
+    results: list[dict] = BatchValidator(files, max_workers=workers, download_workers=downloads).validate()
+    click.echo(dumps({'data': results, 'summary': summarize(results)}, indent=2))
+    if any(result['valid'] is not True for result in results):
+        raise SystemExit(1)
@@ -15,16 +15,17 @@ from .users import (
     verify_token
 )
 from .files import (
-    validate_file,
+    validate_file, validate_file_async, get_validation_job, get_validation_cache, purge_validation_cache,
+    stream_validation_report,
     CreateGDriveFile,
     register_gdrive_file,
-    create_gdrive_file,
+    create_gdrive_file, get_template_cache, create_campaign_files,
     search_files_in_database,
     delete_file,
     ship_data, receive_data,
     convert_to_isa,
-    batch_validation,
-    update_file_batch
+    batch_validation, bulk_validate_files,
+    update_file_batch, update_files_batch
 )
-from .samples import save_samples, get_sample, get_samples
+from .samples import save_samples, get_sample, get_samples, search_samples_in_database
 from .chemicals import create_chemicals, get_chemical
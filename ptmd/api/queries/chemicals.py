@@ -12,6 +12,8 @@ from ptmd.const import CREATE_CHEMICAL_SCHEMA_PATH, CREATE_CHEMICALS_SCHEMA_PATH
 from ptmd.config import session
 from ptmd.api.queries.utils import check_role
 from ptmd.database.models import Chemical
+from ptmd.database.queries import reference_data
+from ptmd.lib.validator import report_cache
 
 
 @check_role(role='user')
@@ -28,6 +30,9 @@ def create_chemicals() -> tuple[Response, int]:
         chemicals_from_db: list[Chemical] = [Chemical(**chemical) for chemical in chemicals]
         session.add_all(chemicals_from_db)
         session.commit()
+        # cached reports may contain errors about chemicals that now exist
+        reference_data.invalidate()
+        report_cache.purge()
         return jsonify({
             'message': 'Chemicals created successfully.',
             'data': [chemical.chemical_id for chemical in chemicals_from_db]
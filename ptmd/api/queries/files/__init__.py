@@ -1,14 +1,21 @@
 """ This module hanldes all the queries related file management:
 - create a new file (and register it)
+- create the files of a whole exposure campaign
 - register an existing file
-- validate a registered file
+- validate a registered file, synchronously or in a background job
+- change the batch of one or many files
 """
-from .validate import validate_file
-from .create import CreateGDriveFile, create_gdrive_file
+from .validate import (
+    validate_file, validate_file_async, get_validation_job, get_validation_cache, purge_validation_cache,
+    stream_validation_report
+)
+from .create import CreateGDriveFile, create_gdrive_file, get_template_cache
+from .campaign import create_campaign_files
 from .register import register_gdrive_file
 from .search import search_files_in_database
 from .delete import delete_file
 from .shipment import ship_data, receive_data
 from .isa import convert_to_isa
 from .validate_batch import batch_validation
-from .update import update_file_batch
+from .bulk_validate import bulk_validate_files
+from .update import update_file_batch, update_files_batch
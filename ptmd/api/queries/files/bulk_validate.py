@@ -0,0 +1,112 @@
+""" This file handles the route that validates many google drive files at once. The validation runs in a background
+job polled with the validation jobs route.
+"""
+from __future__ import annotations
+
+from threading import Lock
+from typing import Callable
+
+from flask import jsonify, Response, request
+from flask_jwt_extended import get_current_user
+
+from ptmd.config import app
+from ptmd.const import DOT_ENV_CONFIG
+from ptmd.database import File
+from ptmd.database.queries import build_search_clauses
+from ptmd.lib.jobs import JobQueue, JOB_VALIDATING, JOB_KIND_BULK_VALIDATION
+from ptmd.lib.validator.batch import BatchValidator, summarize
+from ptmd.api.queries.utils import check_role, get_workers
+from .validate import get_validation_queue, VALIDATION_JOBS_RETENTION
+
+
+SEARCH_FILTERS: tuple[str, ...] = (
+    'name', 'batch', 'is_valid', 'replicates', 'controls', 'blanks',
+    'organisation_name', 'organism_name', 'vehicle_name', 'chemical_name'
+)
+MAX_BULK_VALIDATION_WORKERS: int = int(DOT_ENV_CONFIG.get('BULK_VALIDATION_MAX_WORKERS') or 4)
+
+bulk_validation_queue: JobQueue | None = None
+bulk_validation_queue_lock: Lock = Lock()
+
+
+def run_bulk_validation(
+        file_id: None, on_status: Callable[[str], None], file_ids: list[int], workers: int
+) -> tuple[dict, int]:
+    """ Validate many files concurrently and build the result of the job.
+
+    :param file_id: unused, the bulk validation jobs don't concern a single file
+    :param on_status: the function called with the new status when the validation starts
+    :param file_ids: the ids of the files to validate, from the payload of the job
+    :param workers: the number of validation processes, from the payload of the job
+    :return: the result of each file with a summary, and the HTTP code
+    """
+    on_status(JOB_VALIDATING)
+    files: list[dict] = find_files(file_ids)
+    results: list[dict] = BatchValidator(files, max_workers=workers).validate()
+    return {"data": results, "summary": summarize(results)}, 200
+
+
+def get_bulk_validation_queue() -> JobQueue:
+    """ Get the queue of the bulk validations, created on first use. It runs one bulk validation at a time and shares
+    the store of the validation jobs, so that the bulk jobs are polled with the same route.
+
+    :return: the bulk validation queue
+    """
+    global bulk_validation_queue
+    with bulk_validation_queue_lock:
+        if bulk_validation_queue is None:
+            bulk_validation_queue = JobQueue(
+                app, get_validation_queue().store, run_bulk_validation, max_workers=1,
+                retention=VALIDATION_JOBS_RETENTION, kind=JOB_KIND_BULK_VALIDATION
+            )
+        return bulk_validation_queue
+
+
+@check_role(role='admin')
+def bulk_validate_files() -> tuple[Response, int]:
+    """ Queue the validation of many files. The files are given by a list of 'file_ids' and/or search 'filters' in the
+    JSON body, and are validated by 'workers' processes capped by the BULK_VALIDATION_MAX_WORKERS setting. This is an
+    admin only route.
+
+    :return: the queued job and the requested file ids that don't exist
+    """
+    payload: dict = request.json or {}
+    file_ids: list[int] | None = payload.get('file_ids', None)
+    try:
+        workers: int = get_workers(payload.get('workers', None), MAX_BULK_VALIDATION_WORKERS)
+        files: list[dict] = find_files(file_ids, payload.get('filters', None))
+    except (ValueError, TypeError) as e:
+        return jsonify({"message": str(e)}), 400
+    if not files:
+        return jsonify({"message": "No files found"}), 404
+
+    found: set[int] = {file['file_id'] for file in files}
+    missing: list[int] = [file_id for file_id in file_ids or [] if file_id not in found]
+    job: dict = get_bulk_validation_queue().submit(
+        None, owner=get_current_user().id, payload={'file_ids': [file['file_id'] for file in files], 'workers': workers}
+    )
+    return jsonify({"message": "Bulk validation queued.", "job": job, "missing": missing}), 202
+
+
+def find_files(file_ids: list[int] | None = None, filters: dict | None = None) -> list[dict]:
+    """ Find the files to validate.
+
+    :param file_ids: the ids of the files
+    :param filters: the search filters, with the same names as the parameters of search_files
+    :return: the files found, as dictionaries with the 'file_id', 'gdrive_id' and 'name' keys
+    """
+    clauses: list = []
+    if file_ids:
+        if not all(isinstance(file_id, int) for file_id in file_ids):
+            raise TypeError("file_ids must be a list of integers.")
+        clauses.append(File.file_id.in_(file_ids))  # type: ignore
+    if filters:
+        unknown: list[str] = [key for key in filters if key not in SEARCH_FILTERS]
+        if unknown:
+            raise ValueError(f"Unknown filters: {', '.join(unknown)}. Allowed filters: {', '.join(SEARCH_FILTERS)}.")
+        clauses.extend(build_search_clauses(**filters))
+    if not clauses:
+        raise ValueError("file_ids or filters must be provided.")
+    rows: list = File.query.with_entities(File.file_id, File.gdrive_id, File.name)\
+        .filter(*clauses).order_by(File.file_id).all()
+    return [{'file_id': file_id, 'gdrive_id': gdrive_id, 'name': name} for file_id, gdrive_id, name in rows]
@@ -0,0 +1,43 @@
+""" This file handles the route that creates the templates of a whole exposure campaign at once.
+"""
+from __future__ import annotations
+
+from flask import jsonify, Response, request
+from flask_jwt_extended import get_current_user
+
+from ptmd.const import DOT_ENV_CONFIG
+from ptmd.lib.creator.campaign import CampaignCreator, summarize_campaign
+from ptmd.api.queries.utils import check_role, get_workers
+from .create import parse_design
+
+
+MAX_CAMPAIGN_DESIGNS: int = 100
+MAX_CAMPAIGN_WORKERS: int = int(DOT_ENV_CONFIG.get('CAMPAIGN_MAX_WORKERS') or 4)
+
+
+@check_role(role='user')
+def create_campaign_files() -> tuple[Response, int]:
+    """ Create one file per design given in the 'designs' list of the JSON body. Each design has the same format as the
+    body of the single file creation route. A design that fails doesn't prevent the others from being created. The
+    optional number of 'workers' is capped by the CAMPAIGN_MAX_WORKERS setting.
+
+    :return: the result of each design and a summary
+    """
+    payload: dict = request.json or {}
+    designs: list | None = payload.get('designs', None)
+    if not isinstance(designs, list) or not designs:
+        return jsonify({"message": "designs must be a non-empty list."}), 400
+    if len(designs) > MAX_CAMPAIGN_DESIGNS:
+        return jsonify({"message": f"A campaign can't have more than {MAX_CAMPAIGN_DESIGNS} designs."}), 400
+    if not all(isinstance(design, dict) for design in designs):
+        return jsonify({"message": "Each design must be an object."}), 400
+
+    try:
+        workers: int = get_workers(payload.get('workers', None), MAX_CAMPAIGN_WORKERS)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    creator: CampaignCreator = CampaignCreator(
+        [parse_design(design) for design in designs], user=get_current_user().id, max_workers=workers
+    )
+    results: list[dict] = creator.create()
+    return jsonify({"data": results, "summary": summarize_campaign(results)}), 200
@@ -2,18 +2,18 @@
 """
 from __future__ import annotations
 
-from os import path
+from io import BytesIO
 from datetime import datetime
 
 from flask import request, Response, jsonify
 from flask_jwt_extended import get_current_user
 
-from ptmd.lib.creator import DataframeCreator
+from ptmd.lib.creator import DataframeCreator, template_cache
 from ptmd.lib.gdrive import GoogleDriveConnector
 from ptmd.config import session
-from ptmd.const import DATA_PATH as OUTPUT_DIRECTORY_PATH
-from ptmd.database.models import Organisation, File, Chemical, Timepoint
+from ptmd.database.models import File, Chemical, Timepoint
 from ptmd.database.queries.chemicals import get_chemicals_from_name
+from ptmd.database.queries.organisations import get_organisation_gdrive_id
 from ptmd.database.queries.timepoints import create_timepoints_hours
 from ptmd.api.queries.utils import check_role
 from ptmd.database import get_shipped_file
@@ -25,25 +25,13 @@ class CreateGDriveFile:
 
     def __init__(self) -> None:
         """ Constructor of the class. Contains the user input. """
-        now: str = datetime.now().strftime("%Y-%m-%d")
-        self.data: dict = {
-            "partner": request.json.get("partner", None),
-            "organism": request.json.get("organism", None),
-            "exposure_batch": request.json.get("exposure_batch", None),
-            "replicates_blank": request.json.get("replicate_blank", None),
-            "start_date": request.json.get("start_date", now),
-            "end_date": request.json.get("end_date", now),
-            "exposure": request.json.get("exposure_conditions", None),
-            "replicates4control": request.json.get("replicate4control", None),
-            "replicates4exposure": request.json.get("replicate4exposure", None),
-            "timepoints": request.json.get("timepoints", None),
-            "vehicle": request.json.get("vehicle", None)
-        }
+        self.data: dict = parse_design(request.json)
         if get_shipped_file(self.data['organism'], self.data['exposure_batch']):
             raise ValueError(f'Batch {self.data["exposure_batch"]} for {self.data["organism"]} already exists.')
 
     def generate_file(self, user: int) -> dict:
-        """ Method to process the user input and create a file in the Google Drive.
+        """ Method to process the user input and create a file in the Google Drive. The workbook is built in memory and
+        uploaded from the buffer, so nothing is written to the local disk.
 
         :param user: user ID
         :return: dictionary containing the response from the Google Drive API
@@ -54,15 +42,13 @@ class CreateGDriveFile:
         chemicals: list[Chemical] = get_chemicals_from_name(chemical_names)
         timepoints: list[Timepoint] = create_timepoints_hours(self.data['timepoints'])
         filename: str = f"{self.data['partner']}_{self.data['organism']}_{self.data['exposure_batch']}.xlsx"
-        file_path: str = path.join(OUTPUT_DIRECTORY_PATH, filename)
         dataframes_generator: DataframeCreator = DataframeCreator(user_input=self.data)
-        dataframes_generator.save_file(file_path)
-        folder_id: str = Organisation.query.filter(Organisation.name == dataframes_generator.partner).first().gdrive_id
+        content: BytesIO = dataframes_generator.save_buffer()
+        folder_id: str = get_organisation_gdrive_id(dataframes_generator.partner)
         gdrive: GoogleDriveConnector = GoogleDriveConnector()
-        response: dict[str, str] | None = gdrive.upload_file(directory_id=folder_id,
-                                                             file_path=file_path,
-                                                             title=filename)
-        dataframes_generator.delete_file()
+        response: dict[str, str] | None = gdrive.upload_content(directory_id=folder_id,
+                                                                content=content,
+                                                                title=filename)
         if not response:
             raise Exception("An error occurred while uploading the file to the Google Drive.")
 
@@ -85,6 +71,28 @@ class CreateGDriveFile:
         return {**dict(db_file), 'file_url': response['alternateLink']}
 
 
+def parse_design(payload: dict) -> dict:
+    """ Convert the JSON payload of a template to the user input expected by the DataframeCreator.
+
+    :param payload: the JSON payload
+    :return: the user input
+    """
+    now: str = datetime.now().strftime("%Y-%m-%d")
+    return {
+        "partner": payload.get("partner", None),
+        "organism": payload.get("organism", None),
+        "exposure_batch": payload.get("exposure_batch", None),
+        "replicates_blank": payload.get("replicate_blank", None),
+        "start_date": payload.get("start_date", now),
+        "end_date": payload.get("end_date", now),
+        "exposure": payload.get("exposure_conditions", None),
+        "replicates4control": payload.get("replicate4control", None),
+        "replicates4exposure": payload.get("replicate4exposure", None),
+        "timepoints": payload.get("timepoints", None),
+        "vehicle": payload.get("vehicle", None)
+    }
+
+
 @check_role(role='user')
 def create_gdrive_file() -> tuple[Response, int]:
     """ Function to create a file in the Google Drive using the data provided by the user. Acquire data from a
@@ -100,3 +108,12 @@ def create_gdrive_file() -> tuple[Response, int]:
         return jsonify({"message": str(e)}), 400
     except Exception as e:
         return jsonify({"message": str(e)}), 400
+
+
+@check_role(role='admin')
+def get_template_cache() -> tuple[Response, int]:
+    """ Inspect the cache of the sample sheets reused between templates with the same design.
+
+    :return: the cache settings and counters
+    """
+    return jsonify(template_cache.inspect()), 200
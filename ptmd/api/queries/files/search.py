@@ -8,6 +8,7 @@ from flask import jsonify, Response, request
 
 from ptmd.database.queries import search_files
 from ptmd.api.queries.utils import check_role
+from ptmd.exceptions import InvalidCursorError
 
 
 @check_role(role='user')
@@ -26,10 +27,15 @@ def search_files_in_database() -> tuple[Response, int]:
     replicates: dict | None = get_integer_input(request.args, 'replicates')
     controls: dict | None = get_integer_input(request.args, 'controls')
     blanks: dict | None = get_integer_input(request.args, 'blanks')
-    response: dict = search_files(page=page, per_page=per_page, is_valid=valid,
-                                  organisation_name=organisation_name, organism_name=organism_name,
-                                  vehicle_name=vehicle_name, chemical_name=chemical_name,
-                                  replicates=replicates, controls=controls, blanks=blanks)
+    cursor, with_total = get_cursor_input(request.args)
+    try:
+        response: dict = search_files(page=page, per_page=per_page, is_valid=valid,
+                                      organisation_name=organisation_name, organism_name=organism_name,
+                                      vehicle_name=vehicle_name, chemical_name=chemical_name,
+                                      replicates=replicates, controls=controls, blanks=blanks,
+                                      cursor=cursor, with_total=with_total)
+    except InvalidCursorError as e:
+        return jsonify({"message": str(e)}), 400
     if len(response['data']) == 0:
         return jsonify({"message": "No files found"}), 404
     return jsonify(response), 200
@@ -48,6 +54,18 @@ def get_state_input(args: ImmutableMultiDict) -> bool | None:
     return True if args['valid'] in true_values else False if args['valid'] in false_values else None
 
 
+def get_cursor_input(args: ImmutableMultiDict) -> tuple[str | None, bool]:
+    """ Get the pagination cursor and whether to count the results from the request arguments. The cursor is None
+    when the results are paginated by page number, and empty for the first page of cursor pagination.
+
+    :param args: the arguments passed in the request
+    :return: the cursor and whether to count the results
+    """
+    cursor: str | None = args.get('cursor', None, type=str)
+    with_total: bool = args.get('total', 'false', type=str) in ['true', 'True', '1']
+    return cursor, with_total
+
+
 def get_integer_input(args: ImmutableMultiDict, field: str) -> dict | None:
     """ Get the integer input from the request arguments for the given field
 
@@ -57,7 +75,7 @@ def get_integer_input(args: ImmutableMultiDict, field: str) -> dict | None:
     operator_field: str = f'{field}_operator'
     value: int | None = args.get(field, None, type=int)
     operator: str | None = args.get(operator_field, None, type=str)
-    if not value:
+    if value is None:
         return None
     elif not operator:
         return {'value': value, 'operator': 'eq'}
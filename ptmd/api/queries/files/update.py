@@ -1,9 +1,14 @@
 """ A module to handle the update of a file batch. """
+from __future__ import annotations
 
 from flask import request, Response, jsonify
 
 from ptmd.api.queries.utils import check_role
 from ptmd.lib import BatchUpdater, BatchError
+from ptmd.lib.updater import BulkBatchUpdater, summarize_rebatch
+
+
+MAX_REBATCH_FILES: int = 200
 
 
 @check_role(role='user')
@@ -23,3 +28,24 @@ def update_file_batch(file_id: int) -> tuple[Response, int]:
         return jsonify({"message": "Batch updated"}), 200
     except BatchError as error:
         return error.serialize()
+
+
+@check_role(role='admin')
+def update_files_batch() -> tuple[Response, int]:
+    """ Method to change the batch of many files at once. The JSON body holds a 'files' list of objects with the
+    'file_id' and the new 'batch'. The database changes are committed in a single transaction and a file that can't be
+    re-batched doesn't prevent the others from being re-batched.
+
+    :return: a tuple with the result of each change and a summary, and the status code
+    """
+    payload: dict = request.json or {}
+    changes: list | None = payload.get('files', None)
+    if not isinstance(changes, list) or not changes:
+        return jsonify({"message": "files must be a non-empty list."}), 400
+    if len(changes) > MAX_REBATCH_FILES:
+        return jsonify({"message": f"Can't change the batch of more than {MAX_REBATCH_FILES} files at once."}), 400
+    if not all(isinstance(change, dict) for change in changes):
+        return jsonify({"message": "Each file must be an object with a file_id and a batch."}), 400
+
+    results: list[dict] = BulkBatchUpdater(changes).update()
+    return jsonify({"data": results, "summary": summarize_rebatch(results)}), 200
@@ -1,26 +1,60 @@
-""" This file handles the route that validates a google drive file.
+""" This file handles the routes that validate a google drive file, either synchronously or in a background job.
 """
 from __future__ import annotations
 
-from flask import jsonify, Response
+from os import path
+from json import dumps
+from threading import Lock
+from typing import Any, Callable, Iterator
 
-from ptmd.lib.validator import ExcelValidator, ExternalExcelValidator
+from flask import jsonify, Response, request
+from flask_jwt_extended import get_current_user
+
+from ptmd.config import app
+from ptmd.const import DOT_ENV_CONFIG, DATA_PATH
+from ptmd.database import User
+from ptmd.lib.validator import (
+    ExcelValidator, ExternalExcelValidator, ErrorLimits, ReportCache, report_cache, incremental_store
+)
+from ptmd.lib.jobs import JobQueue, SQLiteJobStore
 from ptmd.api.queries.utils import check_role
 
 
-@check_role(role='user')
-def validate_file(file_id: int | str) -> tuple[Response, int]:
-    """ Method to validate the file in the Google Drive.
+VALIDATION_JOBS_DATABASE_PATH: str = DOT_ENV_CONFIG.get('VALIDATION_JOBS_DATABASE') or \
+    path.join(DATA_PATH, 'validation_jobs.sqlite')
+MAX_ERRORS_PER_FIELD: int = int(DOT_ENV_CONFIG.get('VALIDATION_MAX_ERRORS_PER_FIELD') or 500)
+MAX_ERRORS_PER_RULE: int = int(DOT_ENV_CONFIG.get('VALIDATION_MAX_ERRORS_PER_RULE') or 50)
+VALIDATION_JOBS_RETENTION: float = float(DOT_ENV_CONFIG.get('VALIDATION_JOBS_RETENTION') or 86400)
+FULL_REPORT_CACHE_SIZE: int = int(DOT_ENV_CONFIG.get('VALIDATION_FULL_REPORT_CACHE_SIZE') or 16)
+
+# The reports of the paged route hold every error, so they are kept apart from the capped reports and never copied.
+full_report_cache: ReportCache = ReportCache(max_size=FULL_REPORT_CACHE_SIZE, copy=False)
+
+
+def build_validator(file_id: int | str, **kwargs: Any) -> ExcelValidator:
+    """ Create the validator of a registered file or, if the id isn't a database id, of an external Google Drive file.
 
     :param file_id: the file id to validate
-    :return: dictionary containing the response from the Google Drive API
+    :param kwargs: the options given to the validator
+    :return: the validator
     """
-    validator: ExcelValidator
-
     try:
-        validator = ExcelValidator(int(file_id))
+        return ExcelValidator(int(file_id), **kwargs)
     except (ValueError, TypeError):
-        validator = ExternalExcelValidator(str(file_id))
+        return ExternalExcelValidator(str(file_id), **kwargs)
+
+
+def run_validation(file_id: int | str, on_status: Callable[[str], None] | None = None) -> tuple[dict, int]:
+    """ Validate the file in the Google Drive and build the response.
+
+    :param file_id: the file id to validate
+    :param on_status: an optional function called with the new status when the validation progresses
+    :return: the response content and the HTTP code
+    """
+    validator: ExcelValidator = build_validator(
+        file_id, on_status=on_status, cache=report_cache, incremental=incremental_store,
+        limits=ErrorLimits(per_field=MAX_ERRORS_PER_FIELD, per_rule=MAX_ERRORS_PER_RULE)
+    )
 
     try:
         validator.validate()
@@ -31,12 +65,137 @@ def validate_file(file_id: int | str) -> tuple[Response, int]:
             code = 406
             message = "File validation failed."
             errors = validator.report['errors']
-        return (
-            jsonify({"message": message, "id": file_id, "errors": errors, 'gdrive': validator.file['gdrive_id']}),
-            code
-        )
+        return {"message": message, "id": file_id, "errors": errors, 'gdrive': validator.file['gdrive_id']}, code
     except Exception as e:
         error: dict = e.__dict__
         error_msg = error['error']['errors'][0]['message'] if error else str(e)
         error_code = error['error']['code'] if error else 404
-        return jsonify({"errors": error_msg}), error_code
+        return {"errors": error_msg}, error_code
+
+
+validation_queue: JobQueue | None = None
+validation_queue_lock: Lock = Lock()
+
+
+def get_validation_queue() -> JobQueue:
+    """ Get the queue of the validation jobs, creating it on first use so that importing the routes has no side effect.
+
+    :return: the validation queue
+    """
+    global validation_queue
+    with validation_queue_lock:
+        if validation_queue is None:
+            validation_queue = JobQueue(
+                app, SQLiteJobStore(VALIDATION_JOBS_DATABASE_PATH), run_validation, retention=VALIDATION_JOBS_RETENTION
+            )
+        return validation_queue
+
+
+@check_role(role='user')
+def validate_file(file_id: int | str) -> tuple[Response, int]:
+    """ Method to validate the file in the Google Drive.
+
+    :param file_id: the file id to validate
+    :return: dictionary containing the response from the Google Drive API
+    """
+    response, code = run_validation(file_id)
+    return jsonify(response), code
+
+
+@check_role(role='user')
+def validate_file_async(file_id: int | str) -> tuple[Response, int]:
+    """ Queue the validation of a file in the Google Drive and return immediately.
+
+    :param file_id: the file id to validate
+    :return: the queued job and the 202 code
+    """
+    user: User = get_current_user()
+    job: dict = get_validation_queue().submit(file_id, owner=user.id)
+    return jsonify({"message": "File validation queued.", "job": job}), 202
+
+
+@check_role(role='user')
+def get_validation_job(job_id: str) -> tuple[Response, int]:
+    """ Get the status of a validation job and, once done, the validation report.
+
+    :param job_id: the id of the job
+    :return: the job and the HTTP code
+    """
+    job: dict | None = get_validation_queue().get(job_id)
+    user: User = get_current_user()
+    if not job or (user.role != 'admin' and job['owner'] != user.id):
+        return jsonify({"message": f"Job {job_id} not found."}), 404
+    return jsonify({"job": job}), 200
+
+
+@check_role(role='admin')
+def get_validation_cache() -> tuple[Response, int]:
+    """ Inspect the cache of validation reports.
+
+    :return: the cache settings, counters and entries
+    """
+    return jsonify(report_cache.inspect()), 200
+
+
+@check_role(role='admin')
+def purge_validation_cache() -> tuple[Response, int]:
+    """ Remove the report given by the 'key' query parameter, or all the reports, from the validation cache.
+
+    :return: the number of purged reports
+    """
+    purged: int = report_cache.purge(request.args.get('key'))
+    return jsonify({"message": f"{purged} report(s) purged from the validation cache.", "purged": purged}), 200
+
+
+def get_full_report(file_id: int | str) -> dict:
+    """ Get the report of a file with all its errors. The file is validated once and its report is then served from the
+    cache of full reports until the file, the schema or the reference data change. The file record isn't updated.
+
+    :param file_id: the file id to validate
+    :return: the report
+    """
+    validator: ExcelValidator = build_validator(file_id, streaming=True, cache=full_report_cache, record=False)
+    validator.validate()
+    return validator.report
+
+
+@check_role(role='user')
+def stream_validation_report(file_id: int | str) -> Response:
+    """ Send all the errors of a file as newline delimited JSON, without any cap. The 'offset' and 'limit' query
+    parameters select a page of errors. The pages are read from the same cached report, so paging through the errors
+    validates the file only once.
+
+    :param file_id: the file id to validate
+    :return: the streamed response
+    """
+    offset: int = max(request.args.get('offset', 0, type=int), 0)
+    limit: int | None = request.args.get('limit', None, type=int)
+    try:
+        report: dict = get_full_report(file_id)
+    except Exception as e:
+        return Response(dumps({'error': str(e), 'next_offset': None}) + '\n', mimetype='application/x-ndjson')
+    return Response(paginate_errors(report, offset, limit), mimetype='application/x-ndjson')
+
+
+def paginate_errors(report: dict, offset: int = 0, limit: int | None = None) -> Iterator[str]:
+    """ Serialize a page of the errors of a report, one JSON object per line. The last line gives the outcome of the
+    validation or, when the page is full, the offset of the next page.
+
+    :param report: the validation report
+    :param offset: the number of errors to skip
+    :param limit: the maximum number of errors to send
+    :return: the lines
+    """
+    index: int = 0
+    for label, errors in report['errors'].items():
+        if index + len(errors) <= offset:
+            index += len(errors)
+            continue
+        for error in errors:
+            if limit is not None and index >= offset + limit:
+                yield dumps({'next_offset': index}) + '\n'
+                return
+            if index >= offset:
+                yield dumps({'index': index, 'label': label, **error}) + '\n'
+            index += 1
+    yield dumps({'valid': report['valid'], 'errors': index, 'next_offset': None}) + '\n'
@@ -1,3 +1,4 @@
 """ Module for samples queries.
 """
 from .core import save_samples, get_sample, get_samples
+from .search import search_samples_in_database
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from uuid import uuid4
 from os import remove
-from json import dumps as json_dumps
+from time import perf_counter
 
 from flask import Response, jsonify, request
 from flask_jwt_extended import get_current_user
@@ -12,9 +12,13 @@ from pandas import ExcelFile, DataFrame
 from numpy import nan
 
 from ptmd.config import session, Base
+from ptmd.logger import LOGGER
 from ptmd.lib.gdrive import GoogleDriveConnector
 from ptmd.database.models import File, User, Sample, Chemical
+from ptmd.database.queries import upsert_samples, sample_loading_options, paginate
 from ptmd.api.queries.utils import check_role
+from ptmd.api.queries.files.search import get_cursor_input
+from ptmd.exceptions import InvalidCursorError
 from ptmd.const import PTX_ID_LABEL
 
 
@@ -30,6 +34,7 @@ class SampleGenerator:
     filepath: str
     response: tuple[Response, int]
     samples: list[str]
+    throughput: float | None = None
 
     def __init__(self, file_id: int) -> None:
         """ Constructor method. """
@@ -72,6 +77,15 @@ class SampleGenerator:
         """
         connector: GoogleDriveConnector = GoogleDriveConnector()
         filepath: str = connector.download_file(file_id=self.file.gdrive_id, filename=self.filename)
+        return self.read_spreadsheet(filepath), filepath
+
+    @staticmethod
+    def read_spreadsheet(filepath: str) -> dict:
+        """ Read the general and exposure information of a spreadsheet.
+
+        :param filepath: The path to the spreadsheet.
+        :return: A dictionary containing the general information and the exposure records.
+        """
         file: ExcelFile = ExcelFile(filepath, engine='openpyxl')
         general_info: DataFrame = file.parse("General Information").replace({nan: None})
         exposure_info: DataFrame = file.parse("Exposure information").replace({nan: None}).replace({"NA": None})
@@ -81,18 +95,36 @@ class SampleGenerator:
         return {
             "general_info": general_info.to_dict(orient='records')[0],
             "exposure_info": exposure_info.to_dict(orient='records')
-        }, filepath
+        }
+
+    def load_compounds(self, names: set[str]) -> None:
+        """ Load the compounds that aren't known yet with a single query. The identifier of each compound is kept so the
+        samples can reference it.
+
+        :param names: The names of the compounds used by the samples.
+        """
+        missing: list[str] = [name for name in names if name not in self.compounds]
+        if not missing:
+            return
+        compounds: dict[str, Chemical] = {
+            compound.common_name: compound for compound in Chemical.query.filter(Chemical.common_name.in_(missing)).all()
+        }
+        for name in missing:
+            self.compounds[name] = {**dict(compounds[name]), "chemical_id": compounds[name].chemical_id} \
+                if name in compounds else {"common_name": None}
 
     def save_samples(self) -> None:
-        """ Save the samples to the database. """
-        for sample_data in self.data["exposure_info"]:
+        """ Save the samples to the database. The existing samples are found with one query, the new ones are inserted
+        in bulk and the existing ones are updated in bulk. The throughput is logged in samples per second.
+        """
+        start: float = perf_counter()
+        records: list[dict] = self.data["exposure_info"]
+        self.load_compounds({sample_data["compound_name"] for sample_data in records})
+        samples: dict[str, dict] = {}
+        for sample_data in records:
             sample_id: str = sample_data[PTX_ID_LABEL]
             compound_name: str = sample_data["compound_name"]
 
-            if compound_name not in self.compounds:
-                compound: Chemical = Chemical.query.filter(Chemical.common_name == compound_name).first()
-                self.compounds[compound_name] = dict(compound) if compound else {"common_name": None}
-
             data: dict = {key.replace(' ', '_'): value for key, value in sample_data.items()}
             if 'CONTROL' not in compound_name and 'BLANK' not in compound_name:
                 del data['compound_name']
@@ -101,16 +133,15 @@ class SampleGenerator:
                 data['compound'] = data['compound_name']
                 del data['compound_name']
 
-            sample: Sample = Sample.query.filter(Sample.sample_id == sample_id).first()
-            if sample:
-                sample.data = json_dumps(data)
-                self.samples.append(sample.sample_id)
-            else:
-                new_sample: Sample = Sample(sample_id=sample_id, file_id=self.file_id, data=data)
-                session.add(new_sample)
-                self.samples.append(new_sample.sample_id)
+            samples[sample_id] = data
+            self.samples.append(sample_id)
 
+        inserted, updated = upsert_samples(samples, self.file_id)
         session.commit()
+        elapsed: float = perf_counter() - start
+        self.throughput = round(len(samples) / elapsed, 1) if elapsed else None
+        LOGGER.info(f"Saved {len(samples)} samples of file {self.file_id} ({inserted} inserted, {updated} updated) "
+                    f"in {elapsed:.3f}s: {self.throughput} samples/s")
 
 
 @check_role(role='user')
@@ -124,7 +155,8 @@ def save_samples(file_id: int) -> tuple[Response, int]:
     sample_generator: SampleGenerator = SampleGenerator(file_id=file_id)
     if hasattr(sample_generator, "response"):
         return sample_generator.response
-    return jsonify({"samples": sample_generator.generate_samples()}), 200
+    samples: list[str] = sample_generator.generate_samples()
+    return jsonify({"samples": samples, "samples_per_second": sample_generator.throughput}), 200
 
 
 def get_sample(sample_id: str) -> tuple[Response, int]:
@@ -141,21 +173,18 @@ def get_sample(sample_id: str) -> tuple[Response, int]:
 
 @check_role(role='user')
 def get_samples() -> tuple[Response, int]:
-    """ Get paginated samples from the database.
+    """ Get paginated samples from the database. The samples are paginated by sample id when a cursor is given, even
+    empty for the first page, and by page number otherwise.
 
     :return: A tuple containing the response and the status code.
     """
     page: int = request.args.get('page', 1, type=int)
     per_page: int = request.args.get('per_page', 10, type=int)
-    query: Base.query = Sample.query.paginate(page=page, per_page=per_page)
-    return jsonify({
-        'samples': [dict(sample) for sample in query.items],
-        'pagination': {
-            'current_page': page,
-            'next_page': page + 1 if query.has_next else None,
-            'previous_previous': page - 1 if query.has_prev else None,
-            'pages': query.pages,
-            'per_page': per_page,
-            'total': query.total
-        }
-    }), 200
+    cursor, with_total = get_cursor_input(request.args)
+    query: Base.query = Sample.query.options(*sample_loading_options())
+    try:
+        samples, pagination = paginate(query, Sample.sample_id, page=page, per_page=per_page,  # type: ignore
+                                       cursor=cursor, with_total=with_total)
+    except InvalidCursorError as e:
+        return jsonify({"message": str(e)}), 400
+    return jsonify({'samples': [dict(sample) for sample in samples], 'pagination': pagination}), 200
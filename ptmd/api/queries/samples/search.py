@@ -0,0 +1,39 @@
+""" This module contains the endpoint for searching for samples in the database
+"""
+
+from __future__ import annotations
+
+from flask import jsonify, Response, request
+
+from ptmd.database.queries import search_samples
+from ptmd.api.queries.utils import check_role
+from ptmd.api.queries.files.search import get_integer_input, get_cursor_input
+from ptmd.exceptions import InvalidCursorError
+
+
+@check_role(role='user')
+def search_samples_in_database() -> tuple[Response, int]:
+    """ Search for samples in the database
+
+    :return: a response with the samples found in the database and the pagination information
+    """
+    page: int = request.args.get('page', 1, type=int)
+    per_page: int = request.args.get('per_page', 10, type=int)
+    compound_name: str | None = request.args.get('compound', None, type=str)
+    dose: str | None = request.args.get('dose', None, type=str)
+    batch: str | None = request.args.get('batch', None, type=str)
+    organism_name: str | None = request.args.get('organism', None, type=str)
+    organisation_name: str | None = request.args.get('organisation', None, type=str)
+    timepoint: dict | None = get_integer_input(request.args, 'timepoint')
+    replicate: dict | None = get_integer_input(request.args, 'replicate')
+    cursor, with_total = get_cursor_input(request.args)
+    try:
+        response: dict = search_samples(page=page, per_page=per_page, compound_name=compound_name, dose=dose,
+                                        timepoint=timepoint, replicate=replicate, batch=batch,
+                                        organism_name=organism_name, organisation_name=organisation_name,
+                                        cursor=cursor, with_total=with_total)
+    except InvalidCursorError as e:
+        return jsonify({"message": str(e)}), 400
+    if len(response['data']) == 0:
+        return jsonify({"message": "No samples found"}), 404
+    return jsonify(response), 200
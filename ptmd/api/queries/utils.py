@@ -3,7 +3,7 @@ decorated function.
 """
 from __future__ import annotations
 from functools import wraps
-from typing import Callable
+from typing import Any, Callable
 
 from flask_jwt_extended import get_current_user, verify_jwt_in_request
 from flask_jwt_extended.exceptions import NoAuthorizationError
@@ -60,3 +60,19 @@ def is_allowed(user_role: str, level: str = 'enabled') -> bool:
     if ROLES.index(user_role) >= ROLES.index(level):
         return True
     return False
+
+
+def get_workers(value: Any, maximum: int) -> int:
+    """ Check the number of workers requested by the client and clamp it to the maximum allowed by the server.
+
+    :param value: the number of workers given in the request, None to use the maximum
+    :param maximum: the maximum number of workers allowed by the server
+
+    :return: the number of workers to use
+    :raises ValueError: if the value isn't a positive integer
+    """
+    if value is None:
+        return maximum
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError("workers must be a positive integer.")
+    return min(value, maximum)
@@ -11,16 +11,18 @@ from ptmd.api.queries import (
     login as login_user, change_password, get_me, logout, enable_account, validate_account, get_users,
     get_organisms, get_organisations,
     get_chemicals, create_chemicals, get_chemical,
-    create_gdrive_file, create_user, validate_file, register_gdrive_file, search_files_in_database, delete_file,
-    get_sample, get_samples,
+    create_gdrive_file, get_template_cache, create_campaign_files, create_user, register_gdrive_file, search_files_in_database, delete_file,
+    validate_file, validate_file_async, get_validation_job, get_validation_cache, purge_validation_cache,
+    stream_validation_report,
+    get_sample, get_samples, search_samples_in_database,
     ship_data, receive_data,
     convert_to_isa,
     send_reset_email, reset_password,
     change_role,
     delete_user,
     verify_token,
-    batch_validation,
-    update_file_batch
+    batch_validation, bulk_validate_files,
+    update_file_batch, update_files_batch
 )
 from ptmd.api.const import SWAGGER_DATA_PATH, FILES_DOC_PATH, USERS_DOC_PATH, CHEMICALS_DOC_PATH, SAMPLES_DOC_PATH
 
@@ -227,6 +229,22 @@ def create_file() -> tuple[Response, int]:
     return create_gdrive_file()
 
 
+@app.route('/api/files/campaign', methods=['POST'])
+@swag_from(path.join(FILES_DOC_PATH, 'create_campaign.yml'))
+@jwt_required()
+def create_campaign() -> tuple[Response, int]:
+    """ Create and saves the spreadsheets of many designs in the Google Drive """
+    return create_campaign_files()
+
+
+@app.route('/api/files/templates/cache', methods=['GET'])
+@swag_from(path.join(FILES_DOC_PATH, 'template_cache.yml'))
+@jwt_required()
+def template_cache() -> tuple[Response, int]:
+    """ Inspect the cache of template sample sheets. This is an admin only route """
+    return get_template_cache()
+
+
 @app.route('/api/files/<file_id>/validate', methods=['GET'])
 @swag_from(path.join(FILES_DOC_PATH, 'validate_file.yml'))
 @jwt_required()
@@ -238,6 +256,63 @@ def validate(file_id: int) -> tuple[Response, int]:
     return validate_file(file_id)
 
 
+@app.route('/api/files/validate', methods=['POST'])
+@swag_from(path.join(FILES_DOC_PATH, 'bulk_validate_files.yml'))
+@jwt_required()
+def bulk_validate() -> tuple[Response, int]:
+    """ Validate many files at once. This is an admin only route """
+    return bulk_validate_files()
+
+
+@app.route('/api/files/<file_id>/validate', methods=['POST'])
+@swag_from(path.join(FILES_DOC_PATH, 'validate_file_async.yml'))
+@jwt_required()
+def validate_async(file_id: int) -> tuple[Response, int]:
+    """ Queue the validation of a file and return the job immediately
+
+    :param file_id: the id of the file to validate
+    """
+    return validate_file_async(file_id)
+
+
+@app.route('/api/files/validate/jobs/<job_id>', methods=['GET'])
+@swag_from(path.join(FILES_DOC_PATH, 'validation_job.yml'))
+@jwt_required()
+def validation_job(job_id: str) -> tuple[Response, int]:
+    """ Get the status and report of a validation job
+
+    :param job_id: the id of the validation job
+    """
+    return get_validation_job(job_id)
+
+
+@app.route('/api/files/<file_id>/validate/report', methods=['GET'])
+@swag_from(path.join(FILES_DOC_PATH, 'validation_report.yml'))
+@jwt_required()
+def validation_report(file_id: int) -> Response:
+    """ Validate a file and stream all its errors as newline delimited JSON
+
+    :param file_id: the id of the file to validate
+    """
+    return stream_validation_report(file_id)
+
+
+@app.route('/api/files/validate/cache', methods=['GET'])
+@swag_from(path.join(FILES_DOC_PATH, 'validation_cache.yml'))
+@jwt_required()
+def validation_cache() -> tuple[Response, int]:
+    """ Inspect the cache of validation reports. This is an admin only route """
+    return get_validation_cache()
+
+
+@app.route('/api/files/validate/cache', methods=['DELETE'])
+@swag_from(path.join(FILES_DOC_PATH, 'purge_validation_cache.yml'))
+@jwt_required()
+def purge_validation_cache_() -> tuple[Response, int]:
+    """ Purge the cache of validation reports. This is an admin only route """
+    return purge_validation_cache()
+
+
 @app.route('/api/files/register', methods=['POST'])
 @swag_from(path.join(FILES_DOC_PATH, 'register_file.yml'))
 @jwt_required()
@@ -317,9 +392,25 @@ def update_file_batch_(file_id):
     return update_file_batch(file_id)
 
 
+@app.route('/api/files/batch', methods=['POST'])
+@swag_from(path.join(FILES_DOC_PATH, 'rebatch_files.yml'))
+@jwt_required()
+def update_files_batch_() -> tuple[Response, int]:
+    """ Change the batch of many files in a single transaction """
+    return update_files_batch()
+
+
 ###########################################################
 #                          SAMPLES                        #
 ###########################################################
+@app.route('/api/samples/search', methods=['GET'])
+@swag_from(path.join(SAMPLES_DOC_PATH, 'search_samples.yml'))
+@jwt_required()
+def search_samples() -> tuple[Response, int]:
+    """ Search samples """
+    return search_samples_in_database()
+
+
 @app.route('/api/samples/<sample_id>', methods=['GET'])
 @swag_from(path.join(SAMPLES_DOC_PATH, 'get_sample.yml'))
 @jwt_required(optional=True)
@@ -9,6 +9,8 @@ from .models import User, Organisation, Chemical, Organism, File, Token, Dose, T
 from .queries import (
     login_user,
     create_organisations,
+    get_organisation_gdrive_id,
+    reference_data,
     create_users,
     create_chemicals,
     create_organisms,
@@ -20,7 +22,9 @@ from .queries import (
     create_files,
     create_timepoints_hours,
     get_token,
-    get_shipped_file
+    get_shipped_file,
+    get_files_with_organism,
+    get_received_batches
 )
 
 from ptmd.config import Base
@@ -1,25 +1,98 @@
-""" This module contains the Sample database model. The data is stored a JSON string in the 'data' column.
+""" This module contains the Sample database model. The fields used to filter samples are stored in typed and indexed
+columns, the remaining free-form fields of the spreadsheet are stored in the JSON 'data' column.
 """
 from __future__ import annotations
 
 from ptmd.database.utils import get_current_user
 
-from typing import Generator
-from json import dumps as json_dumps, loads as json_loads
+from typing import Any, Generator
 
 from ptmd.config import Base, db
 from ptmd.database.models.user import User
 
 
+SAMPLE_COLUMNS: dict[str, str] = {
+    'replicate': 'replicate',
+    'dose_code': 'dose_code',
+    'timepoint': 'timepoint_(hours)',
+    'box_id': 'box_id',
+    'box_row': 'box_row',
+    'box_column': 'box_column',
+    'collection_order': 'collection_order'
+}
+INTEGER_COLUMNS: tuple[str, ...] = ('replicate', 'timepoint', 'box_column', 'collection_order')
+STRING_COLUMNS: dict[str, int] = {'dose_code': 20, 'box_id': 100, 'box_row': 1}
+
+
+def cast_column(column: str, value: Any) -> Any:
+    """ Convert a value of the spreadsheet to the type of its column.
+
+    :param column: The name of the column.
+    :param value: The value read from the spreadsheet.
+    :return: The value of the column.
+    :raises ValueError: if the value can't be stored in the column without losing information.
+    """
+    if value is None:
+        return None
+    if column in INTEGER_COLUMNS:
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not float(value).is_integer():
+            raise ValueError(f"{value!r} is not an integer.")
+        return int(value)
+    value = str(value)
+    if len(value) > STRING_COLUMNS[column]:
+        raise ValueError(f"{value!r} is longer than {STRING_COLUMNS[column]} characters.")
+    return value
+
+
+def split_sample_data(data: dict) -> dict:
+    """ Split the data of a sample between the typed columns and the JSON overflow column. A compound known to the
+    database is replaced by its identifier, other compounds (controls, blanks) stay in the overflow column. A value
+    that a column can't hold as is, such as a numeric dose code or a non integral replicate, is also kept unchanged in
+    the overflow column so the sample data is rebuilt with its original type. The column is left empty when the value
+    can't be converted at all.
+
+    :param data: The sample data as read from the spreadsheet.
+    :return: The values of the columns, including the overflow 'data' column.
+    """
+    overflow: dict = dict(data)
+    columns: dict = {}
+    for column, field in SAMPLE_COLUMNS.items():
+        value: Any = overflow.get(field)
+        try:
+            columns[column] = cast_column(column, value)
+        except ValueError:
+            columns[column] = None
+            continue
+        if type(columns[column]) is type(value):
+            overflow.pop(field, None)
+    compound: dict | str | None = overflow.get('compound')
+    columns['compound_id'] = None
+    if isinstance(compound, dict) and compound.get('chemical_id'):
+        columns['compound_id'] = compound['chemical_id']
+        del overflow['compound']
+    columns['data'] = overflow
+    return columns
+
+
 class Sample(Base):
     """ The sample creator.
 
     """
     __tablename__: str = 'sample'
     sample_id: str = db.Column(db.String(9), primary_key=True)
-    data: str = db.Column(db.String(100000), nullable=False)
+    data: dict = db.Column(db.JSON, nullable=False)
+
+    replicate: int = db.Column(db.Integer, nullable=True, index=True)
+    dose_code: str = db.Column(db.String(20), nullable=True, index=True)
+    timepoint: int = db.Column(db.Integer, nullable=True, index=True)
+    box_id: str = db.Column(db.String(100), nullable=True, index=True)
+    box_row: str = db.Column(db.String(1), nullable=True, index=True)
+    box_column: int = db.Column(db.Integer, nullable=True, index=True)
+    collection_order: int = db.Column(db.Integer, nullable=True, index=True)
 
-    file_id: int = db.Column(db.Integer, db.ForeignKey('file.file_id'), nullable=False)
+    compound_id: int = db.Column(db.Integer, db.ForeignKey('chemical.chemical_id'), nullable=True, index=True)
+    compound = db.relationship('Chemical')
+    file_id: int = db.Column(db.Integer, db.ForeignKey('file.file_id'), nullable=False, index=True)
     file = db.relationship('File', backref=db.backref('samples'))
 
     def __init__(self, sample_id: str, data: dict, file_id: int) -> None:
@@ -30,15 +103,27 @@ class Sample(Base):
         :param file_id: The file id.
         """
         self.sample_id = sample_id
-        self.data = json_dumps(data)
+        for column, value in split_sample_data(data).items():
+            setattr(self, column, value)
         self.file_id = file_id
 
+    def get_data(self) -> dict:
+        """ Rebuild the sample data as read from the spreadsheet from the typed columns and the overflow column. The
+        values kept in the overflow column take precedence, as they hold the original values the columns couldn't.
+
+        :return: The sample data.
+        """
+        data: dict = {**{field: getattr(self, column) for column, field in SAMPLE_COLUMNS.items()}, **self.data}
+        if self.compound:
+            data['compound'] = dict(self.compound)
+        return data
+
     def __iter__(self) -> Generator:
         """ Iterator for the object. Used to serialize the object as a dictionary.
 
         :return: The iterator.
         """
-        data: dict = json_loads(self.data)
+        data: dict = self.get_data()
         current_user: User | None = get_current_user()
         yield from {
             **data,
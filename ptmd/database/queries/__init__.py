@@ -5,7 +5,12 @@
 from .chemicals import create_chemicals, get_allowed_chemicals, get_chemical_code_mapping, get_chemicals_from_name
 from .organisms import create_organisms, get_allowed_organisms, get_organism_code
 from .users import login_user, create_users, get_token, email_admins_file_shipped
-from .organisations import create_organisations
-from .timepoints import create_timepoints_hours
-from .files import create_files, prepare_files_data, extract_values_from_title, get_shipped_file
-from .search import search_files
+from .organisations import create_organisations, get_organisation_gdrive_id
+from .reference import reference_data, ReferenceData
+from .timepoints import create_timepoints_hours, build_timepoints_hours
+from .files import (create_files, prepare_files_data, extract_values_from_title, get_shipped_file,
+                    get_files_with_organism, get_received_batches)
+from .samples import upsert_samples, get_existing_sample_ids
+from .loading import file_loading_options, sample_loading_options, isa_loading_options
+from .pagination import paginate, paginate_by_key, paginate_by_page, encode_cursor, decode_cursor, count_cache
+from .search import search_files, build_search_clauses, search_samples, build_sample_search_query
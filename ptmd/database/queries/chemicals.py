@@ -3,6 +3,7 @@
 from ptmd.config import session
 from ptmd.logger import LOGGER
 from ptmd.database.models import Chemical
+from .reference import reference_data
 
 
 def get_allowed_chemicals() -> list[str]:
@@ -19,12 +20,12 @@ def get_chemical_code_mapping(chemicals: list[str]) -> dict:
     :param chemicals: list[str]: list of chemicals names
     :return: list of chemicals codes
     """
+    codes: dict[str, int] = reference_data.chemicals
     chemicals_mapping: dict = {}
     for chemical_name in chemicals:
-        chemical: Chemical = Chemical.query.filter(Chemical.common_name == chemical_name).first()
-        if not chemical:
+        if chemical_name not in codes:
             raise ValueError(f'Chemical {chemical_name} not found in the database.')
-        chemicals_mapping[chemical.common_name] = str(chemical.ptx_code).rjust(3, '0')
+        chemicals_mapping[chemical_name] = str(codes[chemical_name]).rjust(3, '0')
     return chemicals_mapping
 
 
@@ -49,6 +50,7 @@ def create_chemicals(chemicals: list[dict]) -> dict[str, Chemical]:
         except Exception as e:
             LOGGER.error(f'Could not create chemical {chemical} with error {str(e)}')
             session.rollback()
+    reference_data.invalidate()
     return chemicals_in_database
 
 
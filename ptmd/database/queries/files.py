@@ -4,6 +4,9 @@ from __future__ import annotations
 
 from os import remove
 
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload
+
 from ptmd.logger import LOGGER
 from ptmd.database import User, Organisation, File, Organism
 from ptmd.config import session
@@ -90,3 +93,31 @@ def get_shipped_file(species: str, batch: str) -> File | None:  # pragma: no cov
             File.batch == batch,
             File.received != 0
     ).first()
+
+
+def get_files_with_organism(file_ids: list[int]) -> list[File]:  # pragma: no cover
+    """ This function returns the files with the given identifiers, loading their organism in the same query
+
+    :param file_ids: the identifiers of the files
+    :return: the files found, in no particular order
+
+    :note: This function is excluded from coverage report because it is just a wrapper around a database query
+    """
+    return File.query.options(joinedload(File.organism)).filter(File.file_id.in_(file_ids)).all()  # type: ignore
+
+
+def get_received_batches(pairs: list[tuple[int, str]]) -> set[tuple[int, str]]:  # pragma: no cover
+    """ This function returns the (organism id, batch) pairs among the given ones that are used by a received file
+
+    :param pairs: the (organism id, batch) pairs to check
+    :return: the pairs already used by a received file
+
+    :note: This function is excluded from coverage report because it is just a wrapper around a database query
+    """
+    if not pairs:
+        return set()
+    rows: list = File.query.with_entities(File.organism_id, File.batch).filter(
+        File.received != 0,
+        tuple_(File.organism_id, File.batch).in_(pairs)  # type: ignore
+    ).distinct().all()
+    return {(organism_id, batch) for organism_id, batch in rows}
@@ -0,0 +1,50 @@
+""" This module contains the eager loading options of the queries serializing files and samples. The serialization of
+a file walks its organisation, author, organism, vehicle, chemicals, timepoints and doses, and the serialization of a
+sample walks its file and compound: without these options every relationship is lazy loaded once per row.
+"""
+from __future__ import annotations
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from ptmd.database.models import File, Sample, Timepoint
+
+
+def file_loading_options() -> list:
+    """ Build the options loading everything the serialization of a file needs. The many-to-one relationships are
+    joined to the query of the files, the collections are loaded with one extra query each.
+
+    :return: the loading options
+    """
+    return [
+        joinedload(File.organisation),
+        joinedload(File.author),
+        joinedload(File.organism),
+        joinedload(File.vehicle),
+        selectinload(File.chemicals),
+        selectinload(File.timepoints).selectinload(Timepoint.files),
+        selectinload(File.doses)
+    ]
+
+
+def sample_loading_options() -> list:
+    """ Build the options loading everything the serialization of a sample needs: its compound, its file and the
+    organism, organisation and vehicle of the file.
+
+    :return: the loading options
+    """
+    return [
+        joinedload(Sample.compound),
+        joinedload(Sample.file).options(
+            joinedload(File.organism),
+            joinedload(File.organisation),
+            joinedload(File.vehicle)
+        )
+    ]
+
+
+def isa_loading_options() -> list:
+    """ Build the options loading a file with its samples and their compounds, as needed by the ISA conversion.
+
+    :return: the loading options
+    """
+    return [*file_loading_options(), selectinload(File.samples).joinedload(Sample.compound)]
@@ -1,8 +1,11 @@
 """ This module contains all queries related to organisations.
 """
+from __future__ import annotations
+
 from ptmd.config import session
 from ptmd.logger import LOGGER
 from ptmd.database.models import Organisation
+from .reference import reference_data
 
 
 def create_organisations(organisations: dict) -> dict:
@@ -17,7 +20,22 @@ def create_organisations(organisations: dict) -> dict:
                                  gdrive_id=organisations[org]['g_drive'],
                                  longname=organisations[org]['long_name']))
     session.commit()
+    reference_data.invalidate()
     organisation = {}
     for org in organisations:
         organisation[org] = Organisation.query.filter(Organisation.name == org).first()
     return organisation
+
+
+def get_organisation_gdrive_id(organisation_name: str) -> str:
+    """ Get the Google Drive folder identifier of an organisation.
+
+    :param organisation_name: the organisation name
+    :return: the Google Drive folder identifier
+    """
+    if organisation_name not in reference_data.organisations:
+        raise ValueError(f'Organisation {organisation_name} not found in the database.')
+    gdrive_id: str | None = reference_data.organisations[organisation_name]
+    if not gdrive_id:
+        raise ValueError(f'Organisation {organisation_name} has no Google Drive folder.')
+    return gdrive_id
@@ -1,8 +1,11 @@
 """ This module contains all queries related to organisms.
 """
+from __future__ import annotations
+
 from ptmd.config import session
 from ptmd.logger import LOGGER
 from ptmd.database.models import Organism
+from .reference import reference_data
 
 
 def get_allowed_organisms() -> list[str]:
@@ -10,7 +13,7 @@ def get_allowed_organisms() -> list[str]:
 
     :return: a list of organisms names
     """
-    return [organism.ptox_biosystem_name for organism in Organism.query.all()]
+    return list(reference_data.organisms)
 
 
 def get_organism_code(organism_name: str) -> str:
@@ -19,10 +22,10 @@ def get_organism_code(organism_name: str) -> str:
     :param organism_name: str: the organism name
     :return: str: the organism code
     """
-    organism = Organism.query.filter(Organism.ptox_biosystem_name == organism_name).first()
-    if not organism:
+    organism_code: str | None = reference_data.organisms.get(organism_name)
+    if organism_code is None:
         raise ValueError(f'Organism {organism_name} not found in the database.')
-    return organism.ptox_biosystem_code
+    return organism_code
 
 
 def create_organisms(organisms: list[dict]) -> dict[str, Organism]:
@@ -42,4 +45,5 @@ def create_organisms(organisms: list[dict]) -> dict[str, Organism]:
         except Exception as e:
             LOGGER.error(f'Could not create organism {organism} with error {str(e)}')
             session.rollback()
+    reference_data.invalidate()
     return organisms_in_database
@@ -0,0 +1,230 @@
+""" This module contains the keyset pagination of the queries. Instead of an OFFSET, each page starts after the key of
+the last row of the previous page, so every page costs the same whatever its depth. The key is handed to the clients
+as an opaque cursor. Counting the rows is optional, and the counts are cached for PAGINATION_COUNT_TTL seconds as they
+are the slowest part of a page on large tables. The cached counts are dropped whenever a transaction writing files or
+samples is committed. Like the other caches, the counts are kept per process: the other workers see the new counts once
+their entries expire.
+"""
+from __future__ import annotations
+
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from binascii import Error as Base64Error
+from collections import OrderedDict
+from json import dumps as json_dumps, loads as json_loads
+from threading import RLock
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import Column, event
+from sqlalchemy.orm import Session
+
+from ptmd.config import Base
+from ptmd.const import DOT_ENV_CONFIG
+from ptmd.exceptions import InvalidCursorError
+
+
+PAGINATION_COUNT_TTL: float = float(DOT_ENV_CONFIG.get('PAGINATION_COUNT_TTL') or 60)
+PAGINATION_COUNT_CACHE_SIZE: int = 256
+PAGINATED_TABLES: tuple[str, ...] = ('file', 'sample')
+
+
+def encode_cursor(key: str | int) -> str:
+    """ Encode the key of the last row of a page as an opaque cursor.
+
+    :param key: the key of the last row of the page
+    :return: the cursor
+    """
+    return urlsafe_b64encode(json_dumps({'after': key}).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, key_type: type) -> str | int:
+    """ Decode a cursor into the key of the last row of the previous page.
+
+    :param cursor: the cursor
+    :param key_type: the type of the keys of the paginated rows, str or int
+    :return: the key of the last row of the previous page
+
+    :raise InvalidCursorError: if the cursor wasn't created by encode_cursor() for a key of this type
+    """
+    try:
+        key: str | int = json_loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))['after']
+    except (Base64Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        raise InvalidCursorError()
+    if type(key) is not key_type:
+        raise InvalidCursorError()
+    return key
+
+
+class CountCache:
+    """ In-memory cache of the number of rows matched by queries, indexed by their SQL and parameters. The least
+    recently used counts are evicted when the cache is full.
+
+    :param ttl: The number of seconds a count is served from memory before being computed again.
+    :param max_size: The maximum number of counts kept in memory.
+    """
+
+    def __init__(self, ttl: float = PAGINATION_COUNT_TTL, max_size: int = PAGINATION_COUNT_CACHE_SIZE) -> None:
+        """ The count cache constructor. """
+        self.ttl: float = ttl
+        self.max_size: int = max_size
+        self.__counts: OrderedDict[tuple, tuple[float, int]] = OrderedDict()
+        self.__lock: RLock = RLock()
+
+    def count(self, query: Base.query) -> int:
+        """ Count the rows matched by a query, or return the count computed less than ttl seconds ago.
+
+        :param query: the query to count the rows of
+        :return: the number of rows
+        """
+        compiled = query.statement.compile()
+        key: tuple = (str(compiled), tuple(sorted((name, str(value)) for name, value in compiled.params.items())))
+        with self.__lock:
+            entry: tuple[float, int] | None = self.__counts.get(key)
+            if entry and monotonic() - entry[0] <= self.ttl:
+                self.__counts.move_to_end(key)
+                return entry[1]
+        total: int = query.order_by(None).count()
+        with self.__lock:
+            now: float = monotonic()
+            for expired in [cached for cached, (counted_at, _) in self.__counts.items() if now - counted_at > self.ttl]:
+                del self.__counts[expired]
+            self.__counts[key] = (now, total)
+            self.__counts.move_to_end(key)
+            while len(self.__counts) > self.max_size:
+                self.__counts.popitem(last=False)
+        return total
+
+    def invalidate(self) -> None:
+        """ Drop all the counts. """
+        with self.__lock:
+            self.__counts.clear()
+
+    def __len__(self) -> int:
+        """ The number of cached counts, including the expired ones not removed yet. """
+        return len(self.__counts)
+
+
+def paginate_by_key(
+        query: Base.query,
+        key: Column,
+        per_page: int = 10,
+        cursor: str | None = None,
+        with_total: bool = False
+) -> tuple[list, dict]:
+    """ Get a page of rows ordered by a unique key, starting after the cursor. One more row than needed is fetched to
+    know whether there is a next page.
+
+    :param query: the query filtering the rows
+    :param key: the unique column the rows are ordered by
+    :param per_page: the number of rows per page
+    :param cursor: the cursor returned with the previous page, or None for the first page
+    :param with_total: whether to count the rows matched by the query
+    :return: the rows of the page and the pagination information
+
+    :raise InvalidCursorError: if the cursor can't be decoded or doesn't hold a key of the type of the column
+    """
+    per_page = max(per_page, 1)
+    page_query: Base.query = query.order_by(key)
+    if cursor:
+        page_query = page_query.filter(key > decode_cursor(cursor, key.type.python_type))
+    items: list = page_query.limit(per_page + 1).all()
+    has_next: bool = len(items) > per_page
+    items = items[:per_page]
+    pagination: dict = {
+        'per_page': per_page,
+        'cursor': cursor or None,
+        'next_cursor': encode_cursor(getattr(items[-1], key.key)) if has_next else None
+    }
+    if with_total:
+        pagination['total'] = count_cache.count(query)
+    return items, pagination
+
+
+def paginate_by_page(query: Base.query, page: int = 1, per_page: int = 10) -> tuple[list, dict]:
+    """ Get a page of rows by page number, with an OFFSET and a count of the rows on every page.
+
+    :param query: the query filtering the rows
+    :param page: the page number
+    :param per_page: the number of rows per page
+    :return: the rows of the page and the pagination information
+    """
+    pages: Base.query = query.paginate(page=page, per_page=per_page)
+    return pages.items, {
+        'current_page': page,
+        'next_page': page + 1 if pages.has_next else None,
+        'previous_previous': page - 1 if pages.has_prev else None,
+        'pages': pages.pages,
+        'per_page': per_page,
+        'total': pages.total
+    }
+
+
+def paginate(
+        query: Base.query,
+        key: Column,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: str | None = None,
+        with_total: bool = False
+) -> tuple[list, dict]:
+    """ Get a page of rows by cursor when a cursor is given, even empty for the first page, and by page number
+    otherwise.
+
+    :param query: the query filtering the rows
+    :param key: the unique column the rows are ordered by in cursor mode
+    :param page: the page number in page mode
+    :param per_page: the number of rows per page
+    :param cursor: the cursor returned with the previous page, empty for the first page, or None for page mode
+    :param with_total: whether to count the rows matched by the query in cursor mode
+    :return: the rows of the page and the pagination information
+    """
+    if cursor is not None:
+        return paginate_by_key(query, key, per_page=per_page, cursor=cursor, with_total=with_total)
+    return paginate_by_page(query, page=page, per_page=per_page)
+
+
+count_cache: CountCache = CountCache()
+
+
+def flag_flushed_rows(session: Session, flush_context: Any) -> None:
+    """ Remember that the session wrote files or samples, when a flush added, changed or deleted some.
+
+    :param session: the session flushed
+    :param flush_context: the state of the flush, unused
+    """
+    instances: set = {*session.new, *session.dirty, *session.deleted}
+    if any(getattr(instance, '__tablename__', None) in PAGINATED_TABLES for instance in instances):
+        session.info['stale_counts'] = True
+
+
+def flag_executed_rows(orm_execute_state: Any) -> None:
+    """ Remember that the session wrote files or samples, when an INSERT, UPDATE or DELETE statement targets them.
+
+    :param orm_execute_state: the statement executed by the session
+    """
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        if getattr(orm_execute_state.statement.table, 'name', None) in PAGINATED_TABLES:
+            orm_execute_state.session.info['stale_counts'] = True
+
+
+def invalidate_counts(session: Session) -> None:
+    """ Drop the cached counts once the transaction writing files or samples is committed.
+
+    :param session: the session committed
+    """
+    if session.info.pop('stale_counts', False):
+        count_cache.invalidate()
+
+
+def discard_flag(session: Session, *args: Any) -> None:
+    """ Forget the writes of a transaction rolled back.
+
+    :param session: the session rolled back
+    """
+    session.info.pop('stale_counts', None)
+
+
+event.listen(Session, 'after_flush', flag_flushed_rows)  # type: ignore
+event.listen(Session, 'do_orm_execute', flag_executed_rows)  # type: ignore
+event.listen(Session, 'after_commit', invalidate_counts)  # type: ignore
+event.listen(Session, 'after_rollback', discard_flag)  # type: ignore
@@ -0,0 +1,108 @@
+""" This module contains the cache of the reference data: the organisms, chemicals and organisations. Each table is
+loaded in bulk the first time it is needed and then served from memory, so building a template or validating a file
+doesn't query the database once per chemical. The cache is invalidated by the queries creating reference data and
+reloaded after REFERENCE_DATA_TTL seconds to pick up the writes made by other processes.
+
+The cache lives in the memory of each process and the invalidation only reaches the process that created the data.
+When the API runs with several worker processes, the other workers keep serving their copy for up to
+REFERENCE_DATA_TTL seconds: a chemical or organism created in one worker can be reported unknown by the others during
+that time. Lower REFERENCE_DATA_TTL in the .env file to shorten this window at the cost of more reloads.
+"""
+from __future__ import annotations
+
+from threading import RLock
+from time import monotonic
+from typing import Callable
+
+from ptmd.const import DOT_ENV_CONFIG
+from ptmd.database.models import Organism, Chemical, Organisation
+
+
+REFERENCE_DATA_TTL: float = float(DOT_ENV_CONFIG.get('REFERENCE_DATA_TTL') or 300)
+
+
+class ReferenceData:
+    """ In-memory copy of the reference tables. The mappings returned are shared and must not be modified.
+
+    :param ttl: The number of seconds a table is served from memory before being reloaded.
+    """
+
+    def __init__(self, ttl: float = REFERENCE_DATA_TTL) -> None:
+        """ The reference data constructor. """
+        self.ttl: float = ttl
+        self.__tables: dict[str, dict] = {}
+        self.__loaded_at: dict[str, float] = {}
+        self.__lock: RLock = RLock()
+
+    @property
+    def organisms(self) -> dict[str, str]:
+        """ The biosystem codes indexed by biosystem name. """
+        return self.__get('organisms', load_organisms)
+
+    @property
+    def chemicals(self) -> dict[str, int]:
+        """ The PTX codes indexed by chemical common name. The first chemical wins when a name is duplicated. """
+        return self.__get('chemicals', load_chemicals)
+
+    @property
+    def organisations(self) -> dict[str, str | None]:
+        """ The Google Drive folder identifiers indexed by organisation name. """
+        return self.__get('organisations', load_organisations)
+
+    def invalidate(self) -> None:
+        """ Drop all the tables so they are loaded again from the database the next time they are needed. """
+        with self.__lock:
+            self.__tables.clear()
+            self.__loaded_at.clear()
+
+    def __get(self, name: str, loader: Callable[[], dict]) -> dict:
+        """ Get a table, loading it if it isn't in memory or has expired.
+
+        :param name: The name of the table.
+        :param loader: The function loading the table from the database.
+        :return: The table.
+        """
+        with self.__lock:
+            loaded_at: float | None = self.__loaded_at.get(name)
+            if loaded_at is None or monotonic() - loaded_at > self.ttl:
+                self.__tables[name] = loader()
+                self.__loaded_at[name] = monotonic()
+            return self.__tables[name]
+
+
+def load_organisms() -> dict[str, str]:
+    """ Load the organisms from the database.
+
+    :return: The biosystem codes indexed by biosystem name.
+    """
+    rows: list = Organism.query.with_entities(Organism.ptox_biosystem_name, Organism.ptox_biosystem_code)\
+        .order_by(Organism.organism_id).all()
+    organisms: dict[str, str] = {}
+    for name, code in rows:
+        organisms.setdefault(name, code)
+    return organisms
+
+
+def load_chemicals() -> dict[str, int]:
+    """ Load the chemicals from the database.
+
+    :return: The PTX codes indexed by chemical common name.
+    """
+    rows: list = Chemical.query.with_entities(Chemical.common_name, Chemical.ptx_code)\
+        .order_by(Chemical.chemical_id).all()
+    chemicals: dict[str, int] = {}
+    for name, code in rows:
+        chemicals.setdefault(name, code)
+    return chemicals
+
+
+def load_organisations() -> dict[str, str | None]:
+    """ Load the organisations from the database.
+
+    :return: The Google Drive folder identifiers indexed by organisation name.
+    """
+    rows: list = Organisation.query.with_entities(Organisation.name, Organisation.gdrive_id).all()
+    return {name: gdrive_id for name, gdrive_id in rows}
+
+
+reference_data: ReferenceData = ReferenceData()
@@ -0,0 +1,80 @@
+""" This module contains the database queries for the Sample table. The samples of a spreadsheet are saved in bulk:
+the existing identifiers are fetched with a few IN queries, the new samples are inserted with a single multi-row INSERT
+and the existing samples are updated with a single executemany UPDATE. The samples inserted by a concurrent request in
+between are updated with the existing samples.
+"""
+from __future__ import annotations
+
+from sqlalchemy import select, insert, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql.dml import Insert
+
+from ptmd.config import session
+from ptmd.database.models import Sample
+from ptmd.database.models.sample import split_sample_data
+
+
+SAMPLE_QUERY_CHUNK: int = 500
+RETURNING_DIALECTS: tuple[str, ...] = ('postgresql', 'sqlite')
+
+
+def get_existing_sample_ids(sample_ids: list[str]) -> set[str]:
+    """ Get the identifiers that are already in the database, with one IN query per chunk of SAMPLE_QUERY_CHUNK
+    identifiers to stay below the bound parameters limit of the database.
+
+    :param sample_ids: the identifiers to look for
+    :return: the identifiers found in the database
+    """
+    existing: set[str] = set()
+    for start in range(0, len(sample_ids), SAMPLE_QUERY_CHUNK):
+        chunk: list[str] = sample_ids[start:start + SAMPLE_QUERY_CHUNK]
+        existing.update(session.execute(select(Sample.sample_id).where(Sample.sample_id.in_(chunk))).scalars())  # type: ignore
+    return existing
+
+
+def build_sample_insert(dialect: str) -> Insert:
+    """ Build the INSERT statement of the samples for a database dialect. On PostgreSQL and SQLite, the samples inserted
+    by a concurrent request since the identifiers were fetched are skipped instead of failing the whole insert, and the
+    statement returns the identifiers it did insert so that the skipped samples can be updated. The statement targets
+    the table rather than the model so that missing values don't split the insert into several statements.
+
+    :param dialect: the name of the database dialect
+    :return: the INSERT statement
+    """
+    if dialect not in RETURNING_DIALECTS:
+        return insert(Sample.__table__)  # type: ignore
+    sample_id = Sample.__table__.c.sample_id  # type: ignore
+    if dialect == 'postgresql':
+        return postgresql_insert(Sample.__table__).on_conflict_do_nothing(index_elements=['sample_id']).returning(sample_id)
+    return sqlite_insert(Sample.__table__).on_conflict_do_nothing(index_elements=['sample_id']).returning(sample_id)
+
+
+def upsert_samples(samples: dict[str, dict], file_id: int) -> tuple[int, int]:
+    """ Insert the new samples and update the data of the existing ones. The changes are not committed.
+
+    :param samples: the data of the samples indexed by sample identifier
+    :param file_id: the file the new samples belong to
+    :return: the number of inserted samples and the number of updated samples
+    """
+    existing: set[str] = get_existing_sample_ids(list(samples))
+    new_rows: list[dict] = []
+    updated_rows: list[dict] = []
+    for sample_id, data in samples.items():
+        if sample_id in existing:
+            updated_rows.append({'sample_id': sample_id, **split_sample_data(data)})
+        else:
+            new_rows.append({'sample_id': sample_id, 'file_id': file_id, **split_sample_data(data)})
+    inserted: int = len(new_rows)
+    if new_rows:
+        dialect: str = session.get_bind().dialect.name
+        if dialect not in RETURNING_DIALECTS:
+            session.execute(build_sample_insert(dialect), new_rows)
+        else:
+            inserted_ids: set[str] = set(session.execute(build_sample_insert(dialect), new_rows).scalars())
+            skipped: list[dict] = [row for row in new_rows if row['sample_id'] not in inserted_ids]
+            updated_rows.extend({key: value for key, value in row.items() if key != 'file_id'} for row in skipped)
+            inserted -= len(skipped)
+    if updated_rows:
+        session.execute(update(Sample), updated_rows)  # type: ignore
+    return inserted, len(updated_rows)
@@ -4,7 +4,9 @@
 from __future__ import annotations
 
 from ptmd.config import Base
-from ptmd.database import Organisation, File, Organism, Chemical
+from ptmd.database import Organisation, File, Organism, Chemical, Sample
+from ptmd.database.queries.loading import file_loading_options, sample_loading_options
+from ptmd.database.queries.pagination import paginate
 
 
 def search_files(
@@ -19,9 +21,12 @@ def search_files(
     organisation_name: str | None = None,
     organism_name: str | None = None,
     vehicle_name: str | None = None,
-    chemical_name: str | None = None
+    chemical_name: str | None = None,
+    cursor: str | None = None,
+    with_total: bool = False
 ) -> dict:
-    """ Given input parameters, search for files in the database.
+    """ Given input parameters, search for files in the database. The files are paginated by cursor when a cursor is
+    given, even empty for the first page, and by page number otherwise.
 
     :param page: the page number to be returned
     :param per_page: the number of files per page
@@ -35,10 +40,51 @@ def search_files(
     :param organism_name: the name of the organism associated with the files
     :param vehicle_name: the name of the vehicle associated with the files
     :param chemical_name: the name of the chemical associated with the files
+    :param cursor: the cursor returned with the previous page
+    :param with_total: whether to count the files in cursor mode
     :return: a list of files found in the database
     """
+    clauses: list = build_search_clauses(
+        name=name, batch=batch, is_valid=is_valid, replicates=replicates, controls=controls, blanks=blanks,
+        organisation_name=organisation_name, organism_name=organism_name, vehicle_name=vehicle_name,
+        chemical_name=chemical_name
+    )
+    query: Base.query = File.query.filter(*clauses).options(*file_loading_options())
+    items, pagination = paginate(query, File.file_id, page=page, per_page=per_page, cursor=cursor, with_total=with_total)
+    files: list[dict] = [dict(file) for file in items]
+    for file in files:
+        for timepoint in file['timepoints']:
+            del timepoint['files']
+    return {'data': files, 'pagination': pagination}
 
-    clauses = []
+
+def build_search_clauses(
+    name: str | None = None,
+    batch: str | None = None,
+    is_valid: bool | None = None,
+    replicates: dict | None = None,
+    controls: dict | None = None,
+    blanks: dict | None = None,
+    organisation_name: str | None = None,
+    organism_name: str | None = None,
+    vehicle_name: str | None = None,
+    chemical_name: str | None = None
+) -> list:
+    """ Given input parameters, assemble the clauses filtering the files.
+
+    :param name: the name of the file
+    :param batch: the batch code of the file
+    :param is_valid: the state of the file
+    :param replicates: filter on replicates, needs an operator and a value
+    :param controls: filter on controls, needs an operator and a value
+    :param blanks: filter on blanks, needs an operator and a value
+    :param organisation_name: the name of the organisation to filter the files
+    :param organism_name: the name of the organism associated with the files
+    :param vehicle_name: the name of the vehicle associated with the files
+    :param chemical_name: the name of the chemical associated with the files
+    :return: the list of clauses
+    """
+    clauses: list = []
 
     if name:
         clauses.append(File.name.like(f'%{name}%'))
@@ -66,22 +112,93 @@ def search_files(
     if chemical_name:
         clauses.append(File.chemicals.any(Chemical.common_name.like(f'%{chemical_name}%')))
 
-    query: Base.query = File.query.filter(*clauses).paginate(page=page, per_page=per_page)
-    files: list[dict] = [dict(file) for file in query.items]
-    for file in files:
-        for timepoint in file['timepoints']:
-            del timepoint['files']
-    return {
-        'data': files,
-        'pagination': {
-            'current_page': page,
-            'next_page': page + 1 if query.has_next else None,
-            'previous_previous': page - 1 if query.has_prev else None,
-            'pages': query.pages,
-            'per_page': per_page,
-            'total': query.total
-        }
-    }
+    return clauses
+
+
+def search_samples(
+    page: int = 1,
+    per_page: int = 10,
+    compound_name: str | None = None,
+    dose: str | None = None,
+    timepoint: dict | None = None,
+    replicate: dict | None = None,
+    batch: str | None = None,
+    organism_name: str | None = None,
+    organisation_name: str | None = None,
+    cursor: str | None = None,
+    with_total: bool = False
+) -> dict:
+    """ Given input parameters, search for samples in the database. The samples are paginated by cursor when a cursor
+    is given, even empty for the first page, and by page number otherwise.
+
+    :param page: the page number to be returned
+    :param per_page: the number of samples per page
+    :param compound_name: the name of the compound the samples were exposed to
+    :param dose: the dose code of the samples
+    :param timepoint: filter on the timepoint in hours, needs an operator and a value
+    :param replicate: filter on the replicate, needs an operator and a value
+    :param batch: the batch code of the file of the samples
+    :param organism_name: the name of the organism of the samples
+    :param organisation_name: the name of the organisation the samples belong to
+    :param cursor: the cursor returned with the previous page
+    :param with_total: whether to count the samples in cursor mode
+    :return: a list of samples found in the database
+    """
+    query: Base.query = build_sample_search_query(
+        compound_name=compound_name, dose=dose, timepoint=timepoint, replicate=replicate, batch=batch,
+        organism_name=organism_name, organisation_name=organisation_name
+    ).options(*sample_loading_options())
+    if cursor is None:
+        query = query.order_by(Sample.sample_id)
+    items, pagination = paginate(query, Sample.sample_id, page=page, per_page=per_page, cursor=cursor,
+                                 with_total=with_total)
+    return {'data': [dict(sample) for sample in items], 'pagination': pagination}
+
+
+def build_sample_search_query(
+    compound_name: str | None = None,
+    dose: str | None = None,
+    timepoint: dict | None = None,
+    replicate: dict | None = None,
+    batch: str | None = None,
+    organism_name: str | None = None,
+    organisation_name: str | None = None
+) -> Base.query:
+    """ Given input parameters, assemble the query filtering the samples. The samples are joined to their file, and to
+    the organism, organisation and compound tables when they are filtered on, so every predicate runs in SQL.
+
+    :param compound_name: the name of the compound the samples were exposed to
+    :param dose: the dose code of the samples
+    :param timepoint: filter on the timepoint in hours, needs an operator and a value
+    :param replicate: filter on the replicate, needs an operator and a value
+    :param batch: the batch code of the file of the samples
+    :param organism_name: the name of the organism of the samples
+    :param organisation_name: the name of the organisation the samples belong to
+    :return: the query
+    """
+    query: Base.query = Sample.query.join(Sample.file)
+    clauses: list = []
+
+    if dose is not None:
+        clauses.append(Sample.dose_code == str(dose))
+    if timepoint:
+        clauses.append(assemble_integer_clause(filter_data=timepoint, column='timepoint', target=Sample))
+    if replicate:
+        clauses.append(assemble_integer_clause(filter_data=replicate, column='replicate', target=Sample))
+    if batch:
+        clauses.append(File.batch == batch)
+
+    if compound_name:
+        query = query.join(Sample.compound)
+        clauses.append(Chemical.common_name.like(f'%{compound_name}%'))
+    if organism_name:
+        query = query.join(File.organism)
+        clauses.append(Organism.scientific_name.like(f'%{organism_name}%'))
+    if organisation_name:
+        query = query.join(File.organisation)
+        clauses.append(Organisation.name.like(f'%{organisation_name}%'))
+
+    return query.filter(*clauses)
 
 
 def assemble_integer_clause(filter_data: dict, column: str, target: Base) -> bool:
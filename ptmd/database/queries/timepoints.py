@@ -8,14 +8,23 @@ from ptmd.exceptions import TimepointValueError
 def create_timepoints_hours(values: list[int]) -> list[Timepoint]:
     """ Given a list of plain values, create the relevant timepoints in the database in hours
 
+    :param values: a list of plain values
+    """
+    timepoints: list[Timepoint] = build_timepoints_hours(values)
+    for timepoint in timepoints:
+        session.add(timepoint)
+    session.commit()
+    return timepoints
+
+
+def build_timepoints_hours(values: list[int]) -> list[Timepoint]:
+    """ Given a list of plain values, build the timepoints in hours without adding them to the session
+
     :param values: a list of plain values
     """
     timepoints: list[Timepoint] = []
     for i, value in enumerate(values):
         if not value or not isinstance(value, int):
             raise TimepointValueError
-        timepoint = Timepoint(value=value, unit='hours', label=f'TP{i + 1}')
-        session.add(timepoint)
-        timepoints.append(timepoint)
-    session.commit()
+        timepoints.append(Timepoint(value=value, unit='hours', label=f'TP{i + 1}'))
     return timepoints
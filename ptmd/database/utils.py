@@ -1,11 +1,17 @@
 """ This module contains utility functions for the database. In particular, a wrapper for getting the current user
-without raising a runtime error when running scripts that don't rely on the API.
+without raising a runtime error when running scripts that don't rely on the API, and a per thread counter of the SQL
+statements executed.
 """
 
 
 from __future__ import annotations
 
+from threading import local
+from typing import Any
+
 from flask_jwt_extended import get_current_user as current_user
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 from ptmd.database.models.user import User
 
@@ -19,3 +25,35 @@ def get_current_user() -> User | None:
         return current_user()
     except RuntimeError:
         return None
+
+
+# The counters active in each thread, fed by a single listener registered once for all the engines.
+active_counters: local = local()
+
+
+class QueryCounter:
+    """ Context manager counting the SQL statements executed by the current thread while it is active. Entering and
+    leaving the counter only touch the counters of the current thread, never the engine listeners.
+    """
+
+    def __init__(self) -> None:
+        """ The counter constructor. """
+        self.count: int = 0
+
+    def __enter__(self) -> QueryCounter:
+        """ Start counting the queries. """
+        if not hasattr(active_counters, 'counters'):
+            active_counters.counters = []
+        active_counters.counters.append(self)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """ Stop counting the queries. """
+        active_counters.counters.remove(self)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')  # type: ignore
+def count_query(*args: Any, **kwargs: Any) -> None:
+    """ Count a statement in the counters active in the thread executing it. """
+    for counter in getattr(active_counters, 'counters', ()):
+        counter.count += 1
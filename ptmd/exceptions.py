@@ -55,3 +55,11 @@ class TimepointValueError(APIError):
     def __init__(self) -> None:
         """ Constructor """
         self.message: str = "Timepoint value must be a positive integer"
+
+
+class InvalidCursorError(APIError):
+    """ Exception raised when a pagination cursor can't be decoded """
+
+    def __init__(self) -> None:
+        """ Constructor """
+        self.message: str = "Invalid cursor"
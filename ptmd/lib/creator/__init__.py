@@ -4,3 +4,4 @@ ISA objects.
 :author: Terazus (D. Batista)
 """
 from .core import DataframeCreator
+from .skeleton import TemplateCache, template_cache
@@ -0,0 +1,261 @@
+""" Creation of the templates of a whole exposure campaign at once. The designs are checked against the database in the
+parent process, then the workbooks are built by a pool of processes and each built workbook is immediately handed to
+a bounded pool of threads uploading it to Google Drive, so that uploads overlap with the CPU-bound generation. The
+files and their timepoints are registered in a single transaction once all the uploads are done. A design that fails
+at any step doesn't prevent the other designs from being created.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from io import BytesIO
+from multiprocessing import get_context
+
+from ptmd.config import session
+from ptmd.database import File, Chemical, Timepoint, get_shipped_file, get_chemicals_from_name
+from ptmd.database.queries import build_timepoints_hours, get_organisation_gdrive_id
+from ptmd.logger import LOGGER
+from ptmd.lib.gdrive import GoogleDriveConnector
+from .core import DataframeCreator
+
+
+CAMPAIGN_UPLOAD_WORKERS: int = 4
+
+
+class CampaignItem:
+    """ A design of the campaign that passed the checks against the database.
+
+    :param index: The position of the design in the campaign.
+    :param data: The user input of the design.
+    :param chemicals_mapping: The chemicals codes indexed by chemical name.
+    :param organism_code: The organism code.
+    :param folder_id: The Google Drive folder of the partner.
+    :param timepoints: The timepoints of the file, not added to the session yet.
+    """
+
+    def __init__(
+            self,
+            index: int,
+            data: dict,
+            chemicals_mapping: dict[str, str],
+            organism_code: str,
+            folder_id: str,
+            timepoints: list[Timepoint]
+    ) -> None:
+        """ The campaign item constructor. """
+        self.index: int = index
+        self.data: dict = data
+        self.chemicals_mapping: dict[str, str] = chemicals_mapping
+        self.organism_code: str = organism_code
+        self.folder_id: str = folder_id
+        self.timepoints: list[Timepoint] = timepoints
+        self.filename: str = f"{data['partner']}_{data['organism']}_{data['exposure_batch']}.xlsx"
+        self.chemicals: set[str] = {chemical for exposure in data['exposure'] for chemical in exposure['chemicals']}
+
+
+class CampaignCreator:
+    """ Create the templates of many designs concurrently.
+
+    :param designs: The user input of each design, with the keys expected by the DataframeCreator.
+    :param user: The id of the user creating the files.
+    :param max_workers: The maximum number of processes building workbooks. Defaults to the number of CPUs.
+    :param upload_workers: The maximum number of workbooks uploaded at the same time.
+    :param pool: An optional executor building the workbooks instead of a new pool of processes.
+    """
+
+    def __init__(
+            self,
+            designs: list[dict],
+            user: int,
+            max_workers: int | None = None,
+            upload_workers: int = CAMPAIGN_UPLOAD_WORKERS,
+            pool: Executor | None = None
+    ) -> None:
+        """ The campaign creator constructor. """
+        self.designs: list[dict] = designs
+        self.user: int = user
+        self.max_workers: int | None = max_workers
+        self.upload_workers: int = upload_workers
+        self.pool: Executor | None = pool
+        self.results: dict[int, dict] = {}
+
+    def create(self) -> list[dict]:
+        """ Build, upload and register the templates of all the designs.
+
+        :return: The result of each design, in the order of the designs.
+        """
+        self.results = {}
+        items: dict[int, CampaignItem] = {}
+        requested: set[tuple[str, str]] = set()
+        for index, design in enumerate(self.designs):
+            try:
+                items[index] = self.prepare(index, design, requested)
+            except Exception as e:
+                self.add_error(index, design, str(e))
+
+        uploaded: dict[int, dict] = {}
+        if items:
+            pool: Executor = self.pool or ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=get_context('spawn')
+            )
+            try:
+                with ThreadPoolExecutor(max_workers=self.upload_workers) as uploads:
+                    builds: dict[Future, CampaignItem] = {
+                        pool.submit(build_template, item.data, item.chemicals_mapping, item.organism_code): item
+                        for item in items.values()
+                    }
+                    pending: dict[Future, CampaignItem] = {}
+                    for future in as_completed(builds):
+                        item: CampaignItem = builds[future]
+                        try:
+                            content: bytes = future.result()
+                        except Exception as e:
+                            self.add_error(item.index, item.data, f"Unable to build the template: {e}")
+                            continue
+                        pending[uploads.submit(self.upload, item, content)] = item
+                    for future in as_completed(pending):
+                        item = pending[future]
+                        try:
+                            uploaded[item.index] = future.result()
+                        except Exception as e:
+                            self.add_error(item.index, item.data, str(e))
+            finally:
+                if self.pool is None:
+                    pool.shutdown()
+        self.__register(items, uploaded)
+        return [self.results[index] for index in range(len(self.designs))]
+
+    @staticmethod
+    def prepare(index: int, design: dict, requested: set[tuple[str, str]]) -> CampaignItem:
+        """ Check a design against the schema, the database and the other designs of the campaign.
+
+        :param index: The position of the design in the campaign.
+        :param design: The user input of the design.
+        :param requested: The (organism, batch) of the designs already accepted, updated with this design.
+        :return: The checked design.
+        """
+        timepoints: list[Timepoint] = build_timepoints_hours(design['timepoints'] or [])
+        creator: DataframeCreator = DataframeCreator(user_input=design)
+        batch: tuple[str, str] = (design['organism'], design['exposure_batch'])
+        if batch in requested:
+            raise ValueError(f'Batch {batch[1]} for {batch[0]} is requested more than once.')
+        if get_shipped_file(*batch):
+            raise ValueError(f'Batch {batch[1]} for {batch[0]} already exists.')
+        chemicals_mapping, organism_code = creator.get_references()
+        folder_id: str = get_organisation_gdrive_id(creator.partner)
+        requested.add(batch)
+        return CampaignItem(index, design, chemicals_mapping, organism_code, folder_id, timepoints)
+
+    @staticmethod
+    def upload(item: CampaignItem, content: bytes) -> dict:
+        """ Upload a built workbook to the Google Drive folder of the partner.
+
+        :param item: The design of the workbook.
+        :param content: The workbook.
+        :return: The response from the Google Drive API.
+        """
+        gdrive: GoogleDriveConnector = GoogleDriveConnector()
+        response: dict[str, str] | None = gdrive.upload_content(
+            directory_id=item.folder_id, content=BytesIO(content), title=item.filename
+        )
+        if not response:
+            raise Exception("An error occurred while uploading the file to the Google Drive.")
+        return response
+
+    def add_error(self, index: int, design: dict, error: str) -> None:
+        """ Store the result of a design that couldn't be created.
+
+        :param index: The position of the design in the campaign.
+        :param design: The user input of the design.
+        :param error: The error that prevented the creation.
+        """
+        self.results[index] = {
+            'index': index,
+            'organism': design.get('organism'),
+            'exposure_batch': design.get('exposure_batch'),
+            'created': False,
+            'message': error
+        }
+        LOGGER.error(f"Campaign design {index}: {error}")
+
+    def __register(self, items: dict[int, CampaignItem], uploaded: dict[int, dict]) -> None:
+        """ Insert the files and timepoints of the uploaded workbooks in a single transaction. The workbooks that
+        couldn't be registered are removed from the Google Drive.
+
+        :param items: The checked designs indexed by position.
+        :param uploaded: The responses from the Google Drive API indexed by position.
+        """
+        if not uploaded:
+            return
+        names: set[str] = {name for index in uploaded for name in items[index].chemicals}
+        chemicals: list[Chemical] = get_chemicals_from_name(list(names))
+        files: dict[int, File] = {}
+        failed: dict[int, str] = {}
+        for index in sorted(uploaded):
+            item: CampaignItem = items[index]
+            response: dict = uploaded[index]
+            try:
+                files[index] = File(gdrive_id=response['id'],
+                                    name=response['title'],
+                                    organisation_name=item.data['partner'],
+                                    user_id=self.user,
+                                    batch=item.data['exposure_batch'],
+                                    organism_name=item.data['organism'],
+                                    replicates=item.data['replicates4exposure'],
+                                    controls=item.data['replicates4control'],
+                                    blanks=item.data['replicates_blank'],
+                                    vehicle_name=item.data['vehicle'],
+                                    chemicals=[chemical for chemical in chemicals
+                                               if chemical.common_name in item.chemicals],
+                                    timepoints=item.timepoints,
+                                    start_date=item.data['start_date'],
+                                    end_date=item.data['end_date'])
+            except Exception as e:
+                failed[index] = f"Unable to register the file: {e}"
+        try:
+            for index in files:
+                session.add_all(items[index].timepoints)
+            session.add_all(list(files.values()))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            failed.update({index: f"Unable to register the file: {e}" for index in files})
+            files = {}
+        for index, file in files.items():
+            self.results[index] = {
+                'index': index,
+                'organism': items[index].data['organism'],
+                'exposure_batch': items[index].data['exposure_batch'],
+                'created': True,
+                'message': "File created successfully.",
+                'data': {**dict(file), 'file_url': uploaded[index]['alternateLink']}
+            }
+        if failed:
+            gdrive: GoogleDriveConnector = GoogleDriveConnector()
+            for index, error in failed.items():
+                self.add_error(index, items[index].data, error)
+                try:
+                    gdrive.delete_file(uploaded[index]['id'])
+                except Exception as e:
+                    LOGGER.error(f"Unable to remove the unregistered file {uploaded[index]['id']}: {e}")
+
+
+def build_template(data: dict, chemicals_mapping: dict[str, str], organism_code: str) -> bytes:
+    """ Build the workbook of a design. This function runs in the worker processes and doesn't use the database.
+
+    :param data: The user input of the design.
+    :param chemicals_mapping: The chemicals codes indexed by chemical name.
+    :param organism_code: The organism code.
+    :return: The content of the workbook.
+    """
+    creator: DataframeCreator = DataframeCreator(data, chemicals_mapping=chemicals_mapping, organism_code=organism_code)
+    return creator.save_buffer().getvalue()
+
+
+def summarize_campaign(results: list[dict]) -> dict[str, int]:
+    """ Count the designs by outcome.
+
+    :param results: The results returned by CampaignCreator.create().
+    :return: The number of designs, of created files and of failed designs.
+    """
+    created: int = sum(1 for result in results if result['created'])
+    return {'total': len(results), 'created': created, 'failed': len(results) - created}
@@ -2,7 +2,8 @@
 """
 from __future__ import annotations
 
-from typing import Generator
+from typing import BinaryIO, Callable, Generator, Iterator, Union
+from io import BytesIO
 from os import remove
 from datetime import datetime
 
@@ -12,17 +13,31 @@ from dateutil.parser import parse as parse_date
 
 from ptmd.const import INPUT_SCHEMA, EXPOSURE_SCHEMA
 from ptmd.database import get_allowed_organisms, get_organism_code, get_chemical_code_mapping
-from ptmd.lib.creator.dataframes import build_general_dataframe, build_sample_dataframe
-from ptmd.lib.excel import save_to_excel
+from ptmd.lib.creator.dataframes import (
+    build_general_dataframe, build_sample_dataframe, build_general_row, iter_sample_rows
+)
+from ptmd.lib.creator.design import build_design_dataframe, count_samples, DESIGN_THRESHOLD
+from ptmd.lib.creator.skeleton import template_cache
+from ptmd.lib.excel import save_to_excel, save_rows_to_excel
+
+
+STREAMING_THRESHOLD: int = 50000
 
 
 class DataframeCreator:
     """ Class to create the dataframes from the user input.
 
     :param user_input: the user input
+    :param chemicals_mapping: the chemicals codes indexed by chemical name, resolved from the database if not given
+    :param organism_code: the organism code, resolved from the database if not given
     """
 
-    def __init__(self, user_input: dict) -> None:
+    def __init__(
+            self,
+            user_input: dict,
+            chemicals_mapping: dict[str, str] | None = None,
+            organism_code: str | None = None
+    ) -> None:
         """ Constructor of the class. """
         self.__general_information_schema: dict = INPUT_SCHEMA
         self.__exposure_information_schema: dict = EXPOSURE_SCHEMA
@@ -43,6 +58,8 @@ class DataframeCreator:
         self.vehicle: str = user_input['vehicle']
         self.exposure_conditions: list[dict] = user_input['exposure']
         self.file_path: str = ''
+        self.__chemicals_mapping: dict[str, str] | None = chemicals_mapping
+        self.__organism_code: str | None = organism_code
 
     def validate(self) -> None:
         """ Validates the user input against the JSON SChema
@@ -83,30 +100,81 @@ class DataframeCreator:
                     array_of_unique_chemicals.append(chemical)
         return array_of_unique_chemicals
 
+    def get_references(self) -> tuple[dict[str, str], str]:
+        """ Resolve the chemicals codes and the organism code of the design, unless they were given to the constructor.
+
+        :return: The chemicals codes indexed by chemical name and the organism code.
+        """
+        if self.__chemicals_mapping is None or self.__organism_code is None:
+            if self.organism not in get_allowed_organisms():
+                raise ValueError(f"Organism {self.organism} not found in the database.")
+            self.__chemicals_mapping = get_chemical_code_mapping(self.get_array_of_unique_chemicals())
+            self.__organism_code = get_organism_code(self.organism)
+        return self.__chemicals_mapping, self.__organism_code
+
     def to_dataframe(self) -> tuple[DataFrame, DataFrame]:
-        """ Convert the object to a pandas DataFrame.
+        """ Convert the object to a pandas DataFrame. Designs of at least DESIGN_THRESHOLD samples are expanded with array
+        operations. The sample sheets are kept in the template cache, so that a template with the same design and another
+        exposure batch only needs the batch of its identifiers to be replaced.
 
         :return: The pandas DataFrame.
         """
-        if self.organism not in get_allowed_organisms():
-            raise ValueError(f"Organism {self.organism} not found in the database.")
-        chemical_map: dict = get_chemical_code_mapping(self.get_array_of_unique_chemicals())
-        organism_code: str = get_organism_code(self.organism)
-        sample_dataframe: DataFrame = build_sample_dataframe(harvester=self,
-                                                             organism_code=organism_code,
-                                                             chemicals_mapping=chemical_map)
+        chemical_map, organism_code = self.get_references()
+        samples: int = count_samples(self)
+        builder: Callable[..., DataFrame] = \
+            build_design_dataframe if samples >= DESIGN_THRESHOLD else build_sample_dataframe
+        sample_dataframe: DataFrame
+        if template_cache.accepts(samples):
+            sample_dataframe = template_cache.sample_dataframe(self, chemical_map, organism_code, builder)
+        else:
+            sample_dataframe = builder(harvester=self, organism_code=organism_code, chemicals_mapping=chemical_map)
 
         return sample_dataframe, build_general_dataframe(harvester=self)
 
-    def save_file(self, path: str) -> str:
+    def save_file(self, path: str, streaming: bool | None = None) -> str:
         """ Save the sample sheet to a file.
 
         :param path: The path to the file.
+        :param streaming: If True, the rows are generated and written one at a time without building the DataFrames,
+                          so that the memory used doesn't grow with the number of samples. By default, the rows are
+                          streamed for designs of at least STREAMING_THRESHOLD samples.
         :return: The path to the file the sample sheet was saved to.
         """
-        self.file_path = save_to_excel(dataframes=self.to_dataframe(), path=path)
+        self.write(path, streaming)
+        self.file_path = path
         return path
 
+    def save_buffer(self, streaming: bool | None = None) -> BytesIO:
+        """ Save the sample sheet to an in-memory buffer instead of a file.
+
+        :param streaming: If True, the rows are generated and written one at a time without building the DataFrames.
+        :return: The buffer holding the workbook, positioned at its start.
+        """
+        buffer: BytesIO = BytesIO()
+        self.write(buffer, streaming)
+        buffer.seek(0)
+        return buffer
+
+    def write(self, target: Union[str, BinaryIO], streaming: bool | None = None) -> None:
+        """ Write the sample sheet to a file path or a binary buffer.
+
+        :param target: The path to the file or the buffer.
+        :param streaming: If True, the rows are generated and written one at a time without building the DataFrames. By
+                          default, the rows are streamed for designs of at least STREAMING_THRESHOLD samples.
+        """
+        if streaming or (streaming is None and count_samples(self) >= STREAMING_THRESHOLD):
+            save_rows_to_excel(self.iter_rows(), [build_general_row(self)], path=target)
+        else:
+            save_to_excel(dataframes=self.to_dataframe(), path=target)
+
+    def iter_rows(self) -> Iterator[list]:
+        """ Generate the rows of the sample sheet one at a time.
+
+        :return: The rows, in the order of the sample sheet columns.
+        """
+        chemical_map, organism_code = self.get_references()
+        return iter_sample_rows(self, chemical_map, organism_code)
+
     def delete_file(self) -> None:
         """ Delete the sample sheet file. """
         if not self.file_path:
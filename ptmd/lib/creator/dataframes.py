@@ -1,6 +1,6 @@
 """ Module to created spreadsheets from the HarvesterInput, style and save them to disk.
 """
-from typing import Any
+from typing import Any, Iterator
 
 from pandas import DataFrame, Series, concat as pd_concat
 
@@ -19,7 +19,17 @@ def build_general_dataframe(harvester: Any) -> DataFrame:
     :return: A DataFrame with the general information of the harvester.
     """
     dataframe = DataFrame(columns=GENERAL_SHEET_COLUMNS)
-    series = Series([
+    series = Series(build_general_row(harvester), index=dataframe.columns)
+    return series.to_frame().T
+
+
+def build_general_row(harvester: Any) -> list:
+    """ Builds the row of the general information sheet.
+
+    :param harvester: The harvester to build the row from.
+    :return: The values, in the order of the general sheet columns.
+    """
+    return [
         harvester.partner,
         harvester.organism,
         harvester.exposure_batch,
@@ -30,39 +40,50 @@ def build_general_dataframe(harvester: Any) -> DataFrame:
         harvester.end_date.strftime('%Y-%m-%d'),
         harvester.timepoints,
         harvester.vehicle,
-    ], index=dataframe.columns)
-    return series.to_frame().T
+    ]
 
 
 def build_sample_dataframe(harvester: Any, chemicals_mapping: dict[str, str], organism_code: str) -> DataFrame:
-    """ Builds a DataFrame with the sample information of the harvester.
+    """ Builds a DataFrame with the sample information of the harvester. The rows are collected first and the DataFrame
+    is built once, so the time taken grows linearly with the number of samples.
 
     :param harvester: The harvester to build the DataFrame from.
     :param chemicals_mapping: A dictionary mapping chemicals names to ptox codes.
     :param organism_code: The organism code to use.
     :return: A DataFrame
     """
-    dataframe: DataFrame = DataFrame(columns=SAMPLE_SHEET_COLUMNS)
+    return build_rows_dataframe(list(iter_sample_rows(harvester, chemicals_mapping, organism_code)))
+
+
+def iter_sample_rows(harvester: Any, chemicals_mapping: dict[str, str], organism_code: str) -> Iterator[list]:
+    """ Generate the rows of the sample sheet one at a time: the exposure conditions, the controls, then the blanks.
+
+    :param harvester: The harvester to build the rows from.
+    :param chemicals_mapping: A dictionary mapping chemicals names to ptox codes.
+    :param organism_code: The organism code to use.
+    :return: The rows, in the order of the sample sheet columns.
+    """
     timepoint: str
     hash_id: str
-    series: Series
     timepoint_value: int
     timepoint_key: str
     number_of_timepoints: int = len(harvester.timepoints)
+    timepoints: list[tuple[int, str, int]] = []
+    for tp in range(1, number_of_timepoints + 1):
+        timepoint_key = f'TP{tp}'
+        timepoint = TIME_POINT_MAPPING[timepoint_key] if timepoint_key in TIME_POINT_MAPPING else 'X'
+        timepoints.append((tp, timepoint, harvester.timepoints[tp - 1]))
 
     # build the section containing the exposition conditions
     for exposure_condition in harvester.exposure_conditions:
         dose_code: str = DOSE_MAPPING[exposure_condition['dose']]
         for chemical in exposure_condition['chemicals']:
             chemical_code: str = chemicals_mapping[chemical]
-            for tp in range(1, number_of_timepoints + 1):
-                timepoint_key = f'TP{tp}'
-                timepoint = TIME_POINT_MAPPING[timepoint_key] if timepoint_key in TIME_POINT_MAPPING else 'X'
-                timepoint_value = harvester.timepoints[tp - 1]
+            for tp, timepoint, timepoint_value in timepoints:
                 for replicate in range(1, harvester.replicates4exposure + 1):
                     hash_id = '%s%s%s%s%s%s' % (organism_code, harvester.exposure_batch, chemical_code,
                                                 dose_code, timepoint, replicate)
-                    series = Series([
+                    yield [
                         hash_id,
                         BASE_IDENTIFIER + chemical_code,
                         *EMPTY_FIELDS_VALUES,
@@ -71,27 +92,18 @@ def build_sample_dataframe(harvester: Any, chemicals_mapping: dict[str, str], or
                         exposure_condition['dose'],
                         'TP%s' % tp,
                         timepoint_value
-                    ], index=dataframe.columns)
-                    dataframe = pd_concat([dataframe, series.to_frame().T], ignore_index=False, sort=False, copy=False)
+                    ]
 
     # build the section containing the control conditions
-    for tp in range(1, number_of_timepoints + 1):
-        timepoint_key = f'TP{tp}'
-        timepoint = TIME_POINT_MAPPING[timepoint_key] if timepoint_key in TIME_POINT_MAPPING else 'X'
-        timepoint_value = harvester.timepoints[tp - 1]
-        control_code = '999' if harvester.vehicle == 'DMSO' else '000'
+    control_code = '999' if harvester.vehicle == 'DMSO' else '000'
+    for tp, timepoint, timepoint_value in timepoints:
         for replicate in range(1, harvester.replicates4control + 1):
             hash_id = '%s%s%sZ%s%s' % (organism_code, harvester.exposure_batch, control_code, timepoint, replicate)
-            series = Series([hash_id, BASE_IDENTIFIER + control_code, *EMPTY_FIELDS_VALUES,
-                             replicate, "CONTROL (%s)" % harvester.vehicle, 0, 'TP%s' % tp, timepoint_value],
-                            index=dataframe.columns)
-            dataframe = pd_concat([dataframe, series.to_frame().T], ignore_index=False, sort=False, copy=False)
+            yield [hash_id, BASE_IDENTIFIER + control_code, *EMPTY_FIELDS_VALUES,
+                   replicate, "CONTROL (%s)" % harvester.vehicle, 0, 'TP%s' % tp, timepoint_value]
 
-    # add the blanks and return the dataframe
-    return add_blanks_to_sample_dataframe(dataframe,
-                                          harvester.replicates_blank,
-                                          organism_code,
-                                          harvester.exposure_batch)
+    # add the blanks
+    yield from build_blank_rows(harvester.replicates_blank, organism_code, harvester.exposure_batch)
 
 
 def add_blanks_to_sample_dataframe(
@@ -108,9 +120,34 @@ def add_blanks_to_sample_dataframe(
     :param exposure_batch: The exposure batch to use.
     :return: The sample dataframe with the blanks.
     """
-    for blank in range(1, replicate_blank + 1):
-        hash_id = '%s%s%sZS%s' % (organism_code, exposure_batch, BLANK_CODE, blank)
-        series = Series([hash_id, f'{BASE_IDENTIFIER}{BLANK_CODE}', *EMPTY_FIELDS_VALUES, blank, 'EXTRACTION BLANK', "0", 'TP0', 0],
-                        index=sample_df.columns)
-        sample_df = pd_concat([sample_df, series.to_frame().T], ignore_index=False, sort=False, copy=False)
-    return sample_df
+    blanks: list[list] = build_blank_rows(replicate_blank, organism_code, exposure_batch)
+    if not blanks:
+        return sample_df
+    return pd_concat([sample_df, build_rows_dataframe(blanks)], ignore_index=False, sort=False, copy=False)
+
+
+def build_blank_rows(replicate_blank: int, organism_code: str, exposure_batch: str) -> list[list]:
+    """ Build the rows of the extraction blanks.
+
+    :param replicate_blank: The number of blanks.
+    :param organism_code: The organism code to use.
+    :param exposure_batch: The exposure batch to use.
+    :return: The rows, in the order of the sample sheet columns.
+    """
+    return [
+        ['%s%s%sZS%s' % (organism_code, exposure_batch, BLANK_CODE, blank), f'{BASE_IDENTIFIER}{BLANK_CODE}',
+         *EMPTY_FIELDS_VALUES, blank, 'EXTRACTION BLANK', "0", 'TP0', 0]
+        for blank in range(1, replicate_blank + 1)
+    ]
+
+
+def build_rows_dataframe(rows: list[list]) -> DataFrame:
+    """ Build the sample DataFrame from its rows at once. The result is the same as appending the rows one at a time
+    as single row frames: every column holds objects and every row is labelled 0.
+
+    :param rows: The rows, in the order of the sample sheet columns.
+    :return: The sample DataFrame.
+    """
+    if not rows:
+        return DataFrame(columns=SAMPLE_SHEET_COLUMNS)
+    return DataFrame(rows, columns=SAMPLE_SHEET_COLUMNS, index=[0] * len(rows), dtype=object)
@@ -0,0 +1,152 @@
+""" Cache of the sample sheets of the study designs created most recently. Partners often create several templates with
+the same design and only change the exposure batch. The batch only appears in the sample identifiers, right after the
+organism code. The sample sheet is therefore cached by its design without the batch, and a new batch is applied by
+replacing these two characters in the identifier column.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+from pandas import DataFrame
+
+from ptmd.const import SAMPLE_SHEET_COLUMNS
+
+
+TEMPLATE_CACHE_SAMPLES: int = 100000
+
+
+class TemplateCache:
+    """ A least recently used cache of sample sheets indexed by study design, bounded by the total number of cached
+    samples rather than by the number of sample sheets, so that a few large designs can't exhaust the memory.
+
+    :param max_samples: The maximum total number of samples in the cached sample sheets.
+    """
+
+    def __init__(self, max_samples: int = TEMPLATE_CACHE_SAMPLES) -> None:
+        """ The cache constructor. """
+        self.max_samples: int = max_samples
+        self.hits: int = 0
+        self.misses: int = 0
+        self.samples: int = 0
+        self.__entries: OrderedDict[Hashable, tuple[str, DataFrame]] = OrderedDict()
+        self.__lock: Lock = Lock()
+
+    def accepts(self, samples: int) -> bool:
+        """ Whether a sample sheet of the given number of samples fits in the cache.
+
+        :param samples: The number of samples of the sample sheet.
+        :return: True if the sample sheet can be cached.
+        """
+        return samples <= self.max_samples
+
+    def sample_dataframe(
+            self,
+            harvester: Any,
+            chemicals_mapping: dict[str, str],
+            organism_code: str,
+            builder: Callable[..., DataFrame]
+    ) -> DataFrame:
+        """ Get the sample sheet of a design, building it only if no template with the same design is cached.
+
+        :param harvester: The harvester holding the design.
+        :param chemicals_mapping: A dictionary mapping chemicals names to ptox codes.
+        :param organism_code: The organism code to use.
+        :param builder: The function building the sample sheet when it isn't cached.
+        :return: The sample sheet, owned by the caller.
+        """
+        key: Hashable = skeleton_key(harvester, chemicals_mapping, organism_code)
+        with self.__lock:
+            entry: tuple[str, DataFrame] | None = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            return with_batch(entry[1], organism_code, entry[0], harvester.exposure_batch)
+        dataframe: DataFrame = builder(harvester=harvester, chemicals_mapping=chemicals_mapping,
+                                       organism_code=organism_code)
+        if not self.accepts(len(dataframe)):
+            return dataframe
+        with self.__lock:
+            previous: tuple[str, DataFrame] | None = self.__entries.pop(key, None)
+            if previous is not None:
+                self.samples -= len(previous[1])
+            self.__entries[key] = (harvester.exposure_batch, dataframe.copy())
+            self.samples += len(dataframe)
+            while self.samples > self.max_samples:
+                self.samples -= len(self.__entries.popitem(last=False)[1][1])
+        return dataframe
+
+    def clear(self) -> None:
+        """ Remove all the sample sheets and reset the counters. """
+        with self.__lock:
+            self.__entries.clear()
+            self.samples = 0
+            self.hits = 0
+            self.misses = 0
+
+    def inspect(self) -> dict:
+        """ Describe the content of the cache.
+
+        :return: The cache settings and counters.
+        """
+        with self.__lock:
+            lookups: int = self.hits + self.misses
+            return {
+                'size': len(self.__entries),
+                'samples': self.samples,
+                'max_samples': self.max_samples,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None
+            }
+
+    def __len__(self) -> int:
+        """ The number of cached sample sheets. """
+        return len(self.__entries)
+
+
+def skeleton_key(harvester: Any, chemicals_mapping: dict[str, str], organism_code: str) -> Hashable:
+    """ Build the key of a design: every input of the sample sheet except the exposure batch.
+
+    :param harvester: The harvester holding the design.
+    :param chemicals_mapping: A dictionary mapping chemicals names to ptox codes.
+    :param organism_code: The organism code to use.
+    :return: The key.
+    """
+    return (
+        organism_code,
+        len(harvester.exposure_batch),
+        harvester.vehicle,
+        tuple(harvester.timepoints),
+        harvester.replicates4exposure,
+        harvester.replicates4control,
+        harvester.replicates_blank,
+        tuple(
+            (condition['dose'], tuple((chemical, chemicals_mapping[chemical]) for chemical in condition['chemicals']))
+            for condition in harvester.exposure_conditions
+        )
+    )
+
+
+def with_batch(skeleton: DataFrame, organism_code: str, skeleton_batch: str, exposure_batch: str) -> DataFrame:
+    """ Copy a cached sample sheet and apply another exposure batch to its identifiers.
+
+    :param skeleton: The cached sample sheet.
+    :param organism_code: The organism code starting the identifiers.
+    :param skeleton_batch: The exposure batch of the cached sample sheet.
+    :param exposure_batch: The exposure batch to apply.
+    :return: The sample sheet of the exposure batch.
+    """
+    dataframe: DataFrame = skeleton.copy()
+    if skeleton_batch != exposure_batch and len(dataframe):
+        identifiers: str = SAMPLE_SHEET_COLUMNS[0]
+        start: int = len(organism_code) + len(skeleton_batch)
+        dataframe[identifiers] = (organism_code + exposure_batch) + skeleton[identifiers].str.slice(start)
+    return dataframe
+
+
+template_cache: TemplateCache = TemplateCache()
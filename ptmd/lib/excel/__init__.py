@@ -1,3 +1,4 @@
 """ A module to handle saving and styling dataframes into excel files.
 """
-from .save import save_to_excel
+from .save import save_to_excel, save_rows_to_excel
+from .rewrite import replace_batch
@@ -1,7 +1,12 @@
 """ Excel submodule containing ExcelWriter formats.
 """
+from typing import Union
+
 from pandas import ExcelWriter
-from xlsxwriter.workbook import Format
+from xlsxwriter.workbook import Format, Workbook
+
+
+Writer = Union[ExcelWriter, Workbook]
 
 
 def set_common_formats(formatter: Format) -> Format:
@@ -15,13 +20,13 @@ def set_common_formats(formatter: Format) -> Format:
     return formatter
 
 
-def get_header_format(writer: ExcelWriter) -> Format:
+def get_header_format(writer: Writer) -> Format:
     """ Get the sample formatter.
 
-    :param writer: The writer to use.
+    :param writer: The pandas writer or the xlsxwriter workbook to use.
     :return: The sample formatter.
     """
-    formatter: Format = writer.book.add_format()
+    formatter: Format = get_workbook(writer).add_format()
     formatter = set_common_formats(formatter)
     formatter.set_bg_color('#008080')
     formatter.set_color('white')
@@ -32,13 +37,13 @@ def get_header_format(writer: ExcelWriter) -> Format:
     return formatter
 
 
-def get_empty_cells_format(writer: ExcelWriter) -> Format:
+def get_empty_cells_format(writer: Writer) -> Format:
     """ Get the cell formatter.
 
-    :param writer: The writer to use.
+    :param writer: The pandas writer or the xlsxwriter workbook to use.
     :return: The cell formatter.
     """
-    formatter: Format = writer.book.add_format()
+    formatter: Format = get_workbook(writer).add_format()
     formatter = set_common_formats(formatter)
     formatter.set_font_size(12)
     formatter.set_border(1)
@@ -46,16 +51,25 @@ def get_empty_cells_format(writer: ExcelWriter) -> Format:
     return formatter
 
 
-def get_extra_cells_format(writer: ExcelWriter) -> Format:
+def get_extra_cells_format(writer: Writer) -> Format:
     """ Get the cell formatter.
 
-    :param writer: The writer to use.
+    :param writer: The pandas writer or the xlsxwriter workbook to use.
     :return: The cell formatter.
     """
-    formatter: Format = writer.book.add_format()
+    formatter: Format = get_workbook(writer).add_format()
     formatter = set_common_formats(formatter)
     formatter.set_font_size(12)
     formatter.set_border(1)
     formatter.set_bg_color('#CCCCCC')
     formatter.set_locked(True)
     return formatter
+
+
+def get_workbook(writer: Writer) -> Workbook:
+    """ Get the xlsxwriter workbook of a writer.
+
+    :param writer: The pandas writer or the xlsxwriter workbook.
+    :return: The workbook.
+    """
+    return writer.book if isinstance(writer, ExcelWriter) else writer
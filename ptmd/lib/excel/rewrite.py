@@ -0,0 +1,57 @@
+""" Excel submodule that edits saved workbooks in place. Only the cells that change are rewritten, so the formatting
+and the content entered by the users are kept as they are.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from openpyxl import load_workbook
+from openpyxl.workbook.workbook import Workbook
+from pandas import Series
+
+from ptmd.const import PTX_ID_LABEL, BATCH_LABEL
+
+
+GENERAL_SHEET_NAME: str = 'General Information'
+SAMPLE_SHEET_NAME: str = 'Exposure information'
+BATCH_POSITION: slice = slice(1, 3)
+
+
+def replace_batch(path: str, batch: str) -> tuple[str, str]:
+    """ Change the exposure batch of a workbook. The workbook is opened once, the 'exposure_batch' cell of the general
+    information and the batch characters of every sample identifier are replaced, and the workbook is saved.
+
+    :param path: The path to the workbook.
+    :param batch: The new batch.
+    :return: The previous batch and the partner of the workbook.
+    """
+    workbook: Workbook = load_workbook(path)
+    try:
+        general: Any = workbook[GENERAL_SHEET_NAME]
+        general_columns: dict[str, int] = get_columns(general)
+        batch_cell: Any = general.cell(row=2, column=general_columns[BATCH_LABEL])
+        old_batch: str = batch_cell.value
+        partner: str = general.cell(row=2, column=general_columns['partner_id']).value
+        batch_cell.value = batch
+
+        samples: Any = workbook[SAMPLE_SHEET_NAME]
+        column: int = get_columns(samples)[PTX_ID_LABEL]
+        cells: list = [row[0] for row in samples.iter_rows(min_row=2, min_col=column, max_col=column)]
+        identifiers: Series = Series([cell.value for cell in cells], dtype=object)
+        renamed: list = identifiers.str.slice_replace(BATCH_POSITION.start, BATCH_POSITION.stop, batch).tolist()
+        for cell, identifier in zip(cells, renamed):
+            if isinstance(identifier, str):
+                cell.value = identifier
+        workbook.save(path)
+    finally:
+        workbook.close()
+    return old_batch, partner
+
+
+def get_columns(worksheet: Any) -> dict[str, int]:
+    """ Get the position of the columns of a worksheet from its header.
+
+    :param worksheet: The worksheet.
+    :return: The 1-based column numbers indexed by column name.
+    """
+    return {str(cell.value): cell.column for cell in worksheet[1] if cell.value is not None}
@@ -1,18 +1,21 @@
-""" Excel submodule that contains the save function
+""" Excel submodule that contains the save functions
 """
+from typing import Any, BinaryIO, Callable, Iterable, Sequence, Union
 
+from numpy import generic
 from pandas import DataFrame, ExcelWriter
 from pandas.io.formats.excel import ExcelFormatter
+from xlsxwriter.workbook import Workbook
 
 from ptmd.const import GENERAL_SHEET_COLUMNS, SAMPLE_SHEET_COLUMNS
-from .styles import style_sheets
+from .styles import style_sheets, style_sample_worksheet, style_general_worksheet
 
 
-def save_to_excel(dataframes: tuple[DataFrame, DataFrame], path: str) -> str:
+def save_to_excel(dataframes: tuple[DataFrame, DataFrame], path: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
     """ Save the dataframes to an Excel file.
 
     :param dataframes: The dataframes to save.
-    :param path: The path to save the file to.
+    :param path: The path to save the file to, or a binary buffer.
     """
     ExcelFormatter.header_style = None
     general_df: DataFrame = dataframes[1]
@@ -23,3 +26,50 @@ def save_to_excel(dataframes: tuple[DataFrame, DataFrame], path: str) -> str:
         general_df.to_excel(writer, sheet_name='General Information', columns=GENERAL_SHEET_COLUMNS, index=False)
         style_sheets(writer)
     return path
+
+
+def save_rows_to_excel(
+        sample_rows: Iterable[Sequence],
+        general_rows: Iterable[Sequence],
+        path: Union[str, BinaryIO]
+) -> Union[str, BinaryIO]:
+    """ Write rows straight to an Excel file, without building DataFrames. The workbook is opened in constant memory
+    mode: each row is flushed to disk once the next one is written, so the rows can be generated on the fly and the
+    memory used doesn't depend on the number of rows. The sheets are styled like the ones written by save_to_excel.
+
+    :param sample_rows: The rows of the sample sheet, in the order of the sample sheet columns.
+    :param general_rows: The rows of the general information sheet, in the order of the general sheet columns.
+    :param path: The path to save the file to, or a binary buffer.
+    :return: The path to the saved file or the buffer.
+    """
+    workbook: Workbook = Workbook(path, {'constant_memory': True})
+    sheets: list[tuple[str, list[str], Iterable[Sequence], Callable[[Any, Workbook], None]]] = [
+        ('Exposure information', SAMPLE_SHEET_COLUMNS, sample_rows, style_sample_worksheet),
+        ('General Information', GENERAL_SHEET_COLUMNS, general_rows, style_general_worksheet)
+    ]
+    try:
+        for sheet_name, columns, rows, style in sheets:
+            worksheet: Any = workbook.add_worksheet(sheet_name)
+            style(worksheet, workbook)
+            worksheet.write_row(0, 0, columns)
+            for row_index, row in enumerate(rows, start=1):
+                worksheet.write_row(row_index, 0, [to_cell_value(value) for value in row])
+    finally:
+        workbook.close()
+    return path
+
+
+def to_cell_value(value: Any) -> Any:
+    """ Convert a value the way pandas does before writing it: missing values are written as empty cells and values
+    other than strings, numbers and booleans as their string representation.
+
+    :param value: The value to convert.
+    :return: The value to write.
+    """
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    if isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, generic):
+        return value.item()
+    return str(value)
@@ -5,7 +5,7 @@ from typing import Any
 
 from pandas import ExcelWriter
 from xlsxwriter.workbook import Format
-from .formats import get_header_format, get_extra_cells_format, get_empty_cells_format
+from .formats import Writer, get_header_format, get_extra_cells_format, get_empty_cells_format
 
 
 def style_sheets(writer: ExcelWriter) -> None:
@@ -22,10 +22,19 @@ def style_sample_sheet(writer: ExcelWriter) -> None:
 
     :param writer: The writer to use.
     """
+    style_sample_worksheet(writer.sheets['Exposure information'], writer)
+
+
+def style_sample_worksheet(worksheet: Any, writer: Writer) -> None:
+    """ Style a sample worksheet. The header row format must be set before the first row is written when the workbook
+    is in constant memory mode.
+
+    :param worksheet: The worksheet to style.
+    :param writer: The pandas writer or the xlsxwriter workbook creating the formats.
+    """
     header_format: Format = get_header_format(writer)
     extra_cells_format: Format = get_extra_cells_format(writer)
     empty_cells_format: Format = get_empty_cells_format(writer)
-    worksheet: Any = writer.sheets['Exposure information']
     worksheet.protect()
 
     worksheet.set_row(0, 50, cell_format=header_format)
@@ -51,8 +60,16 @@ def style_general_sheet(writer: ExcelWriter) -> None:
 
     :param writer: The writer to use.
     """
+    style_general_worksheet(writer.sheets['General Information'], writer)
+
+
+def style_general_worksheet(worksheet: Any, writer: Writer) -> None:
+    """ Style a general information worksheet.
+
+    :param worksheet: The worksheet to style.
+    :param writer: The pandas writer or the xlsxwriter workbook creating the formats.
+    """
     formatter: Format = get_header_format(writer)
     extra_cells_format: Format = get_extra_cells_format(writer)
-    worksheet: Any = writer.sheets['General Information']
     worksheet.set_row(0, 50, cell_format=formatter)
     worksheet.set_column('A:J', 25, cell_format=extra_cells_format)
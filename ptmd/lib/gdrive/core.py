@@ -4,6 +4,7 @@ and upload the files to the drive.
 from __future__ import annotations
 
 from os import path
+from typing import BinaryIO, Callable
 from uuid import uuid4
 
 from pydrive2.auth import GoogleAuth
@@ -110,6 +111,38 @@ class GoogleDriveConnector:
         :param file_path: The path to the file to be uploaded.
         :param title: The title of the file to be uploaded.
         """
+        return self.__upload(directory_id, title, lambda file: file.SetContentFile(file_path))
+
+    def upload_content(self, directory_id: str, content: BinaryIO, title: str) -> dict[str, str] | None:
+        """ This function will upload in-memory content, such as a BytesIO buffer, to the Google Drive without writing
+        it to disk. The content is read from its start and closed once uploaded.
+
+        :param directory_id: The partner organisation Google Drive folder identifier.
+        :param content: The binary content to be uploaded.
+        :param title: The title of the file to be uploaded.
+        """
+        def set_content(file: GoogleDriveFile) -> None:
+            """ Attach the content to the Google Drive file.
+
+            :param file: The Google Drive file.
+            """
+            content.seek(0)
+            file.content = content
+
+        return self.__upload(directory_id, title, set_content)
+
+    def __upload(
+            self,
+            directory_id: str,
+            title: str,
+            set_content: Callable[[GoogleDriveFile], None]
+    ) -> dict[str, str] | None:
+        """ Create a spreadsheet in the Google Drive, share it and return its information.
+
+        :param directory_id: The partner organisation Google Drive folder identifier.
+        :param title: The title of the file to be uploaded.
+        :param set_content: The function attaching the content to the new Google Drive file.
+        """
         file_metadata = {
             'title': title,
             'mimeType': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
@@ -117,7 +150,7 @@ class GoogleDriveConnector:
         }
         if self.google_drive:
             file: GoogleDriveFile = self.google_drive.CreateFile(metadata=file_metadata)
-            file.SetContentFile(file_path)
+            set_content(file)
             file.Upload()
             file.content.close()
             file.InsertPermission({'type': 'anyone', 'role': 'writer'})
@@ -149,6 +182,16 @@ class GoogleDriveConnector:
         file.GetContentFile(file_path)
         return file_path
 
+    def get_checksum(self, file_id: str | int) -> str | None:
+        """ This function will return the MD5 checksum of the file content, without downloading it.
+
+        :param file_id: The file identifier.
+        :return: The checksum or None for files without binary content, like native Google Sheets.
+        """
+        file = self.google_drive.CreateFile({'id': file_id})
+        file.FetchMetadata(fields='md5Checksum')
+        return file.get('md5Checksum')
+
     def get_filename(self, file_id: str | int) -> str | None:
         """ This function will return the file name.
 
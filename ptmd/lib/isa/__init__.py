@@ -1,6 +1,7 @@
 """ Module for converting a file to ISA format.
 """
 from ptmd.database.models import File
+from ptmd.database.queries import isa_loading_options
 
 from .core import Batch2ISA
 
@@ -11,7 +12,7 @@ def convert_file_to_isa(file_id: int) -> list[dict]:
     :param file_id: The id of the file to convert.
     :return: A list of dictionaries containing the ISA investigations.
     """
-    file: File = File.query.filter(File.file_id == file_id).first()
+    file: File = File.query.options(*isa_loading_options()).filter(File.file_id == file_id).first()
     if not file:
         raise FileNotFoundError(f"File with id {file_id} not found")
     if not file.received:
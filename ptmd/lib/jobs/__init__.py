@@ -0,0 +1,9 @@
+""" This module provides a local queue running background jobs (like the validation of files) with pluggable storage
+backends keeping track of their status.
+"""
+from .store import (
+    JobStore, MemoryJobStore, SQLiteJobStore,
+    JOB_QUEUED, JOB_DOWNLOADING, JOB_VALIDATING, JOB_DONE, JOB_FAILED, JOB_STATES, JOB_FINISHED_STATES,
+    JOB_KIND_VALIDATION, JOB_KIND_BULK_VALIDATION
+)
+from .queue import JobQueue
@@ -0,0 +1,134 @@
+""" A queue running jobs in a local pool of worker threads. Each job runs inside an application context so that it can
+use the database, and reports its progress to the job store. The finished jobs are removed from the store once they are
+older than the retention time, when new jobs are submitted. The jobs left unfinished in the store by a previous run of
+the application are marked as failed when the queue is created, since nothing will ever run them.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable
+from uuid import uuid4
+
+from flask import Flask
+
+from ptmd.logger import LOGGER
+from .store import JobStore, JOB_DONE, JOB_FAILED, JOB_KIND_VALIDATION, now
+
+
+Runner = Callable[..., 'tuple[dict, int]']
+INTERRUPTED_JOB_REASON: str = 'The job was interrupted by a restart of the application. Please submit it again.'
+
+
+class JobQueue:
+    """ Submit jobs to a pool of worker threads and keep track of their status.
+
+    :param app: The Flask application providing the context the jobs run in.
+    :param store: The store keeping track of the jobs.
+    :param runner: The function executing a job. It receives the file id, a function to call with the new status
+                   whenever the job progresses, the items of the payload and the options given on submission as keyword
+                   arguments, and returns the result and the HTTP code of the job.
+    :param max_workers: The maximum number of jobs running at the same time.
+    :param retention: The number of seconds the finished jobs are kept in the store. They are kept forever if None.
+    :param kind: The kind of the jobs of the queue.
+    """
+
+    def __init__(
+            self,
+            app: Flask,
+            store: JobStore,
+            runner: Runner,
+            max_workers: int = 4,
+            retention: float | None = None,
+            kind: str = JOB_KIND_VALIDATION
+    ) -> None:
+        """ The queue constructor. """
+        self.app: Flask = app
+        self.store: JobStore = store
+        self.runner: Runner = runner
+        self.max_workers: int = max_workers
+        self.retention: float | None = retention
+        self.kind: str = kind
+        self.__executor: ThreadPoolExecutor | None = None
+        self.__lock: Lock = Lock()
+        self.fail_interrupted()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """ The pool of worker threads, started on first use. """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ptmd-job')
+            return self.__executor
+
+    def submit(
+            self, file_id: int | str | None, owner: int | None = None, payload: dict | None = None, **options: Any
+    ) -> dict:
+        """ Queue a new job, after removing the finished jobs older than the retention time.
+
+        :param file_id: The id of the file to process, None for the jobs processing several files.
+        :param owner: The id of the user submitting the job.
+        :param payload: The description of the work of the job, stored with the job and passed to the runner.
+        :param options: Additional keyword arguments passed to the runner.
+        :return: The queued job.
+        """
+        self.prune()
+        job: dict = self.store.create(uuid4().hex, file_id, owner, kind=self.kind, payload=payload)
+        self.executor.submit(self.run, job['job_id'], file_id, **(payload or {}), **options)
+        return job
+
+    def run(self, job_id: str, file_id: int | str | None, **options: Any) -> None:
+        """ Run a job and store its result. Unexpected errors mark the job as failed.
+
+        :param job_id: The job identifier.
+        :param file_id: The id of the file to process.
+        :param options: The items of the payload and the additional keyword arguments passed to the runner.
+        """
+        with self.app.app_context():
+            try:
+                result, code = self.runner(file_id, lambda status: self.store.update(job_id, status), **options)
+                self.store.update(job_id, JOB_DONE, result, code)
+            except Exception as e:
+                LOGGER.error(f"Job {job_id} ({self.kind}) failed: {e}")
+                self.store.update(job_id, JOB_FAILED, {'errors': str(e)}, 500)
+
+    def fail_interrupted(self) -> int:
+        """ Mark as failed the jobs of the queue's kind left queued or running in the store by a previous run.
+
+        :return: The number of failed jobs.
+        """
+        count: int = self.store.fail_unfinished(self.kind, INTERRUPTED_JOB_REASON)
+        if count:
+            LOGGER.warning(f"Marked {count} interrupted {self.kind} jobs as failed.")
+        return count
+
+    def get(self, job_id: str) -> dict | None:
+        """ Get a job.
+
+        :param job_id: The job identifier.
+        :return: The job or None if it doesn't exist.
+        """
+        return self.store.get(job_id)
+
+    def prune(self) -> int:
+        """ Remove the jobs finished for longer than the retention time.
+
+        :return: The number of removed jobs.
+        """
+        if self.retention is None:
+            return 0
+        count: int = self.store.prune(now(-self.retention))
+        if count:
+            LOGGER.info(f"Removed {count} finished jobs older than {self.retention} seconds.")
+        return count
+
+    def shutdown(self, wait: bool = True) -> None:
+        """ Stop the worker threads. The pool is restarted if new jobs are submitted.
+
+        :param wait: Whether to wait for the running and queued jobs to finish.
+        """
+        with self.__lock:
+            executor: ThreadPoolExecutor | None = self.__executor
+            self.__executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
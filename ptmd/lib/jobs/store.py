@@ -0,0 +1,377 @@
+""" Storage backends for the background jobs. A job is a plain dictionary holding its identifier, its kind, the file it
+concerns (for the jobs on a single file) or the JSON payload describing its work, its current status and, once finished,
+the result and HTTP code returned to the client.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from json import dumps, loads
+from sqlite3 import connect, Connection, Row
+from threading import Lock
+
+
+JOB_QUEUED: str = 'queued'
+JOB_DOWNLOADING: str = 'downloading'
+JOB_VALIDATING: str = 'validating'
+JOB_DONE: str = 'done'
+JOB_FAILED: str = 'failed'
+JOB_STATES: tuple[str, ...] = (JOB_QUEUED, JOB_DOWNLOADING, JOB_VALIDATING, JOB_DONE, JOB_FAILED)
+JOB_FINISHED_STATES: tuple[str, ...] = (JOB_DONE, JOB_FAILED)
+JOB_KIND_VALIDATION: str = 'validation'
+JOB_KIND_BULK_VALIDATION: str = 'bulk_validation'
+
+JOB_TABLE_COLUMNS: str = (
+    "job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, file_id TEXT, payload TEXT, owner INTEGER, status TEXT NOT NULL, "
+    "result TEXT, code INTEGER, created_at TEXT NOT NULL, updated_at TEXT NOT NULL"
+)
+
+
+class JobStore(ABC):
+    """ Interface of the job storage backends. """
+
+    @abstractmethod
+    def create(
+            self,
+            job_id: str,
+            file_id: int | str | None,
+            owner: int | None = None,
+            kind: str = JOB_KIND_VALIDATION,
+            payload: dict | None = None
+    ) -> dict:
+        """ Register a new queued job.
+
+        :param job_id: The job identifier.
+        :param file_id: The id of the file concerned by the job, None for the jobs concerning several files.
+        :param owner: The id of the user who submitted the job.
+        :param kind: The kind of job.
+        :param payload: The JSON serializable description of the work of the job.
+        :return: The job.
+        """
+
+    @abstractmethod
+    def update(self, job_id: str, status: str, result: dict | None = None, code: int | None = None) -> None:
+        """ Change the status of a job and optionally store its result.
+
+        :param job_id: The job identifier.
+        :param status: The new status.
+        :param result: The result of the job.
+        :param code: The HTTP code associated to the result.
+        """
+
+    @abstractmethod
+    def get(self, job_id: str) -> dict | None:
+        """ Get a job.
+
+        :param job_id: The job identifier.
+        :return: The job or None if it doesn't exist.
+        """
+
+    @abstractmethod
+    def prune(self, older_than: str) -> int:
+        """ Remove the finished jobs last updated before the given time.
+
+        :param older_than: The time in ISO format before which the finished jobs are removed.
+        :return: The number of removed jobs.
+        """
+
+    @abstractmethod
+    def fail_unfinished(self, kind: str, reason: str) -> int:
+        """ Mark the queued and running jobs of a kind as failed, with the reason as the error of their result.
+
+        :param kind: The kind of the jobs to fail.
+        :param reason: Why the jobs failed.
+        :return: The number of failed jobs.
+        """
+
+
+class MemoryJobStore(JobStore):
+    """ Job store keeping the jobs in a dictionary. The jobs are only visible to the current process. """
+
+    def __init__(self) -> None:
+        """ The store constructor. """
+        self.__jobs: dict[str, dict] = {}
+        self.__lock: Lock = Lock()
+
+    def create(
+            self,
+            job_id: str,
+            file_id: int | str | None,
+            owner: int | None = None,
+            kind: str = JOB_KIND_VALIDATION,
+            payload: dict | None = None
+    ) -> dict:
+        """ Register a new queued job.
+
+        :param job_id: The job identifier.
+        :param file_id: The id of the file concerned by the job, None for the jobs concerning several files.
+        :param owner: The id of the user who submitted the job.
+        :param kind: The kind of job.
+        :param payload: The JSON serializable description of the work of the job.
+        :return: The job.
+        """
+        job: dict = new_job(job_id, file_id, owner, kind, payload)
+        with self.__lock:
+            self.__jobs[job_id] = job
+        return dict(job)
+
+    def update(self, job_id: str, status: str, result: dict | None = None, code: int | None = None) -> None:
+        """ Change the status of a job and optionally store its result.
+
+        :param job_id: The job identifier.
+        :param status: The new status.
+        :param result: The result of the job.
+        :param code: The HTTP code associated to the result.
+        """
+        check_status(status)
+        with self.__lock:
+            job: dict = self.__jobs[job_id]
+            job['status'] = status
+            job['updated_at'] = now()
+            if result is not None:
+                job['result'] = result
+                job['code'] = code
+
+    def get(self, job_id: str) -> dict | None:
+        """ Get a job.
+
+        :param job_id: The job identifier.
+        :return: The job or None if it doesn't exist.
+        """
+        with self.__lock:
+            job: dict | None = self.__jobs.get(job_id)
+            return dict(job) if job else None
+
+    def prune(self, older_than: str) -> int:
+        """ Remove the finished jobs last updated before the given time.
+
+        :param older_than: The time in ISO format before which the finished jobs are removed.
+        :return: The number of removed jobs.
+        """
+        with self.__lock:
+            expired: list[str] = [
+                job_id for job_id, job in self.__jobs.items()
+                if job['status'] in JOB_FINISHED_STATES and job['updated_at'] < older_than
+            ]
+            for job_id in expired:
+                del self.__jobs[job_id]
+        return len(expired)
+
+    def fail_unfinished(self, kind: str, reason: str) -> int:
+        """ Mark the queued and running jobs of a kind as failed, with the reason as the error of their result.
+
+        :param kind: The kind of the jobs to fail.
+        :param reason: Why the jobs failed.
+        :return: The number of failed jobs.
+        """
+        with self.__lock:
+            unfinished: list[dict] = [
+                job for job in self.__jobs.values() if job['kind'] == kind and job['status'] not in JOB_FINISHED_STATES
+            ]
+            for job in unfinished:
+                job.update(status=JOB_FAILED, result={'errors': reason}, code=500, updated_at=now())
+        return len(unfinished)
+
+
+class SQLiteJobStore(JobStore):
+    """ Job store backed by a SQLite database so that the jobs survive a restart of the process running them. The jobs
+    are run by the queues of a single process: the database isn't meant to be shared by the queues of several
+    processes, which would mark each other's running jobs as failed when they start. The connection is opened on first
+    use.
+
+    :param filepath: The path to the database file or ':memory:'.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        """ The store constructor. """
+        self.filepath: str = filepath
+        self.__connection: Connection | None = None
+        self.__lock: Lock = Lock()
+
+    @property
+    def connection(self) -> Connection:
+        """ The connection to the database. The jobs table is created, or migrated, when the connection is opened. """
+        if self.__connection is None:
+            connection: Connection = connect(self.filepath, check_same_thread=False)
+            connection.row_factory = Row
+            connection.execute(f"CREATE TABLE IF NOT EXISTS validation_job ({JOB_TABLE_COLUMNS})")
+            columns: set[str] = {row['name'] for row in connection.execute("PRAGMA table_info(validation_job)")}
+            if 'kind' not in columns:
+                migrate_job_table(connection)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_validation_job_updated_at ON validation_job (updated_at)"
+            )
+            connection.commit()
+            self.__connection = connection
+        return self.__connection
+
+    def create(
+            self,
+            job_id: str,
+            file_id: int | str | None,
+            owner: int | None = None,
+            kind: str = JOB_KIND_VALIDATION,
+            payload: dict | None = None
+    ) -> dict:
+        """ Register a new queued job.
+
+        :param job_id: The job identifier.
+        :param file_id: The id of the file concerned by the job, None for the jobs concerning several files.
+        :param owner: The id of the user who submitted the job.
+        :param kind: The kind of job.
+        :param payload: The JSON serializable description of the work of the job.
+        :return: The job.
+        """
+        job: dict = new_job(job_id, file_id, owner, kind, payload)
+        with self.__lock:
+            self.connection.execute(
+                "INSERT INTO validation_job (job_id, kind, file_id, payload, owner, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, job['file_id'], dumps(payload) if payload is not None else None, owner, job['status'],
+                 job['created_at'], job['updated_at'])
+            )
+            self.connection.commit()
+        return job
+
+    def update(self, job_id: str, status: str, result: dict | None = None, code: int | None = None) -> None:
+        """ Change the status of a job and optionally store its result.
+
+        :param job_id: The job identifier.
+        :param status: The new status.
+        :param result: The result of the job.
+        :param code: The HTTP code associated to the result.
+        """
+        check_status(status)
+        with self.__lock:
+            if result is None:
+                self.connection.execute(
+                    "UPDATE validation_job SET status = ?, updated_at = ? WHERE job_id = ?", (status, now(), job_id)
+                )
+            else:
+                self.connection.execute(
+                    "UPDATE validation_job SET status = ?, result = ?, code = ?, updated_at = ? WHERE job_id = ?",
+                    (status, dumps(result), code, now(), job_id)
+                )
+            self.connection.commit()
+
+    def get(self, job_id: str) -> dict | None:
+        """ Get a job.
+
+        :param job_id: The job identifier.
+        :return: The job or None if it doesn't exist.
+        """
+        with self.__lock:
+            row: Row | None = self.connection.execute(
+                "SELECT * FROM validation_job WHERE job_id = ?", (job_id, )
+            ).fetchone()
+        if row is None:
+            return None
+        job: dict = dict(row)
+        for key in ('payload', 'result'):
+            job[key] = loads(job[key]) if job[key] is not None else None
+        return job
+
+    def prune(self, older_than: str) -> int:
+        """ Remove the finished jobs last updated before the given time.
+
+        :param older_than: The time in ISO format before which the finished jobs are removed.
+        :return: The number of removed jobs.
+        """
+        with self.__lock:
+            count: int = self.connection.execute(
+                f"DELETE FROM validation_job WHERE updated_at < ? AND status IN "
+                f"({', '.join('?' for _ in JOB_FINISHED_STATES)})",
+                (older_than, *JOB_FINISHED_STATES)
+            ).rowcount
+            self.connection.commit()
+        return count
+
+    def fail_unfinished(self, kind: str, reason: str) -> int:
+        """ Mark the queued and running jobs of a kind as failed, with the reason as the error of their result.
+
+        :param kind: The kind of the jobs to fail.
+        :param reason: Why the jobs failed.
+        :return: The number of failed jobs.
+        """
+        with self.__lock:
+            count: int = self.connection.execute(
+                f"UPDATE validation_job SET status = ?, result = ?, code = ?, updated_at = ? WHERE kind = ? AND status "
+                f"NOT IN ({', '.join('?' for _ in JOB_FINISHED_STATES)})",
+                (JOB_FAILED, dumps({'errors': reason}), 500, now(), kind, *JOB_FINISHED_STATES)
+            ).rowcount
+            self.connection.commit()
+        return count
+
+    def close(self) -> None:
+        """ Close the connection to the database. """
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+
+def migrate_job_table(connection: Connection) -> None:
+    """ Migrate a jobs table created before the jobs had a kind and a payload. Its file_id column can't be made nullable
+    in place, so the table is rebuilt: the jobs whose file_id holds a comma separated list of ids become bulk validation
+    jobs with the ids in their payload, the others become validation jobs.
+
+    :param connection: The connection to the database.
+    """
+    connection.execute("ALTER TABLE validation_job RENAME TO validation_job_old")
+    connection.execute(f"CREATE TABLE validation_job ({JOB_TABLE_COLUMNS})")
+    connection.execute(
+        "INSERT INTO validation_job "
+        "(job_id, kind, file_id, payload, owner, status, result, code, created_at, updated_at) "
+        "SELECT job_id, "
+        "CASE WHEN instr(file_id, ',') THEN ? ELSE ? END, "
+        "CASE WHEN instr(file_id, ',') THEN NULL ELSE file_id END, "
+        "CASE WHEN instr(file_id, ',') THEN '{\"file_ids\": [' || file_id || ']}' ELSE NULL END, "
+        "owner, status, result, code, created_at, updated_at FROM validation_job_old",
+        (JOB_KIND_BULK_VALIDATION, JOB_KIND_VALIDATION)
+    )
+    connection.execute("DROP TABLE validation_job_old")
+
+
+def new_job(
+        job_id: str, file_id: int | str | None, owner: int | None, kind: str = JOB_KIND_VALIDATION,
+        payload: dict | None = None
+) -> dict:
+    """ Create the dictionary representing a newly queued job.
+
+    :param job_id: The job identifier.
+    :param file_id: The id of the file concerned by the job, None for the jobs concerning several files.
+    :param owner: The id of the user who submitted the job.
+    :param kind: The kind of job.
+    :param payload: The JSON serializable description of the work of the job.
+    :return: The job.
+    """
+    created_at: str = now()
+    return {
+        'job_id': job_id,
+        'kind': kind,
+        'file_id': str(file_id) if file_id is not None else None,
+        'payload': payload,
+        'owner': owner,
+        'status': JOB_QUEUED,
+        'result': None,
+        'code': None,
+        'created_at': created_at,
+        'updated_at': created_at
+    }
+
+
+def check_status(status: str) -> None:
+    """ Raise an error if the status is unknown.
+
+    :param status: The status to check.
+    """
+    if status not in JOB_STATES:
+        raise ValueError(f"Unknown job status '{status}'.")
+
+
+def now(delay: float = 0) -> str:
+    """ The current UTC time in ISO format.
+
+    :param delay: An optional number of seconds added to the current time, negative to get a time in the past.
+    """
+    return (datetime.now(timezone.utc) + timedelta(seconds=delay)).isoformat()
@@ -1,3 +1,4 @@
 """ A library that contains various function to update the database """
 
 from .batch import BatchUpdater, BatchError
+from .bulk import BulkBatchUpdater, summarize_rebatch
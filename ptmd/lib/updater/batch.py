@@ -14,6 +14,7 @@ from ptmd.config import session
 from ptmd.const import PTX_ID_LABEL
 from ptmd.database import File, User, get_shipped_file
 from ptmd.lib import save_to_excel, GoogleDriveConnector
+from ptmd.lib.excel import replace_batch
 
 
 class BatchUpdater:
@@ -22,15 +23,24 @@ class BatchUpdater:
     :param batch: the new batch
     :param file_id: the id of the file to be updated from the database
     :param filepath: the path of the file to be updated from the local filesystem
+    :param in_place: if True, only the batch cells of the workbook are rewritten and its formatting is kept. Otherwise,
+                     the workbook is read and written again from scratch.
     """
     old_batch: str
     file_id: int
     filepath: str
     organisation_name: str
 
-    def __init__(self, batch: str, file_id: int | None = None, filepath: str | None = None) -> None:
+    def __init__(
+            self,
+            batch: str,
+            file_id: int | None = None,
+            filepath: str | None = None,
+            in_place: bool = True
+    ) -> None:
         """ Constructor method """
         self.new_batch: str = batch
+        self.in_place: bool = in_place
         if file_id and filepath:
             raise ValueError("Provide only one file_id or filepath, not both")
         if not file_id and not filepath:
@@ -45,6 +55,9 @@ class BatchUpdater:
 
     def modify_in_file(self) -> str:
         """ Method to modify the batch in the file from the local filesystem """
+        if self.in_place:
+            self.old_batch, self.organisation_name = replace_batch(self.filepath, self.new_batch)
+            return self.old_batch
         general_information: DataFrame = read_excel(self.filepath, sheet_name="General Information")
         exposure_information: DataFrame = read_excel(self.filepath, sheet_name="Exposure information")
         samples: list = exposure_information.to_dict(orient='records')
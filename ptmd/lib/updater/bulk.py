@@ -0,0 +1,202 @@
+""" A module to change the batch of many files at once. The conflicts are computed for all the files with a single
+query, the spreadsheets are rewritten concurrently by a pool of threads, and the database changes are committed in a
+single transaction. A file that can't be re-batched doesn't prevent the other files from being re-batched.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from os import remove
+from re import compile, Pattern
+
+from ptmd.config import session
+from ptmd.database import File, get_files_with_organism, get_received_batches
+from ptmd.logger import LOGGER
+from ptmd.lib.gdrive import GoogleDriveConnector
+from ptmd.lib.excel import replace_batch
+
+
+BATCH_PATTERN: Pattern = compile(r'^[A-Z][A-Z]$')
+REBATCH_WORKERS: int = 4
+
+
+class BulkBatchUpdater:
+    """ Change the batch of a list of files.
+
+    :param changes: The changes to make, as dictionaries with the 'file_id' and the new 'batch'.
+    :param max_workers: The maximum number of spreadsheets rewritten at the same time.
+    """
+
+    def __init__(self, changes: list[dict], max_workers: int = REBATCH_WORKERS) -> None:
+        """ The bulk batch updater constructor. """
+        self.changes: list[dict] = changes
+        self.max_workers: int = max_workers
+        self.results: dict[int, dict] = {}
+
+    def update(self) -> list[dict]:
+        """ Check the changes, rewrite the spreadsheets and update the files in a single transaction.
+
+        :return: The result of each change, in the order of the changes.
+        """
+        self.results = {}
+        files: dict[int, File] = self.__check()
+        rewritten: dict[int, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending: dict[Future, int] = {
+                pool.submit(rewrite_file, file.gdrive_id, file.name, file.batch, self.changes[index]['batch']): index
+                for index, file in files.items()
+            }
+            for future in as_completed(pending):
+                index: int = pending[future]
+                try:
+                    rewritten[index] = future.result()
+                except Exception as e:
+                    self.add_result(index, f"Unable to rewrite the file: {e}")
+        self.__commit(files, rewritten)
+        return [self.results[index] for index in range(len(self.changes))]
+
+    def __check(self) -> dict[int, File]:
+        """ Check all the changes against the database with one query for the files and one for the conflicts.
+
+        :return: The files that can be re-batched indexed by the position of their change.
+        """
+        file_ids: list[int] = [change.get('file_id') for change in self.changes]  # type: ignore
+        found: dict[int, File] = {
+            file.file_id: file for file in get_files_with_organism([i for i in file_ids if isinstance(i, int)])
+        }
+        files: dict[int, File] = {}
+        seen: set[int] = set()
+        for index, change in enumerate(self.changes):
+            file: File | None = found.get(change.get('file_id'))  # type: ignore[arg-type]
+            batch: str | None = change.get('batch')
+            if file is None:
+                self.add_result(index, f"File {change.get('file_id')} not found.")
+            elif file.file_id in seen:
+                self.add_result(index, f"File {file.file_id} is requested more than once.")
+            elif not isinstance(batch, str) or not BATCH_PATTERN.match(batch):
+                self.add_result(index, f"Invalid batch {batch}: it must be two uppercase letters.")
+            elif file.batch == batch:
+                self.add_result(index, "Could not update: the new batch and old batch have the same value")
+            elif file.shipped:
+                self.add_result(index, "File already shipped")
+            else:
+                files[index] = file
+            if file is not None:
+                seen.add(file.file_id)
+
+        targets: dict[tuple[int, str], list[int]] = {}
+        for index, file in files.items():
+            targets.setdefault((file.organism_id, self.changes[index]['batch']), []).append(index)
+        used: set[tuple[int, str]] = get_received_batches(list(targets))
+        for target, indexes in targets.items():
+            organism: str = files[indexes[0]].organism.ptox_biosystem_name
+            if target in used:
+                message: str | None = f"Batch already used with {organism}"
+            elif len(indexes) > 1:
+                message = f"Batch {target[1]} is requested for several files of {organism}"
+            else:
+                message = None
+            if message:
+                for index in indexes:
+                    self.add_result(index, message)
+                    del files[index]
+        return files
+
+    def __commit(self, files: dict[int, File], rewritten: dict[int, str]) -> None:
+        """ Update the name and batch of the rewritten files in a single transaction. If the transaction fails, the
+        spreadsheets are rewritten back to their previous batch.
+
+        :param files: The files to update indexed by the position of their change.
+        :param rewritten: The new names of the rewritten files indexed by the position of their change.
+        """
+        if not rewritten:
+            return
+        previous: dict[int, tuple[str, str]] = {}
+        try:
+            for index, name in rewritten.items():
+                file: File = files[index]
+                previous[index] = (file.name, file.batch)
+                file.name = name
+                file.batch = self.changes[index]['batch']
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for index, (name, batch) in previous.items():
+                    pool.submit(revert_file, files[index].gdrive_id, rewritten[index], self.changes[index]['batch'],
+                                batch, name)
+            for index in rewritten:
+                self.add_result(index, f"Unable to update the database: {e}")
+            return
+        for index, name in rewritten.items():
+            self.add_result(index, "Batch updated", name=name, old_batch=previous[index][1])
+
+    def add_result(self, index: int, message: str, name: str | None = None, old_batch: str | None = None) -> None:
+        """ Store the result of a change.
+
+        :param index: The position of the change.
+        :param message: The outcome of the change.
+        :param name: The new name of the file, if it was re-batched.
+        :param old_batch: The previous batch of the file, if it was re-batched.
+        """
+        change: dict = self.changes[index]
+        self.results[index] = {
+            'file_id': change.get('file_id'),
+            'batch': change.get('batch'),
+            'updated': name is not None,
+            'message': message
+        }
+        if name is not None:
+            self.results[index].update({'name': name, 'old_batch': old_batch})
+        else:
+            LOGGER.error(f"Re-batching file {change.get('file_id')}: {message}")
+
+
+def rewrite_file(gdrive_id: str, name: str, old_batch: str, new_batch: str) -> str:
+    """ Download a spreadsheet, change its batch in place and upload it under its new name.
+
+    :param gdrive_id: The Google Drive identifier of the file.
+    :param name: The current name of the file.
+    :param old_batch: The current batch of the file.
+    :param new_batch: The new batch.
+    :return: The new name of the file.
+    """
+    google_drive: GoogleDriveConnector = GoogleDriveConnector()
+    filepath: str = google_drive.download_file(gdrive_id, name)
+    try:
+        replace_batch(filepath, new_batch)
+        new_name: str = name.replace(old_batch, new_batch)
+        google_drive.update_file(gdrive_id, filepath, new_name)
+    finally:
+        remove(filepath)
+    return new_name
+
+
+def revert_file(gdrive_id: str, name: str, batch: str, old_batch: str, old_name: str) -> None:
+    """ Rewrite a spreadsheet back to its previous batch and name, logging the failures.
+
+    :param gdrive_id: The Google Drive identifier of the file.
+    :param name: The current name of the file.
+    :param batch: The current batch of the file.
+    :param old_batch: The batch to restore.
+    :param old_name: The name to restore.
+    """
+    google_drive: GoogleDriveConnector = GoogleDriveConnector()
+    try:
+        filepath: str = google_drive.download_file(gdrive_id, name)
+        try:
+            replace_batch(filepath, old_batch)
+            google_drive.update_file(gdrive_id, filepath, old_name)
+        finally:
+            remove(filepath)
+    except Exception as e:
+        LOGGER.error(f"Unable to restore the batch {old_batch} of file {gdrive_id}: {e}")
+
+
+def summarize_rebatch(results: list[dict]) -> dict[str, int]:
+    """ Count the changes by outcome.
+
+    :param results: The results returned by BulkBatchUpdater.update().
+    :return: The number of changes, of re-batched files and of failed changes.
+    """
+    updated: int = sum(1 for result in results if result['updated'])
+    return {'total': len(results), 'updated': updated, 'failed': len(results) - updated}
@@ -3,3 +3,6 @@ Google Drive.
 """
 
 from ptmd.lib.validator.core import ExcelValidator, ExternalExcelValidator
+from ptmd.lib.validator.cache import ReportCache, report_cache
+from ptmd.lib.validator.limits import ErrorLimits, OMITTED_ERRORS_LABEL
+from ptmd.lib.validator.incremental import IncrementalStore, incremental_store
@@ -0,0 +1,157 @@
+""" Validation of many files at once. The files are downloaded by a pool of threads and each downloaded file is
+immediately handed to a pool of processes running the ExcelValidator, so that downloads overlap with the CPU-bound
+validation. The reference data is loaded once in the parent process and shipped to the workers, which never query the
+database.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import get_context
+from os import remove
+
+from ptmd.config import session
+from ptmd.database import File
+from ptmd.logger import LOGGER
+from ptmd.lib.gdrive import GoogleDriveConnector
+from .core import ExcelValidator
+from .context import ValidationContext
+
+
+class BatchValidator:
+    """ Validate a list of files concurrently.
+
+    :param files: The files to validate, as dictionaries with at least the 'file_id', 'gdrive_id' and 'name' keys.
+    :param max_workers: The maximum number of processes validating files. Defaults to the number of CPUs.
+    :param download_workers: The maximum number of files downloaded at the same time.
+    :param context: The reference data used to validate the identifiers. Loaded from the database if not given.
+    :param pool: An optional executor running the validations instead of a new pool of processes.
+    """
+
+    def __init__(
+            self,
+            files: list[dict],
+            max_workers: int | None = None,
+            download_workers: int = 4,
+            context: ValidationContext | None = None,
+            pool: Executor | None = None
+    ) -> None:
+        """ The batch validator constructor. """
+        self.files: list[dict] = files
+        self.max_workers: int | None = max_workers
+        self.download_workers: int = download_workers
+        self.context: ValidationContext = context or ValidationContext()
+        self.pool: Executor | None = pool
+        self.results: dict[int, dict] = {}
+
+    def validate(self) -> list[dict]:
+        """ Download and validate the files, then update their 'validated' state in a single transaction.
+
+        :return: The result of each file, in the order of the input files.
+        """
+        organisms: dict[str, str] = self.context.organisms
+        chemicals: dict[str, int] = self.context.chemicals
+        self.results = {}
+        pool: Executor = self.pool or ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context('spawn'))
+        try:
+            with ThreadPoolExecutor(max_workers=self.download_workers) as downloads:
+                pending: dict[Future, dict] = {downloads.submit(self.download_file, file): file for file in self.files}
+                validations: dict[Future, tuple[dict, str]] = {}
+                for future in as_completed(pending):
+                    file: dict = pending[future]
+                    try:
+                        filepath: str = future.result()
+                    except Exception as e:
+                        self.add_result(file, error=f"Unable to download the file: {e}")
+                        continue
+                    validation: Future = pool.submit(
+                        validate_downloaded_file, file['file_id'], filepath, organisms, chemicals
+                    )
+                    validations[validation] = (file, filepath)
+            for future in as_completed(validations):
+                file, filepath = validations[future]
+                try:
+                    self.add_result(file, report=future.result())
+                except Exception as e:
+                    self.add_result(file, error=f"Unable to validate the file: {e}")
+                finally:
+                    remove(filepath)
+        finally:
+            if self.pool is None:
+                pool.shutdown()
+        self.__update_file_records()
+        return [self.results[file['file_id']] for file in self.files]
+
+    @staticmethod
+    def download_file(file: dict) -> str:
+        """ Download a file from Google Drive.
+
+        :param file: The file to download.
+        :return: The downloaded file path.
+        """
+        gdrive: GoogleDriveConnector = GoogleDriveConnector()
+        return gdrive.download_file(file['gdrive_id'], file['name'])
+
+    def add_result(self, file: dict, report: dict | None = None, error: str | None = None) -> None:
+        """ Store the result of a file.
+
+        :param file: The validated file.
+        :param report: The validation report, if the file could be validated.
+        :param error: The error that prevented the validation.
+        """
+        result: dict = {
+            'file_id': file['file_id'],
+            'gdrive_id': file['gdrive_id'],
+            'name': file['name'],
+            'valid': None,
+            'errors': {}
+        }
+        if report is not None:
+            result['valid'] = report['valid']
+            result['errors'] = report['errors']
+            result['message'] = "File validated successfully." if report['valid'] else "File validation failed."
+        else:
+            result['message'] = error
+            LOGGER.error(f"File {file['file_id']}: {error}")
+        self.results[file['file_id']] = result
+
+    def __update_file_records(self) -> None:
+        """ Update the 'validated' property of the validated files, using one query per state. """
+        for state, valid in (('success', True), ('failed', False)):
+            file_ids: list[int] = [file_id for file_id, result in self.results.items() if result['valid'] is valid]
+            if file_ids:
+                File.query.filter(File.file_id.in_(file_ids)).update({'validated': state}, synchronize_session=False)  # type: ignore
+        session.commit()
+
+
+def validate_downloaded_file(
+        file_id: int,
+        filepath: str,
+        organisms: dict[str, str],
+        chemicals: dict[str, int]
+) -> dict:
+    """ Validate a file already downloaded. This function runs in the worker processes and doesn't use the database.
+
+    :param file_id: The id of the file.
+    :param filepath: The path to the downloaded file.
+    :param organisms: The biosystem codes indexed by biosystem name.
+    :param chemicals: The PTX codes indexed by chemical common name.
+    :return: The validation report.
+    """
+    validator: ExcelValidator = ExcelValidator(file_id, context=ValidationContext(organisms, chemicals))
+    validator.filepath = filepath
+    validator.validate_file()
+    return validator.report
+
+
+def summarize(results: list[dict]) -> dict[str, int]:
+    """ Count the files by outcome.
+
+    :param results: The results returned by BatchValidator.validate().
+    :return: The number of files, of valid files, of invalid files and of files that couldn't be validated.
+    """
+    return {
+        'total': len(results),
+        'valid': sum(1 for result in results if result['valid'] is True),
+        'invalid': sum(1 for result in results if result['valid'] is False),
+        'errors': sum(1 for result in results if result['valid'] is None)
+    }
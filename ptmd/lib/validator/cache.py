@@ -0,0 +1,150 @@
+""" Cache of the validation reports keyed by the MD5 checksum of the file content, which is the checksum Google Drive
+exposes as md5Checksum. Unchanged files can then be validated without being downloaded or parsed again. Each report
+also stores the fingerprint of the schema and reference data it was validated against: a report validated against
+another schema or other organisms and chemicals is treated as missing.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from copy import deepcopy
+from datetime import datetime, timezone
+from hashlib import blake2b, md5
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable
+
+
+VALIDATION_CACHE_SIZE: int = 256
+VALIDATION_CACHE_TTL: float = 3600
+
+
+class ReportCache:
+    """ A least recently used cache of validation reports whose entries expire after a given time.
+
+    :param max_size: The maximum number of reports kept in the cache.
+    :param ttl: The number of seconds after which a report expires.
+    :param clock: The function giving the current time in seconds. Defaults to time.monotonic.
+    :param copy: If False, the reports are stored and returned without being copied. Only for callers that never
+                 modify them, as copying large reports on every lookup is costly.
+    """
+
+    def __init__(
+            self,
+            max_size: int = VALIDATION_CACHE_SIZE,
+            ttl: float = VALIDATION_CACHE_TTL,
+            clock: Callable[[], float] = monotonic,
+            copy: bool = True
+    ) -> None:
+        """ The cache constructor. """
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.clock: Callable[[], float] = clock
+        self.copy: bool = copy
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__entries: OrderedDict[str, tuple[float, str, str, dict]] = OrderedDict()
+        self.__lock: Lock = Lock()
+
+    def get(self, key: str, fingerprint: str = '') -> dict | None:
+        """ Get the report stored for the given checksum, copied unless the cache was created with copy=False.
+
+        :param key: The checksum of the file.
+        :param fingerprint: The fingerprint of the schema and reference data the report must have been validated
+                            against.
+        :return: The report or None if it isn't cached, has expired or was validated against other reference data.
+        """
+        with self.__lock:
+            entry: tuple[float, str, str, dict] | None = self.__entries.get(key)
+            if entry is None or entry[0] <= self.clock() or entry[2] != fingerprint:
+                if entry is not None:
+                    del self.__entries[key]
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return deepcopy(entry[3]) if self.copy else entry[3]
+
+    def set(self, key: str, report: dict, fingerprint: str = '') -> None:
+        """ Store a report, copied unless the cache was created with copy=False, evicting the least recently used reports
+        if the cache is full.
+
+        :param key: The checksum of the file.
+        :param report: The validation report.
+        :param fingerprint: The fingerprint of the schema and reference data the report was validated against.
+        """
+        stored_at: str = datetime.now(timezone.utc).isoformat()
+        with self.__lock:
+            stored: dict = deepcopy(report) if self.copy else report
+            self.__entries[key] = (self.clock() + self.ttl, stored_at, fingerprint, stored)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def purge(self, key: str | None = None) -> int:
+        """ Remove a report or all the reports from the cache.
+
+        :param key: The checksum of the report to remove. All reports are removed if not given.
+        :return: The number of removed reports.
+        """
+        with self.__lock:
+            if key is None:
+                count: int = len(self.__entries)
+                self.__entries.clear()
+                return count
+            return 1 if self.__entries.pop(key, None) is not None else 0
+
+    def inspect(self) -> dict:
+        """ Describe the content of the cache. Expired reports are removed first.
+
+        :return: The cache settings, counters and entries.
+        """
+        with self.__lock:
+            now: float = self.clock()
+            for key in [key for key, entry in self.__entries.items() if entry[0] <= now]:
+                del self.__entries[key]
+            entries: list[dict] = [
+                {
+                    'key': key,
+                    'fingerprint': fingerprint,
+                    'valid': report['valid'],
+                    'stored_at': stored_at,
+                    'expires_in': round(expires_at - now, 3)
+                } for key, (expires_at, stored_at, fingerprint, report) in self.__entries.items()
+            ]
+            return {
+                'size': len(entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': entries
+            }
+
+    def __len__(self) -> int:
+        """ The number of cached reports, including the expired ones not removed yet. """
+        return len(self.__entries)
+
+
+def file_checksum(filepath: str) -> str:
+    """ Compute the MD5 checksum of a file, as given by Google Drive for binary files.
+
+    :param filepath: The path to the file.
+    :return: The hexadecimal checksum.
+    """
+    checksum = md5()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def reference_fingerprint(*references: Any) -> str:
+    """ Compute the fingerprint of what the reports are validated against, such as the schema and the reference data.
+
+    :param references: The values, made of builtin types.
+    :return: The hexadecimal fingerprint.
+    """
+    return blake2b(repr(references).encode(), digest_size=16).hexdigest()
+
+
+report_cache: ReportCache = ReportCache()
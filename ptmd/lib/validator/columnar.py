@@ -0,0 +1,264 @@
+""" Columnar variant of the identifier validation. The identifier column of the whole sheet is decomposed into an array of
+characters and checked with array operations. Rules depending on other columns are evaluated once per distinct value
+and broadcast back to the records. The errors are produced per record, in the same order and with the same messages as
+the per-record functions of validate_identifier.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence
+from re import match
+from operator import itemgetter
+
+from numpy import array, ndarray, flatnonzero, fromiter, int64, uint32, full
+from pandas import factorize
+
+from ptmd.const import (
+    ALLOWED_EXPOSURE_BATCH,
+    PTX_ID_LABEL,
+    BATCH_LABEL,
+    COMPOUND_NAME_LABEL,
+    DOSE_LABEL,
+    TIMEPOINT_LABEL,
+    BASE_IDENTIFIER
+)
+from .context import ValidationContext
+from .validate_identifier import INV_DOSE_MAPPING, INV_TIMEPOINT_MAPPING
+
+
+COLUMNAR_THRESHOLD: int = 1000
+IDENTIFIER_LENGTH: int = 9
+DIGIT_POSITIONS: list[int] = [3, 4, 5, 8]
+REQUIRED_COLUMNS: list[str] = [PTX_ID_LABEL, 'compound_hash', COMPOUND_NAME_LABEL, DOSE_LABEL, TIMEPOINT_LABEL, 'replicate']
+
+Errors = Sequence[tuple[str, str]]
+NO_ERRORS: tuple = ()
+
+
+def validate_identifier_columns(records: list[dict], general_info: dict, context: ValidationContext) -> list[Errors | None] | None:
+    """ Run the identifier checks (species, batch, compound, dose, timepoint and replicate) on all the records at once.
+    Records with an identifier that isn't made of 9 characters with digits for the compound and replicate are left to
+    the per-record functions.
+
+    :param records: The exposure records.
+    :param general_info: The general information of the sheet.
+    :param context: The reference data used to resolve organisms and chemicals.
+    :return: For each record, the sequence of (message, field) errors or None if the record must be validated by the
+             per-record functions. Returns None if the sheet cannot be validated by columns at all.
+    """
+    if not records or any(column not in records[0] for column in REQUIRED_COLUMNS):
+        return None
+    batch_reference: Any = general_info.get(BATCH_LABEL)
+    if not isinstance(batch_reference, str):
+        return None
+    try:
+        organism_code: str | None = context.get_organism_code(general_info["biosystem_name"])
+        chemicals: dict[str, int] = context.chemicals
+        columns: dict[str, Column] = {
+            label: Column(list(map(itemgetter(label), records))) for label in REQUIRED_COLUMNS if label != PTX_ID_LABEL
+        }
+    except Exception:
+        return None
+
+    # Excel cells cannot contain NUL characters, so the fixed width array preserves the length of the identifiers.
+    ids: list = list(map(itemgetter(PTX_ID_LABEL), records))
+    if list(map(type, ids)).count(str) != len(ids):
+        ids = [value if isinstance(value, str) else '' for value in ids]
+    characters: ndarray = array(ids, dtype=f'U{IDENTIFIER_LENGTH + 1}').view(uint32).reshape(len(ids), -1)
+    digits: ndarray = characters.astype(int64) - ord('0')
+    supported: ndarray = ((digits[:, DIGIT_POSITIONS] >= 0) & (digits[:, DIGIT_POSITIONS] <= 9)).all(axis=1)
+    supported &= characters[:, IDENTIFIER_LENGTH] == 0
+    names: Column = columns[COMPOUND_NAME_LABEL]
+    is_named: ndarray = names.evaluate(bool)
+    supported &= ~is_named | names.evaluate(lambda name: isinstance(name, str))
+
+    errors: list[Errors | None] = [NO_ERRORS if is_supported else None for is_supported in supported.tolist()]
+    table: ErrorTable = ErrorTable(errors)
+
+    # species
+    if not organism_code:
+        table.add(supported, "Organism not found in database.", "biosystem_name")
+    else:
+        species_mismatch: ndarray = characters[:, 0] != ord(organism_code) if len(organism_code) == 1 else supported
+        table.add(supported & species_mismatch, "The identifier organism doesn't match the biosystem_name.", PTX_ID_LABEL)
+
+    # batch
+    if not match(ALLOWED_EXPOSURE_BATCH, batch_reference):
+        table.add(supported, f"The batch '{batch_reference}' is not valid.", BATCH_LABEL)
+    batches: ndarray = characters[:, 1].astype(int64) * 0x110000 + characters[:, 2]
+    valid_batch: ndarray = evaluate_distinct(batches, lambda key: bool(match(ALLOWED_EXPOSURE_BATCH, decode_pair(key))))
+    table.add(supported & ~valid_batch,
+              lambda i: f"The identifier doesn't contain a valid batch '{ids[i][1:3]}'.", PTX_ID_LABEL)
+    table.add(supported & valid_batch & evaluate_distinct(batches, lambda key: decode_pair(key) != batch_reference),
+              f"The identifier batch doesn't match the batch '{batch_reference}'.", PTX_ID_LABEL)
+
+    # compound
+    codes: ndarray = digits[:, 3] * 100 + digits[:, 4] * 10 + digits[:, 5]
+    hashes: Column = columns['compound_hash']
+    hash_mismatch: ndarray = evaluate_pairs(
+        hashes.codes, codes.clip(0, 999), lambda value, code: hashes.uniques[value] != f'{BASE_IDENTIFIER}{code:03d}'
+    )
+    table.add(supported & hash_mismatch,
+              lambda i: f"The compound hash {hashes.values[i]} doesn't match the reference identifier "
+                        f"{BASE_IDENTIFIER}{ids[i][3:6]}.", PTX_ID_LABEL)
+    text_names: list[str] = [name if isinstance(name, str) else '' for name in names.uniques]
+    is_named &= supported
+    is_control: ndarray = is_named & names.broadcast(['CONTROL' in name for name in text_names])
+    is_blank: ndarray = is_named & ~is_control & names.broadcast(['EXTRACTION BLANK' in name for name in text_names])
+    is_compound: ndarray = is_named & ~is_control & ~is_blank
+    chemical_codes: list[int | None] = [chemicals.get(name) for name in text_names]
+    unknown: ndarray = is_compound & names.broadcast([code is None for code in chemical_codes])
+    table.add(unknown, lambda i: f"The identifier doesn't contain a valid compound code '{codes[i]}'.",
+              COMPOUND_NAME_LABEL)
+    code_mismatch: ndarray = evaluate_pairs(names.codes, codes.clip(0, 999),
+                                            lambda name, code: chemical_codes[name] != code)
+    table.add(is_compound & ~unknown & code_mismatch,
+              lambda i: "The identifier %s compound doesn't match the compound %s (%s)" % (
+                  codes[i], names.values[i], chemicals[names.values[i]]
+              ), PTX_ID_LABEL)
+    is_dmso: ndarray = is_control & names.broadcast(['DMSO' in name for name in text_names])
+    is_water: ndarray = is_control & ~is_dmso & names.broadcast(['WATER' in name for name in text_names])
+    table.add(is_dmso & (codes != 999), lambda i: f"The identifier compound should be 999 but got {codes[i]}.",
+              PTX_ID_LABEL)
+    table.add(is_water & (codes != 0), lambda i: f"The identifier compound should be 000 but got {codes[i]}.",
+              PTX_ID_LABEL)
+    table.add(is_blank & (codes != 998), lambda i: f"The identifier compound should be 998 but got {codes[i]}.",
+              PTX_ID_LABEL)
+
+    # dose and timepoint
+    validate_mapping(table, ids, characters[:, 6], supported, columns[DOSE_LABEL], INV_DOSE_MAPPING,
+                     "The identifier contain a invalid dose '%s'.",
+                     "The identifier dose maps to %s but should maps to '%s'.")
+    validate_mapping(table, ids, characters[:, 7], supported, columns[TIMEPOINT_LABEL], INV_TIMEPOINT_MAPPING,
+                     "The identifier contains an invalid timepoint '%s'.",
+                     "The identifier timepoints maps to %s but should maps to '%s'.")
+
+    # replicate
+    replicates: Column = columns['replicate']
+    replicate_mismatch: ndarray = evaluate_pairs(
+        digits[:, 8].clip(0, 9), replicates.codes, lambda replicate, value: replicate != replicates.uniques[value]
+    )
+    table.add(supported & replicate_mismatch,
+              lambda i: f"The identifier replicate {digits[i, 8]} doesn't match the replicate {replicates.values[i]}.",
+              PTX_ID_LABEL)
+    return errors
+
+
+def validate_mapping(
+        table: ErrorTable,
+        ids: list[str],
+        letters: ndarray,
+        supported: ndarray,
+        references: Column,
+        mapping: dict,
+        invalid: str,
+        mismatch: str
+) -> None:
+    """ Check the letters of the identifiers against the mapping of the reference column. Records with an empty
+    reference are skipped.
+
+    :param table: The table collecting the errors.
+    :param ids: The identifiers.
+    :param letters: The code points of the letters to check.
+    :param supported: The mask of the records validated by columns.
+    :param references: The reference column.
+    :param mapping: The mapping of letters to reference values.
+    :param invalid: The message template for letters missing from the mapping.
+    :param mismatch: The message template for letters mapping to another reference value.
+    """
+    letters = letters.astype(int64)
+    checked: ndarray = supported & references.evaluate(bool)
+    missing: ndarray = checked & evaluate_distinct(letters, lambda letter: chr(letter) not in mapping)
+    table.add(missing, lambda i: invalid % chr(letters[i]), PTX_ID_LABEL)
+    mapping_mismatch: ndarray = evaluate_pairs(
+        letters, references.codes, lambda letter, value: mapping.get(chr(letter)) != references.uniques[value]
+    )
+    table.add(checked & ~missing & mapping_mismatch,
+              lambda i: mismatch % (mapping[chr(letters[i])], references.values[i]), PTX_ID_LABEL)
+
+
+class Column:
+    """ The values of a column factorized into the list of distinct values and the index of each value in that list.
+
+    :param values: The values of the column.
+    """
+
+    def __init__(self, values: list) -> None:
+        """ The column constructor. """
+        self.values: list = values
+        self.uniques: list = list(dict.fromkeys(values))
+        index: dict = {value: code for code, value in enumerate(self.uniques)}
+        self.codes: ndarray = fromiter(map(index.__getitem__, values), dtype=int64, count=len(values))
+
+    def broadcast(self, results: list) -> ndarray:
+        """ Broadcast results computed for each distinct value to all the values of the column.
+
+        :param results: A result for each distinct value.
+        :return: The array of results for each value.
+        """
+        return array(results, dtype=bool)[self.codes] if results else full(len(self.values), False)
+
+    def evaluate(self, function: Callable[[Any], bool]) -> ndarray:
+        """ Evaluate a function once per distinct value and broadcast the results to all the values of the column.
+
+        :param function: The function to evaluate.
+        :return: The array of results for each value.
+        """
+        return self.broadcast([function(value) for value in self.uniques])
+
+
+def evaluate_distinct(keys: ndarray, function: Callable[[int], bool]) -> ndarray:
+    """ Evaluate a function once per distinct key and broadcast the results to all the keys.
+
+    :param keys: An array of integer keys.
+    :param function: The function to evaluate on a key.
+    :return: The array of results for each key.
+    """
+    inverse, distinct = factorize(keys)
+    return array([function(int(key)) for key in distinct], dtype=bool)[inverse]
+
+
+def evaluate_pairs(left: ndarray, right: ndarray, function: Callable[[int, int], bool]) -> ndarray:
+    """ Evaluate a function once per distinct pair of integer keys and broadcast the results to all the pairs.
+
+    :param left: The first array of non-negative integer keys.
+    :param right: The second array of non-negative integer keys.
+    :param function: The function to evaluate on a pair of keys.
+    :return: The array of results for each pair.
+    """
+    size: int = int(right.max()) + 1 if len(right) else 1
+    keys: ndarray = left.astype(int64) * size + right
+    return evaluate_distinct(keys, lambda key: function(key // size, key % size))
+
+
+def decode_pair(key: int) -> str:
+    """ Decode two characters encoded as a single integer key.
+
+    :param key: The key.
+    :return: The two characters.
+    """
+    return chr(key // 0x110000) + chr(key % 0x110000)
+
+
+class ErrorTable:
+    """ Append errors to the records selected by boolean masks.
+
+    :param errors: The list of errors for each record. Records set to None are skipped.
+    """
+
+    def __init__(self, errors: list[Errors | None]) -> None:
+        """ The table constructor. """
+        self.errors: list[Errors | None] = errors
+
+    def add(self, mask: ndarray, message: str | Callable[[int], str], field: str) -> None:
+        """ Add an error to the records selected by the mask.
+
+        :param mask: A boolean array selecting the records in error.
+        :param message: The message or a function building the message from the record index.
+        :param field: The field concerned by the error.
+        """
+        for index in flatnonzero(mask).tolist():
+            record_errors: Errors | None = self.errors[index]
+            if record_errors is NO_ERRORS:
+                record_errors = self.errors[index] = []
+            if record_errors is not None:
+                record_errors.append((message(index) if callable(message) else message, field))  # type: ignore
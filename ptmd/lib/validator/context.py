@@ -0,0 +1,50 @@
+""" Reference data shared by all the records of a validation run. The organisms and chemicals are read from the
+reference data cache the first time they are needed, so the identifier checks resolve against dictionaries instead of
+querying the database per record.
+"""
+from __future__ import annotations
+
+from ptmd.database.queries import reference_data
+
+
+class ValidationContext:
+    """ Lazily loaded lookup tables used by the identifier validation.
+
+    :param organisms: An optional mapping of biosystem names to biosystem codes. Read from the cache if not given.
+    :param chemicals: An optional mapping of chemical common names to PTX codes. Read from the cache if not given.
+    """
+
+    def __init__(self, organisms: dict[str, str] | None = None, chemicals: dict[str, int] | None = None) -> None:
+        """ The context constructor. """
+        self.__organisms: dict[str, str] | None = organisms
+        self.__chemicals: dict[str, int] | None = chemicals
+
+    @property
+    def organisms(self) -> dict[str, str]:
+        """ The biosystem codes indexed by biosystem name. """
+        if self.__organisms is None:
+            self.__organisms = reference_data.organisms
+        return self.__organisms
+
+    @property
+    def chemicals(self) -> dict[str, int]:
+        """ The PTX codes indexed by chemical common name. The first chemical wins when a name is duplicated. """
+        if self.__chemicals is None:
+            self.__chemicals = reference_data.chemicals
+        return self.__chemicals
+
+    def get_organism_code(self, organism_name: str) -> str | None:
+        """ Get the biosystem code of an organism.
+
+        :param organism_name: The biosystem name of the organism.
+        :return: The biosystem code or None if the organism doesn't exist.
+        """
+        return self.organisms.get(organism_name)
+
+    def get_chemical_code(self, chemical_name: str) -> int | None:
+        """ Get the PTX code of a chemical.
+
+        :param chemical_name: The common name of the chemical.
+        :return: The PTX code or None if the chemical doesn't exist.
+        """
+        return self.chemicals.get(chemical_name)
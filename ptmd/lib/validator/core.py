@@ -2,52 +2,168 @@
 """
 from __future__ import annotations
 
-from typing import Generator
+from typing import Callable, Iterable, Iterator
 from os import remove
 
-from json import loads
-from jsonschema import Draft4Validator as JSONValidator
 from numpy import nan
 from pandas import DataFrame, ExcelFile
 
 from ptmd.const import EXPOSURE_INFORMATION_SCHEMA_FILEPATH, PTX_ID_LABEL
 from ptmd.config import session
 from ptmd.database import File
+from ptmd.database.utils import QueryCounter
+from ptmd.logger import LOGGER
 from ptmd.lib.gdrive import GoogleDriveConnector
+from ptmd.lib.jobs import JOB_DOWNLOADING, JOB_VALIDATING
 from .validate_identifier import validate_identifier
+from .reader import SheetReader
+from .context import ValidationContext
+from .duplicates import DuplicateIndex, get_box_position
+from .columnar import validate_identifier_columns, COLUMNAR_THRESHOLD
+from .schema import CompiledSchema, schema_registry
+from .cache import ReportCache, file_checksum, reference_fingerprint
+from .limits import ErrorLimits, OMITTED_ERRORS_LABEL
+from .incremental import IncrementalStore
 
 
 class ExcelValidator:
     """ The core of the validator.
 
     :param file_id: The file id to validate.
+    :param streaming: If True, the exposure records are read and validated one row at a time instead of being loaded
+                      in memory first.
+    :param context: The reference data used to validate the identifiers. Loaded from the database when needed if not
+                    given.
+    :param columnar: If True, the identifiers of all the records are validated at once with vectorized operations. By
+                     default, the columnar validation is used for sheets of at least COLUMNAR_THRESHOLD records. It is
+                     not available in streaming mode.
+    :param on_status: An optional function called with the new status when the validation starts downloading or
+                      validating the file.
+    :param cache: An optional cache of reports keyed by the file checksum. When given, unchanged files are not
+                  downloaded or parsed again and their cached report is used instead, as long as the schema and the
+                  reference data didn't change since.
+    :param limits: Optional caps on the number of errors kept in the report per field and per rule. The omitted errors
+                   are summarised under OMITTED_ERRORS_LABEL.
+    :param record: If False, the outcome of the validation isn't saved in the file record, for instance when the
+                   validation only serves a report.
+    :param incremental: An optional store of what was kept of the previous validations. When given, only the records
+                        that changed since the previous validation of the file are checked again, along with the study
+                        design of the compounds they touch. The columnar validation isn't used in this mode.
     """
 
-    def __init__(self, file_id: int | str) -> None:
+    def __init__(
+            self,
+            file_id: int | str,
+            streaming: bool = False,
+            context: ValidationContext | None = None,
+            columnar: bool | None = None,
+            on_status: Callable[[str], None] | None = None,
+            cache: ReportCache | None = None,
+            limits: ErrorLimits | None = None,
+            record: bool = True,
+            incremental: IncrementalStore | None = None
+    ) -> None:
         """ The validator constructor. """
         self.report: dict = {'valid': True, 'errors': {}}
         self.current_record: dict = {'data': {}, 'label': ''}
         self.general_info: dict = {}
         self.exposure_data: list[dict] = []
-        self.identifiers: list[str] = []
+        self.identifiers: DuplicateIndex = DuplicateIndex()
         self.vertical_validation_data: dict = {}
-        self.__schema: dict = {}
         self.file_id: int | str = file_id
         self.file: dict = {}
         self.filepath: str = ''
+        self.streaming: bool = streaming
+        self.__reader: SheetReader | None = None
+        self.context: ValidationContext = context or ValidationContext()
+        self.query_count: int = 0
+        self.columnar: bool | None = columnar
+        self.identifier_errors: list | None = None
+        self.on_status: Callable[[str], None] | None = on_status
+        self.cache: ReportCache | None = cache
+        self.checksum: str | None = None
+        self.fingerprint: str = ''
+        self.cached: bool = False
+        self.limits: ErrorLimits | None = limits
+        self.record: bool = record
+        self.incremental: IncrementalStore | None = incremental
 
     def validate(self) -> None:
         """ Validates the file. """
         if isinstance(self.file_id, int):
             self.file = self.__get_file_from_database(self.file_id)
-            filepath: str | None = self.download_file()
-            if filepath:
-                self.filepath = filepath
+            self.validate_content()
+            if self.record:
+                self.__update_file_record()
+
+    def validate_content(self) -> None:
+        """ Download and validate the file. When a cache is given, the checksum of the file is looked up first and the
+        cached report is used if the file didn't change. The Drive md5Checksum is used when available, otherwise the
+        checksum of the downloaded content is computed before parsing. The downloaded file is always removed, even
+        when the validation is interrupted by an exception.
+        """
+        self.notify(JOB_DOWNLOADING)
+        if self.cache is not None:
+            self.fingerprint = self.get_fingerprint()
+            self.checksum = self.get_checksum()
+            if self.__load_cached_report():
+                return
+        filepath: str | None = self.download_file()
+        if filepath:
+            self.filepath = filepath
+        try:
+            if self.cache is not None and not self.checksum:
+                self.checksum = file_checksum(self.filepath)
+                if self.__load_cached_report():
+                    return
+            self.notify(JOB_VALIDATING)
             self.validate_file()
-            self.__update_file_record()
-
+            if self.cache is not None and self.checksum:
+                self.cache.set(self.checksum, self.report, self.fingerprint)
+        finally:
             remove(self.filepath)
 
+    def __load_cached_report(self) -> bool:
+        """ Replace the report by the cached report of the file checksum if there is one.
+
+        :return: True if the cached report was found, False otherwise.
+        """
+        if self.cache is None or not self.checksum:
+            return False
+        report: dict | None = self.cache.get(self.checksum, self.fingerprint)
+        if report is None:
+            return False
+        self.report = report
+        self.cached = True
+        LOGGER.info(f"Using the cached validation report of file {self.file_id} ({self.checksum}).")
+        return True
+
+    def get_checksum(self) -> str | None:
+        """ Get the MD5 checksum of the file from Google Drive.
+
+        :return: The checksum or None if Google Drive doesn't provide one.
+        """
+        gdrive: GoogleDriveConnector = GoogleDriveConnector()
+        return gdrive.get_checksum(self.file['gdrive_id'])
+
+    def get_fingerprint(self) -> str:
+        """ Get the fingerprint of the schema and the reference data the file is validated against.
+
+        :return: The hexadecimal fingerprint.
+        """
+        schema: CompiledSchema = schema_registry.get(EXPOSURE_INFORMATION_SCHEMA_FILEPATH)
+        return reference_fingerprint(
+            schema.schema, sorted(self.context.organisms.items()), sorted(self.context.chemicals.items())
+        )
+
+    def notify(self, status: str) -> None:
+        """ Report the progress of the validation.
+
+        :param status: The new status.
+        """
+        if self.on_status:
+            self.on_status(status)
+
     @staticmethod
     def __get_file_from_database(file_id: int) -> dict[str, str]:
         """ Get the file id from the database.
@@ -69,42 +185,89 @@ class ExcelValidator:
         return gdrive.download_file(self.file['gdrive_id'], self.file['name'])
 
     def __load_data(self) -> None:
-        """ Load the dataframe and schema in memory.
+        """ Load the dataframes in memory. In streaming mode, only the general information is loaded and the
+        exposure records are read lazily by iter_records().
         """
-        file_handler: ExcelFile = ExcelFile(self.filepath, engine='openpyxl')
-        exposure_df: DataFrame = file_handler.parse("Exposure information")
-        general_df: DataFrame = file_handler.parse("General Information")
-        self.exposure_data = exposure_df.replace({nan: None}).to_dict(orient='records')
-        self.general_info = general_df.replace({nan: None}).to_dict(orient='records')[0]
+        if self.streaming:
+            self.__reader = SheetReader(self.filepath)
+            self.general_info = self.__reader.get_first_record("General Information")
+        else:
+            file_handler: ExcelFile = ExcelFile(self.filepath, engine='openpyxl')
+            exposure_df: DataFrame = file_handler.parse("Exposure information")
+            general_df: DataFrame = file_handler.parse("General Information")
+            self.exposure_data = exposure_df.replace({nan: None}).to_dict(orient='records')
+            self.general_info = general_df.replace({nan: None}).to_dict(orient='records')[0]
         timepoints: str = self.general_info['timepoints'].strip('[]').split(', ')
         self.general_info['timepoints'] = list(map(lambda x: int(x), timepoints))
-        with open(EXPOSURE_INFORMATION_SCHEMA_FILEPATH, 'r') as f:
-            self.__schema = loads(f.read())
+
+    def iter_records(self) -> Iterable[dict]:
+        """ Get the exposure records to validate.
+
+        :return: The list of loaded records or, in streaming mode, a generator reading the records one at a time.
+        """
+        if self.__reader:
+            return self.__reader.iter_records("Exposure information")
+        return self.exposure_data
 
     def validate_file(self) -> None:
-        """ Validates the file.
+        """ Validates the file. The number of queries issued during the validation is stored in query_count.
         """
         self.__load_data()
-        validator: JSONValidator = JSONValidator(self.__schema)
+        validator: CompiledSchema = schema_registry.get(EXPOSURE_INFORMATION_SCHEMA_FILEPATH)
         self.report['valid'] = True
+        if self.limits is not None:
+            self.limits.reset()
         graph: VerticalValidator = VerticalValidator(self.general_info, self)
 
-        for record_index, record in enumerate(self.exposure_data):
-            ptx_id: str = record[PTX_ID_LABEL]
-            label: str = f"Record at line {record_index + 2} ({ptx_id})"
-            errors: Generator = validator.iter_errors(record)
-            self.current_record = {'data': record, 'label': label}
+        with QueryCounter() as counter:
+            try:
+                if self.incremental is not None:
+                    self.incremental.validate(self, validator, graph)
+                else:
+                    self.validate_records(validator, graph)
+            finally:
+                if self.__reader:
+                    self.__reader.close()
+                    self.__reader = None
+        self.__add_omitted_errors()
+        self.query_count = counter.count
+        LOGGER.info(f"Validation of file {self.file_id} issued {self.query_count} queries.")
+
+    def validate_records(self, validator: CompiledSchema, graph: VerticalValidator) -> None:
+        """ Validates all the exposure records, then the study design they describe.
+
+        :param validator: The compiled exposure information schema.
+        :param graph: The vertical validator collecting the study design.
+        """
+        self.identifier_errors = None
+        if not self.streaming and (self.columnar or
+                                   (self.columnar is None and len(self.exposure_data) >= COLUMNAR_THRESHOLD)):
+            self.identifier_errors = validate_identifier_columns(self.exposure_data, self.general_info, self.context)
+        for record_index, record in enumerate(self.iter_records()):
+            self.validate_record(record_index, record, validator, graph)
+        graph.validate()
+
+    def validate_record(self, record_index: int, record: dict, validator: CompiledSchema, graph: VerticalValidator) -> None:
+        """ Validates a single exposure record against the schema, the study design and the identifier rules.
 
-            for error in errors:
-                message: str = "This field is required." if "None is not of type" in error.message else error.message
-                field: str = error.message.split("'")[1] if not error.path else error.path[0]
-                self.add_error(label, message, field)
+        :param record_index: The index of the record in the exposure sheet.
+        :param record: The record to validate.
+        :param validator: The compiled exposure information schema.
+        :param graph: The vertical validator collecting the study design.
+        """
+        ptx_id: str = record[PTX_ID_LABEL]
+        label: str = f"Record at line {record_index + 2} ({ptx_id})"
+        self.current_record = {'data': record, 'label': label, 'line': record_index + 2}
 
-            graph.add_node(self.current_record)
+        for message, field in validator.iter_errors(record):
+            if "None is not of type" in message:
+                message = "This field is required."
+            self.add_error(label, message, field)
 
-            validate_identifier(excel_validator=self, record_index=record_index)
+        graph.add_node(self.current_record)
 
-        graph.validate()
+        errors: list | None = self.identifier_errors[record_index] if self.identifier_errors else None
+        validate_identifier(excel_validator=self, record_index=record_index, errors=errors)
 
     def add_error(self, label: str, message: str, field: str) -> None:
         """ Adds an error to the report.
@@ -115,10 +278,19 @@ class ExcelValidator:
         :return: None
         """
         self.report['valid'] = False
+        if self.limits is not None and not self.limits.allow(message, field):
+            return
         if label not in self.report['errors']:
             self.report['errors'][label] = []
         self.report['errors'][label].append({'message': message, 'field_concerned': field})
 
+    def __add_omitted_errors(self) -> None:
+        """ Summarise the errors omitted because of the limits, if any. """
+        if self.limits is None or not self.limits.omitted:
+            return
+        self.report['errors'][OMITTED_ERRORS_LABEL] = self.limits.summaries()
+        LOGGER.info(f"Validation of file {self.file_id} omitted {self.limits.omitted_count} errors.")
+
     def __update_file_record(self) -> None:
         """ Updates the 'validated' property of the file record in the database.
         'success': if the validation was successful.
@@ -137,19 +309,45 @@ class ExternalExcelValidator(ExcelValidator):
     """ Variation of the ExcelValidator for external files that doesn't use the database.
 
     :param file_id: The file id to validate.
+    :param streaming: If True, the exposure records are read and validated one row at a time.
+    :param context: The reference data used to validate the identifiers.
+    :param columnar: If True, the identifiers of all the records are validated at once with vectorized operations.
+    :param on_status: An optional function called with the new status when the validation progresses.
+    :param cache: An optional cache of reports keyed by the file checksum.
+    :param limits: Optional caps on the number of errors kept in the report per field and per rule.
+    :param record: Unused, external files have no file record.
+    :param incremental: An optional store of what was kept of the previous validations.
     """
 
-    def __init__(self, file_id: str) -> None:
+    def __init__(
+            self,
+            file_id: str,
+            streaming: bool = False,
+            context: ValidationContext | None = None,
+            columnar: bool | None = None,
+            on_status: Callable[[str], None] | None = None,
+            cache: ReportCache | None = None,
+            limits: ErrorLimits | None = None,
+            record: bool = True,
+            incremental: IncrementalStore | None = None
+    ) -> None:
         """ The validator constructor. """
-        super().__init__(file_id)
+        super().__init__(
+            file_id, streaming=streaming, context=context, columnar=columnar, on_status=on_status, cache=cache,
+            limits=limits, record=record, incremental=incremental
+        )
 
     def validate(self) -> None:
         """ Validates the file. """
-        file: str | None = self.download_file()
-        if file:
-            self.filepath = file
-        self.validate_file()
-        remove(self.filepath)
+        self.validate_content()
+
+    def get_checksum(self) -> str | None:
+        """ Get the MD5 checksum of the file from Google Drive.
+
+        :return: The checksum or None if Google Drive doesn't provide one.
+        """
+        gdrive: GoogleDriveConnector = GoogleDriveConnector()
+        return gdrive.get_checksum(self.file_id)
 
     def download_file(self) -> str | None:
         """ Download the file from Google Drive.
@@ -181,8 +379,8 @@ class VerticalValidator:
         self.compounds: dict = {}
         self.extraction_blanks: int = 0
 
-        self.box_positions: list[str] = []
-        self.collection_order: list[int] = []
+        self.box_positions: DuplicateIndex = DuplicateIndex()
+        self.collection_order: DuplicateIndex = DuplicateIndex()
 
     def add_node(self, node: dict) -> None:
         """ Add the node and validates it.
@@ -190,51 +388,25 @@ class VerticalValidator:
         :param node: The node to add.
         :return: None
         """
-        message: str
         label: str = node['label']
         compound_name: str = node['data'].get('compound_name', None)
         replicate: int = node['data'].get('replicate', None)
         timepoint: int = node['data'].get('timepoint_(hours)', None)
-        dose: int = node['data'].get('dose_code', None)
-        box_position: str = (f"{node['data'].get('box_id')}"
-                             f"_{node['data'].get('box_row')}"
-                             f"_{node['data'].get('box_column')}")
+        box_position: str = get_box_position(node['data'])
         collection_order: int = node['data'].get('collection_order')
+        line: int = node.get('line', 0)
 
         if compound_name:
-            if box_position in self.box_positions:
-                message = f"Box position {box_position} is already used."
-                self.validator.add_error(label, message, 'box_position')
-            else:
-                self.box_positions.append(box_position)
-
-            if collection_order in self.collection_order:
-                message = f"Collection order {collection_order} is already used."
-                self.validator.add_error(label, message, 'collection_order')
-            else:
-                self.collection_order.append(collection_order)
-
-            if compound_name not in self.controls_keys and replicate > self.replicates:
-                message = f"Replicate {replicate} is greater than the number of replicates {self.replicates}."
-                self.validator.add_error(label, message, 'replicate')
-
-            if timepoint not in self.timepoints and compound_name != 'EXTRACTION BLANK':
-                message = f"Timepoint {timepoint} is not in the list of timepoints {self.timepoints}."
-                self.validator.add_error(label, message, 'timepoint_(hours)')
+            box_duplicated: bool = self.box_positions.add(box_position, line) is not None
+            order_duplicated: bool = self.collection_order.add(collection_order, line) is not None
+            for message, field in [
+                *self.duplicate_errors(box_position, box_duplicated, collection_order, order_duplicated),
+                *self.check_node(node['data'])
+            ]:
+                self.validator.add_error(label, message, field)
 
             if compound_name == 'EXTRACTION BLANK':
                 self.extraction_blanks += 1
-                if timepoint != 0:
-                    message = "Extraction blank must have a timepoint of 0."
-                    self.validator.add_error(label, message, 'timepoint_(hours)')
-
-            if compound_name in self.controls_keys:
-                if dose != 0:
-                    message = "Controls must have a dose of 0."
-                    self.validator.add_error(label, message, 'dose_code')
-                if replicate > self.controls:
-                    message = f"Control {replicate} is greater than the number of controls {self.controls}."
-                    self.validator.add_error(label, message, 'replicate')
 
             if compound_name not in self.compounds:
                 self.compounds[compound_name] = {
@@ -250,64 +422,149 @@ class VerticalValidator:
             self.compounds[compound_name]['replicates'][timepoint] += 1
             self.compounds[compound_name]['timepoints'][replicate] += 1
 
+    @staticmethod
+    def duplicate_errors(
+            box_position: str, box_duplicated: bool, collection_order: int, order_duplicated: bool
+    ) -> list[tuple[str, str]]:
+        """ Build the errors of a node whose box position or collection order is already used by a previous node.
+
+        :param box_position: The box position of the node.
+        :param box_duplicated: Whether the box position is already used.
+        :param collection_order: The collection order of the node.
+        :param order_duplicated: Whether the collection order is already used.
+        :return: The (message, field) errors.
+        """
+        errors: list[tuple[str, str]] = []
+        if box_duplicated:
+            errors.append((f"Box position {box_position} is already used.", 'box_position'))
+        if order_duplicated:
+            errors.append((f"Collection order {collection_order} is already used.", 'collection_order'))
+        return errors
+
+    def check_node(self, data: dict) -> list[tuple[str, str]]:
+        """ Run the checks of a node that don't depend on the other nodes.
+
+        :param data: The exposure record of the node, which must have a compound name.
+        :return: The (message, field) errors.
+        """
+        errors: list[tuple[str, str]] = []
+        compound_name: str = data.get('compound_name', None)
+        replicate: int = data.get('replicate', None)
+        timepoint: int = data.get('timepoint_(hours)', None)
+        dose: int = data.get('dose_code', None)
+
+        if compound_name not in self.controls_keys and replicate > self.replicates:
+            errors.append((f"Replicate {replicate} is greater than the number of replicates {self.replicates}.",
+                           'replicate'))
+
+        if timepoint not in self.timepoints and compound_name != 'EXTRACTION BLANK':
+            errors.append((f"Timepoint {timepoint} is not in the list of timepoints {self.timepoints}.",
+                           'timepoint_(hours)'))
+
+        if compound_name == 'EXTRACTION BLANK' and timepoint != 0:
+            errors.append(("Extraction blank must have a timepoint of 0.", 'timepoint_(hours)'))
+
+        if compound_name in self.controls_keys:
+            if dose != 0:
+                errors.append(("Controls must have a dose of 0.", 'dose_code'))
+            if replicate > self.controls:
+                errors.append((f"Control {replicate} is greater than the number of controls {self.controls}.",
+                               'replicate'))
+        return errors
+
     def validate(self) -> None:
         """ Validates the study design after all nodes have been added
 
         :return: None
         """
-        if self.extraction_blanks != self.blanks:
-            message = f"The number of extraction blanks should be {self.blanks} but is {self.extraction_blanks}"
-            self.validator.add_error('Extraction blanks', message, 'compound_name')
+        for label, message, field in self.blank_errors(self.extraction_blanks):
+            self.validator.add_error(label, message, field)
+        for compound_name in self.validated_compounds(self.compounds):
+            for label, message, field in self.compound_errors(compound_name, self.compounds[compound_name]):
+                self.validator.add_error(label, message, field)
 
-        for compound_name, compound_val in self.compounds.items():
-            if compound_name == 'EXTRACTION BLANK':
-                break
+    def blank_errors(self, extraction_blanks: int) -> list[tuple[str, str, str]]:
+        """ Check the number of extraction blanks against the general information.
+
+        :param extraction_blanks: The number of extraction blanks.
+        :return: The (label, message, field) errors.
+        """
+        if extraction_blanks == self.blanks:
+            return []
+        message: str = f"The number of extraction blanks should be {self.blanks} but is {extraction_blanks}"
+        return [('Extraction blanks', message, 'compound_name')]
 
+    def validated_compounds(self, compound_names: Iterable[str]) -> Iterator[str]:
+        """ Select the compounds whose design is validated: the compounds are checked in the order they first appear,
+        up to the extraction blank or up to the first control included.
+
+        :param compound_names: The compound names in the order they first appear.
+        :return: The compound names to validate.
+        """
+        for compound_name in compound_names:
+            if compound_name == 'EXTRACTION BLANK':
+                return
+            yield compound_name
             if compound_name in self.controls_keys:
-                self.validate_controls(compound_val)
-                break
-
-            for timepoint in compound_val['replicates']:
-                if timepoint in self.timepoints:
-                    replicate: int = compound_val['replicates'][timepoint]
-                    index: int = self.timepoints.index(timepoint) + 1
-                    if replicate < self.replicates:
-                        message = f"Replicate {index} is missing {self.replicates - replicate } timespoints(s)."
-                        self.validator.add_error(compound_name, message, 'timepoints')
-                    elif replicate > self.replicates:
-                        message = f"Replicate {index} has too many timepoints."
-                        self.validator.add_error(compound_name, message, 'timepoints')
-
-            for replicate in compound_val['timepoints']:
-                timepoint = compound_val['timepoints'][replicate]
-                if timepoint > len(self.timepoints):
-                    message = f"Timepoint {replicate} has greater number of replicates {timepoint} " \
-                              f"than expected ({self.replicates})."
-                    self.validator.add_error(compound_name, message, 'replicates')
-                elif timepoint < len(self.timepoints):
-                    message = f"Timepoint {replicate} is missing {len(self.timepoints) - timepoint} replicate(s)."
-                    self.validator.add_error(compound_name, message, 'replicates')
-
-    def validate_controls(self, compound_values: dict) -> None:
+                return
+
+    def compound_errors(self, compound_name: str, compound_values: dict) -> list[tuple[str, str, str]]:
+        """ Validates the number of replicates and timepoints of a compound against the general information.
+
+        :param compound_name: The compound name.
+        :param compound_values: The number of records of the compound per timepoint and per replicate.
+        :return: The (label, message, field) errors.
+        """
+        if compound_name in self.controls_keys:
+            return self.control_errors(compound_values)
+
+        message: str
+        errors: list[tuple[str, str, str]] = []
+        for timepoint in compound_values['replicates']:
+            if timepoint in self.timepoints:
+                replicate: int = compound_values['replicates'][timepoint]
+                index: int = self.timepoints.index(timepoint) + 1
+                if replicate < self.replicates:
+                    message = f"Replicate {index} is missing {self.replicates - replicate } timespoints(s)."
+                    errors.append((compound_name, message, 'timepoints'))
+                elif replicate > self.replicates:
+                    message = f"Replicate {index} has too many timepoints."
+                    errors.append((compound_name, message, 'timepoints'))
+
+        for replicate in compound_values['timepoints']:
+            timepoint = compound_values['timepoints'][replicate]
+            if timepoint > len(self.timepoints):
+                message = f"Timepoint {replicate} has greater number of replicates {timepoint} " \
+                          f"than expected ({self.replicates})."
+                errors.append((compound_name, message, 'replicates'))
+            elif timepoint < len(self.timepoints):
+                message = f"Timepoint {replicate} is missing {len(self.timepoints) - timepoint} replicate(s)."
+                errors.append((compound_name, message, 'replicates'))
+        return errors
+
+    def control_errors(self, compound_values: dict) -> list[tuple[str, str, str]]:
         """ Validates the controls points against the general information. Verify the number of replicates and
         timepoints.
 
         :param compound_values: The compound values to validate.
+        :return: The (label, message, field) errors.
         """
         message: str
+        errors: list[tuple[str, str, str]] = []
         for timepoint, replicate in compound_values['replicates'].items():
             if replicate < self.controls:
                 message = f"Control at timepoint {timepoint} is missing {self.controls - replicate} replicate(s)."
-                self.validator.add_error('Control', message, 'replicates')
+                errors.append(('Control', message, 'replicates'))
             elif replicate > self.controls:
                 message = f"Control at timepoint {timepoint} has too many replicates ({replicate})."
-                self.validator.add_error('Control', message, 'replicates')
+                errors.append(('Control', message, 'replicates'))
 
         for replicate, timepoint in compound_values['timepoints'].items():
             if timepoint > len(self.timepoints):
                 message = f"Timepoint {replicate} has greater number of controls {timepoint} " \
                           f"than expected ({self.controls})."
-                self.validator.add_error('Control', message, 'timepoints')
+                errors.append(('Control', message, 'timepoints'))
             elif timepoint < len(self.timepoints):
                 message = f"Timepoint {replicate} is missing {len(self.timepoints) - timepoint} control(s)."
-                self.validator.add_error('Control', message, 'timepoints')
+                errors.append(('Control', message, 'timepoints'))
+        return errors
@@ -0,0 +1,112 @@
+""" Indexes used to detect duplicated values in the exposure records in constant time.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Hashable
+
+
+class DuplicateIndex:
+    """ Map each key to the position, line or record index, where it was first seen. """
+
+    def __init__(self) -> None:
+        """ The index constructor. """
+        self.__positions: dict[Hashable, int] = {}
+
+    def add(self, key: Hashable, position: int) -> int | None:
+        """ Register a key if it wasn't seen before.
+
+        :param key: The key to register.
+        :param position: The position where the key is found.
+        :return: The position where the key was first seen if it is a duplicate, None otherwise.
+        """
+        if key in self.__positions:
+            return self.__positions[key]
+        self.__positions[key] = position
+        return None
+
+    def get(self, key: Hashable) -> int | None:
+        """ Get the position where a key was first seen.
+
+        :param key: The key to look for.
+        :return: The position or None if the key was never seen.
+        """
+        return self.__positions.get(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """ Whether the key was already seen. """
+        return key in self.__positions
+
+    def __len__(self) -> int:
+        """ The number of distinct keys. """
+        return len(self.__positions)
+
+
+def get_box_position(data: dict) -> str:
+    """ Build the box position of an exposure record.
+
+    :param data: The exposure record.
+    :return: The box position.
+    """
+    return f"{data.get('box_id')}_{data.get('box_row')}_{data.get('box_column')}"
+
+
+class PositionIndex:
+    """ Map each key to the sorted positions of all the records holding it. Unlike the DuplicateIndex, records can be
+    removed, so that the first position of a key stays right when a record is replaced.
+    """
+
+    def __init__(self) -> None:
+        """ The index constructor. """
+        self.__positions: dict[Hashable, list[int]] = {}
+
+    def add(self, key: Hashable, position: int) -> None:
+        """ Register the position of a record holding a key.
+
+        :param key: The key.
+        :param position: The position of the record.
+        """
+        insort(self.__positions.setdefault(key, []), position)
+
+    def remove(self, key: Hashable, position: int) -> None:
+        """ Forget the position of a record holding a key.
+
+        :param key: The key.
+        :param position: The position of the record.
+        """
+        positions: list[int] = self.__positions[key]
+        del positions[bisect_left(positions, position)]
+        if not positions:
+            del self.__positions[key]
+
+    def first(self, key: Hashable) -> int | None:
+        """ Get the first position of a key.
+
+        :param key: The key.
+        :return: The position or None if no record holds the key.
+        """
+        positions: list[int] | None = self.__positions.get(key)
+        return positions[0] if positions else None
+
+    def count(self, key: Hashable) -> int:
+        """ Count the records holding a key.
+
+        :param key: The key.
+        :return: The number of records.
+        """
+        return len(self.__positions.get(key, ()))
+
+    def counts(self) -> dict[Hashable, int]:
+        """ Count the records holding each key.
+
+        :return: The number of records per key, in the order the keys first appear.
+        """
+        return {key: len(positions) for key, positions in sorted(self.__positions.items(), key=lambda item: item[1][0])}
+
+    def __contains__(self, key: Hashable) -> bool:
+        """ Whether a record holds the key. """
+        return key in self.__positions
+
+    def __len__(self) -> int:
+        """ The number of distinct keys. """
+        return len(self.__positions)
@@ -0,0 +1,353 @@
+""" Incremental validation of the files validated before. The results of the checks of a single record only depend on its
+content, so they are kept per record fingerprint and reused on the next validation of the file. The checks spanning
+several records are kept as indexes of the positions holding each identifier, box position, collection order and
+compound: only the entries of the records that changed are updated, and only the study design of the compounds they
+touch is validated again. A change of the general information, the schema or the reference data discards what was
+kept and the file is validated in full.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, NamedTuple, Optional
+
+from ptmd.const import PTX_ID_LABEL
+from .cache import reference_fingerprint
+from .context import ValidationContext
+from .duplicates import PositionIndex, get_box_position
+from .schema import CompiledSchema
+from .validate_identifier import validate_identifier_fields, duplicated_identifier_message
+
+
+INCREMENTAL_RECORDS: int = 100000
+
+Errors = list[tuple[str, str]]
+
+
+class RecordFacts(NamedTuple):
+    """ The values of a record used by the checks spanning several records. """
+    ptx_id: str
+    compound_name: Any
+    timepoint: Any
+    replicate: Any
+    box_position: str
+    collection_order: Any
+
+
+class RecordResult(NamedTuple):
+    """ The outcome of the checks of a single record. The identifier errors are None when the identifier checks failed
+    on the record: they are then run again by the validator, which decides whether the failure stops the validation.
+    """
+    facts: RecordFacts
+    schema_errors: Errors
+    node_errors: Errors
+    identifier_errors: Optional[Errors]
+
+
+class DesignIndex:
+    """ The positions of the records of each compound, per timepoint and per replicate, from which the counters of the
+    VerticalValidator are rebuilt.
+    """
+
+    def __init__(self) -> None:
+        """ The index constructor. """
+        self.compounds: PositionIndex = PositionIndex()
+        self.timepoints: dict[Any, PositionIndex] = {}
+        self.replicates: dict[Any, PositionIndex] = {}
+
+    def add(self, facts: RecordFacts, position: int) -> None:
+        """ Register a record of a compound.
+
+        :param facts: The values of the record.
+        :param position: The position of the record.
+        """
+        self.compounds.add(facts.compound_name, position)
+        self.timepoints.setdefault(facts.compound_name, PositionIndex()).add(facts.timepoint, position)
+        self.replicates.setdefault(facts.compound_name, PositionIndex()).add(facts.replicate, position)
+
+    def remove(self, facts: RecordFacts, position: int) -> None:
+        """ Forget a record of a compound.
+
+        :param facts: The values of the record.
+        :param position: The position of the record.
+        """
+        self.compounds.remove(facts.compound_name, position)
+        self.timepoints[facts.compound_name].remove(facts.timepoint, position)
+        self.replicates[facts.compound_name].remove(facts.replicate, position)
+        if facts.compound_name not in self.compounds:
+            del self.timepoints[facts.compound_name], self.replicates[facts.compound_name]
+
+    def values(self, compound_name: Any) -> dict:
+        """ Build the counters of a compound as the VerticalValidator does.
+
+        :param compound_name: The compound name.
+        :return: The number of records per timepoint and per replicate, in the order they first appear.
+        """
+        return {
+            'replicates': self.timepoints[compound_name].counts(),
+            'timepoints': self.replicates[compound_name].counts()
+        }
+
+
+class FileState:
+    """ What is kept of a file between two validations.
+
+    :param general: The fingerprint of the general information, the schema and the reference data.
+    """
+
+    def __init__(self, general: str) -> None:
+        """ The state constructor. """
+        self.general: str = general
+        self.fingerprints: list[str] = []
+        self.results: dict[str, RecordResult] = {}
+        self.identifiers: PositionIndex = PositionIndex()
+        self.box_positions: PositionIndex = PositionIndex()
+        self.collection_orders: PositionIndex = PositionIndex()
+        self.design: DesignIndex = DesignIndex()
+        self.compound_errors: dict[Any, list[tuple[Any, str, str]]] = {}
+
+    def add(self, facts: RecordFacts, position: int, touched: set) -> None:
+        """ Register the values of a record in the indexes.
+
+        :param facts: The values of the record.
+        :param position: The position of the record.
+        :param touched: The compounds whose design changed, updated in place.
+        """
+        self.identifiers.add(facts.ptx_id, position)
+        if facts.compound_name:
+            self.box_positions.add(facts.box_position, position)
+            self.collection_orders.add(facts.collection_order, position)
+            self.design.add(facts, position)
+            touched.add(facts.compound_name)
+
+    def remove(self, facts: RecordFacts, position: int, touched: set) -> None:
+        """ Remove the values of a record from the indexes.
+
+        :param facts: The values of the record.
+        :param position: The position of the record.
+        :param touched: The compounds whose design changed, updated in place.
+        """
+        self.identifiers.remove(facts.ptx_id, position)
+        if facts.compound_name:
+            self.box_positions.remove(facts.box_position, position)
+            self.collection_orders.remove(facts.collection_order, position)
+            self.design.remove(facts, position)
+            touched.add(facts.compound_name)
+
+
+class IncrementalStore:
+    """ Keep the state of the most recently validated files, within a budget of records.
+
+    :param max_records: The maximum total number of records of the files kept in the store.
+    """
+
+    def __init__(self, max_records: int = INCREMENTAL_RECORDS) -> None:
+        """ The store constructor. """
+        self.max_records: int = max_records
+        self.records: int = 0
+        self.__files: OrderedDict[int | str, FileState] = OrderedDict()
+        self.__lock: Lock = Lock()
+
+    def take(self, file_id: int | str) -> FileState | None:
+        """ Remove the state of a file from the store and hand it to the validation of the file. Another validation of
+        the same file running meanwhile doesn't find it and validates the file in full.
+
+        :param file_id: The file id.
+        :return: The state or None if the file wasn't validated before.
+        """
+        with self.__lock:
+            state: FileState | None = self.__files.pop(file_id, None)
+            if state is not None:
+                self.records -= len(state.fingerprints)
+            return state
+
+    def put(self, file_id: int | str, state: FileState) -> None:
+        """ Store the state of a file, evicting the least recently validated files beyond the budget of records.
+
+        :param file_id: The file id.
+        :param state: The state of the file.
+        """
+        if len(state.fingerprints) > self.max_records:
+            return
+        with self.__lock:
+            previous: FileState | None = self.__files.pop(file_id, None)
+            if previous is not None:
+                self.records -= len(previous.fingerprints)
+            self.__files[file_id] = state
+            self.records += len(state.fingerprints)
+            while self.records > self.max_records:
+                self.records -= len(self.__files.popitem(last=False)[1].fingerprints)
+
+    def clear(self) -> None:
+        """ Remove all the states. """
+        with self.__lock:
+            self.__files.clear()
+            self.records = 0
+
+    def validate(self, validator: Any, schema: CompiledSchema, graph: Any) -> None:
+        """ Validate the records of a file, reusing what was kept of its previous validation. The errors are added to
+        the validator in the same order as a full validation.
+
+        :param validator: The ExcelValidator whose records are validated.
+        :param schema: The compiled exposure information schema.
+        :param graph: The VerticalValidator of the file.
+        """
+        general: str = general_fingerprint(validator.general_info, schema, validator.context)
+        state: FileState | None = self.take(validator.file_id)
+        if state is None or state.general != general:
+            state = FileState(general)
+        validate_records(validator, schema, graph, state)
+        self.put(validator.file_id, state)
+
+    def __len__(self) -> int:
+        """ The number of files kept in the store. """
+        return len(self.__files)
+
+
+class ErrorCollector:
+    """ Stand-in for the ExcelValidator collecting the identifier errors of a single record.
+
+    :param record: The record to check.
+    :param general_info: The general information of the file.
+    :param context: The reference data used to validate the identifiers.
+    """
+
+    def __init__(self, record: dict, general_info: dict, context: ValidationContext) -> None:
+        """ The collector constructor. """
+        self.current_record: dict = {'data': record, 'label': ''}
+        self.general_info: dict = general_info
+        self.context: ValidationContext = context
+        self.errors: Errors = []
+
+    def add_error(self, label: str, message: str, field: str) -> None:
+        """ Collect an error.
+
+        :param label: The label of the record, unused.
+        :param message: The error message.
+        :param field: The field concerned by the error.
+        """
+        self.errors.append((message, field))
+
+
+def general_fingerprint(general_info: dict, schema: CompiledSchema, context: ValidationContext) -> str:
+    """ Compute the fingerprint of everything the records are validated against.
+
+    :param general_info: The general information of the file.
+    :param schema: The exposure information schema.
+    :param context: The reference data used to validate the identifiers.
+    :return: The hexadecimal fingerprint.
+    """
+    return reference_fingerprint(
+        tuple(general_info.items()), schema.schema, sorted(context.organisms.items()), sorted(context.chemicals.items())
+    )
+
+
+def check_record(record: dict, validator: Any, schema: CompiledSchema, graph: Any) -> RecordResult:
+    """ Run the checks of a record that don't depend on the other records.
+
+    :param record: The record.
+    :param validator: The ExcelValidator whose records are validated.
+    :param schema: The compiled exposure information schema.
+    :param graph: The VerticalValidator of the file.
+    :return: The result of the checks.
+    """
+    facts: RecordFacts = RecordFacts(
+        record[PTX_ID_LABEL], record.get('compound_name', None), record.get('timepoint_(hours)', None),
+        record.get('replicate', None), get_box_position(record), record.get('collection_order')
+    )
+    schema_errors: Errors = []
+    for message, field in schema.iter_errors(record):
+        if "None is not of type" in message:
+            message = "This field is required."
+        schema_errors.append((message, field))
+    node_errors: Errors = graph.check_node(record) if facts.compound_name else []
+
+    collector: ErrorCollector = ErrorCollector(record, validator.general_info, validator.context)
+    identifier_errors: Errors | None = collector.errors
+    try:
+        validate_identifier_fields(collector)
+    except Exception:
+        identifier_errors = None
+    return RecordResult(facts, schema_errors, node_errors, identifier_errors)
+
+
+def validate_records(validator: Any, schema: CompiledSchema, graph: Any, state: FileState) -> None:
+    """ Validate the records of a file against the state of its previous validation, then update the state.
+
+    :param validator: The ExcelValidator whose records are validated.
+    :param schema: The compiled exposure information schema.
+    :param graph: The VerticalValidator of the file.
+    :param state: The state of the previous validation, empty for a full validation.
+    """
+    previous: list[str] = state.fingerprints
+    fingerprints: list[str] = []
+    results: dict[str, RecordResult] = {}
+    touched: set = set()
+    for position, record in enumerate(validator.iter_records()):
+        fingerprint: str = reference_fingerprint(tuple(record.items()))
+        result: RecordResult | None = results.get(fingerprint) or state.results.get(fingerprint)
+        if result is None:
+            result = check_record(record, validator, schema, graph)
+        results[fingerprint] = result
+        fingerprints.append(fingerprint)
+        if position >= len(previous) or previous[position] != fingerprint:
+            if position < len(previous):
+                state.remove(state.results[previous[position]].facts, position, touched)
+            state.add(result.facts, position, touched)
+        add_record_errors(validator, graph, record, position, result, state)
+    for position in range(len(fingerprints), len(previous)):
+        state.remove(state.results[previous[position]].facts, position, touched)
+
+    state.fingerprints = fingerprints
+    state.results = results
+    for compound_name in touched:
+        state.compound_errors.pop(compound_name, None)
+    for label, message, field in graph.blank_errors(state.design.compounds.count('EXTRACTION BLANK')):
+        validator.add_error(label, message, field)
+    for compound_name in graph.validated_compounds(state.design.compounds.counts()):
+        if compound_name not in state.compound_errors:
+            state.compound_errors[compound_name] = graph.compound_errors(
+                compound_name, state.design.values(compound_name)
+            )
+        for label, message, field in state.compound_errors[compound_name]:
+            validator.add_error(label, message, field)
+
+
+def add_record_errors(
+        validator: Any, graph: Any, record: dict, position: int, result: RecordResult, state: FileState
+) -> None:
+    """ Add the errors of a record to the validator, in the same order as a full validation.
+
+    :param validator: The ExcelValidator whose records are validated.
+    :param graph: The VerticalValidator of the file.
+    :param record: The record.
+    :param position: The position of the record.
+    :param result: The result of the checks of the record.
+    :param state: The state holding the positions of the records.
+    """
+    facts: RecordFacts = result.facts
+    label: str = f"Record at line {position + 2} ({facts.ptx_id})"
+    validator.current_record = {'data': record, 'label': label, 'line': position + 2}
+    errors: Errors = list(result.schema_errors)
+    if facts.compound_name:
+        errors.extend(graph.duplicate_errors(
+            facts.box_position, state.box_positions.first(facts.box_position) != position,
+            facts.collection_order, state.collection_orders.first(facts.collection_order) != position
+        ))
+        errors.extend(result.node_errors)
+    first: int | None = state.identifiers.first(facts.ptx_id)
+    if first is not None and first != position:
+        errors.append((duplicated_identifier_message(facts.ptx_id, position, first), PTX_ID_LABEL))
+    for message, field in errors:
+        validator.add_error(label, message, field)
+
+    if not validator.report['valid']:
+        return
+    if result.identifier_errors is None:
+        validate_identifier_fields(validator)
+        return
+    for message, field in result.identifier_errors:
+        validator.add_error(label, message, field)
+
+
+incremental_store: IncrementalStore = IncrementalStore()
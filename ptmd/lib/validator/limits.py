@@ -0,0 +1,80 @@
+""" Bounds on the number of errors kept in a validation report. A badly formatted sheet can raise the same error on
+every record: past the configured caps, the errors are only counted and replaced by a single "N more similar errors"
+summary per field and rule. A rule is the error message with its quoted values and numbers blanked out.
+"""
+from __future__ import annotations
+
+from re import compile, Pattern
+
+
+OMITTED_ERRORS_LABEL: str = 'Omitted errors'
+RULE_VALUES: Pattern = compile(r"'[^']*'|\"[^\"]*\"|\[[^\]]*\]|\d+(?:\.\d+)?")
+
+
+class ErrorLimits:
+    """ Count the errors of a validation and decide which ones are kept in the report.
+
+    :param per_field: The maximum number of errors kept for a field. Unlimited if None.
+    :param per_rule: The maximum number of errors kept for a rule on a field. Unlimited if None.
+    """
+
+    def __init__(self, per_field: int | None = None, per_rule: int | None = None) -> None:
+        """ The limits constructor. """
+        self.per_field: int | None = per_field
+        self.per_rule: int | None = per_rule
+        self.fields: dict[str, int] = {}
+        self.rules: dict[tuple[str, str], int] = {}
+        self.omitted: dict[tuple[str, str], list] = {}
+
+    def reset(self) -> None:
+        """ Forget the errors counted during the previous validation. """
+        self.fields = {}
+        self.rules = {}
+        self.omitted = {}
+
+    def allow(self, message: str, field: str) -> bool:
+        """ Count an error and tell whether it should be kept in the report.
+
+        :param message: The error message.
+        :param field: The field concerned by the error.
+        :return: True if the error is within the caps, False if it should be omitted.
+        """
+        key: tuple[str, str] = (field, rule_of(message))
+        field_count: int = self.fields.get(field, 0)
+        rule_count: int = self.rules.get(key, 0)
+        if (self.per_field is not None and field_count >= self.per_field) or \
+                (self.per_rule is not None and rule_count >= self.per_rule):
+            if key not in self.omitted:
+                self.omitted[key] = [0, message]
+            self.omitted[key][0] += 1
+            return False
+        self.fields[field] = field_count + 1
+        self.rules[key] = rule_count + 1
+        return True
+
+    @property
+    def omitted_count(self) -> int:
+        """ The total number of omitted errors. """
+        return sum(count for count, _ in self.omitted.values())
+
+    def summaries(self) -> list[dict]:
+        """ Build one report entry per field and rule that had errors omitted.
+
+        :return: The entries, with the same keys as the errors of the report.
+        """
+        return [
+            {
+                'message': f"{count} more similar error{'s' if count > 1 else ''}, such as: {example}",
+                'field_concerned': field,
+                'omitted': count
+            } for (field, _), (count, example) in self.omitted.items()
+        ]
+
+
+def rule_of(message: str) -> str:
+    """ Get the rule of an error message by blanking out the quoted values, lists and numbers.
+
+    :param message: The error message.
+    :return: The rule.
+    """
+    return RULE_VALUES.sub('*', message)
@@ -0,0 +1,75 @@
+""" Streaming reader for the spreadsheets to validate. Rows are read one at a time with the openpyxl read-only iterator
+so the memory footprint of the validation stays flat regardless of the size of the sheet.
+"""
+from __future__ import annotations
+
+from typing import Any, Generator
+
+from openpyxl import load_workbook
+from openpyxl.workbook.workbook import Workbook
+
+
+# Strings that pandas interprets as missing values when parsing a sheet. They are mapped to None to produce the same
+# records as the pandas based loader.
+NA_VALUES: frozenset[str] = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA',
+    'NULL', 'NaN', 'n/a', 'nan', 'null'
+])
+
+
+class SheetReader:
+    """ Read the sheets of a workbook row by row without loading the whole workbook in memory.
+
+    :param filepath: The path to the xlsx file to read.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        """ The reader constructor. """
+        self.filepath: str = filepath
+        self.__workbook: Workbook = load_workbook(filepath, read_only=True, data_only=True)
+
+    def iter_records(self, sheet_name: str) -> Generator[dict, None, None]:
+        """ Iterate over the records of the given sheet. The first row is used as the header. Empty rows are skipped.
+
+        :param sheet_name: The name of the sheet to read.
+        :return: A generator of records. A single dictionary is reused and updated in place for each row.
+        """
+        rows: Generator = self.__workbook[sheet_name].iter_rows(values_only=True)
+        header: tuple | None = next(rows, None)
+        if not header:
+            return
+        columns: list[str] = [str(column) for column in header]
+        width: int = len(columns)
+        record: dict = dict.fromkeys(columns)
+        for row in rows:
+            values: list = [clean_value(value) for value in row[:width]]
+            if all(value is None for value in values):
+                continue
+            values += [None] * (width - len(values))
+            record.update(zip(columns, values))
+            yield record
+
+    def get_first_record(self, sheet_name: str) -> dict:
+        """ Get a copy of the first record of the given sheet.
+
+        :param sheet_name: The name of the sheet to read.
+        :return: The first record of the sheet.
+        """
+        for record in self.iter_records(sheet_name):
+            return dict(record)
+        raise ValueError(f"Sheet '{sheet_name}' does not contain any record.")
+
+    def close(self) -> None:
+        """ Close the underlying workbook and release the file handle. """
+        self.__workbook.close()
+
+
+def clean_value(value: Any) -> Any:
+    """ Normalise a cell value the same way the pandas loader does: strings representing missing values become None.
+
+    :param value: The value of the cell.
+    :return: The cleaned value.
+    """
+    if isinstance(value, str) and value in NA_VALUES:
+        return None
+    return value
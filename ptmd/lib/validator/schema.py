@@ -0,0 +1,285 @@
+""" Compiled and cached JSON schemas used to validate the exposure records. The schemas are loaded once per process and
+reloaded only when the file changes on disk. The per-field rules are compiled into plain python checkers producing the
+same messages as the Draft4 validator, which falls back to the generic jsonschema dispatch for unsupported keywords.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Generator
+from json import loads
+from numbers import Number
+from os import stat
+from re import compile as compile_pattern, Pattern
+from threading import Lock
+
+from jsonschema import Draft4Validator as JSONValidator
+
+
+Checker = Callable[[Any], 'str | None']
+
+# Draft4 type semantics: booleans are neither numbers nor integers.
+TYPE_CHECKERS: dict[str, Callable[[Any], bool]] = {
+    'array': lambda value: isinstance(value, list),
+    'boolean': lambda value: isinstance(value, bool),
+    'integer': lambda value: isinstance(value, int) and not isinstance(value, bool),
+    'null': lambda value: value is None,
+    'number': lambda value: isinstance(value, Number) and not isinstance(value, bool),
+    'object': lambda value: isinstance(value, dict),
+    'string': lambda value: isinstance(value, str)
+}
+TRUE: object = object()
+FALSE: object = object()
+
+
+class UnsupportedSchemaError(Exception):
+    """ Raised when a schema uses a keyword that cannot be compiled into a checker. """
+
+
+class CompiledSchema:
+    """ A schema compiled into per-field checkers.
+
+    :param schema: The JSON schema to compile.
+    """
+
+    def __init__(self, schema: dict) -> None:
+        """ The compiled schema constructor. """
+        self.schema: dict = schema
+        self.validator: JSONValidator = JSONValidator(schema)
+        self.fields: dict[str, list[Checker]] | None
+        self.required: list[str] = []
+        try:
+            self.fields, self.required = compile_record_schema(schema)
+        except UnsupportedSchemaError:
+            self.fields = None
+
+    @property
+    def compiled(self) -> bool:
+        """ Whether the fast path is available for this schema. """
+        return self.fields is not None
+
+    def iter_errors(self, record: dict) -> Generator[tuple[str, str], None, None]:
+        """ Validate a record against the schema.
+
+        :param record: The record to validate.
+        :return: A generator of (message, field) tuples in the order the Draft4 validator would report them.
+        """
+        if self.fields is None:
+            for error in self.validator.iter_errors(record):
+                yield error.message, error.message.split("'")[1] if not error.path else error.path[0]
+            return
+
+        for field, checkers in self.fields.items():
+            if field in record:
+                value: Any = record[field]
+                for checker in checkers:
+                    message: str | None = checker(value)
+                    if message is not None:
+                        yield message, field
+        for field in self.required:
+            if field not in record:
+                yield f"{field!r} is a required property", field
+
+
+class SchemaRegistry:
+    """ A process-wide registry of compiled schemas keyed by file path and invalidated when the file mtime changes. """
+
+    def __init__(self) -> None:
+        """ The registry constructor. """
+        self.__schemas: dict[str, tuple[int, CompiledSchema]] = {}
+        self.__lock: Lock = Lock()
+
+    def get(self, filepath: str) -> CompiledSchema:
+        """ Get the compiled schema stored at the given path, loading it if needed.
+
+        :param filepath: The path to the JSON schema.
+        :return: The compiled schema.
+        """
+        mtime: int = stat(filepath).st_mtime_ns
+        entry: tuple[int, CompiledSchema] | None = self.__schemas.get(filepath)
+        if entry and entry[0] == mtime:
+            return entry[1]
+        with self.__lock:
+            with open(filepath, 'r') as f:
+                schema: CompiledSchema = CompiledSchema(loads(f.read()))
+            self.__schemas[filepath] = (mtime, schema)
+        return schema
+
+    def clear(self) -> None:
+        """ Remove all the schemas from the registry. """
+        with self.__lock:
+            self.__schemas.clear()
+
+
+def compile_record_schema(schema: dict) -> tuple[dict[str, list[Checker]], list[str]]:
+    """ Compile the schema of a record into checkers for each of its properties.
+
+    :param schema: The record schema.
+    :return: The checkers for each field and the list of required fields.
+    """
+    if '$ref' in schema or schema.get('type', 'object') != 'object':
+        raise UnsupportedSchemaError('Only object schemas without references can be compiled.')
+    ensure_supported(schema, {'type', 'properties', 'required'})
+    if [keyword for keyword in schema if keyword in ('properties', 'required')] == ['required', 'properties']:
+        raise UnsupportedSchemaError('The required keyword must follow the properties keyword.')
+    fields: dict[str, list[Checker]] = {
+        field: compile_field_schema(subschema) for field, subschema in schema.get('properties', {}).items()
+    }
+    return fields, list(schema.get('required', []))
+
+
+def compile_field_schema(schema: dict) -> list[Checker]:
+    """ Compile the schema of a single field into a list of checkers, in the order of the schema keywords.
+
+    :param schema: The field schema.
+    :return: The list of checkers.
+    """
+    if '$ref' in schema:
+        raise UnsupportedSchemaError('References cannot be compiled.')
+    ensure_supported(schema, {'type', 'enum', 'pattern', 'maxLength', 'minimum', 'anyOf'})
+    checkers: list[Checker] = []
+    for keyword, value in schema.items():
+        if keyword == 'type':
+            checkers.append(compile_type(value))
+        elif keyword == 'enum':
+            checkers.append(compile_enum(value))
+        elif keyword == 'pattern':
+            checkers.append(compile_pattern_checker(value))
+        elif keyword == 'maxLength':
+            checkers.append(compile_max_length(value))
+        elif keyword == 'minimum':
+            checkers.append(compile_minimum(value, schema.get('exclusiveMinimum', False)))
+        elif keyword == 'anyOf':
+            checkers.append(compile_any_of(value))
+    return checkers
+
+
+def ensure_supported(schema: dict, keywords: set[str]) -> None:
+    """ Raise an error if the schema uses a Draft4 keyword that is not in the given set. Unknown keywords are
+    annotations and are ignored, like the Draft4 validator does.
+
+    :param schema: The schema to check.
+    :param keywords: The supported keywords.
+    """
+    for keyword in schema:
+        if keyword in JSONValidator.VALIDATORS and keyword not in keywords:
+            raise UnsupportedSchemaError(f"Keyword '{keyword}' cannot be compiled.")
+
+
+def compile_type(types: str | list[str]) -> Checker:
+    """ Compile a type keyword.
+
+    :param types: The allowed type or types.
+    :return: The checker.
+    """
+    types = [types] if isinstance(types, str) else list(types)
+    if any(type_name not in TYPE_CHECKERS for type_name in types):
+        raise UnsupportedSchemaError(f"Unknown type in {types}.")
+    type_checkers: list[Callable[[Any], bool]] = [TYPE_CHECKERS[type_name] for type_name in types]
+    reprs: str = ", ".join(repr(type_name) for type_name in types)
+
+    def check(value: Any) -> str | None:
+        """ Return the error message for an invalid value or None. """
+        for type_checker in type_checkers:
+            if type_checker(value):
+                return None
+        return f"{value!r} is not of type {reprs}"
+    return check
+
+
+def compile_enum(enums: list) -> Checker:
+    """ Compile an enum keyword.
+
+    :param enums: The allowed values.
+    :return: The checker.
+    """
+    unbooled: list = [unbool(value) for value in enums]
+
+    def check(value: Any) -> str | None:
+        """ Return the error message for an invalid value or None. """
+        if value == 0 or value == 1:
+            if unbool(value) in unbooled:
+                return None
+        elif value in enums:
+            return None
+        return f"{value!r} is not one of {enums!r}"
+    return check
+
+
+def compile_pattern_checker(pattern: str) -> Checker:
+    """ Compile a pattern keyword.
+
+    :param pattern: The regular expression string values must match.
+    :return: The checker.
+    """
+    regex: Pattern = compile_pattern(pattern)
+
+    def check(value: Any) -> str | None:
+        """ Return the error message for an invalid value or None. """
+        if isinstance(value, str) and not regex.search(value):
+            return f"{value!r} does not match {pattern!r}"
+        return None
+    return check
+
+
+def compile_max_length(max_length: int) -> Checker:
+    """ Compile a maxLength keyword.
+
+    :param max_length: The maximum length of string values.
+    :return: The checker.
+    """
+    def check(value: Any) -> str | None:
+        """ Return the error message for an invalid value or None. """
+        if isinstance(value, str) and len(value) > max_length:
+            return f"{value!r} is too long"
+        return None
+    return check
+
+
+def compile_minimum(minimum: int | float, exclusive: bool) -> Checker:
+    """ Compile a minimum keyword.
+
+    :param minimum: The minimum of number values.
+    :param exclusive: Whether the minimum itself is excluded.
+    :return: The checker.
+    """
+    comparison: str = "less than or equal to" if exclusive else "less than"
+    is_number: Callable[[Any], bool] = TYPE_CHECKERS['number']
+
+    def check(value: Any) -> str | None:
+        """ Return the error message for an invalid value or None. """
+        if is_number(value) and (value <= minimum if exclusive else value < minimum):
+            return f"{value!r} is {comparison} the minimum of {minimum!r}"
+        return None
+    return check
+
+
+def compile_any_of(schemas: list[dict]) -> Checker:
+    """ Compile an anyOf keyword.
+
+    :param schemas: The sub-schemas of which at least one must be valid.
+    :return: The checker.
+    """
+    alternatives: list[list[Checker]] = [compile_field_schema(schema) for schema in schemas]
+
+    def check(value: Any) -> str | None:
+        """ Return the error message for an invalid value or None. """
+        for checkers in alternatives:
+            if all(checker(value) is None for checker in checkers):
+                return None
+        return f"{value!r} is not valid under any of the given schemas"
+    return check
+
+
+def unbool(value: Any) -> Any:
+    """ Replace booleans by sentinels so that True and False are not equal to 1 and 0.
+
+    :param value: The value to convert.
+    :return: The converted value.
+    """
+    if value is True:
+        return TRUE
+    elif value is False:
+        return FALSE
+    return value
+
+
+schema_registry: SchemaRegistry = SchemaRegistry()
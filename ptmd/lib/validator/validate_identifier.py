@@ -1,10 +1,11 @@
 """ Validate the identifier of the current ExcelValidator
 """
-from typing import Any
+from __future__ import annotations
+
+from typing import Any, Sequence
 
 from re import match
 
-from ptmd.database import Organism, Chemical
 from ptmd.const import (
     ALLOWED_EXPOSURE_BATCH,
     DOSE_MAPPING,
@@ -22,20 +23,33 @@ INV_DOSE_MAPPING: dict = {v: k for k, v in DOSE_MAPPING.items()}
 INV_TIMEPOINT_MAPPING: dict = {v: k for k, v in TIME_POINT_MAPPING.items()}
 
 
-def validate_identifier(excel_validator: Any, record_index: int) -> None:
+def validate_identifier(excel_validator: Any, record_index: int, errors: Sequence[tuple[str, str]] | None = None) -> None:
     """ Validate the identifier of the current ExcelValidator.
 
     :param excel_validator: The ExcelValidator for which to run the identifier validation.
     :param record_index: The index of the record to validate.
+    :param errors: The (message, field) errors of the record precomputed by the columnar validation. The per-record
+                   checks are run when not given.
     """
     validate_unique_identifier(excel_validator, record_index)
-    if excel_validator.report['valid']:
-        validate_species(excel_validator)
-        validate_batch(excel_validator)
-        validate_compound(excel_validator)
-        validate_dose(excel_validator)
-        validate_timepoints(excel_validator)
-        validate_replicate(excel_validator)
+    if excel_validator.report['valid'] and errors is not None:
+        for message, field in errors:
+            excel_validator.add_error(excel_validator.current_record['label'], message, field)
+    elif excel_validator.report['valid']:
+        validate_identifier_fields(excel_validator)
+
+
+def validate_identifier_fields(validator: Any) -> None:
+    """ Validate each part of the identifier of the current record against the other fields of the record.
+
+    :param validator: The ExcelValidator for which to run the identifier validation.
+    """
+    validate_species(validator)
+    validate_batch(validator)
+    validate_compound(validator)
+    validate_dose(validator)
+    validate_timepoints(validator)
+    validate_replicate(validator)
 
 
 def validate_unique_identifier(validator: Any, record_index: int) -> None:
@@ -45,11 +59,21 @@ def validate_unique_identifier(validator: Any, record_index: int) -> None:
     :param record_index: The index of the record to validate.
     """
     ptx_id: str = validator.current_record['data'][PTX_ID_LABEL]
-    if ptx_id in validator.identifiers:
-        msg: str = (f"Record at line {record_index + 2} ({ptx_id}) "
-                    f"is duplicated with record at line {validator.identifiers.index(ptx_id) + 3}")
+    first_index: int | None = validator.identifiers.add(ptx_id, record_index)
+    if first_index is not None:
+        msg: str = duplicated_identifier_message(ptx_id, record_index, first_index)
         validator.add_error(validator.current_record['label'], msg, PTX_ID_LABEL)
-    validator.identifiers.append(ptx_id)
+
+
+def duplicated_identifier_message(ptx_id: str, record_index: int, first_index: int) -> str:
+    """ Build the message of a duplicated identifier.
+
+    :param ptx_id: The identifier.
+    :param record_index: The index of the record holding the duplicate.
+    :param first_index: The index of the first record holding the identifier.
+    :return: The message.
+    """
+    return f"Record at line {record_index + 2} ({ptx_id}) is duplicated with record at line {first_index + 3}"
 
 
 def validate_species(validator: Any) -> None:
@@ -60,10 +84,10 @@ def validate_species(validator: Any) -> None:
     species: str = validator.current_record['data'][PTX_ID_LABEL][0]
     try:
         organism_name: str = validator.general_info["biosystem_name"]
-        organism: Organism = Organism.query.filter(Organism.ptox_biosystem_name == organism_name).first()
-        if not organism:
+        organism_code: str | None = validator.context.get_organism_code(organism_name)
+        if not organism_code:
             validator.add_error(validator.current_record['label'], "Organism not found in database.", "biosystem_name")
-        elif species != organism.ptox_biosystem_code:
+        elif species != organism_code:
             validator.add_error(
                 validator.current_record['label'],
                 "The identifier organism doesn't match the biosystem_name.",
@@ -139,14 +163,14 @@ def validate_replicates_compound(validator: Any, compound_name: str, code: int)
     :param code: The compound code to check
     """
     try:
-        compound: Chemical = Chemical.query.filter(Chemical.common_name == compound_name).first()
-        if not compound:
+        compound_code: int | None = validator.context.get_chemical_code(compound_name)
+        if compound_code is None:
             validator.add_error(validator.current_record['label'],
                                 f"The identifier doesn't contain a valid compound code '{code}'.",
                                 COMPOUND_NAME_LABEL)
-        elif compound.ptx_code != code:
+        elif compound_code != code:
             msg: str = "The identifier %s compound doesn't match the compound %s (%s)" % (
-                code, compound_name, compound.ptx_code
+                code, compound_name, compound_code
             )
             validator.add_error(validator.current_record['label'], msg, PTX_ID_LABEL)
     except Exception as e:
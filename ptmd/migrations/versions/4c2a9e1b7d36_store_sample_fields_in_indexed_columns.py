@@ -0,0 +1,161 @@
+"""store sample fields in indexed columns
+
+Revision ID: 4c2a9e1b7d36
+Revises: ed8a4d3a91fe
+Create Date: 2026-10-17 10:12:41.508213
+
+"""
+from json import loads as json_loads, dumps as json_dumps
+
+import sqlalchemy as sa
+from alembic import op
+
+from ptmd.logger import LOGGER
+
+
+# revision identifiers, used by Alembic.
+revision = '4c2a9e1b7d36'
+down_revision = 'ed8a4d3a91fe'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the mapping between the columns and the fields of the sample data at this revision.
+SAMPLE_COLUMNS = {
+    'replicate': 'replicate',
+    'dose_code': 'dose_code',
+    'timepoint': 'timepoint_(hours)',
+    'box_id': 'box_id',
+    'box_row': 'box_row',
+    'box_column': 'box_column',
+    'collection_order': 'collection_order'
+}
+INTEGER_COLUMNS = ('replicate', 'timepoint', 'box_column', 'collection_order')
+STRING_COLUMNS = {'dose_code': 20, 'box_id': 100, 'box_row': 1}
+BASE_IDENTIFIER = 'PTX'
+BATCH_SIZE = 500
+
+COLUMNS = [
+    sa.Column('replicate', sa.Integer(), nullable=True),
+    sa.Column('dose_code', sa.String(20), nullable=True),
+    sa.Column('timepoint', sa.Integer(), nullable=True),
+    sa.Column('box_id', sa.String(100), nullable=True),
+    sa.Column('box_row', sa.String(1), nullable=True),
+    sa.Column('box_column', sa.Integer(), nullable=True),
+    sa.Column('collection_order', sa.Integer(), nullable=True),
+    sa.Column('compound_id', sa.Integer(), nullable=True)
+]
+INDEXED_COLUMNS = [*SAMPLE_COLUMNS, 'compound_id', 'file_id']
+SAMPLE = sa.table('sample', sa.column('sample_id'), sa.column('data'), *[sa.column(column.name) for column in COLUMNS])
+UPDATE_SAMPLE = SAMPLE.update().where(SAMPLE.c.sample_id == sa.bindparam('key'))
+
+
+def cast_column(column, value):
+    if value is None:
+        return None
+    if column in INTEGER_COLUMNS:
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not float(value).is_integer():
+            raise ValueError(f'{value!r} is not an integer.')
+        return int(value)
+    value = str(value)
+    if len(value) > STRING_COLUMNS[column]:
+        raise ValueError(f'{value!r} is longer than {STRING_COLUMNS[column]} characters.')
+    return value
+
+
+# Values the columns can't hold as is stay in the overflow data, the column is left empty if they can't be converted.
+def split_sample_data(data):
+    overflow = dict(data)
+    columns = {}
+    for column, field in SAMPLE_COLUMNS.items():
+        value = overflow.get(field)
+        try:
+            columns[column] = cast_column(column, value)
+        except ValueError:
+            columns[column] = None
+            LOGGER.warning(f'Sample value {value!r} of {field} kept in the data column only')
+            continue
+        if type(columns[column]) is type(value):
+            overflow.pop(field, None)
+    compound = overflow.get('compound')
+    columns['compound_id'] = None
+    if isinstance(compound, dict) and compound.get('chemical_id'):
+        columns['compound_id'] = compound['chemical_id']
+        del overflow['compound']
+    columns['data'] = overflow
+    return columns
+
+
+def iter_batches(bind, *columns):
+    last = None
+    while True:
+        query = sa.select(*columns).order_by(SAMPLE.c.sample_id).limit(BATCH_SIZE)
+        if last is not None:
+            query = query.where(SAMPLE.c.sample_id > last)
+        rows = bind.execute(query).all()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1].sample_id
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if 'compound_id' in {column['name'] for column in sa.inspect(bind).get_columns('sample')}:
+        LOGGER.info('Table sample already has indexed columns')
+        return
+
+    with op.batch_alter_table('sample') as batch_op:
+        for column in COLUMNS:
+            batch_op.add_column(column)
+        batch_op.create_foreign_key('fk_sample_compound_id_chemical', 'chemical', ['compound_id'], ['chemical_id'])
+        for column_name in INDEXED_COLUMNS:
+            batch_op.create_index(op.f(f'ix_sample_{column_name}'), [column_name])
+
+    count = 0
+    for rows in iter_batches(bind, SAMPLE.c.sample_id, SAMPLE.c.data):
+        values = []
+        for row in rows:
+            columns = split_sample_data(json_loads(row.data))
+            values.append({**columns, 'data': json_dumps(columns['data']), 'key': row.sample_id})
+        bind.execute(UPDATE_SAMPLE, values)
+        count += len(values)
+    LOGGER.info(f'Moved the fields of {count} samples to indexed columns')
+
+    with op.batch_alter_table('sample') as batch_op:
+        batch_op.alter_column('data', type_=sa.JSON(), existing_type=sa.String(100000), existing_nullable=False,
+                              postgresql_using='data::json')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    chemical = sa.table('chemical', sa.column('chemical_id'), sa.column('common_name'), sa.column('cas'),
+                        sa.column('formula'), sa.column('ptx_code'))
+    compounds = {
+        row.chemical_id: {
+            'common_name': row.common_name,
+            'cas': row.cas,
+            'formula': row.formula,
+            'ptx_code': BASE_IDENTIFIER + str(row.ptx_code).rjust(3, '0'),
+            'chemical_id': row.chemical_id
+        } for row in bind.execute(sa.select(chemical))
+    }
+
+    with op.batch_alter_table('sample') as batch_op:
+        batch_op.alter_column('data', type_=sa.String(100000), existing_type=sa.JSON(), existing_nullable=False,
+                              postgresql_using='data::text')
+
+    for rows in iter_batches(bind, SAMPLE):
+        values = []
+        for row in rows:
+            data = {field: getattr(row, column) for column, field in SAMPLE_COLUMNS.items()}
+            data.update(row.data if isinstance(row.data, dict) else json_loads(row.data))
+            if row.compound_id in compounds:
+                data['compound'] = compounds[row.compound_id]
+            values.append({'data': json_dumps(data), 'key': row.sample_id})
+        bind.execute(UPDATE_SAMPLE, values)
+
+    with op.batch_alter_table('sample') as batch_op:
+        for column_name in INDEXED_COLUMNS:
+            batch_op.drop_index(op.f(f'ix_sample_{column_name}'))
+        for column in COLUMNS:
+            batch_op.drop_column(column.name)
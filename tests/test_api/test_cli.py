@@ -0,0 +1,40 @@
+from unittest import TestCase
+from unittest.mock import patch
+from json import loads
+
+from ptmd.api import app
+
+
+FILES = [{'file_id': 1, 'gdrive_id': 'a', 'name': 'A.xlsx'}]
+
+
+@patch('ptmd.api.cli.BatchValidator')
+@patch('ptmd.api.cli.find_files', return_value=FILES)
+class TestValidateFilesCommand(TestCase):
+
+    def test_validate_files(self, mock_find, mock_batch):
+        mock_batch.return_value.validate.return_value = [{'file_id': 1, 'valid': True, 'errors': {}}]
+        result = app.test_cli_runner().invoke(args=['validate-files', '1', '2', '--batch', 'AA', '--invalid-only',
+                                                    '--workers', '3'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(loads(result.output)['summary'], {'total': 1, 'valid': 1, 'invalid': 0, 'errors': 0})
+        mock_find.assert_called_once_with([1, 2], {'batch': 'AA', 'is_valid': False})
+        mock_batch.assert_called_once_with(FILES, max_workers=3, download_workers=4)
+
+    def test_invalid_files(self, mock_find, mock_batch):
+        mock_batch.return_value.validate.return_value = [{'file_id': 1, 'valid': False, 'errors': {'A': []}}]
+        result = app.test_cli_runner().invoke(args=['validate-files', '1'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(loads(result.output)['summary']['invalid'], 1)
+
+    def test_errors(self, mock_find, mock_batch):
+        mock_find.side_effect = ValueError('file_ids or filters must be provided.')
+        result = app.test_cli_runner().invoke(args=['validate-files'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('file_ids or filters must be provided.', result.output)
+        mock_find.side_effect = None
+        mock_find.return_value = []
+        result = app.test_cli_runner().invoke(args=['validate-files', '1'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('No files found', result.output)
+        mock_batch.assert_not_called()
@@ -34,6 +34,7 @@ class TestAPIChemicals(TestCase):
     def test_validate_chemicals_success(self):
         self.assertIsNone(validate_chemicals([VALID_CHEMICAL]))
 
+    @patch('ptmd.api.queries.chemicals.reference_data')
     @patch('ptmd.api.queries.chemicals.session')
     @patch('ptmd.api.queries.utils.verify_jwt_in_request', return_value=None)
     @patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
@@ -41,7 +42,7 @@ class TestAPIChemicals(TestCase):
     @patch('ptmd.api.queries.utils.check_role')
     @patch('ptmd.api.queries.chemicals.Chemical')
     def test_create_chemicals_success(self, mock_chemical, mock_role, mock_get_current_user,
-                                      mock_verify_jwt, mock_verify_in_request, mock_get_session):
+                                      mock_verify_jwt, mock_verify_in_request, mock_get_session, mock_reference_data):
         mock_get_current_user.return_value.role = 'user'
         mock_chemical.return_value.chemical_id = 1
         with app.test_client() as client:
@@ -50,6 +51,7 @@ class TestAPIChemicals(TestCase):
                                    data=dumps({'chemicals': [VALID_CHEMICAL]}))
             self.assertEqual(response.json, {'data': [1], 'message': 'Chemicals created successfully.'})
             self.assertEqual(response.status_code, 201)
+            mock_reference_data.invalidate.assert_called_once()
 
     @patch('ptmd.api.queries.utils.verify_jwt_in_request', return_value=None)
     @patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
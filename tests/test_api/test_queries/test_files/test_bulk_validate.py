@@ -0,0 +1,93 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from ptmd.api import app
+from ptmd.api.queries.files.bulk_validate import find_files, run_bulk_validation
+from ptmd.lib.jobs import JobQueue, MemoryJobStore, JOB_KIND_BULK_VALIDATION
+
+
+HEADERS = {'Content-Type': 'application/json'}
+FILES = [{'file_id': 1, 'gdrive_id': 'a', 'name': 'A.xlsx'}, {'file_id': 3, 'gdrive_id': 'c', 'name': 'C.xlsx'}]
+RESULTS = [
+    {'file_id': 1, 'gdrive_id': 'a', 'name': 'A.xlsx', 'valid': True, 'errors': {}, 'message': 'ok'},
+    {'file_id': 3, 'gdrive_id': 'c', 'name': 'C.xlsx', 'valid': None, 'errors': {}, 'message': 'error'}
+]
+
+
+class MockedUser:
+    def __init__(self, role):
+        self.id = 1
+        self.role = role
+
+
+@patch('ptmd.api.queries.utils.verify_jwt_in_request')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+@patch('ptmd.api.queries.utils.get_current_user', return_value=MockedUser('admin'))
+class TestBulkValidateFiles(TestCase):
+
+    @patch('ptmd.api.queries.files.bulk_validate.get_current_user', return_value=MockedUser('admin'))
+    @patch('ptmd.api.queries.files.bulk_validate.BatchValidator')
+    @patch('ptmd.api.queries.files.bulk_validate.find_files', return_value=FILES)
+    def test_success(self, mock_find, mock_batch, mock_current_user, mock_user, mock_jwt, mock_verify_jwt):
+        mock_batch.return_value.validate.return_value = RESULTS
+        queue = JobQueue(app, MemoryJobStore(), run_bulk_validation, max_workers=1, kind=JOB_KIND_BULK_VALIDATION)
+        with patch('ptmd.api.queries.files.bulk_validate.bulk_validation_queue', queue), \
+                patch('ptmd.api.queries.files.bulk_validate.MAX_BULK_VALIDATION_WORKERS', 3):
+            with app.test_client() as client:
+                response = client.post('/api/files/validate', headers=HEADERS,
+                                       json={'file_ids': [1, 2, 3], 'filters': {'batch': 'AA'}, 'workers': 8})
+            queue.shutdown()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json['missing'], [2])
+        job = queue.get(response.json['job']['job_id'])
+        self.assertEqual((job['kind'], job['file_id'], job['owner'], job['status'], job['code']),
+                         (JOB_KIND_BULK_VALIDATION, None, 1, 'done', 200))
+        self.assertEqual(job['payload'], {'file_ids': [1, 3], 'workers': 3})
+        self.assertEqual(job['result']['data'], RESULTS)
+        self.assertEqual(job['result']['summary'], {'total': 2, 'valid': 1, 'invalid': 0, 'errors': 1})
+        mock_find.assert_any_call([1, 2, 3], {'batch': 'AA'})
+        mock_find.assert_called_with([1, 3])
+        mock_batch.assert_called_once_with(FILES, max_workers=3)
+
+    @patch('ptmd.api.queries.files.bulk_validate.find_files', return_value=[])
+    def test_not_found(self, mock_find, mock_user, mock_jwt, mock_verify_jwt):
+        with app.test_client() as client:
+            response = client.post('/api/files/validate', headers=HEADERS, json={'file_ids': [1]})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json, {'message': 'No files found'})
+
+    def test_bad_request(self, mock_user, mock_jwt, mock_verify_jwt):
+        with app.test_client() as client:
+            response = client.post('/api/files/validate', headers=HEADERS, json={})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json, {'message': 'file_ids or filters must be provided.'})
+            response = client.post('/api/files/validate', headers=HEADERS, json={'filters': {'owner': 'me'}})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('Unknown filters: owner.', response.json['message'])
+            response = client.post('/api/files/validate', headers=HEADERS, json={'file_ids': ['a']})
+            self.assertEqual(response.json, {'message': 'file_ids must be a list of integers.'})
+            for workers in (0, '2', -1):
+                response = client.post('/api/files/validate', headers=HEADERS, json={'file_ids': [1], 'workers': workers})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json, {'message': 'workers must be a positive integer.'})
+
+    def test_admin_only(self, mock_user, mock_jwt, mock_verify_jwt):
+        mock_user.return_value = MockedUser('user')
+        with app.test_client() as client:
+            response = client.post('/api/files/validate', headers=HEADERS, json={'file_ids': [1]})
+        self.assertEqual(response.status_code, 401)
+
+
+class TestFindFiles(TestCase):
+
+    @patch('ptmd.api.queries.files.bulk_validate.build_search_clauses', return_value=['clause'])
+    @patch('ptmd.api.queries.files.bulk_validate.File')
+    def test_find_files(self, mock_file, mock_clauses):
+        query = mock_file.query.with_entities.return_value.filter.return_value.order_by.return_value
+        query.all.return_value = [(1, 'a', 'A.xlsx')]
+        files = find_files([1], {'batch': 'AA', 'is_valid': False})
+        self.assertEqual(files, [{'file_id': 1, 'gdrive_id': 'a', 'name': 'A.xlsx'}])
+        mock_clauses.assert_called_once_with(batch='AA', is_valid=False)
+        mock_file.query.with_entities.return_value.filter.assert_called_once_with(
+            mock_file.file_id.in_.return_value, 'clause'
+        )
@@ -0,0 +1,69 @@
+from unittest import TestCase
+from unittest.mock import patch
+from json import dumps
+
+from ptmd.api import app
+
+
+HEADERS = {'Content-Type': 'application/json', 'Authorization': f'Bearer {123}'}
+
+
+class MockedUser:
+    id = 1
+    role = 'user'
+
+
+@patch('ptmd.api.queries.utils.get_current_user', return_value=MockedUser())
+@patch('ptmd.api.queries.files.campaign.get_current_user', return_value=MockedUser())
+@patch('ptmd.api.queries.utils.verify_jwt_in_request')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+class TestCampaign(TestCase):
+
+    @patch('ptmd.api.queries.files.campaign.CampaignCreator')
+    def test_create_campaign(self, mock_creator, *mocks):
+        mock_creator.return_value.create.return_value = [
+            {'index': 0, 'created': True, 'message': 'File created successfully.', 'data': {'file_url': 'a'}},
+            {'index': 1, 'created': False, 'message': 'Batch AA for H is requested more than once.'}
+        ]
+        designs = [
+            {'partner': 'UOB', 'organism': 'H', 'exposure_batch': 'AA', 'replicate_blank': 2,
+             'exposure_conditions': [{'chemicals': ['chemical1'], 'dose': 'BMD10'}]},
+            {'partner': 'UOB', 'organism': 'H', 'exposure_batch': 'AA'}
+        ]
+        with app.test_client() as client:
+            response = client.post('/api/files/campaign', headers=HEADERS, data=dumps({'designs': designs, 'workers': 2}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['summary'], {'total': 2, 'created': 1, 'failed': 1})
+        parsed, = mock_creator.call_args.args
+        self.assertEqual(parsed[0]['replicates_blank'], 2)
+        self.assertEqual(parsed[0]['exposure'], [{'chemicals': ['chemical1'], 'dose': 'BMD10'}])
+        self.assertIsNone(parsed[1]['exposure'])
+        self.assertEqual(mock_creator.call_args.kwargs, {'user': 1, 'max_workers': 2})
+
+    @patch('ptmd.api.queries.files.campaign.MAX_CAMPAIGN_WORKERS', 3)
+    @patch('ptmd.api.queries.files.campaign.CampaignCreator')
+    def test_create_campaign_workers_capped(self, mock_creator, *mocks):
+        mock_creator.return_value.create.return_value = []
+        designs = [{'partner': 'UOB', 'organism': 'H', 'exposure_batch': 'AA'}]
+        with app.test_client() as client:
+            for workers, expected in ((None, 3), (1, 1), (1000, 3)):
+                payload = {'designs': designs} if workers is None else {'designs': designs, 'workers': workers}
+                response = client.post('/api/files/campaign', headers=HEADERS, data=dumps(payload))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(mock_creator.call_args.kwargs['max_workers'], expected)
+
+    def test_bad_request(self, *mocks):
+        with app.test_client() as client:
+            for payload, message in (
+                ({}, "designs must be a non-empty list."),
+                ({'designs': []}, "designs must be a non-empty list."),
+                ({'designs': [{}] * 101}, "A campaign can't have more than 100 designs."),
+                ({'designs': [1]}, "Each design must be an object."),
+                ({'designs': [{}], 'workers': 0}, "workers must be a positive integer."),
+                ({'designs': [{}], 'workers': -2}, "workers must be a positive integer."),
+                ({'designs': [{}], 'workers': '4'}, "workers must be a positive integer."),
+                ({'designs': [{}], 'workers': 2.5}, "workers must be a positive integer.")
+            ):
+                response = client.post('/api/files/campaign', headers=HEADERS, data=dumps(payload))
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json, {'message': message})
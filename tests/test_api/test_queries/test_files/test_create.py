@@ -7,6 +7,7 @@ from json import dumps
 from ptmd.api import app
 from ptmd.const import ALLOWED_DOSE_VALUES
 from ptmd.database.models import Timepoint
+from ptmd.lib.creator import TemplateCache
 from ptmd.exceptions import TimepointValueError
 
 
@@ -43,15 +44,15 @@ def mock_jwt_required(*args, **kwargs):
 # test
 @patch('ptmd.api.queries.files.create.session')
 @patch('flask_jwt_extended.view_decorators.verify_jwt_in_request', side_effect=mock_jwt_required)
-@patch('ptmd.GoogleDriveConnector.upload_file', return_value=({"id": "45", "title": "test", "alternateLink": "a"}))
+@patch('ptmd.GoogleDriveConnector.upload_content', return_value=({"id": "45", "title": "test", "alternateLink": "a"}))
 @patch('ptmd.lib.gdrive.core.GoogleAuth', return_value=MockGoogleAuth)
 @patch('ptmd.lib.creator.core.get_chemical_code_mapping', return_value={"chemical1": '001'})
 @patch('ptmd.lib.creator.core.get_allowed_organisms', return_value=['organism1'])
-@patch('ptmd.lib.creator.core.get_organism_code', return_value=['A'])
+@patch('ptmd.lib.creator.core.get_organism_code', return_value='A')
 @patch('ptmd.lib.creator.core.get_chemical_code_mapping', return_value={'chemical1': '001'})
 @patch('ptmd.api.queries.users.login_user', return_value={'access_token': '123'})
 @patch('ptmd.api.queries.files.create.get_current_user')
-@patch('ptmd.api.queries.files.create.Organisation')
+@patch('ptmd.api.queries.files.create.get_organisation_gdrive_id', return_value='123')
 @patch('ptmd.database.models.file.Organisation')
 @patch('ptmd.database.models.file.Organism')
 @patch('ptmd.database.models.file.Chemical')
@@ -69,9 +70,8 @@ class TestCreateFile(TestCase):
                                 mock_organisation_1, mock_organisation_2,
                                 mock_get_current_user, mock_login,
                                 mock_get_chemicals_mapping, mock_get_organism_code,
-                                mock_get_organism, mock_get_chem, mock_upload, mock_auth,
+                                mock_get_organism, mock_get_chem, mock_auth, mock_upload,
                                 mock_jwt, mock_session):
-        mock_organisation_2.query.filter().first().gdrive_id = '123'
         mock_organisation_1.query.filter_by().first().organisation_id = 1
         mock_organism.query.filter_by().first().organism_id = 1
         mock_chemical.query.filter_by().first().chemical_id = 1
@@ -101,6 +101,11 @@ class TestCreateFile(TestCase):
             response = client.post('/api/files', headers={'Authorization': f'Bearer {123}', **HEADERS},
                                    data=dumps(data))
             self.assertEqual(response.json['data']['file_url'], 'a')
+            upload = mock_upload.call_args.kwargs
+            self.assertEqual(upload['title'], 'UOB_organism1_AA.xlsx')
+            self.assertEqual(upload['directory_id'], '123')
+            mock_organisation_2.assert_called_with('UOB')
+            self.assertEqual(upload['content'].getvalue()[:2], b'PK')
 
             mock_timepoints.side_effect = TimepointValueError
             data['timepoints'] = [None, 1]
@@ -119,7 +124,6 @@ class TestCreateFile(TestCase):
                                  mock_get_chemicals_mapping, mock_get_organism_code,
                                  mock_get_organism, mock_get_chem, mock_auth, mock_upload,
                                  mock_jwt, mock_session):
-        mock_organisation_2.query.filter().first().gdrive_id = '123'
         mock_organisation_1.query.filter_by().first().organisation_id = 1
         mock_organism.query.filter_by().first().organism_id = 1
         mock_chemical.query.filter_by().first().chemical_id = 1
@@ -166,3 +170,29 @@ class TestCreateFile(TestCase):
                                    data=dumps(data))
             self.assertEqual(response.json, {'message': 'Batch AA for organism1 already exists.'})
             self.assertEqual(response.status_code, 400)
+
+
+class MockedUser:
+    def __init__(self, role):
+        self.id = 1
+        self.role = role
+
+
+@patch('ptmd.api.queries.utils.verify_jwt_in_request')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+class TestTemplateCache(TestCase):
+
+    def test_inspect(self, mock_jwt, mock_verify_jwt):
+        cache = TemplateCache(max_samples=4)
+        headers = {'Authorization': f'Bearer {123}', **HEADERS}
+        with patch('ptmd.api.queries.files.create.template_cache', cache), app.test_client() as client:
+            with patch('ptmd.api.queries.utils.get_current_user', return_value=MockedUser('admin')):
+                response = client.get('/api/files/templates/cache', headers=headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json, {
+                    'size': 0, 'samples': 0, 'max_samples': 4,
+                    'hits': 0, 'misses': 0, 'hit_rate': None
+                })
+            with patch('ptmd.api.queries.utils.get_current_user', return_value=MockedUser('user')):
+                response = client.get('/api/files/templates/cache', headers=headers)
+                self.assertEqual(response.status_code, 401)
@@ -23,6 +23,9 @@ class TestSearchFiles(TestCase):
         arguments = ImmutableMultiDict([('replicates', 1), ('replicates_operator', 'invalid')])
         self.assertEqual(get_integer_input(arguments, 'replicates'), expected)
 
+        arguments = ImmutableMultiDict([('replicates', 0)])
+        self.assertEqual(get_integer_input(arguments, 'replicates'), {'value': 0, 'operator': 'eq'})
+
         arguments = ImmutableMultiDict([])
         self.assertEqual(get_integer_input(arguments, 'replicates'), None)
 
@@ -1,5 +1,6 @@
 from unittest import TestCase
 from unittest.mock import patch
+from json import dumps
 
 from ptmd.api import app
 from ptmd.lib import BatchError
@@ -36,3 +37,47 @@ class TestUpdater(TestCase):
             response = client.get('/api/files/1/batch?batch=AA', headers={'Authorization': f'Bearer {123}', **HEADERS})
             self.assertEqual(response.status_code, 200)
             mock_jsonify.assert_called_once_with({"message": "Batch updated"})
+
+
+@patch('ptmd.api.queries.utils.get_current_user')
+@patch('ptmd.api.queries.utils.verify_jwt_in_request')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+class TestBulkUpdater(TestCase):
+
+    def post(self, payload):
+        with app.test_client() as client:
+            return client.post('/api/files/batch', headers={'Authorization': f'Bearer {123}', **HEADERS},
+                               data=dumps(payload))
+
+    @patch('ptmd.api.queries.files.update.BulkBatchUpdater')
+    def test_success(self, mock_updater, mock_jwt, mock_verify_jwt_in_request, mock_user):
+        mock_user().role = 'admin'
+        mock_updater.return_value.update.return_value = [
+            {'file_id': 1, 'batch': 'AB', 'updated': True, 'message': 'Batch updated', 'name': 'a', 'old_batch': 'AA'},
+            {'file_id': 2, 'batch': 'AB', 'updated': False, 'message': 'File already shipped'}
+        ]
+        changes = [{'file_id': 1, 'batch': 'AB'}, {'file_id': 2, 'batch': 'AB'}]
+        response = self.post({'files': changes})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['summary'], {'total': 2, 'updated': 1, 'failed': 1})
+        mock_updater.assert_called_once_with(changes)
+
+    @patch('ptmd.api.queries.files.update.MAX_REBATCH_FILES', 2)
+    @patch('ptmd.api.queries.files.update.BulkBatchUpdater')
+    def test_errors_400(self, mock_updater, mock_jwt, mock_verify_jwt_in_request, mock_user):
+        mock_user().role = 'admin'
+        for payload, message in [
+            ({}, 'files must be a non-empty list.'),
+            ({'files': []}, 'files must be a non-empty list.'),
+            ({'files': [{}, {}, {}]}, "Can't change the batch of more than 2 files at once."),
+            ({'files': [1]}, 'Each file must be an object with a file_id and a batch.')
+        ]:
+            response = self.post(payload)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json, {'message': message})
+        mock_updater.assert_not_called()
+
+    def test_error_401(self, mock_jwt, mock_verify_jwt_in_request, mock_user):
+        mock_user().role = 'user'
+        response = self.post({'files': [{'file_id': 1, 'batch': 'AB'}]})
+        self.assertEqual(response.status_code, 401)
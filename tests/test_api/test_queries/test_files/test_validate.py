@@ -1,8 +1,11 @@
+from json import loads
 from unittest import TestCase
 from unittest.mock import patch
 
 from ptmd.api import app
-from ptmd.api.queries.files.validate import validate_file
+from ptmd.api.queries.files.validate import validate_file, run_validation, get_validation_queue
+from ptmd.lib.jobs import JobQueue, MemoryJobStore
+from ptmd.lib.validator import ReportCache
 
 
 HEADERS = {'Content-Type': 'application/json'}
@@ -83,3 +86,190 @@ class TestValidateFile(TestCase):
         with app.test_client() as test_client:
             response = test_client.get('/api/files/1/validate')
         self.assertEqual(response.json, {'message': 'File validated successfully.'})
+
+
+class MockedUser:
+    def __init__(self, user_id, role='user'):
+        self.id = user_id
+        self.role = role
+
+
+class MockedStatusValidator(MockedValidator):
+    def __init__(self, file_id, on_status=None, **kwargs):
+        super().__init__(file_id)
+        self.on_status = on_status
+
+    def validate(self):
+        self.on_status('downloading')
+        self.on_status('validating')
+
+
+@patch('ptmd.api.queries.utils.verify_jwt_in_request')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+class TestValidateFileAsync(TestCase):
+
+    def setUp(self):
+        self.queue = JobQueue(app, MemoryJobStore(), run_validation)
+        self.headers = {'Authorization': f'Bearer {123}', **HEADERS}
+
+    def tearDown(self):
+        self.queue.shutdown()
+
+    @patch('ptmd.api.queries.files.validate.ExcelValidator', side_effect=MockedStatusValidator)
+    def test_queue_and_poll(self, mock_validator, mock_jwt, mock_verify_jwt):
+        statuses = []
+        self.queue.store.update = lambda job_id, status, *args: (
+            statuses.append(status), MemoryJobStore.update(self.queue.store, job_id, status, *args)
+        )
+        user = MockedUser(1)
+        with patch('ptmd.api.queries.files.validate.validation_queue', self.queue), \
+                patch('ptmd.api.queries.utils.get_current_user', return_value=user), \
+                patch('ptmd.api.queries.files.validate.get_current_user', return_value=user):
+            with app.test_client() as client:
+                response = client.post('/api/files/1/validate', headers=self.headers)
+                self.assertEqual(response.status_code, 202)
+                self.assertEqual(response.json['message'], 'File validation queued.')
+                job_id = response.json['job']['job_id']
+                self.assertEqual(response.json['job']['owner'], 1)
+                self.queue.shutdown()
+
+                response = client.get(f'/api/files/validate/jobs/{job_id}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        job = response.json['job']
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['code'], 200)
+        self.assertEqual(job['result'], {'message': 'File validated successfully.', 'id': '1', 'errors': [], 'gdrive': 1})
+        self.assertEqual(statuses, ['downloading', 'validating', 'done'])
+        mock_validator.assert_called_once()
+
+    def test_lazy_queue(self, mock_jwt, mock_verify_jwt):
+        with patch('ptmd.api.queries.files.validate.validation_queue', None), \
+                patch('ptmd.api.queries.files.validate.SQLiteJobStore') as mock_store:
+            queue = get_validation_queue()
+            self.assertIs(get_validation_queue(), queue)
+        mock_store.assert_called_once()
+        self.assertEqual(queue.retention, 86400)
+
+    def test_job_not_found(self, mock_jwt, mock_verify_jwt):
+        job = self.queue.store.create('job1', 1, owner=1)
+        with patch('ptmd.api.queries.files.validate.validation_queue', self.queue):
+            for user, code in ((MockedUser(2), 404), (MockedUser(2, 'admin'), 200), (MockedUser(1), 200)):
+                with patch('ptmd.api.queries.utils.get_current_user', return_value=user), \
+                        patch('ptmd.api.queries.files.validate.get_current_user', return_value=user):
+                    with app.test_client() as client:
+                        response = client.get(f'/api/files/validate/jobs/{job["job_id"]}', headers=self.headers)
+                self.assertEqual(response.status_code, code)
+            with patch('ptmd.api.queries.utils.get_current_user', return_value=MockedUser(1)), \
+                    patch('ptmd.api.queries.files.validate.get_current_user', return_value=MockedUser(1)):
+                with app.test_client() as client:
+                    response = client.get('/api/files/validate/jobs/unknown', headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json, {'message': 'Job unknown not found.'})
+
+
+@patch('ptmd.api.queries.utils.verify_jwt_in_request')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+class TestValidationCache(TestCase):
+
+    def setUp(self):
+        self.cache = ReportCache()
+        self.cache.set('abc', {'valid': True, 'errors': {}})
+        self.cache.set('def', {'valid': False, 'errors': {'A': []}})
+        self.headers = {'Authorization': f'Bearer {123}', **HEADERS}
+
+    def test_inspect_and_purge(self, mock_jwt, mock_verify_jwt):
+        with patch('ptmd.api.queries.files.validate.report_cache', self.cache), \
+                patch('ptmd.api.queries.utils.get_current_user', return_value=MockedUser(1, 'admin')):
+            with app.test_client() as client:
+                response = client.get('/api/files/validate/cache', headers=self.headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json['size'], 2)
+                self.assertEqual([entry['key'] for entry in response.json['entries']], ['abc', 'def'])
+
+                response = client.delete('/api/files/validate/cache?key=abc', headers=self.headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json['purged'], 1)
+                self.assertEqual(len(self.cache), 1)
+
+                response = client.delete('/api/files/validate/cache', headers=self.headers)
+                self.assertEqual(response.json, {'message': '1 report(s) purged from the validation cache.', 'purged': 1})
+                self.assertEqual(len(self.cache), 0)
+
+    def test_admin_only(self, mock_jwt, mock_verify_jwt):
+        with patch('ptmd.api.queries.files.validate.report_cache', self.cache), \
+                patch('ptmd.api.queries.utils.get_current_user', return_value=MockedUser(1)):
+            with app.test_client() as client:
+                response = client.delete('/api/files/validate/cache', headers=self.headers)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(len(self.cache), 2)
+
+
+class MockedReportValidator:
+    def __init__(self, file_id, streaming=False, cache=None, record=True):
+        self.cache = cache
+        self.report = {'valid': True, 'errors': {}}
+
+    def validate(self):
+        cached = self.cache.get('checksum')
+        if cached is not None:
+            self.report = cached
+            return
+        self.report['valid'] = False
+        for i in range(4):
+            self.report['errors'][f'Record at line {i + 2} (FAC002LA1)'] = [
+                {'message': 'This field is required.', 'field_concerned': 'replicate'}
+            ]
+        self.report['errors']['Control'] = [{'message': 'Missing control.', 'field_concerned': 'replicates'}]
+        self.cache.set('checksum', self.report)
+
+
+@patch('ptmd.api.queries.utils.verify_jwt_in_request')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+@patch('ptmd.api.queries.utils.get_current_user', return_value=MockedUser(1))
+@patch('ptmd.api.queries.files.validate.ExcelValidator', side_effect=MockedReportValidator)
+class TestValidationReport(TestCase):
+
+    def setUp(self):
+        self.cache = ReportCache(copy=False)
+        self.patcher = patch('ptmd.api.queries.files.validate.full_report_cache', self.cache)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def get_lines(self, url):
+        with app.test_client() as client:
+            response = client.get(url, headers={'Authorization': f'Bearer {123}', **HEADERS})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        return [loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    def test_stream(self, mock_validator, mock_user, mock_jwt, mock_verify_jwt):
+        lines = self.get_lines('/api/files/1/validate/report')
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[0], {
+            'index': 0, 'label': 'Record at line 2 (FAC002LA1)', 'message': 'This field is required.',
+            'field_concerned': 'replicate'
+        })
+        self.assertEqual(lines[-2], {
+            'index': 4, 'label': 'Control', 'message': 'Missing control.', 'field_concerned': 'replicates'
+        })
+        self.assertEqual(lines[-1], {'valid': False, 'errors': 5, 'next_offset': None})
+        self.assertEqual(mock_validator.call_args.kwargs, {'streaming': True, 'cache': self.cache, 'record': False})
+
+    def test_pages(self, mock_validator, mock_user, mock_jwt, mock_verify_jwt):
+        lines = self.get_lines('/api/files/1/validate/report?offset=1&limit=2')
+        self.assertEqual([line.get('index') for line in lines], [1, 2, None])
+        self.assertEqual(lines[-1], {'next_offset': 3})
+        lines = self.get_lines('/api/files/1/validate/report?offset=3&limit=2')
+        self.assertEqual([line.get('index') for line in lines], [3, 4, None])
+        self.assertEqual(lines[-1]['next_offset'], None)
+        lines = self.get_lines('/api/files/1/validate/report?offset=9')
+        self.assertEqual(lines, [{'valid': False, 'errors': 5, 'next_offset': None}])
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 2))
+
+    def test_error(self, mock_validator, mock_user, mock_jwt, mock_verify_jwt):
+        mock_validator.return_value.validate.side_effect = ValueError('File with ID 1 does not exist.')
+        mock_validator.side_effect = None
+        lines = self.get_lines('/api/files/1/validate/report')
+        self.assertEqual(lines, [{'error': 'File with ID 1 does not exist.', 'next_offset': None}])
@@ -61,6 +61,13 @@ class TestSamples(TestCase):
             'organisation': 'test',
             'organism': 'test',
             'test': 'test',
+            'replicate': None,
+            'dose_code': None,
+            'timepoint_(hours)': None,
+            'box_id': None,
+            'box_row': None,
+            'box_column': None,
+            'collection_order': None,
             'vehicle': {
                 'cas': None,
                 'chemical_id': 1,
@@ -129,7 +136,7 @@ class TestSamples(TestCase):
                 self.total = 0
 
         with patch('ptmd.api.queries.samples.core.Sample') as mock_sample:
-            mock_sample.query.paginate.return_value = MockQuery()
+            mock_sample.query.options().paginate.return_value = MockQuery()
             mock_user().id = 1
             mock_user().role = 'admin'
             with app.test_client() as client:
@@ -207,37 +214,41 @@ class TestSampleGenerator(TestCase):
     @patch('ptmd.api.queries.samples.core.remove')
     @patch('ptmd.api.queries.samples.core.SampleGenerator.get_data', return_value=({"exposure_info": SAMPLES}, "test"))
     @patch('ptmd.api.queries.samples.core.Chemical')
-    @patch('ptmd.api.queries.samples.core.Sample')
-    def test_generate_samples(self, mock_sample, mock_chem, mock_get_data, mock_rm, mock_session, mock_user):
-        mock_chem.query.filter().first.return_value = None
-        mock_sample.query.filter().first.return_value = None
-        mock_sample.return_value = MockSample()
+    @patch('ptmd.api.queries.samples.core.upsert_samples', return_value=(2, 0))
+    def test_generate_samples(self, mock_upsert, mock_chem, mock_get_data, mock_rm, mock_session, mock_user):
+        mock_chem.query.filter().all.return_value = []
         sample_generator, _ = self.make_generator(mock_user)
         samples = sample_generator.generate_samples()
-        self.assertEqual(samples, ['A', 'A'])
+        self.assertEqual(samples, ['A', 'B'])
         mock_session.commit.assert_called_once()
         mock_rm.assert_called_once()
         mock_get_data.assert_called_once()
-        self.assertEqual(mock_session.add.call_count, 2)
+        mock_upsert.assert_called_once_with({
+            'A': {'precisiontox_short_identifier': 'A', 'compound': {'common_name': 'test'}},
+            'B': {'precisiontox_short_identifier': 'B', 'compound': 'CONTROL_test1'}
+        }, 1)
+        self.assertGreater(sample_generator.throughput, 0)
 
     @patch('ptmd.api.queries.samples.core.get_current_user')
-    @patch('ptmd.api.queries.samples.core.session')
-    @patch('ptmd.api.queries.samples.core.remove')
-    @patch('ptmd.api.queries.samples.core.SampleGenerator.get_data', return_value=({"exposure_info": SAMPLES}, "test"))
     @patch('ptmd.api.queries.samples.core.Chemical')
-    @patch('ptmd.api.queries.samples.core.Sample')
-    def test_generate_samples_existing(self, mock_sample, mock_chem, mock_get_data, mock_rm, mock_session, mock_user):
-        mocked_sample = MockSample()
-        mock_chem.query.filter().first.return_value = None
-        mock_sample.query.filter().first.return_value = mocked_sample
-        mock_sample.return_value = mocked_sample
-        sample_generator, _ = self.make_generator(mock_user)
-        samples = sample_generator.generate_samples()
-        self.assertEqual(samples, ['A', 'A'])
-        mock_session.commit.assert_called_once()
-        mock_rm.assert_called_once()
-        mock_get_data.assert_called_once()
-        self.assertEqual(mock_session.add.call_count, 0)
+    def test_load_compounds(self, mock_chem, mock_user):
+        class MockChemical:
+            common_name = 'chemical1'
+            chemical_id = 1
+
+            def __iter__(self):
+                yield from {'common_name': 'chemical1', 'ptx_code': 'PTX001'}.items()
+
+        mock_chem.query.filter().all.return_value = [MockChemical()]
+        generator, _ = self.make_generator(mock_user)
+        generator.load_compounds({'test', 'chemical1', 'CONTROL (DMSO)'})
+        self.assertEqual(generator.compounds, {
+            'test': {'common_name': 'test'},
+            'chemical1': {'common_name': 'chemical1', 'ptx_code': 'PTX001', 'chemical_id': 1},
+            'CONTROL (DMSO)': {'common_name': None}
+        })
+        generator.load_compounds({'test', 'chemical1'})
+        self.assertEqual(mock_chem.query.filter().all.call_count, 1)
 
     @patch('ptmd.api.queries.samples.core.GoogleDriveConnector')
     @patch('ptmd.api.queries.samples.core.ExcelFile')
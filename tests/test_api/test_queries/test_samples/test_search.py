@@ -0,0 +1,45 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from ptmd.api import app
+from ptmd.exceptions import InvalidCursorError
+
+
+HEADERS = {'Content-Type': 'application/json', 'Authorization': 'Bearer 123'}
+
+
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+@patch('ptmd.api.queries.utils.verify_jwt_in_request')
+@patch('ptmd.api.queries.utils.get_current_user')
+class TestSearchSamples(TestCase):
+
+    @patch('ptmd.api.queries.samples.search.search_samples', return_value={'data': []})
+    def test_route_404(self, mock_search, mock_get_current_user, mock_verify_jwt_in_request, mock_jwt_required):
+        mock_get_current_user().role = 'user'
+        with app.test_client() as client:
+            response = client.get('/api/samples/search', headers=HEADERS)
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.json, {'message': 'No samples found'})
+
+    @patch('ptmd.api.queries.samples.search.search_samples', return_value={'data': ['sample1']})
+    def test_route_200(self, mock_search, mock_get_current_user, mock_verify_jwt_in_request, mock_jwt_required):
+        mock_get_current_user().role = 'user'
+        query = ('compound=Imidazole&dose=BMD10&timepoint=0&timepoint_operator=gt&replicate=2&batch=AA'
+                 '&organism=Danio&organisation=UOB&page=2&per_page=5')
+        with app.test_client() as client:
+            response = client.get(f'/api/samples/search?{query}', headers=HEADERS)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json, {'data': ['sample1']})
+        mock_search.assert_called_once_with(
+            page=2, per_page=5, compound_name='Imidazole', dose='BMD10',
+            timepoint={'value': 0, 'operator': 'gt'}, replicate={'value': 2, 'operator': 'eq'},
+            batch='AA', organism_name='Danio', organisation_name='UOB', cursor=None, with_total=False
+        )
+
+    @patch('ptmd.api.queries.samples.search.search_samples', side_effect=InvalidCursorError())
+    def test_route_400(self, mock_search, mock_get_current_user, mock_verify_jwt_in_request, mock_jwt_required):
+        mock_get_current_user().role = 'user'
+        with app.test_client() as client:
+            response = client.get('/api/samples/search?cursor=invalid', headers=HEADERS)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json, {'message': 'Invalid cursor'})
@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from ptmd.database.models import Sample, Chemical
+from ptmd.database.models.sample import split_sample_data
+
+
+DATA = {
+    'replicate': 1.0, 'dose_code': 0, 'timepoint_(hours)': 4, 'box_id': 'Box1', 'box_row': 'A', 'box_column': 2,
+    'collection_order': 3, 'operator': 'MJones',
+    'compound': {'common_name': 'foo', 'cas': None, 'formula': 'C', 'ptx_code': 'PTX001', 'chemical_id': 1}
+}
+
+
+class TestSample(TestCase):
+
+    def test_split_sample_data(self):
+        columns = split_sample_data(DATA)
+        self.assertEqual(columns, {
+            'replicate': 1, 'dose_code': '0', 'timepoint': 4, 'box_id': 'Box1', 'box_row': 'A', 'box_column': 2,
+            'collection_order': 3, 'compound_id': 1, 'data': {'operator': 'MJones', 'replicate': 1.0, 'dose_code': 0}
+        })
+        self.assertIn('compound', DATA)
+
+        columns = split_sample_data({'replicate': 1.5, 'timepoint_(hours)': 'n/a', 'box_row': 'AB', 'dose_code': '1'})
+        self.assertEqual(
+            [columns['replicate'], columns['timepoint'], columns['box_row'], columns['dose_code']], [None, None, None, '1']
+        )
+        self.assertEqual(columns['data'], {'replicate': 1.5, 'timepoint_(hours)': 'n/a', 'box_row': 'AB'})
+
+        columns = split_sample_data({'compound': 'CONTROL (DMSO)'})
+        self.assertIsNone(columns['compound_id'])
+        self.assertIsNone(columns['replicate'])
+        self.assertEqual(columns['data'], {'compound': 'CONTROL (DMSO)'})
+
+    def test_get_data(self):
+        sample = Sample(sample_id='ABC', data=DATA, file_id=1)
+        self.assertEqual(sample.file_id, 1)
+        self.assertEqual(sample.compound_id, 1)
+        sample.compound = Chemical(common_name='foo', formula='C', ptx_code=1)
+        self.assertEqual(sample.get_data(), {
+            **DATA,
+            'compound': {'common_name': 'foo', 'cas': None, 'formula': 'C', 'ptx_code': 'PTX001'}
+        })
+        self.assertIsInstance(sample.get_data()['dose_code'], int)
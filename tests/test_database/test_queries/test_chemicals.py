@@ -17,8 +17,9 @@ class MockModel:
 
 class TestChemicalQueries(TestCase):
 
+    @patch('ptmd.database.queries.chemicals.reference_data')
     @patch('ptmd.database.models.chemical.get_current_user')
-    def test_create_chemicals(self, mock_current_user):
+    def test_create_chemicals(self, mock_current_user, mock_reference_data):
         mock_current_user.return_value.role = 'admin'
         with patch('ptmd.database.queries.chemicals.session'):
             chemical_input = [{"common_name": "test", "formula": "test", "cas": "test", "ptx_code": 1}]
@@ -29,18 +30,18 @@ class TestChemicalQueries(TestCase):
             self.assertEqual(dict(chemicals['test']), expected_chemical)
             chemicals = create_chemicals(chemicals=[{"test": 1}])
             self.assertEqual(chemicals, {})
+            self.assertEqual(mock_reference_data.invalidate.call_count, 2)
 
     @patch('ptmd.database.queries.chemicals.Chemical')
     def test_get_allowed_chemicals(self, mock_chemical):
         mock_chemical.query.all.return_value = [MockModel()]
         self.assertEqual(get_allowed_chemicals(), ['A NAME'])
 
-    @patch('ptmd.database.queries.chemicals.Chemical')
-    def test_get_chemical_code_mapping(self, mock_chemical):
-        mock_chemical.query.filter().first.return_value = MockModel()
-        self.assertEqual(get_chemical_code_mapping(['A']), {'A NAME': '001'})
+    @patch('ptmd.database.queries.chemicals.reference_data')
+    def test_get_chemical_code_mapping(self, mock_reference_data):
+        mock_reference_data.chemicals = {'A NAME': 1, 'B NAME': 998}
+        self.assertEqual(get_chemical_code_mapping(['A NAME', 'B NAME']), {'A NAME': '001', 'B NAME': '998'})
 
-        mock_chemical.query.filter().first.return_value = None
         with self.assertRaises(ValueError) as context:
             get_chemical_code_mapping(['A'])
         self.assertEqual(str(context.exception), 'Chemical A not found in the database.')
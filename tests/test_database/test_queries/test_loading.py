@@ -0,0 +1,136 @@
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from contextlib import contextmanager
+
+from ptmd.api import app
+from ptmd.config import db, session
+from ptmd.database import Organisation, Organism, Chemical, File, Sample, User, Timepoint, Dose
+from ptmd.database.utils import QueryCounter
+from ptmd.database.queries import count_cache
+from ptmd.lib.isa import convert_file_to_isa
+
+
+HEADERS = {'Content-Type': 'application/json', 'Authorization': 'Bearer 123'}
+SAMPLES_PER_FILE = 12
+
+
+def make_sample_data(index: int, chemical: Chemical) -> dict:
+    return {
+        'precisiontox_short_identifier': f'S{index}', 'replicate': index % 4 + 1, 'dose_code': 'BMD10',
+        'timepoint_level': 'TP1', 'timepoint_(hours)': 4, 'box_id': 'Box1', 'box_row': 'A', 'box_column': index % 9,
+        'collection_order': index, 'exposure_route': 'water', 'operator': 'MJones', 'observations_notes': None,
+        'compound': {**dict(chemical), 'chemical_id': chemical.chemical_id}
+    }
+
+
+@patch('ptmd.database.utils.current_user')
+@patch('ptmd.api.queries.utils.get_current_user')
+@patch('ptmd.api.queries.utils.verify_jwt_in_request')
+@patch('flask_jwt_extended.view_decorators.verify_jwt_in_request')
+class TestQueryCount(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        count_cache.invalidate()
+        with app.app_context():
+            db.create_all()
+            session.add(Organisation(name='UOB', longname='University of Birmingham'))
+            session.add_all([
+                Organism(ptox_biosystem_name='Danio_rerio', scientific_name='Danio rerio', ptox_biosystem_code='A'),
+                *[Chemical(common_name=f'chemical {index}', formula='C', ptx_code=index) for index in range(1, 5)]
+            ])
+            session.commit()
+            user = User(username='counter', password='A!Password1', email='counter@example.com', role='admin')
+            session.add(user)
+            session.commit()
+            chemicals = Chemical.query.filter(Chemical.common_name != 'chemical 4').all()
+            organism = Organism.query.first()
+            for file_index in range(3):
+                file = File(gdrive_id=f'file{file_index}', name=f'file{file_index}.xlsx', batch=f'A{file_index}',
+                            replicates=4, controls=1, blanks=1, organisation_name='UOB', user_id=user.id,
+                            organism_name='Danio_rerio', vehicle_name='chemical 4', start_date='2021-01-01',
+                            end_date='2021-01-02', chemicals=chemicals,
+                            timepoints=[Timepoint(value=hours, unit='hours', label=f'TP{hours}') for hours in (4, 8)],
+                            doses=[Dose(value=1, unit='mg/L', label='BMD10', organism=organism, chemical=chemical)
+                                   for chemical in chemicals])
+                file.received = True
+                session.add(file)
+                session.commit()
+                start = file_index * SAMPLES_PER_FILE
+                session.add_all([
+                    Sample(sample_id=f'S{index}', data=make_sample_data(index, chemicals[index % 3]),
+                           file_id=file.file_id)
+                    for index in range(start, start + SAMPLES_PER_FILE)
+                ])
+                session.commit()
+            session.remove()
+
+    @classmethod
+    def tearDownClass(cls):
+        with app.app_context():
+            session.remove()
+            db.drop_all()
+
+    @contextmanager
+    def assertMaxQueries(self, limit: int):
+        with QueryCounter() as counter:
+            yield counter
+        self.assertLessEqual(counter.count, limit, f'{counter.count} queries executed, expected at most {limit}')
+
+    def get(self, url: str, limit: int):
+        with app.test_client() as client:
+            with self.assertMaxQueries(limit):
+                response = client.get(url, headers=HEADERS)
+            session.remove()
+        self.assertEqual(response.status_code, 200)
+        return response.json
+
+    def login(self, mock_current_user, mock_user):
+        user = MagicMock(role='admin')
+        mock_user.return_value = user
+        mock_current_user.return_value = user
+
+    def test_get_samples(self, mock_jwt, mock_verify_jwt, mock_user, mock_current_user):
+        self.login(mock_current_user, mock_user)
+        response = self.get('/api/samples?per_page=30', limit=2)
+        self.assertEqual(len(response['samples']), 30)
+        self.assertEqual(response['samples'][0]['compound']['common_name'], 'chemical 1')
+        self.assertEqual(response['samples'][0]['organism'], 'Danio_rerio')
+
+    def test_search_samples(self, mock_jwt, mock_verify_jwt, mock_user, mock_current_user):
+        self.login(mock_current_user, mock_user)
+        response = self.get('/api/samples/search?per_page=30&organism=Danio&compound=chemical 1', limit=2)
+        self.assertEqual(len(response['data']), 12)
+
+    def test_get_samples_by_cursor(self, mock_jwt, mock_verify_jwt, mock_user, mock_current_user):
+        self.login(mock_current_user, mock_user)
+        sample_ids, cursor = [], ''
+        while cursor is not None:
+            response = self.get(f'/api/samples?per_page=5&cursor={cursor}', limit=1)
+            sample_ids.extend(sample['precisiontox_short_identifier'] for sample in response['samples'])
+            cursor = response['pagination']['next_cursor']
+        self.assertEqual(sample_ids, sorted(f'S{index}' for index in range(3 * SAMPLES_PER_FILE)))
+
+        response = self.get('/api/samples?per_page=5&cursor=&total=true', limit=2)
+        self.assertEqual(response['pagination']['total'], 3 * SAMPLES_PER_FILE)
+        response = self.get('/api/samples?per_page=5&cursor=&total=true', limit=1)
+        self.assertEqual(response['pagination']['total'], 3 * SAMPLES_PER_FILE)
+
+        with app.test_client() as client:
+            response = client.get('/api/samples?cursor=invalid', headers=HEADERS)
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_files(self, mock_jwt, mock_verify_jwt, mock_user, mock_current_user):
+        self.login(mock_current_user, mock_user)
+        response = self.get('/api/files/search', limit=6)
+        self.assertEqual(len(response['data']), 3)
+        self.assertEqual(response['data'][0]['chemicals'], ['chemical 1', 'chemical 2', 'chemical 3'])
+        self.assertEqual(len(response['data'][0]['doses']), 3)
+
+    def test_convert_file_to_isa(self, mock_jwt, mock_verify_jwt, mock_user, mock_current_user):
+        self.login(mock_current_user, mock_user)
+        with app.app_context():
+            file_id = File.query.first().file_id
+            with self.assertMaxQueries(6):
+                isa = convert_file_to_isa(file_id)
+            session.remove()
+        self.assertEqual(len(isa), 1)
@@ -1,7 +1,7 @@
 from unittest import TestCase
 from unittest.mock import patch
 
-from ptmd.database import create_organisations
+from ptmd.database import create_organisations, get_organisation_gdrive_id
 
 
 INPUTS_ORGS = {'KIT': {"g_drive": "123", "long_name": "test12"}}
@@ -9,12 +9,25 @@ INPUTS_ORGS = {'KIT': {"g_drive": "123", "long_name": "test12"}}
 
 class TestOrganisationsQueries(TestCase):
 
+    @patch('ptmd.database.queries.organisations.reference_data')
     @patch('ptmd.database.queries.organisations.session')
     @patch('ptmd.database.queries.organisations.Organisation')
-    def test_create_organisations(self, mock_organisation, mock_session):
+    def test_create_organisations(self, mock_organisation, mock_session, mock_reference_data):
         mock_organisation.query.filter().first.return_value = INPUTS_ORGS['KIT']
         organisations = create_organisations(organisations=INPUTS_ORGS)
         self.assertTrue(mock_session.commit.called)
+        mock_reference_data.invalidate.assert_called_once()
         self.assertTrue(mock_session.add)
         organisations = {org: dict(organisations[org]) for org in organisations}
         self.assertEqual(organisations['KIT']['g_drive'], "123")
+
+    @patch('ptmd.database.queries.organisations.reference_data')
+    def test_get_organisation_gdrive_id(self, mock_reference_data):
+        mock_reference_data.organisations = {'KIT': '123', 'UOB': None}
+        self.assertEqual(get_organisation_gdrive_id('KIT'), '123')
+        with self.assertRaises(ValueError) as context:
+            get_organisation_gdrive_id('UOB')
+        self.assertEqual(str(context.exception), 'Organisation UOB has no Google Drive folder.')
+        with self.assertRaises(ValueError) as context:
+            get_organisation_gdrive_id('UOX')
+        self.assertEqual(str(context.exception), 'Organisation UOX not found in the database.')
@@ -0,0 +1,153 @@
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from ptmd.config import Base
+from ptmd.database.models import Sample, Organisation
+from ptmd.database.queries.pagination import (
+    encode_cursor, decode_cursor, CountCache, paginate_by_key, paginate_by_page, paginate
+)
+from ptmd.exceptions import InvalidCursorError
+
+
+class TestCursor(TestCase):
+
+    def test_encode_decode(self):
+        for key in ['ABC', 12, '']:
+            cursor = encode_cursor(key)
+            self.assertNotIn('=', cursor)
+            self.assertEqual(decode_cursor(cursor, type(key)), key)
+
+    def test_decode_invalid(self):
+        for cursor in ['invalid', '%%%', encode_cursor(None), 'eyJmb28iOiAxfQ']:
+            with self.assertRaises(InvalidCursorError) as context:
+                decode_cursor(cursor, str)
+            self.assertEqual(str(context.exception), 'Invalid cursor')
+
+    def test_decode_wrong_type(self):
+        for key, key_type in (('12', int), (12, str), (True, int), (1.5, int)):
+            with self.assertRaises(InvalidCursorError):
+                decode_cursor(encode_cursor(key), key_type)
+
+
+class TestCountCache(TestCase):
+
+    @patch('ptmd.database.queries.pagination.monotonic')
+    def test_count(self, mock_time):
+        query = MagicMock()
+        query.statement.compile().params = {'batch_1': 'AA'}
+        query.order_by().count.return_value = 3
+        cache = CountCache(ttl=10)
+        mock_time.return_value = 0
+        self.assertEqual(cache.count(query), 3)
+        query.order_by().count.return_value = 4
+        mock_time.return_value = 10
+        self.assertEqual(cache.count(query), 3)
+        mock_time.return_value = 11
+        self.assertEqual(cache.count(query), 4)
+        query.order_by().count.return_value = 5
+        cache.invalidate()
+        self.assertEqual(cache.count(query), 5)
+        self.assertEqual(query.order_by().count.call_count, 3)
+
+    @patch('ptmd.database.queries.pagination.monotonic')
+    def test_size(self, mock_time):
+        cache = CountCache(ttl=10, max_size=2)
+        queries = []
+        for batch in ('AA', 'AB', 'AC'):
+            query = MagicMock()
+            query.statement.compile().params = {'batch_1': batch}
+            query.order_by().count.return_value = 1
+            queries.append(query)
+        mock_time.return_value = 0
+        cache.count(queries[0])
+        cache.count(queries[1])
+        cache.count(queries[0])
+        cache.count(queries[2])
+        self.assertEqual(len(cache), 2)
+        cache.count(queries[0])
+        cache.count(queries[1])
+        self.assertEqual([query.order_by().count.call_count for query in queries], [1, 2, 1])
+        mock_time.return_value = 20
+        cache.count(queries[2])
+        self.assertEqual(len(cache), 1)
+
+
+class TestPagination(TestCase):
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add_all([Sample(sample_id=f'S{index:02}', data={}, file_id=1) for index in range(7)])
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    @patch('ptmd.database.queries.pagination.count_cache')
+    def test_invalidate_on_commit(self, mock_cache):
+        self.session.add(Sample(sample_id='S07', data={}, file_id=1))
+        self.session.commit()
+        self.assertEqual(mock_cache.invalidate.call_count, 1)
+        self.session.execute(update(Sample).where(Sample.sample_id == 'S07').values(replicate=2))
+        self.session.commit()
+        self.assertEqual(mock_cache.invalidate.call_count, 2)
+        self.session.add(Sample(sample_id='S08', data={}, file_id=1))
+        self.session.flush()
+        self.session.rollback()
+        self.session.commit()
+        self.session.add(Organisation(name='UOB', longname='University of Birmingham'))
+        self.session.commit()
+        self.assertEqual(mock_cache.invalidate.call_count, 2)
+
+    @patch('ptmd.database.queries.pagination.count_cache')
+    def test_paginate_by_key(self, mock_cache):
+        mock_cache.count.return_value = 7
+        pages, cursor = [], ''
+        while cursor is not None:
+            items, pagination = paginate_by_key(self.session.query(Sample), Sample.sample_id, per_page=3, cursor=cursor)
+            pages.append([sample.sample_id for sample in items])
+            self.assertEqual(pagination['cursor'], cursor or None)
+            self.assertNotIn('total', pagination)
+            cursor = pagination['next_cursor']
+        self.assertEqual(pages, [['S00', 'S01', 'S02'], ['S03', 'S04', 'S05'], ['S06']])
+        mock_cache.count.assert_not_called()
+
+        query = self.session.query(Sample).filter(Sample.sample_id != 'S01')
+        items, pagination = paginate_by_key(query, Sample.sample_id, per_page=0, with_total=True)
+        self.assertEqual([sample.sample_id for sample in items], ['S00'])
+        self.assertEqual(pagination, {'per_page': 1, 'cursor': None, 'next_cursor': encode_cursor('S00'), 'total': 7})
+        mock_cache.count.assert_called_once_with(query)
+
+        items, pagination = paginate_by_key(self.session.query(Sample), Sample.sample_id, cursor=encode_cursor('S06'))
+        self.assertEqual((items, pagination['next_cursor']), ([], None))
+
+    def test_paginate_by_key_wrong_cursor_type(self):
+        with self.assertRaises(InvalidCursorError):
+            paginate_by_key(self.session.query(Sample), Sample.sample_id, cursor=encode_cursor(6))
+
+    def test_paginate_by_page(self):
+        query = MagicMock()
+        query.paginate().items = ['A']
+        query.paginate().has_next = True
+        query.paginate().has_prev = False
+        query.paginate().pages = 2
+        query.paginate().total = 2
+        items, pagination = paginate_by_page(query, page=1, per_page=1)
+        self.assertEqual(items, ['A'])
+        self.assertEqual(pagination, {
+            'current_page': 1, 'next_page': 2, 'previous_previous': None, 'pages': 2, 'per_page': 1, 'total': 2
+        })
+
+    @patch('ptmd.database.queries.pagination.paginate_by_page', return_value=([], {'page': True}))
+    @patch('ptmd.database.queries.pagination.paginate_by_key', return_value=([], {'cursor': True}))
+    def test_paginate(self, mock_by_key, mock_by_page):
+        query = MagicMock()
+        self.assertEqual(paginate(query, Sample.sample_id, page=2, per_page=5), ([], {'page': True}))
+        mock_by_page.assert_called_once_with(query, page=2, per_page=5)
+        self.assertEqual(paginate(query, Sample.sample_id, cursor='', with_total=True), ([], {'cursor': True}))
+        mock_by_key.assert_called_once_with(query, Sample.sample_id, per_page=10, cursor='', with_total=True)
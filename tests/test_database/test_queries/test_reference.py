@@ -0,0 +1,46 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from ptmd.database.queries.reference import ReferenceData
+
+
+@patch('ptmd.database.queries.reference.Organisation')
+@patch('ptmd.database.queries.reference.Chemical')
+@patch('ptmd.database.queries.reference.Organism')
+class TestReferenceData(TestCase):
+
+    def test_bulk_load(self, mock_organism, mock_chemical, mock_organisation):
+        mock_organism.query.with_entities().order_by().all.return_value = [('human', 'H'), ('fly', 'F')]
+        mock_chemical.query.with_entities().order_by().all.return_value = [('Compound 1', 1), ('Compound 1', 2)]
+        mock_organisation.query.with_entities().all.return_value = [('UOB', '123'), ('KIT', None)]
+        reference_data = ReferenceData()
+        self.assertEqual(reference_data.organisms, {'human': 'H', 'fly': 'F'})
+        self.assertEqual(reference_data.chemicals, {'Compound 1': 1})
+        self.assertEqual(reference_data.organisations, {'UOB': '123', 'KIT': None})
+        for _ in range(3):
+            reference_data.organisms.get('fly')
+            reference_data.chemicals.get('Compound 1')
+        self.assertEqual(mock_organism.query.with_entities().order_by().all.call_count, 1)
+        self.assertEqual(mock_chemical.query.with_entities().order_by().all.call_count, 1)
+        self.assertEqual(mock_organisation.query.with_entities().all.call_count, 1)
+
+    def test_invalidate(self, mock_organism, mock_chemical, mock_organisation):
+        mock_chemical.query.with_entities().order_by().all.return_value = [('Compound 1', 1)]
+        reference_data = ReferenceData()
+        self.assertEqual(reference_data.chemicals, {'Compound 1': 1})
+        mock_chemical.query.with_entities().order_by().all.return_value = [('Compound 1', 1), ('Compound 2', 2)]
+        self.assertEqual(reference_data.chemicals, {'Compound 1': 1})
+        reference_data.invalidate()
+        self.assertEqual(reference_data.chemicals, {'Compound 1': 1, 'Compound 2': 2})
+
+    @patch('ptmd.database.queries.reference.monotonic')
+    def test_expiry(self, mock_monotonic, mock_organism, mock_chemical, mock_organisation):
+        mock_organism.query.with_entities().order_by().all.return_value = [('fly', 'F')]
+        mock_monotonic.return_value = 0
+        reference_data = ReferenceData(ttl=10)
+        self.assertEqual(reference_data.organisms, {'fly': 'F'})
+        mock_organism.query.with_entities().order_by().all.return_value = [('fly', 'F'), ('human', 'H')]
+        mock_monotonic.return_value = 5
+        self.assertEqual(reference_data.organisms, {'fly': 'F'})
+        mock_monotonic.return_value = 11
+        self.assertEqual(reference_data.organisms, {'fly': 'F', 'human': 'H'})
@@ -0,0 +1,78 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, select, event
+from sqlalchemy.orm import Session
+
+from ptmd.config import Base
+from ptmd.database.models import Sample
+from ptmd.database.queries.samples import upsert_samples, get_existing_sample_ids, build_sample_insert
+
+
+class TestSampleQueries(TestCase):
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.add(Sample(sample_id='A', data={'replicate': 1}, file_id=1))
+        self.session.commit()
+        self.patcher = patch('ptmd.database.queries.samples.session', self.session)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.session.close()
+        self.engine.dispose()
+
+    def test_upsert_samples(self):
+        statements = []
+
+        def count(connection, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(self.engine, 'before_cursor_execute', count)
+        inserted, updated = upsert_samples({
+            'A': {'replicate': 2, 'box_id': 'Box1'},
+            'B': {'replicate': 3, 'operator': 'MJones'},
+            'C': {'replicate': 4, 'compound': {'common_name': 'foo', 'chemical_id': 5}}
+        }, 2)
+        self.session.commit()
+        event.remove(self.engine, 'before_cursor_execute', count)
+        self.assertEqual((inserted, updated), (2, 1))
+        self.assertEqual(len(statements), 3)
+
+        rows = {row[0]: row[1:] for row in self.session.execute(
+            select(Sample.sample_id, Sample.data, Sample.file_id, Sample.replicate, Sample.box_id, Sample.compound_id)
+        )}
+        self.assertEqual(rows, {
+            'A': ({}, 1, 2, 'Box1', None),
+            'B': ({'operator': 'MJones'}, 2, 3, None, None),
+            'C': ({}, 2, 4, None, 5)
+        })
+
+    def test_upsert_samples_inserted_concurrently(self):
+        with patch('ptmd.database.queries.samples.get_existing_sample_ids', return_value=set()):
+            inserted, updated = upsert_samples({
+                'A': {'replicate': 2, 'box_id': 'Box1'},
+                'B': {'replicate': 3}
+            }, 2)
+        self.session.commit()
+        self.assertEqual((inserted, updated), (1, 1))
+        rows = {row[0]: row[1:] for row in self.session.execute(
+            select(Sample.sample_id, Sample.file_id, Sample.replicate, Sample.box_id)
+        )}
+        self.assertEqual(rows, {'A': (1, 2, 'Box1'), 'B': (2, 3, None)})
+
+    @patch('ptmd.database.queries.samples.SAMPLE_QUERY_CHUNK', 2)
+    def test_get_existing_sample_ids(self):
+        self.session.add_all([Sample(sample_id=sample_id, data={}, file_id=1) for sample_id in 'BCD'])
+        self.session.commit()
+        self.assertEqual(get_existing_sample_ids(['A', 'C', 'D', 'E', 'F']), {'A', 'C', 'D'})
+        self.assertEqual(get_existing_sample_ids([]), set())
+
+    def test_build_sample_insert(self):
+        self.assertIn('ON CONFLICT', str(build_sample_insert('sqlite').compile(dialect=self.engine.dialect)))
+        self.assertNotIn('ON CONFLICT', str(build_sample_insert('mysql')))
+        self.assertIn('ON CONFLICT', str(build_sample_insert('postgresql')))
+        self.assertIn('RETURNING', str(build_sample_insert('sqlite').compile(dialect=self.engine.dialect)))
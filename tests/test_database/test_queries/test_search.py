@@ -3,7 +3,7 @@ from unittest.mock import patch
 
 from ptmd.config import app
 from ptmd.database import File
-from ptmd.database.queries.search import search_files, assemble_integer_clause
+from ptmd.database.queries.search import search_files, assemble_integer_clause, search_samples, build_sample_search_query
 
 
 class TestSearch(TestCase):
@@ -11,11 +11,11 @@ class TestSearch(TestCase):
     @patch("ptmd.database.queries.search.File")
     @patch("ptmd.database.queries.search.assemble_integer_clause")
     def test_search_files(self, mock_clause, mock_file):
-        mock_file.query.filter().paginate().items = [
+        mock_file.query.filter().options().paginate().items = [
             {'timepoints': [{"files": [{"id": 1}, {"id": 2}]}]},
         ]
-        mock_file.query.filter().paginate().pages = 2
-        mock_file.query.filter().paginate().total = 4
+        mock_file.query.filter().options().paginate().pages = 2
+        mock_file.query.filter().options().paginate().total = 4
         with app.app_context():
             files = search_files(
                 page=2, per_page=2,
@@ -32,7 +32,7 @@ class TestSearch(TestCase):
             self.assertEqual(files['pagination'], page)
             self.assertEqual(len(files['data']), 1)
 
-            mock_file.query.filter().paginate().items = [{'timepoints': [{"files": [{"id": 1}, {"id": 2}]}]}]
+            mock_file.query.filter().options().paginate().items = [{'timepoints': [{"files": [{"id": 1}, {"id": 2}]}]}]
             files = search_files(
                 page=2, per_page=2,
                 batch='AC', name="A", is_valid=True,
@@ -48,6 +48,40 @@ class TestSearch(TestCase):
             self.assertEqual(files['pagination'], page)
             self.assertEqual(len(files['data']), 1)
 
+    @patch("ptmd.database.queries.search.build_sample_search_query")
+    def test_search_samples(self, mock_query):
+        paginated = mock_query().options().order_by().paginate()
+        paginated.items = [{'replicate': 1}]
+        paginated.pages = 2
+        paginated.total = 3
+        paginated.has_next = False
+        with app.app_context():
+            samples = search_samples(page=2, per_page=2, dose='BMD10', batch='AA')
+        self.assertEqual(samples['data'], [{'replicate': 1}])
+        page = {'current_page': 2, 'next_page': None, 'previous_previous': 1, 'pages': 2, 'per_page': 2, 'total': 3}
+        self.assertEqual(samples['pagination'], page)
+        mock_query.assert_called_with(compound_name=None, dose='BMD10', timepoint=None, replicate=None, batch='AA',
+                                      organism_name=None, organisation_name=None)
+
+    def test_build_sample_search_query(self):
+        with app.app_context():
+            query = str(build_sample_search_query())
+            self.assertIn('JOIN file ON file.file_id = sample.file_id', query)
+            self.assertNotIn('WHERE', query)
+
+            query = str(build_sample_search_query(
+                compound_name='Imidazole', dose=0,
+                timepoint={'operator': 'gte', 'value': 0},
+                replicate={'operator': 'eq', 'value': 2},
+                batch='AA', organism_name='Danio', organisation_name='UOB'
+            ))
+        self.assertIn('JOIN chemical ON chemical.chemical_id = sample.compound_id', query)
+        self.assertIn('JOIN organism ON organism.organism_id = file.organism_id', query)
+        self.assertIn('JOIN organisation ON organisation.organisation_id = file.organisation_id', query)
+        for clause in ['sample.dose_code = ', 'sample.timepoint >= ', 'sample.replicate = ', 'file.batch = ',
+                       'chemical.common_name LIKE ', 'organism.scientific_name LIKE ', 'organisation.name LIKE ']:
+            self.assertIn(clause, query)
+
     def test_assemble_integer_clause(self):
         clause = assemble_integer_clause(
             filter_data={'operator': 'ne', 'value': 3},
@@ -2,7 +2,7 @@ from unittest import TestCase
 from unittest.mock import patch
 
 
-from ptmd.database.queries import create_timepoints_hours
+from ptmd.database.queries import create_timepoints_hours, build_timepoints_hours
 from ptmd.exceptions import TimepointValueError
 
 
@@ -20,3 +20,12 @@ class TestCreateTimepointsHours(TestCase):
         with self.assertRaises(TimepointValueError) as context:
             create_timepoints_hours([None, 1])
         self.assertTrue('Timepoint value must be a positive integer' in str(context.exception))
+
+    @patch('ptmd.database.queries.timepoints.session')
+    def test_build_timepoints_hours(self, mock_session):
+        timepoints = build_timepoints_hours([4, 8])
+        self.assertEqual([(timepoint.value, timepoint.label) for timepoint in timepoints], [(4, 'TP1'), (8, 'TP2')])
+        mock_session.add.assert_not_called()
+        mock_session.commit.assert_not_called()
+        with self.assertRaises(TimepointValueError):
+            build_timepoints_hours([4, 0])
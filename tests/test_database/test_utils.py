@@ -1,7 +1,10 @@
 from unittest import TestCase
 from unittest.mock import patch
+from threading import Thread
 
-from ptmd.database.utils import get_current_user
+from sqlalchemy import create_engine, text
+
+from ptmd.database.utils import get_current_user, QueryCounter
 
 
 @patch('ptmd.database.utils.current_user')
@@ -14,3 +17,40 @@ class TestUtils(TestCase):
     def test_get_user_invalid(self, mock_user):
         mock_user.side_effect = RuntimeError('No user')
         self.assertEqual(get_current_user(), None)
+
+
+class TestQueryCounter(TestCase):
+
+    def test_count_queries(self):
+        engine = create_engine('sqlite://')
+        with QueryCounter() as counter:
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+                connection.execute(text('SELECT 2'))
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 3'))
+        self.assertEqual(counter.count, 2)
+
+    @patch('ptmd.database.utils.event')
+    def test_no_listener_per_counter(self, mock_event):
+        with QueryCounter():
+            pass
+        mock_event.listen.assert_not_called()
+        mock_event.remove.assert_not_called()
+
+    def test_nested_counters_and_threads(self):
+        engine = create_engine('sqlite://')
+
+        def execute():
+            with engine.connect() as other_connection:
+                other_connection.execute(text('SELECT 3'))
+
+        with QueryCounter() as outer:
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+                with QueryCounter() as inner:
+                    connection.execute(text('SELECT 2'))
+                    thread = Thread(target=execute)
+                    thread.start()
+                    thread.join()
+        self.assertEqual((outer.count, inner.count), (2, 1))
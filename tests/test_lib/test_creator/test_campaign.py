@@ -0,0 +1,129 @@
+from unittest import TestCase
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from io import BytesIO
+
+from pandas import read_excel
+
+from ptmd.lib.creator.campaign import CampaignCreator, build_template, summarize_campaign
+from .test_creator import VALID_INPUT, CHEMICAL_MAPPING
+
+
+DESIGN = {**deepcopy(VALID_INPUT), 'exposure': [{"chemicals": ["chemical1", "chemical2"], "dose": "BMD10"}]}
+
+
+class MockedChemical:
+    def __init__(self, name):
+        self.common_name = name
+
+
+def make_design(**kwargs):
+    return {**deepcopy(DESIGN), **kwargs}
+
+
+@patch('ptmd.lib.creator.core.get_chemical_code_mapping', return_value=CHEMICAL_MAPPING)
+@patch('ptmd.lib.creator.core.get_organism_code', return_value='H')
+@patch('ptmd.lib.creator.core.get_allowed_organisms', return_value=['H'])
+@patch('ptmd.lib.creator.campaign.get_organisation_gdrive_id', return_value='folder')
+@patch('ptmd.lib.creator.campaign.get_shipped_file', side_effect=lambda organism, batch: batch == 'ZZ')
+@patch('ptmd.lib.creator.campaign.get_chemicals_from_name',
+       return_value=[MockedChemical('chemical1'), MockedChemical('chemical2'), MockedChemical('chemical3')])
+@patch('ptmd.lib.creator.campaign.session')
+@patch('ptmd.lib.creator.campaign.File')
+@patch('ptmd.lib.creator.campaign.GoogleDriveConnector')
+class TestCampaignCreator(TestCase):
+
+    def setUp(self):
+        self.uploaded = {}
+
+    def upload(self, directory_id, content, title):
+        if title.endswith('_FF.xlsx'):
+            return None
+        self.uploaded[title] = content.getvalue()
+        return {'id': f'id_{title}', 'title': title, 'alternateLink': f'url_{title}'}
+
+    def create(self, designs):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            return CampaignCreator(designs, user=1, pool=pool, upload_workers=2).create()
+
+    def test_create(self, mock_gdrive, mock_file, mock_session, *mocks):
+        mock_gdrive().upload_content.side_effect = self.upload
+        mock_file.side_effect = lambda **kwargs: {'name': kwargs['name'], 'chemicals': kwargs['chemicals']}
+        designs = [
+            make_design(exposure_batch='AA'),
+            make_design(exposure_batch='ZZ'),
+            make_design(exposure_batch='AB', timepoints=[4, None]),
+            make_design(exposure_batch='AA'),
+            make_design(exposure_batch='FF'),
+            make_design(partner='ABC'),
+            make_design(exposure_batch='AC', exposure=[{"chemicals": ["chemical3"], "dose": "BMD25"}])
+        ]
+        results = self.create(designs)
+        self.assertEqual([result['index'] for result in results], list(range(7)))
+        self.assertEqual([result['created'] for result in results], [True, False, False, False, False, False, True])
+        self.assertEqual(results[1]['message'], 'Batch ZZ for H already exists.')
+        self.assertEqual(results[2]['message'], 'Timepoint value must be a positive integer')
+        self.assertEqual(results[3]['message'], 'Batch AA for H is requested more than once.')
+        self.assertEqual(results[4]['message'], 'An error occurred while uploading the file to the Google Drive.')
+        self.assertIn("'partner' value 'ABC' is not one of", results[5]['message'])
+        self.assertEqual(results[0]['data']['file_url'], f"url_{VALID_INPUT['partner']}_H_AA.xlsx")
+        self.assertEqual([chemical.common_name for chemical in results[6]['data']['chemicals']], ['chemical3'])
+        self.assertEqual(summarize_campaign(results), {'total': 7, 'created': 2, 'failed': 5})
+
+        self.assertEqual(len(self.uploaded), 2)
+        content = self.uploaded[f"{VALID_INPUT['partner']}_H_AC.xlsx"]
+        samples = read_excel(BytesIO(content), sheet_name=0)
+        self.assertTrue(all(identifier.startswith('HAC') for identifier in samples.iloc[:, 0]))
+        mock_session.commit.assert_called_once()
+        self.assertEqual(len(mock_session.add_all.call_args_list[-1].args[0]), 2)
+        mock_gdrive().delete_file.assert_not_called()
+
+    def test_registration_failure(self, mock_gdrive, mock_file, mock_session, *mocks):
+        mock_gdrive().upload_content.side_effect = self.upload
+        mock_file.side_effect = lambda **kwargs: {'name': kwargs['name']}
+        mock_session.commit.side_effect = ValueError('database is down')
+        results = self.create([make_design(exposure_batch='AA'), make_design(exposure_batch='AB')])
+        self.assertEqual([result['message'] for result in results],
+                         ['Unable to register the file: database is down'] * 2)
+        mock_session.rollback.assert_called_once()
+        self.assertEqual(mock_gdrive().delete_file.call_count, 2)
+
+    def test_file_failure(self, mock_gdrive, mock_file, mock_session, *mocks):
+        mock_gdrive().upload_content.side_effect = self.upload
+
+        def make_file(**kwargs):
+            if kwargs['batch'] == 'AB':
+                raise ValueError('unknown organisation')
+            return {'name': kwargs['name']}
+        mock_file.side_effect = make_file
+        results = self.create([make_design(exposure_batch='AA'), make_design(exposure_batch='AB')])
+        self.assertEqual([result['created'] for result in results], [True, False])
+        self.assertEqual(results[1]['message'], 'Unable to register the file: unknown organisation')
+        mock_session.commit.assert_called_once()
+        mock_gdrive().delete_file.assert_called_once_with(f"id_{VALID_INPUT['partner']}_H_AB.xlsx")
+
+    def test_build_failure(self, mock_gdrive, mock_file, mock_session, *mocks):
+        with patch('ptmd.lib.creator.campaign.build_template', side_effect=ValueError('broken')):
+            results = self.create([make_design(exposure_batch='AA')])
+        self.assertEqual(results[0]['message'], 'Unable to build the template: broken')
+        mock_gdrive().upload_content.assert_not_called()
+        mock_session.commit.assert_not_called()
+
+    def test_process_pool(self, mock_gdrive, mock_file, mock_session, *mocks):
+        mock_gdrive().upload_content.side_effect = self.upload
+        mock_file.side_effect = lambda **kwargs: {'name': kwargs['name']}
+        results = CampaignCreator([make_design(exposure_batch='AA')], user=1, max_workers=1).create()
+        self.assertTrue(results[0]['created'])
+        self.assertEqual(self.uploaded[f"{VALID_INPUT['partner']}_H_AA.xlsx"][:2], b'PK')
+
+
+class TestBuildTemplate(TestCase):
+
+    def test_build_template(self):
+        with patch('ptmd.lib.creator.core.get_allowed_organisms') as mock_allowed_organisms:
+            content = build_template(make_design(), CHEMICAL_MAPPING, 'H')
+            mock_allowed_organisms.assert_not_called()
+        samples = read_excel(BytesIO(content), sheet_name=0)
+        self.assertEqual(samples.iloc[0, 0], 'HAC001LA1')
+        self.assertEqual(len(samples), 2 * 3 * 2 + 2 * 3 + 1)
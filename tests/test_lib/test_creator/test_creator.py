@@ -4,6 +4,7 @@ from copy import deepcopy
 from os import path
 
 from jsonschema import ValidationError
+from pandas import read_excel
 
 from ptmd.lib.creator.core import DataframeCreator
 from ptmd.const import ALLOWED_PARTNERS
@@ -110,3 +111,38 @@ class TestFileCreator(TestCase):
             creator: DataframeCreator = DataframeCreator(data)
             creator.validate()
         self.assertEqual(str(context.exception), "Timepoint 30000000 is over extending the end date.")
+
+    @patch('ptmd.lib.creator.core.get_chemical_code_mapping', return_value=CHEMICAL_MAPPING)
+    @patch('ptmd.lib.creator.core.get_organism_code', return_value='H')
+    @patch('ptmd.lib.creator.core.get_allowed_organisms', return_value=['H'])
+    def test_save_streaming(self, mock_chemical_mapping, mock_organism_code, mock_allowed_organisms):
+        data = deepcopy(VALID_INPUT)
+        data['exposure'] = [{"chemicals": ["chemical1", "chemical1", "chemical2"], "dose": 0}]
+        creator: DataframeCreator = DataframeCreator(data)
+        expected, _ = creator.to_dataframe()
+        output_path = path.join(HERE, "..", "..", "test_streaming.xlsx")
+        with patch.object(creator, 'to_dataframe') as mock_to_dataframe:
+            creator.save_file(output_path, streaming=True)
+            mock_to_dataframe.assert_not_called()
+        try:
+            exposure = read_excel(output_path, sheet_name='Exposure information', dtype=object).fillna('')
+            general = read_excel(output_path, sheet_name='General Information')
+        finally:
+            creator.delete_file()
+        self.assertEqual(exposure.values.tolist(), expected.values.tolist())
+        self.assertEqual(general['timepoints'][0], '[1, 2, 3]')
+
+    @patch('ptmd.lib.creator.core.get_chemical_code_mapping', return_value=CHEMICAL_MAPPING)
+    @patch('ptmd.lib.creator.core.get_organism_code', return_value='H')
+    @patch('ptmd.lib.creator.core.get_allowed_organisms', return_value=['H'])
+    def test_save_buffer(self, mock_chemical_mapping, mock_organism_code, mock_allowed_organisms):
+        data = deepcopy(VALID_INPUT)
+        data['exposure'] = [{"chemicals": ["chemical1", "chemical2"], "dose": 0}]
+        creator: DataframeCreator = DataframeCreator(data)
+        expected, _ = creator.to_dataframe()
+        for streaming in (False, True):
+            buffer = creator.save_buffer(streaming=streaming)
+            self.assertEqual(buffer.tell(), 0)
+            exposure = read_excel(buffer, sheet_name='Exposure information', dtype=object).fillna('')
+            self.assertEqual(exposure.values.tolist(), expected.values.tolist())
+        self.assertEqual(creator.file_path, '')
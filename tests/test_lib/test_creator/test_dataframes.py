@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from ptmd.lib.creator.dataframes import build_sample_dataframe, add_blanks_to_sample_dataframe
+from ptmd.const import SAMPLE_SHEET_COLUMNS, EMPTY_FIELDS_VALUES
+
+
+class MockedHarvester:
+    def __init__(self, exposure_conditions, replicates4control=2, replicates_blank=1):
+        self.exposure_conditions = exposure_conditions
+        self.timepoints = [4, 8]
+        self.replicates4exposure = 2
+        self.replicates4control = replicates4control
+        self.replicates_blank = replicates_blank
+        self.exposure_batch = 'AC'
+        self.vehicle = 'DMSO'
+
+
+class TestSampleDataframe(TestCase):
+
+    def test_build_sample_dataframe(self):
+        harvester = MockedHarvester([{'chemicals': ['chemical1', 'chemical2'], 'dose': 'BMD10'}])
+        dataframe = build_sample_dataframe(harvester, {'chemical1': '001', 'chemical2': '002'}, 'F')
+        self.assertEqual(dataframe.shape, (13, len(SAMPLE_SHEET_COLUMNS)))
+        self.assertEqual(list(dataframe.columns), SAMPLE_SHEET_COLUMNS)
+        self.assertEqual(list(dataframe.index), [0] * 13)
+        self.assertTrue(all(dtype == object for dtype in dataframe.dtypes))
+        rows = dataframe.values.tolist()
+        self.assertEqual(rows[0], ['FAC001LA1', 'PTX001', *EMPTY_FIELDS_VALUES, 1, 'chemical1', 'BMD10', 'TP1', 4])
+        self.assertEqual(rows[7], ['FAC002LB2', 'PTX002', *EMPTY_FIELDS_VALUES, 2, 'chemical2', 'BMD10', 'TP2', 8])
+        self.assertEqual(rows[8], ['FAC999ZA1', 'PTX999', *EMPTY_FIELDS_VALUES, 1, 'CONTROL (DMSO)', 0, 'TP1', 4])
+        self.assertEqual(rows[12], ['FAC998ZS1', 'PTX998', *EMPTY_FIELDS_VALUES, 1, 'EXTRACTION BLANK', '0', 'TP0', 0])
+
+    def test_empty_design(self):
+        dataframe = build_sample_dataframe(MockedHarvester([], replicates4control=0, replicates_blank=0), {}, 'F')
+        self.assertEqual(dataframe.shape, (0, len(SAMPLE_SHEET_COLUMNS)))
+        dataframe = add_blanks_to_sample_dataframe(dataframe, 2, 'F', 'AC')
+        self.assertEqual(list(dataframe['precisiontox_short_identifier']), ['FAC998ZS1', 'FAC998ZS2'])
+        self.assertEqual(list(dataframe.index), [0, 0])
@@ -0,0 +1,52 @@
+from unittest import TestCase
+from unittest.mock import patch
+from copy import deepcopy
+
+from ptmd.lib.creator.core import DataframeCreator
+from ptmd.lib.creator.dataframes import build_sample_dataframe
+from ptmd.lib.creator.design import build_design_dataframe, count_samples
+from ptmd.lib.creator.skeleton import template_cache
+from .test_creator import VALID_INPUT, CHEMICAL_MAPPING
+from .test_dataframes import MockedHarvester
+
+
+class TestDesignDataframe(TestCase):
+
+    def assertIdentical(self, harvester, mapping):
+        expected = build_sample_dataframe(harvester, mapping, 'F')
+        dataframe = build_design_dataframe(harvester, mapping, 'F')
+        self.assertTrue(expected.equals(dataframe))
+        self.assertTrue(expected.index.equals(dataframe.index))
+        self.assertTrue(expected.dtypes.equals(dataframe.dtypes))
+        self.assertEqual(expected.to_csv(), dataframe.to_csv())
+        self.assertEqual(count_samples(harvester), len(dataframe))
+
+    def test_identical(self):
+        mapping = {'chemical1': '001', 'chemical2': '002'}
+        conditions = [{'chemicals': ['chemical1', 'chemical2'], 'dose': 'BMD10'}, {'chemicals': ['chemical2'], 'dose': 0}]
+        self.assertIdentical(MockedHarvester(conditions), mapping)
+        harvester = MockedHarvester(conditions, replicates4control=0, replicates_blank=3)
+        harvester.vehicle = 'Water'
+        harvester.timepoints = list(range(1, 13))
+        self.assertIdentical(harvester, mapping)
+
+    def test_empty_sections(self):
+        self.assertIdentical(MockedHarvester([], replicates4control=0, replicates_blank=0), {})
+        self.assertIdentical(MockedHarvester([], replicates4control=0, replicates_blank=2), {})
+        self.assertIdentical(MockedHarvester([], replicates4control=3, replicates_blank=0), {})
+
+    @patch('ptmd.lib.creator.core.get_chemical_code_mapping', return_value=CHEMICAL_MAPPING)
+    @patch('ptmd.lib.creator.core.get_organism_code', return_value='H')
+    @patch('ptmd.lib.creator.core.get_allowed_organisms', return_value=['H'])
+    def test_to_dataframe(self, mock_allowed_organisms, mock_organism_code, mock_chemical_mapping):
+        data = deepcopy(VALID_INPUT)
+        data['exposure'] = [{"chemicals": ["chemical1", "chemical2"], "dose": 0}]
+        creator = DataframeCreator(data)
+        with patch('ptmd.lib.creator.core.build_design_dataframe', side_effect=build_design_dataframe) as mock_design:
+            rows, _ = creator.to_dataframe()
+            mock_design.assert_not_called()
+            template_cache.clear()
+            with patch('ptmd.lib.creator.core.DESIGN_THRESHOLD', 10):
+                design, _ = creator.to_dataframe()
+            mock_design.assert_called_once()
+        self.assertTrue(rows.equals(design))
@@ -0,0 +1,108 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from ptmd.lib.creator.dataframes import build_sample_dataframe
+from ptmd.lib.creator.design import build_design_dataframe
+from ptmd.lib.creator.skeleton import TemplateCache, skeleton_key
+from .test_dataframes import MockedHarvester
+
+
+MAPPING = {'chemical1': '001', 'chemical2': '002'}
+CONDITIONS = [{'chemicals': ['chemical1', 'chemical2'], 'dose': 'BMD10'}]
+
+
+class TestTemplateCache(TestCase):
+
+    def test_batch_substitution(self):
+        cache = TemplateCache()
+        builder = MagicMock(side_effect=build_sample_dataframe)
+        harvester = MockedHarvester(CONDITIONS)
+        first = cache.sample_dataframe(harvester, MAPPING, 'F', builder)
+        harvester.exposure_batch = 'BD'
+        second = cache.sample_dataframe(harvester, MAPPING, 'F', builder)
+        builder.assert_called_once()
+        expected = build_sample_dataframe(harvester, MAPPING, 'F')
+        self.assertTrue(expected.equals(second))
+        self.assertTrue(expected.dtypes.equals(second.dtypes))
+        self.assertEqual(expected.to_csv(), second.to_csv())
+        self.assertEqual(first['precisiontox_short_identifier'].iloc[0], 'FAC001LA1')
+        self.assertEqual(second['precisiontox_short_identifier'].iloc[0], 'FBD001LA1')
+        self.assertEqual(cache.inspect(), {
+            'size': 1, 'samples': 13, 'max_samples': 100000,
+            'hits': 1, 'misses': 1, 'hit_rate': 0.5
+        })
+
+        second.iloc[0, 0] = 'changed'
+        third = cache.sample_dataframe(harvester, MAPPING, 'F', builder)
+        self.assertEqual(third['precisiontox_short_identifier'].iloc[0], 'FBD001LA1')
+
+    def test_design_changes(self):
+        cache = TemplateCache()
+        builder = MagicMock(side_effect=build_sample_dataframe)
+        harvester = MockedHarvester(CONDITIONS)
+        cache.sample_dataframe(harvester, MAPPING, 'F', builder)
+        cache.sample_dataframe(harvester, MAPPING, 'H', builder)
+        cache.sample_dataframe(harvester, {**MAPPING, 'chemical2': '003'}, 'F', builder)
+        harvester.replicates_blank = 3
+        cache.sample_dataframe(harvester, MAPPING, 'F', builder)
+        self.assertEqual(builder.call_count, 4)
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(cache.hits, 0)
+
+    def test_eviction(self):
+        cache = TemplateCache(max_samples=27)
+        builder = MagicMock(side_effect=build_sample_dataframe)
+        harvesters = [MockedHarvester(CONDITIONS, replicates_blank=blanks) for blanks in range(3)]
+        for harvester in harvesters:
+            cache.sample_dataframe(harvester, MAPPING, 'F', builder)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.samples, 27)
+        cache.sample_dataframe(harvesters[2], MAPPING, 'F', builder)
+        cache.sample_dataframe(harvesters[0], MAPPING, 'F', builder)
+        self.assertEqual(builder.call_count, 4)
+        self.assertEqual(cache.samples, 26)
+        cache.clear()
+        self.assertEqual(cache.inspect()['hit_rate'], None)
+        self.assertEqual(cache.samples, 0)
+
+    def test_large_design(self):
+        cache = TemplateCache()
+        builder = MagicMock(side_effect=build_design_dataframe)
+        conditions = [{'chemicals': [f'chemical{i}' for i in range(100)], 'dose': dose} for dose in ('BMD10', 'BMD25')]
+        mapping = {f'chemical{i}': str(i).rjust(3, '0') for i in range(100)}
+        harvester = MockedHarvester(conditions)
+        harvester.replicates4exposure = 4
+        harvester.timepoints = [4, 8, 12, 24]
+        cache.sample_dataframe(harvester, mapping, 'F', builder)
+        harvester.exposure_batch = 'BD'
+        dataframe = cache.sample_dataframe(harvester, mapping, 'F', builder)
+        builder.assert_called_once()
+        self.assertEqual(len(dataframe), 3209)
+        self.assertEqual(cache.samples, 3209)
+        self.assertTrue(build_design_dataframe(harvester, mapping, 'F').equals(dataframe))
+
+    def test_too_large(self):
+        cache = TemplateCache(max_samples=12)
+        builder = MagicMock(side_effect=build_sample_dataframe)
+        harvester = MockedHarvester(CONDITIONS)
+        self.assertEqual(len(cache.sample_dataframe(harvester, MAPPING, 'F', builder)), 13)
+        cache.sample_dataframe(harvester, MAPPING, 'F', builder)
+        self.assertEqual(builder.call_count, 2)
+        self.assertEqual((len(cache), cache.samples), (0, 0))
+        self.assertTrue(cache.accepts(12))
+        self.assertFalse(cache.accepts(13))
+
+    def test_empty_design(self):
+        cache = TemplateCache()
+        harvester = MockedHarvester([], replicates4control=0, replicates_blank=0)
+        cache.sample_dataframe(harvester, {}, 'F', build_sample_dataframe)
+        harvester.exposure_batch = 'BD'
+        self.assertEqual(cache.sample_dataframe(harvester, {}, 'F', build_sample_dataframe).shape, (0, 20))
+
+    def test_skeleton_key(self):
+        harvester = MockedHarvester(CONDITIONS)
+        key = skeleton_key(harvester, MAPPING, 'F')
+        harvester.exposure_batch = 'ZZ'
+        self.assertEqual(key, skeleton_key(harvester, MAPPING, 'F'))
+        harvester.timepoints = [4]
+        self.assertNotEqual(key, skeleton_key(harvester, MAPPING, 'F'))
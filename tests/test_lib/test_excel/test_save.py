@@ -0,0 +1,59 @@
+from unittest import TestCase
+from os import path
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from numpy import int64
+from openpyxl import load_workbook
+from pandas import DataFrame
+
+from ptmd.lib.excel import save_to_excel, save_rows_to_excel
+from ptmd.lib.excel.save import to_cell_value
+from ptmd.const import SAMPLE_SHEET_COLUMNS, GENERAL_SHEET_COLUMNS, EMPTY_FIELDS_VALUES
+
+
+SAMPLE_ROWS = [
+    ['FAC001LA1', 'PTX001', *EMPTY_FIELDS_VALUES, 1, 'chemical1', 'BMD10', 'TP1', 4],
+    ['FAC999ZA1', 'PTX999', *EMPTY_FIELDS_VALUES, 1, 'CONTROL (DMSO)', 0, 'TP1', 4],
+    ['FAC998ZS1', 'PTX998', *EMPTY_FIELDS_VALUES, 1, 'EXTRACTION BLANK', '0', 'TP0', 0]
+]
+GENERAL_ROW = ["UOB", "Drosophila_melanogaster_female", "AC", 1, 1, 1, "2020-01-01", "2020-10-01", [4], "DMSO"]
+
+
+def describe(cell):
+    return cell.value, cell.protection.locked, cell.fill.fgColor.rgb, cell.font.name, cell.font.size, \
+        cell.border.left.style, cell.alignment.horizontal
+
+
+class TestSaveRows(TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    def test_same_workbook(self):
+        expected_path = save_to_excel((DataFrame(SAMPLE_ROWS, columns=SAMPLE_SHEET_COLUMNS),
+                                       DataFrame([GENERAL_ROW], columns=GENERAL_SHEET_COLUMNS)),
+                                      path.join(self.directory, 'dataframes.xlsx'))
+        streamed_path = save_rows_to_excel(iter(SAMPLE_ROWS), [GENERAL_ROW], path.join(self.directory, 'rows.xlsx'))
+        expected, streamed = load_workbook(expected_path), load_workbook(streamed_path)
+        self.assertEqual(streamed.sheetnames, ['Exposure information', 'General Information'])
+        for sheet_name in expected.sheetnames:
+            expected_sheet, streamed_sheet = expected[sheet_name], streamed[sheet_name]
+            self.assertEqual(expected_sheet.protection.sheet, streamed_sheet.protection.sheet)
+            self.assertEqual(expected_sheet.row_dimensions[1].height, streamed_sheet.row_dimensions[1].height)
+            self.assertEqual({key: column.width for key, column in expected_sheet.column_dimensions.items()},
+                             {key: column.width for key, column in streamed_sheet.column_dimensions.items()})
+            self.assertEqual([[describe(cell) for cell in row] for row in expected_sheet.iter_rows()],
+                             [[describe(cell) for cell in row] for row in streamed_sheet.iter_rows()])
+        self.assertTrue(streamed['Exposure information'].protection.sheet)
+        self.assertEqual(streamed['General Information']['I2'].value, '[4]')
+
+    def test_to_cell_value(self):
+        self.assertEqual(to_cell_value(None), '')
+        self.assertEqual(to_cell_value(float('nan')), '')
+        self.assertEqual(to_cell_value('a'), 'a')
+        self.assertIs(type(to_cell_value(int64(3))), int)
+        self.assertEqual(to_cell_value([1, 2]), '[1, 2]')
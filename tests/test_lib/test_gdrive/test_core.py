@@ -1,3 +1,4 @@
+from io import BytesIO
 from os import path
 from unittest import TestCase
 from unittest.mock import patch
@@ -85,6 +86,15 @@ class TestGetFileName(TestCase):
             filename = gdrive_connector.get_filename(file_id="123")
             self.assertEqual(filename, "title test")
 
+    def test_get_checksum(self, google_auth_mock):
+        with patch('ptmd.lib.gdrive.core.GoogleDrive') as google_drive_mock:
+            google_drive_mock.return_value.CreateFile.return_value.get.return_value = "abc"
+            gdrive_connector = GoogleDriveConnector()
+            self.assertEqual(gdrive_connector.get_checksum(file_id="123"), "abc")
+            file = google_drive_mock.return_value.CreateFile.return_value
+            file.FetchMetadata.assert_called_once_with(fields='md5Checksum')
+            file.get.assert_called_once_with('md5Checksum')
+
 
 @patch('ptmd.lib.gdrive.core.GoogleAuth', return_value=MockGoogleAuth)
 @patch('ptmd.lib.gdrive.core.GoogleDrive', return_value=MockGoogleDrive())
@@ -172,6 +182,25 @@ class TestUploader(TestCase):
         file_metadata = gdrive_connector.update_file(file_id="1", file_path=self.xlsx_file, title="test")
         self.assertEqual(file_metadata, "1")
 
+    @patch('ptmd.lib.gdrive.core.get_file_information', return_value={'id': '1234'})
+    def test_upload_content(self, content_exist_mock, google_drive_mock, google_auth_mock):
+        file = FileMock()
+        google_drive_mock.return_value.CreateFile.return_value = file
+        content = BytesIO(b'PK content')
+        content.read()
+        gdrive_connector = GoogleDriveConnector()
+        file_metadata = gdrive_connector.upload_content(directory_id="123", content=content, title="test.xlsx")
+        self.assertEqual(file_metadata, {'id': '1234'})
+        self.assertIs(file.content, content)
+        self.assertTrue(content.closed)
+        google_drive_mock.return_value.CreateFile.assert_called_with(metadata={
+            'title': 'test.xlsx',
+            'mimeType': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            'parents': [{'id': '123'}]
+        })
+        content_exist_mock.assert_called_with(google_drive=google_drive_mock.return_value, folder_id='123',
+                                              filename='test.xlsx')
+
     def test_upload_file_no_file(self, google_drive_mock, google_auth_mock):
         google_drive_mock.CreateFile().return_value = None
         gdrive_connector = GoogleDriveConnector()
@@ -37,12 +37,12 @@ class TestIsa(TestCase):
 
     def test_converter_errors(self):
         with patch('ptmd.lib.isa.File') as mock_file:
-            mock_file.query.filter().first.return_value = None
+            mock_file.query.options().filter().first.return_value = None
             with self.assertRaises(FileNotFoundError) as context:
                 convert_file_to_isa(1)
             self.assertEqual(str(context.exception), 'File with id 1 not found')
 
-            mock_file.query.filter().first.return_value = mock_file
+            mock_file.query.options().filter().first.return_value = mock_file
             mock_file.received = False
             with self.assertRaises(ValueError) as context:
                 convert_file_to_isa(1)
@@ -63,6 +63,8 @@ class TestIsa(TestCase):
         organisation = Organisation(longname='org', name='org')
         chemical = Chemical(common_name='foo', cas='bar', formula='AC', ptx_code=1)
         sample = Sample(sample_id="ABC", data=SAMPLE_DATA, file_id=1)
+        sample.compound = Chemical(common_name="Cytosine arabinoside", cas="147-94-4", formula="C9H13N3O5",
+                                   ptx_code=100, chemical_id=102)
         blank_sample = Sample(sample_id="BLANK_", data=BLANK_SAMPLE_DATA, file_id=1)
         control_sample = Sample(sample_id="CONTROL_", data=CONTROL_SAMPLE_DATA, file_id=1)
         file = File(
@@ -87,7 +89,7 @@ class TestIsa(TestCase):
         file.samples = [sample, blank_sample, control_sample]
         file.organisation = organisation
         file.vehicle = chemical
-        mock_file.query.filter().first.return_value = file
+        mock_file.query.options().filter().first.return_value = file
 
         isa = convert_file_to_isa(1)[0]
         investigation = Investigation()
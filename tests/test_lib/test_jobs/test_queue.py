@@ -0,0 +1,123 @@
+from unittest import TestCase
+from unittest.mock import patch
+from threading import Event
+
+from flask import Flask
+
+from ptmd.lib.jobs import (
+    JobQueue, MemoryJobStore, SQLiteJobStore,
+    JOB_DOWNLOADING, JOB_VALIDATING, JOB_DONE, JOB_FAILED, JOB_KIND_BULK_VALIDATION
+)
+from ptmd.lib.jobs.queue import INTERRUPTED_JOB_REASON
+
+
+class TestJobQueue(TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def test_run_job(self):
+        statuses = []
+
+        def runner(file_id, notify):
+            notify(JOB_DOWNLOADING)
+            statuses.append(queue.get(job['job_id'])['status'])
+            notify(JOB_VALIDATING)
+            statuses.append(queue.get(job['job_id'])['status'])
+            return {'message': 'ok', 'id': file_id}, 200
+
+        queue = JobQueue(self.app, SQLiteJobStore(':memory:'), runner, max_workers=1)
+        release = Event()
+        queue.executor.submit(release.wait)
+        try:
+            job = queue.submit(1, owner=3)
+            self.assertEqual(queue.get(job['job_id'])['status'], 'queued')
+        finally:
+            release.set()
+            queue.shutdown()
+        self.assertEqual(statuses, [JOB_DOWNLOADING, JOB_VALIDATING])
+        job = queue.get(job['job_id'])
+        self.assertEqual(job['status'], JOB_DONE)
+        self.assertEqual(job['result'], {'message': 'ok', 'id': 1})
+        self.assertEqual(job['code'], 200)
+        self.assertEqual(job['owner'], 3)
+
+    def test_submit_options(self):
+        def runner(file_id, notify, workers):
+            return {'id': file_id, 'workers': workers}, 200
+
+        queue = JobQueue(self.app, MemoryJobStore(), runner)
+        job = queue.submit(1, workers=3)
+        queue.shutdown()
+        self.assertEqual(queue.get(job['job_id'])['result'], {'id': 1, 'workers': 3})
+
+    def test_submit_payload(self):
+        def runner(file_id, notify, file_ids, workers):
+            return {'id': file_id, 'file_ids': file_ids, 'workers': workers}, 200
+
+        queue = JobQueue(self.app, SQLiteJobStore(':memory:'), runner, kind=JOB_KIND_BULK_VALIDATION)
+        job = queue.submit(None, owner=1, payload={'file_ids': [1, 2]}, workers=3)
+        queue.shutdown()
+        job = queue.get(job['job_id'])
+        self.assertEqual((job['kind'], job['file_id'], job['payload']), (JOB_KIND_BULK_VALIDATION, None, {'file_ids': [1, 2]}))
+        self.assertEqual(job['result'], {'id': None, 'file_ids': [1, 2], 'workers': 3})
+
+    def test_prune_on_submit(self):
+        store = MemoryJobStore()
+        store.create('old', 1)
+        store.update('old', JOB_DONE)
+        queue = JobQueue(self.app, store, lambda file_id, notify: ({}, 200), max_workers=1, retention=-1)
+        try:
+            queue.submit(2)
+        finally:
+            queue.shutdown()
+        self.assertIsNone(store.get('old'))
+        self.assertEqual(JobQueue(self.app, store, lambda file_id, notify: ({}, 200)).prune(), 0)
+
+    def test_job_uses_app_context(self):
+        from flask import current_app
+
+        def runner(file_id, notify):
+            return {'app': current_app.name}, 200
+
+        queue = JobQueue(self.app, MemoryJobStore(), runner)
+        job = queue.submit('abc')
+        queue.shutdown()
+        self.assertEqual(queue.get(job['job_id'])['result'], {'app': self.app.name})
+
+    @patch('ptmd.lib.jobs.queue.LOGGER')
+    def test_failed_job(self, mock_logger):
+        def runner(file_id, notify):
+            raise RuntimeError('boom')
+
+        queue = JobQueue(self.app, MemoryJobStore(), runner)
+        job = queue.submit(1)
+        queue.shutdown()
+        job = queue.get(job['job_id'])
+        self.assertEqual(job['status'], JOB_FAILED)
+        self.assertEqual(job['result'], {'errors': 'boom'})
+        self.assertEqual(job['code'], 500)
+        mock_logger.error.assert_called_once()
+
+    @patch('ptmd.lib.jobs.queue.LOGGER')
+    def test_fail_interrupted_jobs(self, mock_logger):
+        store = MemoryJobStore()
+        store.create('stale', 1)
+        store.update('stale', JOB_VALIDATING)
+        store.create('bulk', None, kind=JOB_KIND_BULK_VALIDATION, payload={'file_ids': [1, 2]})
+        JobQueue(self.app, store, lambda file_id, notify: ({}, 200))
+        job = store.get('stale')
+        self.assertEqual((job['status'], job['result'], job['code']),
+                         (JOB_FAILED, {'errors': INTERRUPTED_JOB_REASON}, 500))
+        self.assertEqual(store.get('bulk')['status'], 'queued')
+        mock_logger.warning.assert_called_once_with("Marked 1 interrupted validation jobs as failed.")
+
+    def test_restart_after_shutdown(self):
+        queue = JobQueue(self.app, MemoryJobStore(), lambda file_id, notify: ({}, 200), max_workers=1)
+        first = queue.submit(1)
+        queue.shutdown()
+        second = queue.submit(2)
+        queue.shutdown()
+        self.assertEqual(queue.get(first['job_id'])['status'], JOB_DONE)
+        self.assertEqual(queue.get(second['job_id'])['status'], JOB_DONE)
+        self.assertIsNone(queue.get('unknown'))
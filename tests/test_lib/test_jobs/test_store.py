@@ -0,0 +1,137 @@
+from unittest import TestCase
+from os import path
+from tempfile import TemporaryDirectory
+
+from sqlite3 import connect
+
+from ptmd.lib.jobs import (
+    MemoryJobStore, SQLiteJobStore,
+    JOB_QUEUED, JOB_VALIDATING, JOB_DONE, JOB_FAILED, JOB_KIND_VALIDATION, JOB_KIND_BULK_VALIDATION
+)
+from ptmd.lib.jobs.store import now
+
+
+class StoreTests:
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def test_create_and_get(self):
+        store = self.make_store()
+        job = store.create('job1', 1, owner=2)
+        self.assertEqual(job['status'], JOB_QUEUED)
+        self.assertEqual(store.get('job1'), job)
+        self.assertEqual(job['file_id'], '1')
+        self.assertEqual((job['kind'], job['payload']), (JOB_KIND_VALIDATION, None))
+        self.assertEqual(job['owner'], 2)
+        self.assertIsNone(job['result'])
+        self.assertIsNone(store.get('job2'))
+
+    def test_create_with_payload(self):
+        store = self.make_store()
+        job = store.create('job1', None, kind=JOB_KIND_BULK_VALIDATION, payload={'file_ids': [1, 3], 'workers': 2})
+        self.assertEqual(store.get('job1'), job)
+        self.assertEqual((job['kind'], job['file_id']), (JOB_KIND_BULK_VALIDATION, None))
+        self.assertEqual(job['payload'], {'file_ids': [1, 3], 'workers': 2})
+
+    def test_update(self):
+        store = self.make_store()
+        store.create('job1', 'abc')
+        store.update('job1', JOB_VALIDATING)
+        job = store.get('job1')
+        self.assertEqual(job['status'], JOB_VALIDATING)
+        self.assertIsNone(job['result'])
+        store.update('job1', JOB_DONE, {'message': 'ok', 'errors': {'A': [1]}}, 406)
+        job = store.get('job1')
+        self.assertEqual(job['status'], JOB_DONE)
+        self.assertEqual(job['result'], {'message': 'ok', 'errors': {'A': [1]}})
+        self.assertEqual(job['code'], 406)
+        self.assertGreaterEqual(job['updated_at'], job['created_at'])
+
+    def test_unknown_status(self):
+        store = self.make_store()
+        store.create('job1', 1)
+        with self.assertRaises(ValueError) as context:
+            store.update('job1', 'sleeping')
+        self.assertEqual(str(context.exception), "Unknown job status 'sleeping'.")
+
+    def test_prune(self):
+        store = self.make_store()
+        for job_id, status in (('job1', JOB_DONE), ('job2', JOB_FAILED), ('job3', JOB_VALIDATING), ('job4', None)):
+            store.create(job_id, 1)
+            if status:
+                store.update(job_id, status)
+        self.assertEqual(store.prune(now(-60)), 0)
+        self.assertEqual(store.prune(now(60)), 2)
+        self.assertEqual([store.get(job_id) is not None for job_id in ('job1', 'job2', 'job3', 'job4')],
+                         [False, False, True, True])
+
+    def test_fail_unfinished(self):
+        store = self.make_store()
+        for job_id, status in (('job1', JOB_DONE), ('job2', JOB_VALIDATING), ('job3', None)):
+            store.create(job_id, 1)
+            if status:
+                store.update(job_id, status, {'message': 'ok'} if status == JOB_DONE else None, 200)
+        store.create('job4', None, kind=JOB_KIND_BULK_VALIDATION, payload={'file_ids': [1]})
+        self.assertEqual(store.fail_unfinished(JOB_KIND_VALIDATION, 'Interrupted'), 2)
+        self.assertEqual(store.get('job1')['result'], {'message': 'ok'})
+        for job_id in ('job2', 'job3'):
+            job = store.get(job_id)
+            self.assertEqual((job['status'], job['result'], job['code']), (JOB_FAILED, {'errors': 'Interrupted'}, 500))
+        self.assertEqual(store.get('job4')['status'], JOB_QUEUED)
+        self.assertEqual(store.fail_unfinished(JOB_KIND_VALIDATION, 'Interrupted'), 0)
+
+
+class TestMemoryJobStore(StoreTests, TestCase):
+
+    def make_store(self):
+        return MemoryJobStore()
+
+    def test_get_returns_copy(self):
+        store = self.make_store()
+        store.create('job1', 1)
+        store.get('job1')['status'] = JOB_DONE
+        self.assertEqual(store.get('job1')['status'], JOB_QUEUED)
+
+
+class TestSQLiteJobStore(StoreTests, TestCase):
+
+    def make_store(self):
+        return SQLiteJobStore(':memory:')
+
+    def test_shared_file(self):
+        with TemporaryDirectory() as directory:
+            filepath = path.join(directory, 'jobs.sqlite')
+            store = SQLiteJobStore(filepath)
+            other_store = SQLiteJobStore(filepath)
+            store.create('job1', 1)
+            store.update('job1', JOB_DONE, {'message': 'ok'}, 200)
+            self.assertEqual(other_store.get('job1')['result'], {'message': 'ok'})
+            store.close()
+            other_store.close()
+
+    def test_migrate(self):
+        with TemporaryDirectory() as directory:
+            filepath = path.join(directory, 'jobs.sqlite')
+            connection = connect(filepath)
+            connection.execute(
+                "CREATE TABLE validation_job ("
+                "job_id TEXT PRIMARY KEY, file_id TEXT NOT NULL, owner INTEGER, status TEXT NOT NULL, "
+                "result TEXT, code INTEGER, created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+            connection.executemany(
+                "INSERT INTO validation_job VALUES (?, ?, 1, 'done', '{}', 200, '2023-01-01', '2023-01-01')",
+                (('job1', '1'), ('job2', '1,3'))
+            )
+            connection.commit()
+            connection.close()
+            store = SQLiteJobStore(filepath)
+            job = store.get('job1')
+            self.assertEqual((job['kind'], job['file_id'], job['payload'], job['result']),
+                             (JOB_KIND_VALIDATION, '1', None, {}))
+            job = store.get('job2')
+            self.assertEqual((job['kind'], job['file_id'], job['payload']),
+                             (JOB_KIND_BULK_VALIDATION, None, {'file_ids': [1, 3]}))
+            store.create('job3', None, kind=JOB_KIND_BULK_VALIDATION, payload={'file_ids': [2]})
+            self.assertEqual(store.get('job3')['payload'], {'file_ids': [2]})
+            store.close()
@@ -0,0 +1,146 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from ptmd.lib.updater.bulk import BulkBatchUpdater, rewrite_file, revert_file, summarize_rebatch
+
+
+class MockedOrganism:
+    def __init__(self, name):
+        self.ptox_biosystem_name = name
+
+
+class MockedFile:
+    def __init__(self, file_id, batch, organism_id=1, shipped=False):
+        self.file_id = file_id
+        self.batch = batch
+        self.organism_id = organism_id
+        self.organism = MockedOrganism(f"organism{organism_id}")
+        self.shipped = shipped
+        self.gdrive_id = f"gdrive{file_id}"
+        self.name = f"UOB_organism{organism_id}_{batch}.xlsx"
+
+
+FILES = {}
+
+
+def make_files():
+    FILES.clear()
+    FILES.update({
+        1: MockedFile(1, 'AA'),
+        2: MockedFile(2, 'AB'),
+        3: MockedFile(3, 'AC', shipped=True),
+        4: MockedFile(4, 'AD'),
+        5: MockedFile(5, 'AE', organism_id=2),
+        6: MockedFile(6, 'AF', organism_id=2),
+        7: MockedFile(7, 'AG'),
+        8: MockedFile(8, 'AH')
+    })
+
+
+@patch('ptmd.lib.updater.bulk.get_files_with_organism',
+       side_effect=lambda ids: [FILES[file_id] for file_id in set(ids) if file_id in FILES])
+@patch('ptmd.lib.updater.bulk.get_received_batches', side_effect=lambda pairs: {(1, 'ZZ')} & set(pairs))
+@patch('ptmd.lib.updater.bulk.session')
+@patch('ptmd.lib.updater.bulk.rewrite_file')
+class TestBulkBatchUpdater(TestCase):
+
+    def setUp(self):
+        make_files()
+
+    @staticmethod
+    def rewrite(gdrive_id, name, old_batch, new_batch):
+        if gdrive_id == 'gdrive7':
+            raise ValueError('download failed')
+        return name.replace(old_batch, new_batch)
+
+    def test_update(self, mock_rewrite, mock_session, mock_received, mock_files):
+        mock_rewrite.side_effect = self.rewrite
+        changes = [
+            {'file_id': 1, 'batch': 'BA'},
+            {'file_id': 99, 'batch': 'BB'},
+            {'file_id': 2, 'batch': 'AB'},
+            {'file_id': 3, 'batch': 'BC'},
+            {'file_id': 4, 'batch': 'ZZ'},
+            {'file_id': 5, 'batch': 'BD'},
+            {'file_id': 6, 'batch': 'BD'},
+            {'file_id': 7, 'batch': 'BE'},
+            {'file_id': 1, 'batch': 'BF'},
+            {'file_id': 8, 'batch': 'b1'}
+        ]
+        results = BulkBatchUpdater(changes, max_workers=2).update()
+        self.assertEqual([result['updated'] for result in results],
+                         [True, False, False, False, False, False, False, False, False, False])
+        self.assertEqual(results[0]['name'], 'UOB_organism1_BA.xlsx')
+        self.assertEqual(results[0]['old_batch'], 'AA')
+        self.assertEqual(results[1]['message'], 'File 99 not found.')
+        self.assertEqual(results[2]['message'], 'Could not update: the new batch and old batch have the same value')
+        self.assertEqual(results[3]['message'], 'File already shipped')
+        self.assertEqual(results[4]['message'], 'Batch already used with organism1')
+        self.assertEqual(results[5]['message'], 'Batch BD is requested for several files of organism2')
+        self.assertEqual(results[6]['message'], 'Batch BD is requested for several files of organism2')
+        self.assertEqual(results[7]['message'], 'Unable to rewrite the file: download failed')
+        self.assertEqual(results[8]['message'], 'File 1 is requested more than once.')
+        self.assertEqual(results[9]['message'], 'Invalid batch b1: it must be two uppercase letters.')
+        self.assertEqual(summarize_rebatch(results), {'total': 10, 'updated': 1, 'failed': 9})
+
+        mock_files.assert_called_once_with([1, 99, 2, 3, 4, 5, 6, 7, 1, 8])
+        mock_received.assert_called_once_with([(1, 'BA'), (1, 'ZZ'), (2, 'BD'), (1, 'BE')])
+        self.assertEqual(mock_rewrite.call_count, 2)
+        mock_session.commit.assert_called_once()
+        self.assertEqual(FILES[1].batch, 'BA')
+        self.assertEqual(FILES[1].name, 'UOB_organism1_BA.xlsx')
+        self.assertEqual(FILES[7].batch, 'AG')
+
+    @patch('ptmd.lib.updater.bulk.revert_file')
+    def test_update_commit_error(self, mock_revert, mock_rewrite, mock_session, mock_received, mock_files):
+        mock_rewrite.side_effect = self.rewrite
+        mock_session.commit.side_effect = Exception('database is locked')
+        results = BulkBatchUpdater([{'file_id': 1, 'batch': 'BA'}, {'file_id': 2, 'batch': 'BB'}]).update()
+        self.assertEqual([result['updated'] for result in results], [False, False])
+        self.assertEqual(results[0]['message'], 'Unable to update the database: database is locked')
+        mock_session.rollback.assert_called_once()
+        self.assertEqual(sorted(call.args for call in mock_revert.call_args_list), [
+            ('gdrive1', 'UOB_organism1_BA.xlsx', 'BA', 'AA', 'UOB_organism1_AA.xlsx'),
+            ('gdrive2', 'UOB_organism1_BB.xlsx', 'BB', 'AB', 'UOB_organism1_AB.xlsx')
+        ])
+
+    def test_update_nothing_to_do(self, mock_rewrite, mock_session, mock_received, mock_files):
+        results = BulkBatchUpdater([{'file_id': 'abc', 'batch': 'BA'}]).update()
+        self.assertEqual(results[0]['message'], 'File abc not found.')
+        mock_files.assert_called_once_with([])
+        mock_received.assert_called_once_with([])
+        mock_rewrite.assert_not_called()
+        mock_session.commit.assert_not_called()
+
+
+@patch('ptmd.lib.updater.bulk.remove')
+@patch('ptmd.lib.updater.bulk.replace_batch')
+@patch('ptmd.lib.updater.bulk.GoogleDriveConnector')
+class TestRewriteFile(TestCase):
+
+    def test_rewrite_file(self, mock_gdrive, mock_replace, mock_remove):
+        mock_gdrive().download_file.return_value = '/tmp/file.xlsx'
+        self.assertEqual(rewrite_file('id', 'UOB_DM_AA.xlsx', 'AA', 'AB'), 'UOB_DM_AB.xlsx')
+        mock_replace.assert_called_once_with('/tmp/file.xlsx', 'AB')
+        mock_gdrive().update_file.assert_called_once_with('id', '/tmp/file.xlsx', 'UOB_DM_AB.xlsx')
+        mock_remove.assert_called_once_with('/tmp/file.xlsx')
+
+    def test_rewrite_file_error(self, mock_gdrive, mock_replace, mock_remove):
+        mock_gdrive().download_file.return_value = '/tmp/file.xlsx'
+        mock_replace.side_effect = KeyError('exposure_batch')
+        with self.assertRaises(KeyError):
+            rewrite_file('id', 'UOB_DM_AA.xlsx', 'AA', 'AB')
+        mock_gdrive().update_file.assert_not_called()
+        mock_remove.assert_called_once_with('/tmp/file.xlsx')
+
+    @patch('ptmd.lib.updater.bulk.LOGGER')
+    def test_revert_file(self, mock_logger, mock_gdrive, mock_replace, mock_remove):
+        mock_gdrive().download_file.return_value = '/tmp/file.xlsx'
+        revert_file('id', 'UOB_DM_AB.xlsx', 'AB', 'AA', 'UOB_DM_AA.xlsx')
+        mock_replace.assert_called_once_with('/tmp/file.xlsx', 'AA')
+        mock_gdrive().update_file.assert_called_once_with('id', '/tmp/file.xlsx', 'UOB_DM_AA.xlsx')
+        mock_logger.error.assert_not_called()
+
+        mock_gdrive().download_file.side_effect = Exception('not found')
+        revert_file('id', 'UOB_DM_AB.xlsx', 'AB', 'AA', 'UOB_DM_AA.xlsx')
+        mock_logger.error.assert_called_once_with('Unable to restore the batch AA of file id: not found')
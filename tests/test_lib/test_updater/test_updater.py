@@ -1,10 +1,16 @@
 from unittest import TestCase
 from unittest.mock import patch
 
-from pandas import DataFrame
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from openpyxl import load_workbook
+from pandas import DataFrame, read_excel
 
 from ptmd.lib import BatchUpdater, BatchError
-from ptmd.const import PTX_ID_LABEL
+from ptmd.const import PTX_ID_LABEL, SAMPLE_SHEET_COLUMNS
+from ptmd.lib.excel import save_rows_to_excel
 
 
 class MockedFile:
@@ -45,7 +51,7 @@ class TestBatchUpdater(TestCase):
     @patch('ptmd.lib.updater.batch.read_excel', side_effect=read_excel_side_effect)
     @patch('ptmd.lib.updater.batch.save_to_excel')
     def test_modify_in_file(self, mock_save_excel, mock_read_excel):
-        batch_updater = BatchUpdater(batch="AB", filepath="test")
+        batch_updater = BatchUpdater(batch="AB", filepath="test", in_place=False)
         self.assertEqual(batch_updater.old_batch, "AA")
         self.assertEqual(batch_updater.new_batch, "AB")
         self.assertFalse(hasattr(batch_updater, "file_id"))
@@ -135,3 +141,41 @@ class TestBatchUpdater(TestCase):
         with self.assertRaises(BatchError):
             BatchUpdater(batch="AA", file_id=1)
         mock_session.rollback.assert_called_once()
+
+
+class TestInPlaceBatchUpdate(TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.filepath = path.join(self.directory, 'UOX_R_AA.xlsx')
+        empty = [''] * (len(SAMPLE_SHEET_COLUMNS) - 7)
+        samples = [
+            ['RAA002LA1', 'PTX002', *empty, 1, 'chemical2', 'BMD10', 'TP1', 4],
+            ['RAA998ZS1', 'PTX998', *empty, 1, 'EXTRACTION BLANK', '0', 'TP0', 0],
+            [None, None, *empty, None, None, None, None, None]
+        ]
+        general = [['UOX', 'Rat', 'AA', 2, 1, 1, '2023-01-01', '2023-01-02', 1, 'DMSO']]
+        save_rows_to_excel(samples, general, self.filepath)
+        workbook = load_workbook(self.filepath)
+        workbook['Exposure information'].cell(row=2, column=3).value = 'user comment'
+        workbook.save(self.filepath)
+        self.header_fill = workbook['Exposure information']['A1'].fill.fgColor.rgb
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    @patch('ptmd.lib.updater.batch.save_to_excel')
+    def test_modify_in_file(self, mock_save_to_excel):
+        batch_updater = BatchUpdater(batch="AB", filepath=self.filepath)
+        self.assertEqual(batch_updater.old_batch, "AA")
+        self.assertEqual(batch_updater.organisation_name, "UOX")
+        mock_save_to_excel.assert_not_called()
+
+        samples = read_excel(self.filepath, sheet_name='Exposure information')
+        general = read_excel(self.filepath, sheet_name='General Information')
+        self.assertEqual(samples[PTX_ID_LABEL].tolist(), ['RAB002LA1', 'RAB998ZS1'])
+        self.assertEqual(samples['compound_name'].tolist(), ['chemical2', 'EXTRACTION BLANK'])
+        self.assertEqual(general['exposure_batch'].tolist(), ['AB'])
+        workbook = load_workbook(self.filepath)
+        self.assertEqual(workbook['Exposure information'].cell(row=2, column=3).value, 'user comment')
+        self.assertEqual(workbook['Exposure information']['A1'].fill.fgColor.rgb, self.header_fill)
@@ -0,0 +1,91 @@
+from unittest import TestCase
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from shutil import copyfile, rmtree
+from tempfile import mkdtemp
+
+from ptmd.lib.excel import save_to_excel
+from ptmd.lib.validator.batch import BatchValidator, validate_downloaded_file, summarize
+from ptmd.lib.validator.context import ValidationContext
+from ptmd.lib.validator.core import ExcelValidator
+from .test_validate_file import mock_exposure_dataframe, mock_exposure_dataframe_error, mock_general_dataframe
+
+
+ORGANISMS = {'Drosophila_melanogaster_female': 'A'}
+CHEMICALS = {'Ethoprophos': 2}
+
+
+@patch('ptmd.lib.validator.batch.session')
+@patch('ptmd.lib.validator.batch.File')
+class TestBatchValidator(TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.sources = {}
+        for name, exposure in (('valid', mock_exposure_dataframe), ('invalid', mock_exposure_dataframe_error)):
+            self.sources[name] = path.join(self.directory, f'{name}.xlsx')
+            save_to_excel((exposure, mock_general_dataframe), self.sources[name])
+        self.files = [
+            {'file_id': 1, 'gdrive_id': 'a', 'name': 'invalid'},
+            {'file_id': 2, 'gdrive_id': 'b', 'name': 'missing'},
+            {'file_id': 3, 'gdrive_id': 'c', 'name': 'valid'}
+        ]
+        self.downloaded = []
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    def download(self, file):
+        if file['name'] not in self.sources:
+            raise FileNotFoundError(file['name'])
+        filepath = path.join(self.directory, f"{file['name']}_{file['file_id']}_download.xlsx")
+        copyfile(self.sources[file['name']], filepath)
+        self.downloaded.append(filepath)
+        return filepath
+
+    def expected_report(self, name):
+        validator = ExcelValidator(1, context=ValidationContext(ORGANISMS, CHEMICALS))
+        validator.filepath = self.sources[name]
+        validator.validate_file()
+        return validator.report
+
+    def validate(self, pool=None):
+        context = ValidationContext(ORGANISMS, CHEMICALS)
+        with patch.object(BatchValidator, 'download_file', side_effect=self.download):
+            return BatchValidator(self.files, max_workers=1, context=context, pool=pool).validate()
+
+    def test_validate(self, mock_file, mock_session):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = self.validate(pool)
+        self.assertEqual([result['file_id'] for result in results], [1, 2, 3])
+        self.assertEqual(results[0]['errors'], self.expected_report('invalid')['errors'])
+        self.assertFalse(results[0]['valid'])
+        self.assertEqual(results[0]['message'], "File validation failed.")
+        self.assertIsNone(results[1]['valid'])
+        self.assertEqual(results[1]['message'], "Unable to download the file: missing")
+        self.assertEqual(results[2]['valid'], self.expected_report('valid')['valid'])
+        self.assertEqual(summarize(results), {
+            'total': 3, 'valid': int(results[2]['valid']), 'invalid': 2 - int(results[2]['valid']), 'errors': 1
+        })
+        self.assertFalse(any(path.exists(filepath) for filepath in self.downloaded))
+        mock_session.commit.assert_called_once()
+
+    def test_validate_process_pool(self, mock_file, mock_session):
+        results = self.validate()
+        self.assertEqual(results[0]['errors'], self.expected_report('invalid')['errors'])
+        self.assertEqual(results[2]['errors'], self.expected_report('valid')['errors'])
+        self.assertIsNone(results[1]['valid'])
+
+    def test_validation_error(self, mock_file, mock_session):
+        self.files = [self.files[0]]
+        with ThreadPoolExecutor(max_workers=1) as pool, \
+                patch('ptmd.lib.validator.batch.validate_downloaded_file', side_effect=ValueError('broken')):
+            results = self.validate(pool)
+        self.assertEqual(results[0]['message'], "Unable to validate the file: broken")
+        self.assertFalse(path.exists(self.downloaded[0]))
+        mock_file.query.filter().update.assert_not_called()
+
+    def test_validate_downloaded_file(self, mock_file, mock_session):
+        report = validate_downloaded_file(1, self.sources['invalid'], ORGANISMS, CHEMICALS)
+        self.assertEqual(report, self.expected_report('invalid'))
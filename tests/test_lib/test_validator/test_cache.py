@@ -0,0 +1,106 @@
+from unittest import TestCase
+from os import path
+from tempfile import mkdtemp
+from shutil import rmtree
+from hashlib import md5
+
+from ptmd.lib.validator.cache import ReportCache, file_checksum, reference_fingerprint
+
+
+class MockClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestReportCache(TestCase):
+
+    def setUp(self):
+        self.clock = MockClock()
+        self.cache = ReportCache(max_size=2, ttl=10, clock=self.clock)
+        self.report = {'valid': False, 'errors': {'Record at line 2': [{'message': 'error', 'field_concerned': 'a'}]}}
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.set('a', self.report)
+        cached = self.cache.get('a')
+        self.assertEqual(cached, self.report)
+        cached['errors'].clear()
+        self.report['valid'] = True
+        self.assertEqual(self.cache.get('a')['errors']['Record at line 2'][0]['message'], 'error')
+        self.assertFalse(self.cache.get('a')['valid'])
+        self.assertEqual((self.cache.hits, self.cache.misses), (3, 1))
+
+    def test_no_copy(self):
+        cache = ReportCache(copy=False)
+        cache.set('a', self.report)
+        self.assertIs(cache.get('a'), self.report)
+
+    def test_fingerprint(self):
+        self.cache.set('a', self.report, fingerprint='v1')
+        self.assertIsNotNone(self.cache.get('a', 'v1'))
+        self.assertIsNone(self.cache.get('a', 'v2'))
+        self.assertIsNone(self.cache.get('a', 'v1'))
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(reference_fingerprint({'a': 1}, [('b', 2)]), reference_fingerprint({'a': 1}, [('b', 2)]))
+        self.assertNotEqual(reference_fingerprint({'a': 1}, [('b', 2)]), reference_fingerprint({'a': 1}, [('b', 3)]))
+
+    def test_ttl(self):
+        self.cache.set('a', self.report)
+        self.clock.now = 9
+        self.assertIsNotNone(self.cache.get('a'))
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_size(self):
+        self.cache.set('a', self.report)
+        self.cache.set('b', self.report)
+        self.cache.get('a')
+        self.cache.set('c', self.report)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNotNone(self.cache.get('c'))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_purge(self):
+        self.cache.set('a', self.report)
+        self.cache.set('b', self.report)
+        self.assertEqual(self.cache.purge('c'), 0)
+        self.assertEqual(self.cache.purge('a'), 1)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.purge(), 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_inspect(self):
+        self.cache.set('a', self.report)
+        self.clock.now = 5
+        self.cache.set('b', {'valid': True, 'errors': {}})
+        self.cache.get('a')
+        self.clock.now = 12
+        content = self.cache.inspect()
+        self.assertEqual(content['size'], 1)
+        self.assertEqual(content['max_size'], 2)
+        self.assertEqual(content['ttl'], 10)
+        self.assertEqual((content['hits'], content['misses']), (1, 0))
+        self.assertEqual(content['entries'][0]['key'], 'b')
+        self.assertEqual(content['entries'][0]['fingerprint'], '')
+        self.assertTrue(content['entries'][0]['valid'])
+        self.assertEqual(content['entries'][0]['expires_in'], 3)
+        self.assertIn('stored_at', content['entries'][0])
+
+
+class TestFileChecksum(TestCase):
+
+    def test_file_checksum(self):
+        directory = mkdtemp()
+        filepath = path.join(directory, 'file.xlsx')
+        content = b'ptmd' * 100000
+        try:
+            with open(filepath, 'wb') as f:
+                f.write(content)
+            self.assertEqual(file_checksum(filepath), md5(content).hexdigest())
+        finally:
+            rmtree(directory)
@@ -0,0 +1,131 @@
+from unittest import TestCase
+from os import path
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from pandas import DataFrame
+
+from ptmd.const import SAMPLE_SHEET_COLUMNS, GENERAL_SHEET_COLUMNS
+from ptmd.lib.excel import save_to_excel
+from ptmd.lib.validator.core import ExcelValidator
+
+from ptmd.lib.validator.columnar import validate_identifier_columns
+from ptmd.lib.validator.context import ValidationContext
+from ptmd.lib.validator.validate_identifier import validate_identifier
+from ptmd.lib.validator.duplicates import DuplicateIndex
+
+
+SHEET_RECORD = {
+    "sampleid_label": "label", "shipment_identifier": "shipment", "operator": "operator",
+    "quantity_dead_during_exposure": 12, "amount_replaced_before_collection": 1, "box_id": "box",
+    "exposure_route": "route", "mass_including_tube_(mg)": 10, "mass_excluding_tube_(mg)": 8, "observations_notes": None
+}
+GENERAL_INFO = {'exposure_batch': 'AC', 'biosystem_name': 'fly'}
+BASE_RECORD = {
+    'precisiontox_short_identifier': 'FAC002LA1', 'compound_hash': 'PTX002', 'compound_name': 'Compound 1',
+    'dose_code': 'BMD10', 'timepoint_level': 'TP1', 'replicate': 1
+}
+RECORDS = [
+    {},
+    {'precisiontox_short_identifier': 'HAC002LA1'},
+    {'precisiontox_short_identifier': 'Fq^002LA1'},
+    {'precisiontox_short_identifier': 'FBC002LA1'},
+    {'compound_hash': 'PTX003'},
+    {'compound_hash': None},
+    {'compound_name': 'Compound 2'},
+    {'compound_name': 'Unknown'},
+    {'compound_name': None},
+    {'compound_name': 12},
+    {'compound_name': 'CONTROL (DMSO)', 'precisiontox_short_identifier': 'FAC999ZA1', 'dose_code': 0},
+    {'compound_name': 'CONTROL (DMSO)'},
+    {'compound_name': 'CONTROL (WATER)'},
+    {'compound_name': 'EXTRACTION BLANK'},
+    {'dose_code': 'BMD25'},
+    {'dose_code': None},
+    {'dose_code': '0', 'precisiontox_short_identifier': 'FAC002ZA1'},
+    {'precisiontox_short_identifier': 'FAC002QA1'},
+    {'timepoint_level': 'TP2'},
+    {'timepoint_level': None},
+    {'precisiontox_short_identifier': 'FAC002LQ1'},
+    {'replicate': 2},
+    {'replicate': None},
+    {'replicate': 1.0},
+    {'precisiontox_short_identifier': 'FAC-01LA1'},
+    {'precisiontox_short_identifier': 'FAC002'},
+    {'precisiontox_short_identifier': None},
+    {'precisiontox_short_identifier': 'FAC002LA10'},
+    {'precisiontox_short_identifier': 123456789},
+]
+
+
+class MockValidator:
+
+    def __init__(self, record, context):
+        self.report = {'valid': True, 'errors': {}}
+        self.current_record = {'data': record, 'label': 'test'}
+        self.general_info = GENERAL_INFO
+        self.identifiers = DuplicateIndex()
+        self.context = context
+
+    def add_error(self, label, message, field):
+        self.report['valid'] = False
+        self.report['errors'].setdefault(label, []).append((message, field))
+
+
+class TestColumnarValidation(TestCase):
+
+    def setUp(self) -> None:
+        self.context = ValidationContext(organisms={'fly': 'F'}, chemicals={'Compound 1': 2, 'Compound 2': 3})
+        self.records = [{**BASE_RECORD, **record} for record in RECORDS]
+
+    def test_same_errors_as_per_record(self):
+        errors = validate_identifier_columns(self.records, GENERAL_INFO, self.context)
+        self.assertEqual(len(errors), len(self.records))
+        for record, record_errors in zip(self.records, errors):
+            if record_errors is None:
+                continue
+            validator = MockValidator(record, self.context)
+            validate_identifier(validator, 0)
+            self.assertEqual(list(record_errors), validator.report['errors'].get('test', []), record)
+        self.assertEqual(list(errors[0]), [])
+        self.assertEqual([index for index, value in enumerate(errors) if value is None], [9, 24, 25, 26, 27, 28])
+
+    def test_sheet_errors(self):
+        errors = validate_identifier_columns(self.records[:1], {**GENERAL_INFO, 'exposure_batch': 'A'}, self.context)
+        self.assertEqual(errors, [[("The batch 'A' is not valid.", 'exposure_batch'),
+                                   ("The identifier batch doesn't match the batch 'A'.", 'precisiontox_short_identifier')]])
+        errors = validate_identifier_columns(self.records[:1], {**GENERAL_INFO, 'biosystem_name': 'fish'}, self.context)
+        self.assertEqual(errors, [[("Organism not found in database.", 'biosystem_name')]])
+
+    def test_unsupported(self):
+        self.assertIsNone(validate_identifier_columns([], GENERAL_INFO, self.context))
+        self.assertIsNone(validate_identifier_columns([{'replicate': 1}], GENERAL_INFO, self.context))
+        self.assertIsNone(validate_identifier_columns(self.records, {**GENERAL_INFO, 'exposure_batch': None}, self.context))
+        self.assertIsNone(validate_identifier_columns(self.records, GENERAL_INFO, ValidationContext()))
+
+    def test_precomputed_errors(self):
+        validator = MockValidator(self.records[0], self.context)
+        validate_identifier(validator, 0, errors=[('message', 'field')])
+        self.assertEqual(validator.report['errors']['test'], [('message', 'field')])
+
+    def test_validate_file(self):
+        directory = mkdtemp()
+        filepath = path.join(directory, 'test.xlsx')
+        records = [{
+            **SHEET_RECORD, **record, 'collection_order': index, 'box_row': 'A', 'box_column': index
+        } for index, record in enumerate(self.records) if record['replicate'] is not None]
+        general_information = ["UOB", "fly", "AC", 1, 1, 0, "2020-01-01", "2020-10-01", "[4]", "DMSO"]
+        save_to_excel((DataFrame(records, columns=SAMPLE_SHEET_COLUMNS),
+                       DataFrame([general_information], columns=GENERAL_SHEET_COLUMNS)), filepath)
+        reports = []
+        try:
+            for columnar in (False, True):
+                validator = ExcelValidator(1, context=self.context, columnar=columnar)
+                validator.filepath = filepath
+                validator.validate_file()
+                self.assertEqual(validator.identifier_errors is not None, columnar)
+                reports.append(validator.report)
+        finally:
+            rmtree(directory)
+        self.assertEqual(reports[0], reports[1])
+        self.assertFalse(reports[0]['valid'])
@@ -0,0 +1,38 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from ptmd.database.queries import reference_data
+from ptmd.lib.validator.context import ValidationContext
+
+
+class TestValidationContext(TestCase):
+
+    def setUp(self):
+        reference_data.invalidate()
+
+    def tearDown(self):
+        reference_data.invalidate()
+
+    @patch('ptmd.database.queries.reference.Organism')
+    @patch('ptmd.database.queries.reference.Chemical')
+    def test_lazy_load(self, mock_chemical, mock_organism):
+        mock_organism.query.with_entities().order_by().all.return_value = [('human', 'H'), ('fly', 'F')]
+        mock_chemical.query.with_entities().order_by().all.return_value = [('Compound 1', 1), ('Compound 1', 2)]
+        context = ValidationContext()
+        self.assertEqual(context.get_organism_code('fly'), 'F')
+        self.assertIsNone(context.get_organism_code('fish'))
+        self.assertEqual(context.get_chemical_code('Compound 1'), 1)
+        self.assertIsNone(context.get_chemical_code('Compound 2'))
+        context.get_organism_code('human')
+        context.get_chemical_code('Compound 1')
+        self.assertEqual(mock_organism.query.with_entities().order_by().all.call_count, 1)
+        self.assertEqual(mock_chemical.query.with_entities().order_by().all.call_count, 1)
+
+        ValidationContext().get_chemical_code('Compound 1')
+        self.assertEqual(mock_chemical.query.with_entities().order_by().all.call_count, 1)
+
+    @patch('ptmd.database.queries.reference.Organism')
+    def test_preloaded(self, mock_organism):
+        context = ValidationContext(organisms={'fly': 'F'}, chemicals={})
+        self.assertEqual(context.organisms, {'fly': 'F'})
+        mock_organism.query.with_entities.assert_not_called()
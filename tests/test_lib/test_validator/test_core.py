@@ -135,6 +135,19 @@ class TestExternalValidator(TestCase):
         validator.validate()
         self.assertEqual(validator.report['valid'], True)
 
+    def test_validator_status(self, mock_rm, mocked_validate_file, mocked_gdrive_connector):
+        statuses = []
+        validator = ExternalExcelValidator("A", on_status=statuses.append)
+        validator.validate()
+        self.assertEqual(statuses, ['downloading', 'validating'])
+
+    def test_validator_removes_file_on_error(self, mock_rm, mocked_validate_file, mocked_gdrive_connector):
+        mocked_validate_file.side_effect = RuntimeError('interrupted')
+        validator = ExternalExcelValidator("A")
+        with self.assertRaises(RuntimeError):
+            validator.validate()
+        mock_rm.assert_called_once_with('PTX001.xlsx')
+
 
 class TestVerticalValidator(TestCase):
     def setUp(self) -> None:
@@ -345,3 +358,17 @@ class TestVerticalValidator(TestCase):
         vertical_validator.validate()
         errors = validator.report['errors']
         self.assertEqual(errors['Control'][0]['message'], 'Timepoint 1 is missing 1 control(s).')
+
+    def test_validate_duplicated_positions(self):
+        validator = MockValidator()
+        node: dict = deepcopy(self.default_node)
+        node['data'].update({'box_id': 'Box1', 'box_row': 'A', 'box_column': 1, 'collection_order': 1})
+        graph = VerticalValidator(self.general_information, validator)
+        graph.add_node({**node, 'line': 2})
+        graph.add_node({**node, 'line': 3, 'label': 'CP2'})
+        self.assertEqual(validator.report['errors']['CP2'], [
+            {'message': 'Box position Box1_A_1 is already used.', 'field_concerned': 'box_position'},
+            {'message': 'Collection order 1 is already used.', 'field_concerned': 'collection_order'}
+        ])
+        self.assertEqual(graph.box_positions.get('Box1_A_1'), 2)
+        self.assertEqual(graph.collection_order.get(1), 2)
@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from ptmd.lib.validator.duplicates import DuplicateIndex, PositionIndex
+
+
+class TestDuplicateIndex(TestCase):
+
+    def test_add(self):
+        index = DuplicateIndex()
+        self.assertIsNone(index.add('FAC002LA1', 2))
+        self.assertIsNone(index.add('FAC002LA2', 3))
+        self.assertEqual(index.add('FAC002LA1', 4), 2)
+        self.assertEqual(index.add('FAC002LA1', 5), 2)
+        self.assertEqual(index.get('FAC002LA1'), 2)
+        self.assertIsNone(index.get('FAC002LA3'))
+        self.assertIn('FAC002LA2', index)
+        self.assertNotIn('FAC002LA3', index)
+        self.assertEqual(len(index), 2)
+
+
+class TestPositionIndex(TestCase):
+
+    def test_add_remove(self):
+        index = PositionIndex()
+        index.add('Compound 2', 5)
+        index.add('Compound 1', 3)
+        index.add('Compound 2', 1)
+        self.assertEqual(index.first('Compound 2'), 1)
+        self.assertEqual(index.count('Compound 2'), 2)
+        self.assertEqual(index.counts(), {'Compound 2': 2, 'Compound 1': 1})
+        index.remove('Compound 2', 1)
+        self.assertEqual(index.first('Compound 2'), 5)
+        self.assertEqual(index.counts(), {'Compound 1': 1, 'Compound 2': 1})
+        index.remove('Compound 1', 3)
+        self.assertNotIn('Compound 1', index)
+        self.assertIsNone(index.first('Compound 1'))
+        self.assertEqual(index.count('Compound 1'), 0)
+        self.assertEqual(len(index), 1)
@@ -0,0 +1,141 @@
+from unittest import TestCase
+from unittest.mock import patch
+from os import path
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from pandas import DataFrame
+
+from ptmd.const import SAMPLE_SHEET_COLUMNS, GENERAL_SHEET_COLUMNS
+from ptmd.lib.excel import save_to_excel
+from ptmd.lib.creator.dataframes import build_sample_dataframe
+from ptmd.lib.validator.core import ExcelValidator, VerticalValidator
+from ptmd.lib.validator.context import ValidationContext
+from ptmd.lib.validator.limits import ErrorLimits
+from ptmd.lib.validator.incremental import IncrementalStore, FileState, check_record
+from ..test_creator.test_dataframes import MockedHarvester
+from .test_columnar import SHEET_RECORD
+
+
+GENERAL_INFORMATION = ["UOB", "fly", "AC", 2, 2, 1, "2020-01-01", "2020-10-01", "[4, 8]", "DMSO"]
+CONDITIONS = [{'chemicals': ['Compound 1', 'Compound 2'], 'dose': 'BMD10'}]
+MAPPING = {'Compound 1': '002', 'Compound 2': '003'}
+
+
+class TestIncrementalValidation(TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.context = ValidationContext(organisms={'fly': 'F'}, chemicals={'Compound 1': 2, 'Compound 2': 3})
+        dataframe = build_sample_dataframe(MockedHarvester(CONDITIONS), MAPPING, 'F')
+        self.records = [{
+            **record, **SHEET_RECORD, 'collection_order': index + 1, 'box_row': 'A', 'box_column': index + 1
+        } for index, record in enumerate(dataframe.to_dict(orient='records'))]
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    def validate(self, records, general_information=None, store=None, streaming=False, limits=None):
+        filepath = path.join(self.directory, 'test.xlsx')
+        save_to_excel((DataFrame(records, columns=SAMPLE_SHEET_COLUMNS),
+                       DataFrame([general_information or GENERAL_INFORMATION], columns=GENERAL_SHEET_COLUMNS)),
+                      filepath)
+        validator = ExcelValidator(1, context=self.context, incremental=store, streaming=streaming, limits=limits)
+        validator.filepath = filepath
+        validator.validate_file()
+        return validator
+
+    def assert_same_report(self, records, store, checked, designs, general_information=None, streaming=False):
+        full = self.validate(records, general_information)
+        with patch('ptmd.lib.validator.incremental.check_record', side_effect=check_record) as mock_check, \
+                patch.object(VerticalValidator, 'compound_errors', autospec=True,
+                             side_effect=VerticalValidator.compound_errors) as mock_design:
+            incremental = self.validate(records, general_information, store, streaming)
+        self.assertEqual(list(incremental.report['errors'].items()), list(full.report['errors'].items()))
+        self.assertEqual(incremental.report['valid'], full.report['valid'])
+        self.assertEqual(mock_check.call_count, checked)
+        self.assertEqual([call.args[1] for call in mock_design.call_args_list], designs)
+        return full.report
+
+    def test_incremental(self):
+        all_compounds = ['Compound 1', 'Compound 2', 'CONTROL (DMSO)']
+        for streaming in (False, True):
+            store = IncrementalStore()
+            records = [dict(record) for record in self.records]
+            self.assertTrue(self.assert_same_report(records, store, 13, all_compounds, streaming=streaming)['valid'])
+            self.assert_same_report(records, store, 0, [], streaming=streaming)
+
+            # a wrong replicate only touches the design of its compound
+            records[1]['replicate'] = 1
+            report = self.assert_same_report(records, store, 1, ['Compound 1'], streaming=streaming)
+            self.assertIn('Compound 1', report['errors'])
+
+            # duplicated identifier, box position and collection order point to the first record
+            records[3]['precisiontox_short_identifier'] = records[0]['precisiontox_short_identifier']
+            records[3]['box_column'] = records[2]['box_column']
+            records[3]['collection_order'] = records[2]['collection_order']
+            report = self.assert_same_report(records, store, 1, ['Compound 1'], streaming=streaming)
+            self.assertEqual([error['field_concerned'] for error in report['errors']['Record at line 5 (FAC002LA1)']],
+                             ['box_position', 'collection_order', 'precisiontox_short_identifier'])
+
+            # fixing the first record makes the later ones the first holders of their values
+            records[0] = {**records[0], 'precisiontox_short_identifier': 'FAC002LA9', 'box_column': 99,
+                          'collection_order': 99}
+            records[2]['box_column'] = 98
+            records[2]['collection_order'] = 98
+            self.assert_same_report(records, store, 2, ['Compound 1'], streaming=streaming)
+
+            # removed records only move the positions, the records themselves aren't checked again
+            records = records[:5] + records[6:]
+            self.assert_same_report(records, store, 0, all_compounds[1:], streaming=streaming)
+            records.append(dict(records[-1]))
+            self.assert_same_report(records, store, 0, [], streaming=streaming)
+
+            general_information = [*GENERAL_INFORMATION[:3], 1, *GENERAL_INFORMATION[4:]]
+            self.assert_same_report(records, store, 12, all_compounds, general_information, streaming)
+
+    def test_reference_data_changed(self):
+        store = IncrementalStore()
+        self.assert_same_report(self.records, store, 13, ['Compound 1', 'Compound 2', 'CONTROL (DMSO)'])
+        self.context = ValidationContext(organisms={'fly': 'F'}, chemicals={'Compound 1': 2})
+        report = self.assert_same_report(self.records, store, 13, ['Compound 1', 'Compound 2', 'CONTROL (DMSO)'])
+        self.assertFalse(report['valid'])
+
+    def test_limits(self):
+        store = IncrementalStore()
+        records = [{**record, 'replicate': 1} for record in self.records]
+        for _ in range(2):
+            full = self.validate(records, limits=ErrorLimits(per_rule=1))
+            incremental = self.validate(records, store=store, limits=ErrorLimits(per_rule=1))
+            self.assertEqual(list(incremental.report['errors'].items()), list(full.report['errors'].items()))
+
+    def test_failure_not_stored(self):
+        store = IncrementalStore()
+        records = [dict(record) for record in self.records]
+        records[0]['replicate'] = None
+        with self.assertRaises(TypeError):
+            self.validate(records, store=store)
+        self.assertEqual(len(store), 0)
+
+
+class TestIncrementalStore(TestCase):
+
+    @staticmethod
+    def make_state(records):
+        state = FileState('general')
+        state.fingerprints = [str(index) for index in range(records)]
+        return state
+
+    def test_budget(self):
+        store = IncrementalStore(max_records=10)
+        store.put(1, self.make_state(4))
+        store.put(2, self.make_state(4))
+        store.put(3, self.make_state(11))
+        self.assertEqual((len(store), store.records), (2, 8))
+        store.put(3, self.make_state(5))
+        self.assertEqual((len(store), store.records), (2, 9))
+        self.assertIsNone(store.take(1))
+        self.assertEqual(len(store.take(3).fingerprints), 5)
+        self.assertEqual(store.records, 4)
+        store.clear()
+        self.assertEqual((len(store), store.records), (0, 0))
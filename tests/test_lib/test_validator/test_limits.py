@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from ptmd.lib.validator.limits import ErrorLimits, rule_of
+
+
+class TestErrorLimits(TestCase):
+
+    def test_rule_of(self):
+        self.assertEqual(rule_of("'A' is not of type 'number'"), "* is not of type *")
+        self.assertEqual(rule_of("Timepoint 4 is not in the list of timepoints [1, 2]."),
+                         "Timepoint * is not in the list of timepoints *.")
+        self.assertEqual(rule_of("Collection order 12 is already used."), rule_of("Collection order 3 is already used."))
+
+    def test_unlimited(self):
+        limits = ErrorLimits()
+        self.assertTrue(all(limits.allow(f"Collection order {i} is already used.", 'collection_order')
+                            for i in range(100)))
+        self.assertEqual(limits.summaries(), [])
+        self.assertEqual(limits.omitted_count, 0)
+
+    def test_per_rule(self):
+        limits = ErrorLimits(per_rule=2)
+        allowed = [limits.allow(f"Collection order {i} is already used.", 'collection_order') for i in range(5)]
+        self.assertEqual(allowed, [True, True, False, False, False])
+        self.assertTrue(limits.allow("Box position 1_A_1 is already used.", 'box_position'))
+        self.assertTrue(limits.allow("Collection order 1 is already used.", 'other'))
+        self.assertEqual(limits.summaries(), [{
+            'message': "3 more similar errors, such as: Collection order 2 is already used.",
+            'field_concerned': 'collection_order',
+            'omitted': 3
+        }])
+
+    def test_per_field(self):
+        limits = ErrorLimits(per_field=3, per_rule=2)
+        messages = ["'A' is not of type 'number'", "'B' is not of type 'number'", "'A' is not of type 'number'",
+                    "12 is greater than the maximum of 10", "13 is greater than the maximum of 10"]
+        allowed = [limits.allow(message, 'box_row') for message in messages]
+        self.assertEqual(allowed, [True, True, False, True, False])
+        self.assertEqual(limits.omitted_count, 2)
+        self.assertEqual([summary['omitted'] for summary in limits.summaries()], [1, 1])
+        limits.reset()
+        self.assertEqual(limits.omitted_count, 0)
+        self.assertTrue(limits.allow(messages[0], 'box_row'))
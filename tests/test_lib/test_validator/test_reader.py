@@ -0,0 +1,64 @@
+from unittest import TestCase
+from os import path, remove
+from tempfile import mkdtemp
+from shutil import rmtree
+
+from pandas import DataFrame
+
+from ptmd.lib.excel import save_to_excel
+from ptmd.lib.validator.reader import SheetReader, clean_value
+from ptmd.const import SAMPLE_SHEET_COLUMNS, GENERAL_SHEET_COLUMNS
+
+
+EXPOSURE_ROW = [
+    "FAC002LA1", "PTX002", "sampleid_label", "shipment_identifier", "operator",
+    12, 1, 4, "box_id", "A", 1, "route", "NA", 8, None,
+    1, "Ethoprophos", "BMD10", "TP1", 4
+]
+GENERAL_ROW = ["UOB", "Drosophila_melanogaster_female", "AC", 1, 1, 0, "2020-01-01", "2020-10-01", "[4]", "DMSO"]
+
+
+class TestSheetReader(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = mkdtemp()
+        self.filepath = path.join(self.directory, 'test.xlsx')
+        save_to_excel((DataFrame([EXPOSURE_ROW, EXPOSURE_ROW], columns=SAMPLE_SHEET_COLUMNS),
+                       DataFrame([GENERAL_ROW], columns=GENERAL_SHEET_COLUMNS)), self.filepath)
+
+    def tearDown(self) -> None:
+        rmtree(self.directory)
+
+    def test_iter_records(self):
+        reader = SheetReader(self.filepath)
+        records = [dict(record) for record in reader.iter_records("Exposure information")]
+        reader.close()
+        self.assertEqual(len(records), 2)
+        self.assertEqual(list(records[0].keys()), SAMPLE_SHEET_COLUMNS)
+        self.assertEqual(records[0]['precisiontox_short_identifier'], "FAC002LA1")
+        self.assertEqual(records[0]['box_column'], 1)
+        self.assertIsNone(records[0]['mass_including_tube_(mg)'])
+        self.assertIsNone(records[0]['observations_notes'])
+
+    def test_get_first_record(self):
+        reader = SheetReader(self.filepath)
+        general_info = reader.get_first_record("General Information")
+        self.assertEqual(general_info['exposure_batch'], "AC")
+        self.assertEqual(general_info['timepoints'], "[4]")
+        reader.close()
+
+    def test_get_first_record_empty(self):
+        remove(self.filepath)
+        save_to_excel((DataFrame(columns=SAMPLE_SHEET_COLUMNS), DataFrame([GENERAL_ROW], columns=GENERAL_SHEET_COLUMNS)),
+                      self.filepath)
+        reader = SheetReader(self.filepath)
+        with self.assertRaises(ValueError) as context:
+            reader.get_first_record("Exposure information")
+        self.assertEqual(str(context.exception), "Sheet 'Exposure information' does not contain any record.")
+        reader.close()
+
+    def test_clean_value(self):
+        self.assertIsNone(clean_value("n/a"))
+        self.assertIsNone(clean_value(""))
+        self.assertEqual(clean_value("value"), "value")
+        self.assertEqual(clean_value(0), 0)
@@ -0,0 +1,85 @@
+from unittest import TestCase
+from os import path, utime, stat
+from tempfile import mkdtemp
+from shutil import rmtree
+from json import dumps
+
+from jsonschema import Draft4Validator
+
+from ptmd.const import EXPOSURE_INFORMATION_SCHEMA_FILEPATH
+from ptmd.const.schema_loaders import EXPOSURE_INFORMATION_SCHEMA
+from ptmd.lib.validator.schema import CompiledSchema, SchemaRegistry, schema_registry
+
+
+VALID_RECORD = {
+    "precisiontox_short_identifier": "FAC002LA1", "compound_hash": "PTX002", "sampleid_label": "label",
+    "shipment_identifier": "shipment", "operator": "operator", "quantity_dead_during_exposure": 12,
+    "amount_replaced_before_collection": 1, "collection_order": 4, "box_id": "box_id", "box_row": "A",
+    "box_column": 1, "exposure_route": "route", "mass_including_tube_(mg)": "NA", "mass_excluding_tube_(mg)": 8.5,
+    "observations_notes": None, "replicate": 1, "compound_name": "Ethoprophos", "dose_code": "BMD10",
+    "timepoint_level": "TP1", "timepoint_(hours)": 4
+}
+
+
+def draft4_errors(schema: dict, record: dict) -> list[tuple[str, str]]:
+    return [(error.message, error.message.split("'")[1] if not error.path else error.path[0])
+            for error in Draft4Validator(schema).iter_errors(record)]
+
+
+class TestCompiledSchema(TestCase):
+
+    def test_matches_draft4(self):
+        schema = CompiledSchema(EXPOSURE_INFORMATION_SCHEMA)
+        self.assertTrue(schema.compiled)
+        records = [
+            VALID_RECORD,
+            {**VALID_RECORD, "box_column": "A", "box_row": "AB", "collection_order": -1, "dose_code": 1},
+            {**VALID_RECORD, "box_row": "a", "replicate": 0, "timepoint_level": "T1", "dose_code": False},
+            {**VALID_RECORD, "mass_including_tube_(mg)": "none", "mass_excluding_tube_(mg)": -1, "operator": None},
+            {**VALID_RECORD, "quantity_dead_during_exposure": True, "dose_code": 0, "observations_notes": 1},
+            {key: value for key, value in VALID_RECORD.items() if key not in ("box_id", "compound_name")},
+            {key: None for key in VALID_RECORD}
+        ]
+        for record in records:
+            self.assertEqual(list(schema.iter_errors(record)), draft4_errors(EXPOSURE_INFORMATION_SCHEMA, record))
+        self.assertEqual(list(schema.iter_errors(VALID_RECORD)), [])
+
+    def test_unsupported_keyword_falls_back(self):
+        raw_schema = {"type": "object", "properties": {"a": {"type": "array", "items": {"type": "string"}}}}
+        schema = CompiledSchema(raw_schema)
+        self.assertFalse(schema.compiled)
+        record = {"a": ["x", 1]}
+        self.assertEqual(list(schema.iter_errors(record)), [("1 is not of type 'string'", "a")])
+
+
+class TestSchemaRegistry(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = mkdtemp()
+        self.filepath = path.join(self.directory, 'schema.json')
+        with open(self.filepath, 'w') as f:
+            f.write(dumps({"type": "object", "required": ["a"]}))
+
+    def tearDown(self) -> None:
+        rmtree(self.directory)
+
+    def test_cached_until_modified(self):
+        registry = SchemaRegistry()
+        schema = registry.get(self.filepath)
+        self.assertIs(registry.get(self.filepath), schema)
+        self.assertEqual(schema.required, ['a'])
+
+        with open(self.filepath, 'w') as f:
+            f.write(dumps({"type": "object", "required": ["b"]}))
+        mtime = stat(self.filepath).st_mtime_ns + 1_000_000_000
+        utime(self.filepath, ns=(mtime, mtime))
+        reloaded = registry.get(self.filepath)
+        self.assertIsNot(reloaded, schema)
+        self.assertEqual(reloaded.required, ['b'])
+
+        registry.clear()
+        self.assertIsNot(registry.get(self.filepath), reloaded)
+
+    def test_default_registry(self):
+        self.assertIs(schema_registry.get(EXPOSURE_INFORMATION_SCHEMA_FILEPATH),
+                      schema_registry.get(EXPOSURE_INFORMATION_SCHEMA_FILEPATH))
@@ -1,9 +1,16 @@
 from unittest import TestCase
 from unittest.mock import patch
+from os import path
+from tempfile import mkdtemp
+from shutil import rmtree
 
 from pandas import DataFrame, Series, concat
 
+from ptmd.lib.excel import save_to_excel
 from ptmd.lib.validator.core import ExcelValidator
+from ptmd.lib.validator.cache import ReportCache
+from ptmd.lib.validator.context import ValidationContext
+from ptmd.lib.validator.limits import ErrorLimits, OMITTED_ERRORS_LABEL
 from ptmd.const import SAMPLE_SHEET_COLUMNS, GENERAL_SHEET_COLUMNS
 
 
@@ -146,3 +153,100 @@ class TestExcelValidator(TestCase):
                 validator = ExcelValidator(1)
                 validator.validate()
             self.assertEqual('File with ID 1 does not exist.', str(context.exception))
+
+    def test_streaming_report_matches(self, mock_rm, mocked_gdrive_connector, mocked_validate_identifier,
+                                      mocked_get_session):
+        directory = mkdtemp()
+        filepath = path.join(directory, 'PTX001.xlsx')
+        save_to_excel((mock_exposure_dataframe_error, mock_general_dataframe), filepath)
+        mocked_gdrive_connector.return_value.download_file = lambda *args, **kwargs: filepath
+        reports = []
+        try:
+            for streaming in (False, True):
+                with patch('ptmd.lib.validator.core.File') as mocked_file:
+                    mocked_file.query.filter().first.return_value = MOCKED_FILE
+                    validator = ExcelValidator(1, streaming=streaming)
+                    validator.validate()
+                    reports.append(validator.report)
+        finally:
+            rmtree(directory)
+        self.assertEqual(reports[0], reports[1])
+        self.assertFalse(reports[1]['valid'])
+        self.assertIn({'message': "'A' is not of type 'number'", 'field_concerned': 'box_column'},
+                      reports[1]['errors']['Record at line 3 (FAC002LA1)'])
+
+    def test_cached_report(self, mock_rm, mocked_gdrive_connector, mocked_validate_identifier, mocked_get_session):
+        connector = mocked_gdrive_connector.return_value
+        cache = ReportCache()
+        context = ValidationContext(organisms={'Drosophila_melanogaster_female': 'F'}, chemicals={'Ethoprophos': 1})
+        for checksum in ('abc', None):
+            cache.purge()
+            with patch('ptmd.lib.validator.core.ExcelFile', return_value=MockExcelFileError()) as mock_excel_file, \
+                    patch.object(connector, 'get_checksum', create=True, return_value=checksum), \
+                    patch.object(connector, 'download_file', return_value='PTX001.xlsx') as mock_download, \
+                    patch('ptmd.lib.validator.core.file_checksum', return_value='def'), \
+                    patch('ptmd.lib.validator.core.File') as mocked_file:
+                mocked_file.query.filter().first.return_value = MOCKED_FILE
+                reports = []
+                for _ in range(2):
+                    validator = ExcelValidator(1, cache=cache, context=context)
+                    validator.validate()
+                    reports.append(validator.report)
+                self.assertFalse(validator.report['valid'])
+                self.assertTrue(validator.cached)
+                self.assertEqual(reports[0], reports[1])
+                self.assertEqual(mock_excel_file.call_count, 1)
+                self.assertEqual(mock_download.call_count, 1 if checksum else 2)
+                self.assertEqual(validator.checksum, checksum or 'def')
+                mocked_file.query.filter().update.assert_called_with({'validated': 'failed'})
+                self.assertEqual(mocked_file.query.filter().update.call_count, 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_cached_report_reference_data_changed(self, mock_rm, mocked_gdrive_connector, mocked_validate_identifier,
+                                                  mocked_get_session):
+        connector = mocked_gdrive_connector.return_value
+        cache = ReportCache()
+        with patch('ptmd.lib.validator.core.ExcelFile', return_value=MockExcelFileError()) as mock_excel_file, \
+                patch.object(connector, 'get_checksum', create=True, return_value='abc'), \
+                patch.object(connector, 'download_file', return_value='PTX001.xlsx'), \
+                patch('ptmd.lib.validator.core.File') as mocked_file:
+            mocked_file.query.filter().first.return_value = MOCKED_FILE
+            for chemicals in ({'Ethoprophos': 1}, {'Ethoprophos': 1, 'Paracetamol': 2}, {'Ethoprophos': 1}):
+                context = ValidationContext(organisms={'Drosophila_melanogaster_female': 'F'}, chemicals=chemicals)
+                validator = ExcelValidator(1, cache=cache, context=context)
+                validator.validate()
+                self.assertFalse(validator.cached)
+        self.assertEqual(mock_excel_file.call_count, 3)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    @patch('ptmd.lib.validator.core.ExcelFile', return_value=MockExcelFileError())
+    def test_limited_report(self, mock_rm, mock_excel_file, mocked_get_session,
+                            mocked_validate_identifier, mocked_gdrive_connector):
+        with patch('ptmd.lib.validator.core.File') as mocked_file:
+            mocked_file.query.filter().first.return_value = MOCKED_FILE
+            validator = ExcelValidator(1)
+            validator.validate()
+            full = validator.report
+            limits = ErrorLimits(per_field=0)
+            for _ in range(2):
+                validator = ExcelValidator(1, limits=limits)
+                validator.validate()
+        self.assertFalse(validator.report['valid'])
+        self.assertEqual(list(validator.report['errors']), [OMITTED_ERRORS_LABEL])
+        summaries = validator.report['errors'][OMITTED_ERRORS_LABEL]
+        self.assertEqual(sum(summary['omitted'] for summary in summaries), sum(map(len, full['errors'].values())))
+        self.assertIn({
+            'message': "1 more similar error, such as: 'A' is not of type 'number'",
+            'field_concerned': 'box_column',
+            'omitted': 1
+        }, summaries)
+
+    @patch('ptmd.lib.validator.core.ExcelFile', return_value=MockExcelFileError())
+    def test_no_record(self, mock_rm, mock_excel_file, mocked_get_session,
+                       mocked_validate_identifier, mocked_gdrive_connector):
+        with patch('ptmd.lib.validator.core.File') as mocked_file:
+            mocked_file.query.filter().first.return_value = MOCKED_FILE
+            validator = ExcelValidator(1, record=False)
+            validator.validate()
+        self.assertFalse(validator.report['valid'])
+        mocked_file.query.filter().update.assert_not_called()
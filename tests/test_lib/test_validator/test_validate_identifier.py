@@ -1,5 +1,4 @@
 from unittest import TestCase
-from unittest.mock import patch
 
 from ptmd.lib.validator.validate_identifier import (
     validate_identifier,
@@ -10,6 +9,8 @@ from ptmd.lib.validator.validate_identifier import (
     validate_timepoints,
     validate_replicate,
 )
+from ptmd.lib.validator.context import ValidationContext
+from ptmd.lib.validator.duplicates import DuplicateIndex
 from ptmd.const import PTX_ID_LABEL, COMPOUND_NAME_LABEL, DOSE_LABEL, TIMEPOINT_LABEL
 
 
@@ -35,7 +36,8 @@ class ExcelValidatorMock:
             'compound_name': 'Compound 1',
         }
         self.exposure_data: list[dict] = []
-        self.identifiers: list[str] = []
+        self.identifiers: DuplicateIndex = DuplicateIndex()
+        self.context: ValidationContext = ValidationContext()
 
     def add_error(self, label, message, field):
         self.report['valid'] = False
@@ -48,7 +50,8 @@ class TestValidateIdentifier(TestCase):
 
     def test_validate_identifier_failure(self):
         validator = ExcelValidatorMock()
-        validator.identifiers = ['FAC002LA1', 'PTX002']
+        validator.identifiers.add('FAC002LA1', 0)
+        validator.identifiers.add('PTX002', 1)
         validate_identifier(validator, 0)
         self.assertFalse(validator.report['valid'])
         expected_error = {
@@ -57,28 +60,22 @@ class TestValidateIdentifier(TestCase):
         }
         self.assertEqual(validator.report['errors']['test'][0], expected_error)
 
-    @patch('ptmd.lib.validator.validate_identifier.Organism')
-    @patch('ptmd.lib.validator.validate_identifier.Chemical')
-    def test_validate_identifier_success(self, mock_chemical, mock_organisms):
-        mock_chemical.query.filter().first.return_value.ptx_code = 2
-        mock_organisms.query.filter().first.return_value.ptox_biosystem_code = 'F'
+    def test_validate_identifier_success(self):
         validator = ExcelValidatorMock()
-        validator.identifiers = []
+        validator.context = ValidationContext(organisms={'test': 'F'}, chemicals={'Compound 1': 2})
         validate_identifier(validator, 1)
         self.assertTrue(validator.report['valid'])
 
-    @patch('ptmd.lib.validator.validate_identifier.Organism')
-    def test_validate_species_error_404(self, mock_organisms):
-        mock_organisms.query.filter().first.return_value = None
+    def test_validate_species_error_404(self):
         validator = ExcelValidatorMock()
+        validator.context = ValidationContext(organisms={}, chemicals={})
         validate_species(validator)
         self.assertFalse(validator.report['valid'])
         self.assertEqual(validator.report['errors']['test'][0]['message'], 'Organism not found in database.')
 
-    @patch('ptmd.lib.validator.validate_identifier.Organism')
-    def test_validate_species_error_unmatch(self, mock_organisms):
-        mock_organisms.query.filter().first.return_value.ptox_biosystem_code = 'ABCF'
+    def test_validate_species_error_unmatch(self):
         validator = ExcelValidatorMock()
+        validator.context = ValidationContext(organisms={'test2': 'ABCF'}, chemicals={})
         validator.general_info['biosystem_name'] = 'test2'
         validate_species(validator)
         self.assertFalse(validator.report['valid'])
@@ -127,10 +124,9 @@ class TestValidateIdentifier(TestCase):
         self.assertEqual(validator.report['errors']['test'][0]['message'],
                          "The identifier doesn't contain a valid compound code '-1'.")
 
-    @patch('ptmd.lib.validator.validate_identifier.Chemical')
-    def test_validate_compound_replicates(self, mock_chemical):
-        mock_chemical.query.filter().first.return_value.ptx_code = '2'
+    def test_validate_compound_replicates(self):
         validator = ExcelValidatorMock()
+        validator.context = ValidationContext(organisms={}, chemicals={'Compound 1': 2})
         validator.current_record['data']['compound_hash'] = 'PTX003'
         validator.current_record['data'][PTX_ID_LABEL] = 'FBC003LA1'
         validate_compound(validator)
@@ -155,10 +151,9 @@ class TestValidateIdentifier(TestCase):
         msg = validator.report['errors']['test'][0]['message']
         self.assertIn("The compound hash PTX004 doesn't match the reference identifier PTX003.", msg)
 
-    @patch('ptmd.lib.validator.validate_identifier.Chemical')
-    def test_validate_compound_error_no_compound(self, mock_chemical):
-        mock_chemical.query.filter().first.return_value = None
+    def test_validate_compound_error_no_compound(self):
         validator = ExcelValidatorMock()
+        validator.context = ValidationContext(organisms={}, chemicals={})
         validator.current_record['data']['compound_hash'] = 'PTX002'
         validator.current_record['data'][PTX_ID_LABEL] = 'FBC002LA1'
         validate_compound(validator)
@@ -166,9 +161,7 @@ class TestValidateIdentifier(TestCase):
         self.assertEqual(validator.report['errors']['test'][0]['message'],
                          "The identifier doesn't contain a valid compound code '2'.")
 
-    @patch('ptmd.lib.validator.validate_identifier.Chemical')
-    def test_validate_compound_controls(self, mock_chemical):
-        mock_chemical.query.filter().first.return_value.ptx_code = '2'
+    def test_validate_compound_controls(self):
         validator = ExcelValidatorMock()
         validator.current_record['data'][COMPOUND_NAME_LABEL] = 'CONTROL (DMSO)'
         validate_compound(validator)